@@ -11,6 +11,7 @@ API_KEYS = "API_KEYS"
 API_CONTEXT_INTEGRATION = "API_CONTEXT_INTEGRATION"
 SESSION_MANAGER_CATEGORY_KEY = "SESSION_MANAGEMENT"
 FRONTEND_SANDBOX_CHAT_INTERFACE = "FRONTEND_SANDBOX_CHAT_INTERFACE"
+LLM_CACHE_CATEGORY_KEY = "LLM_CACHE"
 
 
 # DB
@@ -4,12 +4,18 @@ from fastapi import FastAPI, Request, HTTPException
 from pymongo.errors import PyMongoError
 from pydantic import ValidationError  
 
+from utils.cache.tenant_cache import tenant_cache
+from utils.metrics.prometheus_metrics import record_error
+
 async def database_exception_handler(request, exc: PyMongoError):
     return JSONResponse(
         content={"detail": "Database error occurred. Please try again later."},
     )
 
 async def http_exception_handler(request, exc: HTTPException):
+    # The path's tenant_id is client input, only tenants that were loaded are used as a metric label
+    tenant_id = request.path_params.get("tenant_id")
+    record_error(tenant_id if tenant_id and tenant_cache.is_loaded(tenant_id) else None, exc.status_code, exc.detail)
     return JSONResponse(
         status_code=exc.status_code,
         content={"detail": exc.detail},
@@ -17,12 +17,11 @@ class InjectorResolver:
     def _matches_condition(self, condition: str) -> bool:
         """Evaluate the condition against session data."""
         try:
-            resolved_condition = RulesetConditionsService.resolve_condition(
+            return RulesetConditionsService.evaluate_ruleset_condition(
                 condition=condition,
                 session_data=self.session_data.dict(),
                 conditions_dict=getattr(self.ruleset, "conditions", {})
             )
-            return eval(resolved_condition)
         except Exception as error:
             logger.error("Condition evaluation error: %s", error)
             return False
@@ -1,14 +1,27 @@
 import logging
-from typing import Dict, Any, Tuple, Optional, List
+from typing import Dict, Any, Tuple, Optional, List, NamedTuple, Set, Iterable
 from fastapi import HTTPException
 
 from api.core.services.ruleset.ruleset_conditions_service import RulesetConditionsService
 from model.external_system_integration.external_user_session_data import ExternalSessionData
 from model.responses.sql_generation.sql_generation_error import ErrorType, AccessControlViolationResponse, AccessViolation, AccessViolationType
 from model.ruleset.ruleset import Ruleset
+from model.ruleset.group_access_policy import GroupAccessPolicy
 from model.query_scope.query_scope import QueryScope
 from model.schema.schema import Schema
 
+_UNRESOLVED = object()
+
+class TableAccessDecision(NamedTuple):
+    """
+    Compiled access decision for one table of the current request.
+
+    denied_columns maps each denied column to the (policy_type, policy_name) that denies it.
+    """
+    table_violation: Optional[AccessViolation]
+    allowed_columns: Set[str]
+    denied_columns: Dict[str, Tuple[str, Optional[str]]]
+
 class AccessControlResolver:
     def __init__(self, session_data: ExternalSessionData, ruleset: Ruleset, matched_schema: Schema):
         """
@@ -26,6 +39,9 @@ class AccessControlResolver:
         self.group_policy = ruleset.group_access_policy or {}
         self.user_policy = self._get_user_specific_policy()
         self.schema = matched_schema
+        self._session_dict: Optional[Dict[str, Any]] = None
+        self._matched_group_policy: Any = _UNRESOLVED
+        self._decision_table: Dict[str, TableAccessDecision] = {}
 
     def _get_user_specific_policy(self) -> Dict[str, Any]:
         """
@@ -45,21 +61,72 @@ class AccessControlResolver:
         Evaluate a condition dynamically using the RulesetConditionsService.
         """
         try:
-            resolved_condition = RulesetConditionsService.resolve_condition(
-                condition, self.session_data.dict(), self.conditions
+            result = RulesetConditionsService.evaluate_ruleset_condition(
+                condition, self._get_session_dict(), self.conditions
             )
-            result = RulesetConditionsService.evaluate_condition(resolved_condition, self.session_data.dict())
             logging.debug(f"Condition '{condition}' evaluated to: {result}")
             return result
         except Exception as e:
             logging.error(f"Error evaluating condition '{condition}': {e}")
             raise
 
-    def _validate_table_access(self, table_name: str) -> Optional[AccessViolation]:
+    def _get_session_dict(self) -> Dict[str, Any]:
+        if self._session_dict is None:
+            self._session_dict = self.session_data.dict()
+        return self._session_dict
+
+    def compile_decision_table(self, table_names: Iterable[str]) -> Dict[str, TableAccessDecision]:
         """
-        Validate access to a table based on global, group, and user-specific policies.
-        Returns AccessViolation if access is denied, None if allowed.
+        Compile the access decision of each table once for this request. The matching group
+        policy does not depend on the table and is resolved a single time, so checking a column
+        afterwards is a set lookup.
+
+        Args:
+            table_names (Iterable[str]): Tables of the query scope.
+
+        Returns:
+            Dict[str, TableAccessDecision]: Decisions of every table compiled so far.
         """
+        for table_name in table_names:
+            if table_name not in self._decision_table:
+                self._decision_table[table_name] = self._compile_table_decision(table_name)
+        return self._decision_table
+
+    def _compile_table_decision(self, table_name: str) -> TableAccessDecision:
+        table_violation = self._resolve_table_violation(table_name)
+        if table_violation:
+            return TableAccessDecision(table_violation=table_violation, allowed_columns=set(), denied_columns={})
+
+        global_rule = self.global_policy.tables.get(table_name)
+        user_rule = self.user_policy.get(table_name)
+        group_rule = self._match_group_policy(table_name)
+
+        # Get group rule columns safely
+        group_rule_columns = None
+        if group_rule and group_rule.tables and table_name in group_rule.tables:
+            group_rule_columns = group_rule.tables[table_name].columns
+
+        allowed_columns, denied_columns = RulesetConditionsService.merge_column_access(
+            global_rule,
+            group_rule_columns,
+            user_rule,
+            self.schema.tables[table_name]
+        )
+
+        denied_by_policy = {}
+        for column_name in denied_columns:
+            policy_type = "global" if global_rule and column_name in global_rule.columns.deny else \
+                         "user" if user_rule and column_name in user_rule.columns.deny else "group"
+            policy_name = group_rule.description if policy_type == "group" and group_rule else None
+            denied_by_policy[column_name] = (policy_type, policy_name)
+
+        return TableAccessDecision(
+            table_violation=None,
+            allowed_columns=allowed_columns,
+            denied_columns=denied_by_policy
+        )
+
+    def _resolve_table_violation(self, table_name: str) -> Optional[AccessViolation]:
         # Check Global Policy
         global_rule = self.global_policy.tables.get(table_name)
         if global_rule and table_name in global_rule.columns.deny:
@@ -91,36 +158,24 @@ class AccessControlResolver:
             failed_condition="Table not found in any applicable policy"
         )
 
+    def _validate_table_access(self, table_name: str) -> Optional[AccessViolation]:
+        """
+        Validate access to a table based on global, group, and user-specific policies.
+        Returns AccessViolation if access is denied, None if allowed.
+        """
+        return self.compile_decision_table([table_name])[table_name].table_violation
+
     def _validate_column_access(self, table_name: str, column_name: str) -> Optional[AccessViolation]:
         """
         Validate access to a specific column based on global, user-specific, and group policies.
         Returns AccessViolation if access is denied, None if allowed.
         """
-        global_rule = self.global_policy.tables.get(table_name)
-        user_rule = self.user_policy.get(table_name)
-        group_rule = self._match_group_policy(table_name)
-
-        # Get group rule columns safely
-        group_rule_columns = None
-        if group_rule and group_rule.tables and table_name in group_rule.tables:
-            group_rule_columns = group_rule.tables[table_name].columns
-
-        allowed_columns, denied_columns = RulesetConditionsService.merge_column_access(
-            global_rule,
-            group_rule_columns,
-            user_rule,
-            self.schema.tables[table_name]
-        )
-
+        decision = self.compile_decision_table([table_name])[table_name]
         full_column_name = f"{table_name}.{column_name}"
-        
-        if column_name in denied_columns:
-            policy_type = "global" if global_rule and column_name in global_rule.columns.deny else \
-                         "user" if user_rule and column_name in user_rule.columns.deny else "group"
-            policy_name = None
-            if policy_type == "group" and group_rule:
-                policy_name = group_rule.description
-            
+
+        denial = decision.denied_columns.get(column_name)
+        if denial:
+            policy_type, policy_name = denial
             return AccessViolation(
                 entity=full_column_name,
                 policy_type=policy_type,
@@ -130,13 +185,13 @@ class AccessControlResolver:
                 failed_condition=f"Column '{column_name}' is explicitly denied by policy '{policy_type}'"
             )
 
-        if allowed_columns and column_name not in allowed_columns:
+        if decision.allowed_columns and column_name not in decision.allowed_columns:
             return AccessViolation(
                 entity=full_column_name,
                 policy_type="access",
                 violation_type=AccessViolationType.MISSING_PERMISSION,
                 reason="Column access not explicitly allowed by any policy",
-                failed_condition=f"Column '{column_name}' is explicitly denied by policy '{policy_type}'"
+                failed_condition=f"Column '{column_name}' is not in the allowed columns of any applicable policy"
             )
 
         return None
@@ -147,7 +202,7 @@ class AccessControlResolver:
 
         Handles type normalization for booleans, strings, and other potential mismatches.
         """
-        session_dict = self.session_data.dict().get("custom_fields", {})
+        session_dict = self._get_session_dict().get("custom_fields", {})
 
         for key, expected_value in matching_criteria.items():
             value_in_session = session_dict.get(key)
@@ -175,17 +230,23 @@ class AccessControlResolver:
 
         return True
 
-    def _match_group_policy(self, table_name: str):
+    def _match_group_policy(self, table_name: str) -> Optional[GroupAccessPolicy]:
         """
         Match the first applicable group policy based on matching criteria and conditions.
+        The match only depends on the session, it is resolved once and reused for every table.
         """
+        if self._matched_group_policy is not _UNRESOLVED:
+            return self._matched_group_policy
+
         for group_name, group_rule in self.group_policy.items():
             if self._validate_matching_criteria(group_rule.criteria.matching_criteria):
                 condition_str = group_rule.criteria.condition or "True"
                 if self._evaluate_condition(condition_str):
                     logging.debug(f"Group policy '{group_name}' matched for table '{table_name}'.")
+                    self._matched_group_policy = group_rule
                     return group_rule
         logging.debug("No group policy matched.")
+        self._matched_group_policy = None
         return None
 
     def has_access_to_scope(self, query_scope: QueryScope, user_input: str = "", sql_query: str = "") -> bool:
@@ -196,6 +257,12 @@ class AccessControlResolver:
         denied_columns = []
         violations: List[AccessViolation] = []
 
+        self.compile_decision_table(query_scope.entities.tables)
+
+        columns_by_table: Dict[str, List[str]] = {}
+        for column in query_scope.entities.columns:
+            columns_by_table.setdefault(column.split(".", 1)[0], []).append(column)
+
         for table in query_scope.entities.tables:
             table_violation = self._validate_table_access(table)
             if table_violation:
@@ -204,10 +271,7 @@ class AccessControlResolver:
                 violations.append(table_violation)
                 continue
 
-            table_columns = [
-                column for column in query_scope.entities.columns if column.startswith(f"{table}.")
-            ]
-            for column in table_columns:
+            for column in columns_by_table.get(table, []):
                 column_name = column.split(".", 1)[1]
                 column_violation = self._validate_column_access(table, column_name)
                 if column_violation:
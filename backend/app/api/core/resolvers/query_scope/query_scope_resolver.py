@@ -35,7 +35,8 @@ class QueryScopeResolver:
     async def match_user_query_to_schema(self, tenant_id: str) -> Union[Dict[str, List[str]], Any]:
         """
         Fetch and validate schemas, then match the query scope to the most relevant
-        schema(s) and return the appropriate response.
+        schema(s) and return the appropriate response. Routing goes through the tenant's
+        SchemaEntityIndex, so only the matched schema is loaded.
         """
         self.schemas = await QueryScopePreparationService.prepare_query_scope(
             tenant_id=tenant_id,
@@ -11,6 +11,8 @@ from api.core.services.sql_runner.sql_runner_service import SqlRunnerService
 from model.chat_interface.context_user_row import ContextUserRow
 from model.schema.schema import Schema
 from utils.database import mongodb
+from utils.cache.tenant_cache import tenant_cache
+from utils.cache.session_cache import session_cache
 from model.tenant.tenant import Tenant;
 from model.chat_interface.chat_interface_settings import ChatInterfaceSettings;
 from model.chat_interface.chat_interface_setting import ChatInterfaceSetting;
@@ -119,6 +121,8 @@ class ChatInterfaceService:
                 else:
                     logger.warning(f"Tenant setting {category}.{setting_name} does not exist for tenant {tenant.tenant_id}.")
 
+        await tenant_cache.mark_modified(tenant.tenant_id)
+
         # Patch session settings
         for category, settings in patch_request.dict().items():
             logger.debug(f"Patching session category: {category}")
@@ -162,6 +166,8 @@ class ChatInterfaceService:
                         logger.debug(f"No update needed for {category}.{setting_name}. Current value matches patch request.")
                 else:
                     logger.warning(f"Session setting {category}.{setting_name} does not exist in session {session_uuid}.")
+
+        session_cache.invalidate(session_uuid)
                     
     @staticmethod
     async def get_paginated_context_users_from_context_table(
@@ -204,7 +210,7 @@ class ChatInterfaceService:
             .replace("${order_direction}", order_direction.upper())
         )
 
-        users_result = SqlRunnerService.run_sql(
+        users_result = await SqlRunnerService.run_sql_async(
             query=query,
             tenant=tenant,
             schema_name=schema.schema_name
@@ -264,7 +270,7 @@ class ChatInterfaceService:
         """
         Execute the count query to get the total number of records in the context table.
         """
-        count_result = SqlRunnerService.run_sql(
+        count_result = await SqlRunnerService.run_sql_async(
             query=count_query,
             tenant=tenant,
             schema_name=schema_name
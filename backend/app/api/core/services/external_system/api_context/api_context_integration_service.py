@@ -1,3 +1,5 @@
+import ast
+import asyncio
 import aiohttp
 import logging
 import jwt
@@ -16,6 +18,7 @@ from api.core.constants.tenant.settings_categories import(
     API_KEYS
 )
 from utils.tenant_manager.setting_utils import SettingUtils
+from utils.external_system_utils.external_api_client_registry import external_api_client_registry
 
 class APIContextIntegrationService:
 
@@ -70,7 +73,7 @@ class APIContextIntegrationService:
 
         logging.debug(f"Calling external get-user endpoint: {url}")
 
-        async with aiohttp.ClientSession() as session:
+        async with external_api_client_registry.session(tenant.tenant_id, url) as session:
             try:
                 async with session.get(url, headers=headers) as response:
                     logging.debug(f"External get-user response status for tenant {tenant.tenant_id}: {response.status}")
@@ -95,7 +98,7 @@ class APIContextIntegrationService:
                     logging.info(f"Get-user successful for tenant {tenant.tenant_id}.")
                     return await response.json()
 
-            except aiohttp.ClientError as e:
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
                 logging.error(f"Network error during get-user for tenant {tenant.tenant_id}: {str(e)}")
                 raise HTTPException(
                     status_code=502,  
@@ -143,7 +146,7 @@ class APIContextIntegrationService:
         logging.debug(f"Headers for tenant {tenant.tenant_id}: {headers}")
         logging.debug(f"Calling external get-users-context-counts endpoint: {get_users_context_counts_endpoint}")
 
-        async with aiohttp.ClientSession() as session:
+        async with external_api_client_registry.session(tenant.tenant_id, get_users_context_counts_endpoint) as session:
             try:
                 async with session.get(get_users_context_counts_endpoint, headers=headers) as response:
                     logging.debug(f"External get-users-context-counts response status for tenant {tenant.tenant_id}: {response.status}")
@@ -191,7 +194,7 @@ class APIContextIntegrationService:
                         detail="External service returned an unexpected format."
                     )
 
-            except aiohttp.ClientError as e:
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
                 logging.error(f"Network error during get-users-context-counts for tenant {tenant.tenant_id}: {str(e)}")
                 raise HTTPException(
                     status_code=502,
@@ -256,7 +259,7 @@ class APIContextIntegrationService:
         logging.debug(f"Headers for tenant {tenant.tenant_id}: {headers}")
         logging.debug(f"Calling external get-users endpoint: {get_users_endpoint} with params: {params}")
 
-        async with aiohttp.ClientSession() as session:
+        async with external_api_client_registry.session(tenant.tenant_id, get_users_endpoint) as session:
             try:
                 async with session.get(get_users_endpoint, headers=headers, params=params) as response:
                     logging.debug(f"External get-users response status for tenant {tenant.tenant_id}: {response.status}")
@@ -283,7 +286,7 @@ class APIContextIntegrationService:
                     logging.info(f"Get-users successful for tenant {tenant.tenant_id}.")
                     return users_data
 
-            except aiohttp.ClientError as e:
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
                 logging.error(f"Network error during get-users for tenant {tenant.tenant_id}: {str(e)}")
                 raise HTTPException(
                     status_code=502,  
@@ -298,7 +301,7 @@ class APIContextIntegrationService:
 
         # Extract required settings
         access_token = user_token.get("access_token")
-        jwt_custom_fields = eval(SettingUtils.get_setting_value(settings, API_CONTEXT_INTEGRATION, "EXTERNAL_API_CONTEXT_CUSTOM_FIELDS") or "[]")
+        jwt_custom_fields = ast.literal_eval(SettingUtils.get_setting_value(settings, API_CONTEXT_INTEGRATION, "EXTERNAL_API_CONTEXT_CUSTOM_FIELDS") or "[]")
         user_identifier_field = SettingUtils.get_setting_value(settings, API_CONTEXT_INTEGRATION, "EXTERNAL_API_CONTEXT_IDENTIFIER_FIELD")
         external_jwt_secret_key = SettingUtils.get_setting_value(settings, API_KEYS, "EXTERNAL_SYSTEM_CLIENT_TOKEN")
 
@@ -16,6 +16,7 @@ from model.external_system_integration.external_user_session_data import Externa
 from model.tenant.tenant import Tenant
 from model.external_system_integration.external_user_session_data_setting import ExternalSessionDataSetting
 from utils.tenant_manager.setting_utils import SettingUtils
+from utils.cache.session_cache import session_cache
 from api.core.constants.tenant.settings_categories import(
     POST_PROCESS_QUERYSCOPE_CATEGORY_KEY, SESSION_MANAGER_CATEGORY_KEY
 )
@@ -108,6 +109,7 @@ class SessionManagerService:
                 raise HTTPException(status_code=400, detail="Invalid session_id format")
             
             result = await collection.delete_one({"session_id": session_uuid})
+            session_cache.invalidate(session_uuid)
             if result.deleted_count == 0:
                 return False;
             
@@ -137,6 +139,7 @@ class SessionManagerService:
                 {"session_id": session_uuid},
                 {"$set": {"session_settings": session_data["session_settings"]}}
             )
+            session_cache.invalidate(session_uuid)
             
             if result.modified_count == 0:
                 return False
@@ -178,6 +181,7 @@ class SessionManagerService:
         try:
             session_uuid = UUID(session_id)
             result = await collection.delete_one({"session_id": session_uuid})
+            session_cache.invalidate(session_uuid)
             if result.deleted_count == 0:
                 raise HTTPException(status_code=404, detail="Session not found")
             return {"message": "Successfully logged out"}
@@ -49,14 +49,14 @@ class SQLContextIntegrationService:
 
         # Run SQL based on the flavor
         if sql_flavor == "mysql":
-            context_query_result = SqlRunnerService.run_sql(
+            context_query_result = await SqlRunnerService.run_sql_async(
                 query=query,
                 tenant=tenant,
                 params=query_params,
                 schema_name=schema_name  # Required only for MySQL
             )
         else:
-            context_query_result = SqlRunnerService.run_sql(
+            context_query_result = await SqlRunnerService.run_sql_async(
                 query=query,
                 tenant=tenant,
                 params=query_params
@@ -1,8 +1,7 @@
-from typing import Dict, Optional
-from api.core.constants.tenant.settings_categories import SQL_GENERATION_KEY
+from typing import Dict, Optional, Tuple
+from api.core.constants.tenant.settings_categories import SQL_GENERATION_KEY, LLM_CACHE_CATEGORY_KEY
 from utils.prompt_instructions_utils import DefaultPromptInstructionsUtil
 from fastapi import HTTPException
-from openai import OpenAI
 import logging
 import json
 
@@ -12,17 +11,86 @@ from model.query_scope.query_scope import QueryScope
 from model.requests.sql_generation.user_input_request import UserInputRequest
 from api.core.services.tenant_manager.tenant_manager_service import TenantManagerService
 from utils.llm_wrapper.sql_generation_output_utils import SQLUtils
+from utils.llm_wrapper.schema_prompt_utils import SchemaPromptUtils, JSON_SCHEMA_PROMPT_FORMAT, count_tokens
+from utils.llm_wrapper.openai_client import openai_client
+from utils.cache.query_scope_cache import query_scope_cache
+from utils.cache.sql_generation_cache import sql_generation_cache
 from utils.tenant_manager.setting_utils import SettingUtils
+from utils.metrics.prometheus_metrics import record_llm_usage
 
 class LLMServiceWrapper:
 
     @staticmethod
-    async def get_query_scope_using_default_mode(user_input: UserInputRequest) -> QueryScope:
+    def encode_schema_for_prompt(resolved_schema: Dict, tenant: Optional[Tenant] = None) -> str:
+        """
+        Encode the resolved schema in the tenant's SQL_GENERATION.SCHEMA_PROMPT_FORMAT, logging its
+        token count.
+        """
+        schema_format = JSON_SCHEMA_PROMPT_FORMAT
+        if tenant is not None:
+            schema_format = SettingUtils.get_setting_value(
+                settings=tenant.settings,
+                category_key=SQL_GENERATION_KEY,
+                setting_key="SCHEMA_PROMPT_FORMAT"
+            ) or JSON_SCHEMA_PROMPT_FORMAT
+
+        encoded_schema = SchemaPromptUtils.encode(resolved_schema, schema_format)
+        token_count, counted_with = count_tokens(encoded_schema, settings.DEFAULT_APP_LLM_MODEL)
+        logging.info(f"Schema prompt - Format: {schema_format}, Tables: {len(resolved_schema.get('tables', {}))}, "
+                     f"Tokens: {token_count} ({counted_with})")
+        return encoded_schema
+
+    @staticmethod
+    async def get_query_scope_with_cache(user_input: UserInputRequest, tenant: Tenant, schema_name: str) -> QueryScope:
+        """
+        Return the QueryScope of a previously asked question on the same tenant and schema,
+        calling the intent model only on a cache miss.
+        """
+        cache_enabled = SettingUtils.get_setting_value(
+            settings=tenant.settings,
+            category_key=LLM_CACHE_CATEGORY_KEY,
+            setting_key="QUERY_SCOPE_CACHE_ENABLED"
+        )
+        if cache_enabled is False:
+            return await LLMServiceWrapper.get_query_scope_using_default_mode(user_input=user_input, tenant_id=tenant.tenant_id)
+
+        similarity_threshold = None
+        if SettingUtils.get_setting_value(
+            settings=tenant.settings,
+            category_key=LLM_CACHE_CATEGORY_KEY,
+            setting_key="QUERY_SCOPE_CACHE_SIMILARITY_ENABLED"
+        ):
+            similarity_threshold = float(SettingUtils.get_setting_value(
+                settings=tenant.settings,
+                category_key=LLM_CACHE_CATEGORY_KEY,
+                setting_key="QUERY_SCOPE_CACHE_SIMILARITY_THRESHOLD"
+            ) or 0.95)
+
+        cached_query_scope = query_scope_cache.get(
+            tenant_id=tenant.tenant_id,
+            schema_name=schema_name,
+            user_input=user_input.input,
+            similarity_threshold=similarity_threshold
+        )
+        if cached_query_scope is not None:
+            logging.info(f"QueryScope cache hit for tenant '{tenant.tenant_id}' and schema '{schema_name}'")
+            return cached_query_scope
+
+        query_scope = await LLMServiceWrapper.get_query_scope_using_default_mode(user_input=user_input, tenant_id=tenant.tenant_id)
+        query_scope_cache.set(
+            tenant_id=tenant.tenant_id,
+            schema_name=schema_name,
+            user_input=user_input.input,
+            query_scope=query_scope
+        )
+        return query_scope
+
+    @staticmethod
+    async def get_query_scope_using_default_mode(user_input: UserInputRequest, tenant_id: Optional[str] = None) -> QueryScope:
         try:
-            client = OpenAI(api_key=settings.OPENAI_API_KEY)
             json_schema, content_instruction = DefaultPromptInstructionsUtil.get_intent_json_schema_and_content_instruction()
 
-            response = client.chat.completions.create(
+            response = await openai_client.create_chat_completion(
                 model=f"{settings.DEFAULT_APP_LLM_MODEL}",
                 messages=[
                     {
@@ -52,12 +120,8 @@ class LLMServiceWrapper:
             query_scope = QueryScope(**parsed_data)
             
             usage = response.usage
-            prompt_tokens = usage.prompt_tokens
-            completion_tokens = usage.completion_tokens
-            total_tokens = usage.total_tokens
-
-            # logging.info(f"Token Usage - Prompt: {prompt_tokens}, Completion: {completion_tokens}, Total: {total_tokens}")
-            print(f"Token Usage - Prompt: {prompt_tokens}, Completion: {completion_tokens}, Total: {total_tokens}")
+            logging.debug(f"Token Usage - Prompt: {usage.prompt_tokens}, Completion: {usage.completion_tokens}, Total: {usage.total_tokens}")
+            record_llm_usage(tenant_id, settings.DEFAULT_APP_LLM_MODEL, "query_scope", usage)
             
             return query_scope
 
@@ -68,6 +132,62 @@ class LLMServiceWrapper:
                 detail=f"Failed to generate structured query scope: {str(e)}"
             )
 
+    @staticmethod
+    async def get_query_scope_and_sql(user_input: UserInputRequest, resolved_schema: Dict,
+                                      tenant: Optional[Tenant] = None) -> Tuple[QueryScope, str]:
+        """
+        Single round trip mode, one structured-output call returns both the QueryScope and a
+        candidate SQL query written against the resolved schema.
+        """
+        try:
+            json_schema, content_instruction = DefaultPromptInstructionsUtil.get_query_scope_and_sql_json_schema_and_content_instruction()
+            encoded_schema = LLMServiceWrapper.encode_schema_for_prompt(resolved_schema, tenant)
+
+            response = await openai_client.create_chat_completion(
+                model=f"{settings.DEFAULT_APP_LLM_MODEL}",
+                messages=[
+                    {
+                        "role": "system",
+                        "content": f"{content_instruction}\nSchema: {encoded_schema}"
+                    },
+                    {
+                        "role": "user",
+                        "content": user_input.input
+                    }
+                ],
+                response_format={
+                    "type": "json_schema",
+                    "json_schema": {
+                        "name": "query_scope_and_sql_schema",
+                        "schema": json_schema
+                    }
+                },
+                temperature=0.3,
+                max_tokens=512,
+                top_p=1,
+                frequency_penalty=0,
+                presence_penalty=0
+            )
+            parsed_data = json.loads(response.choices[0].message.content)
+            generated_sql = SQLUtils.normalize_sql(parsed_data.pop("sql"))
+            query_scope = QueryScope(**parsed_data)
+
+            usage = response.usage
+            logging.debug(f"Token Usage - Prompt: {usage.prompt_tokens}, Completion: {usage.completion_tokens}, Total: {usage.total_tokens}")
+            record_llm_usage(tenant.tenant_id if tenant else None, settings.DEFAULT_APP_LLM_MODEL, "query_scope_and_sql", usage)
+
+            if not generated_sql.strip().upper().startswith(("SELECT", "INSERT", "UPDATE", "DELETE")):
+                raise ValueError("Invalid SQL Syntax generated.")
+
+            return query_scope, generated_sql
+
+        except Exception as e:
+            logging.error(f"Error in OpenAI API: {e}")
+            raise HTTPException(
+                status_code=500,
+                detail=f"Failed to generate structured query scope and SQL query: {str(e)}"
+            )
+
     @staticmethod
     async def generate_sql_query(user_input: UserInputRequest, 
                                  resolved_schema: Dict, 
@@ -78,16 +198,26 @@ class LLMServiceWrapper:
             category_key=SQL_GENERATION_KEY,
             setting_key="INCLUDE_QUERY_SCOPE_ON_SQL_GENERATION"
         ) or False
+        cache_enabled = SettingUtils.get_setting_value(
+            settings=tenant.settings,
+            category_key=LLM_CACHE_CATEGORY_KEY,
+            setting_key="SQL_GENERATION_CACHE_ENABLED"
+        )
+        cache_persistent = SettingUtils.get_setting_value(
+            settings=tenant.settings,
+            category_key=LLM_CACHE_CATEGORY_KEY,
+            setting_key="SQL_GENERATION_CACHE_PERSISTENT"
+        )
         
         try:
-            client = OpenAI(api_key=settings.OPENAI_API_KEY)
+            encoded_schema = LLMServiceWrapper.encode_schema_for_prompt(resolved_schema, tenant)
             if not include_query_scope:
                 prompt_instruction = DefaultPromptInstructionsUtil.get_sql_generation_instructions()
                 
                 messages = [
                 {
                     "role": "system",
-                    "content": f"{prompt_instruction}\nSchema: {json.dumps(resolved_schema)}"
+                    "content": f"{prompt_instruction}\nSchema: {encoded_schema}"
                 },
                     {
                         "role": "user",
@@ -108,7 +238,7 @@ class LLMServiceWrapper:
                 messages = [
                     {
                         "role": "system",
-                        "content": f"{prompt_instruction}\nQueryScope: {new_query_scope}\nSchema: {json.dumps(resolved_schema)}"
+                        "content": f"{prompt_instruction}\nQueryScope: {new_query_scope}\nSchema: {encoded_schema}"
                     },
                     {
                         "role": "user",
@@ -116,7 +246,15 @@ class LLMServiceWrapper:
                     }
                 ]
 
-            response = client.chat.completions.create(
+            cache_key = None
+            if cache_enabled is not False:
+                cache_key = sql_generation_cache.build_key(settings.DEFAULT_APP_LLM_MODEL, messages)
+                cached_sql = await sql_generation_cache.get(tenant.tenant_id, cache_key, use_persistent=bool(cache_persistent))
+                if cached_sql is not None:
+                    logging.info(f"Generated SQL cache hit for tenant '{tenant.tenant_id}'")
+                    return cached_sql
+
+            response = await openai_client.create_chat_completion(
                 model=f"{settings.DEFAULT_APP_LLM_MODEL}",
                 messages=messages,
                 temperature=0.3,
@@ -132,13 +270,15 @@ class LLMServiceWrapper:
             generated_sql = SQLUtils.normalize_sql(generated_sql)
 
             usage = response.usage
-            # logging.info(f"Token Usage - Prompt: {usage.prompt_tokens}, Completion: {usage.completion_tokens}, Total: {usage.total_tokens}")
-            print(f"Token Usage - Prompt: {usage.prompt_tokens}, Completion: {usage.completion_tokens}, Total: {usage.total_tokens}")
+            logging.debug(f"Token Usage - Prompt: {usage.prompt_tokens}, Completion: {usage.completion_tokens}, Total: {usage.total_tokens}")
+            record_llm_usage(tenant.tenant_id, settings.DEFAULT_APP_LLM_MODEL, "sql_generation", usage)
             
             # Check for invalid SQL structure
             if not generated_sql.strip().upper().startswith(("SELECT", "INSERT", "UPDATE", "DELETE")):
                 raise ValueError("Invalid SQL Syntax generated.")
 
+            if cache_key is not None:
+                await sql_generation_cache.set(tenant.tenant_id, cache_key, generated_sql, use_persistent=bool(cache_persistent))
 
             return generated_sql
 
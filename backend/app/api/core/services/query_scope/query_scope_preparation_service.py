@@ -1,7 +1,6 @@
 import logging
-import difflib
 import re
-from typing import List
+from typing import List, Optional, Union
 from fastapi import HTTPException
 
 from model.query_scope.query_scope import QueryScope
@@ -9,13 +8,17 @@ from model.responses.schema.schema_tables_response import SchemaTablesResponse
 from api.core.services.schema.schema_manager_service import SchemaManagerService
 from model.responses.sql_generation.sql_generation_error import QueryScopeResolutionErrorResponse, QueryScopeErrorType, ErrorType
 from utils.query_scope.validate_query_scope_utils import ValidateQueryScopeUtils
+from utils.schema.schema_lookup_index import FuzzyNameIndex
+from utils.schema.schema_entity_index import SchemaEntityIndex
 
 logger = logging.getLogger(__name__)
 
-def get_table_suggestions(table_name: str, schemas: List[SchemaTablesResponse]) -> List[str]:
-    # Gather valid table names
-    valid_tables = {tbl.table_name for sch in schemas for tbl in sch.tables}
-    return difflib.get_close_matches(table_name, valid_tables)
+def get_table_suggestions(table_name: str, schemas: List[SchemaTablesResponse],
+                          suggestion_index: Optional[FuzzyNameIndex] = None) -> List[str]:
+    # Gather valid table names, callers suggesting for several tables build the index once
+    if suggestion_index is None:
+        suggestion_index = FuzzyNameIndex(tbl.table_name for sch in schemas for tbl in sch.tables)
+    return suggestion_index.get_close_matches(table_name, n=3, cutoff=0.6)
 
 class QueryScopePreparationService:
     """
@@ -24,20 +27,23 @@ class QueryScopePreparationService:
     """
 
     @staticmethod
-    def _soft_preprocess_tables(schemas: List[SchemaTablesResponse], query_scope: QueryScope) -> None:
+    def _soft_preprocess_tables(schemas: Union[List[SchemaTablesResponse], SchemaEntityIndex], query_scope: QueryScope) -> None:
         """
         Soft pre-process table names and associated column names in the query scope
         by correcting minor errors (e.g., missing or extra 's').
         Modifies the query_scope in place.
         """
-        valid_tables = set()
-        for schema in schemas:
-            if isinstance(schema, SchemaTablesResponse):
-                valid_tables.update(table.table_name for table in schema.tables)
-            else:
-                raise AttributeError(
-                    f"Expected SchemaTablesResponse object, but got {type(schema)}"
-                )
+        if isinstance(schemas, SchemaEntityIndex):
+            valid_tables = schemas.table_names
+        else:
+            valid_tables = set()
+            for schema in schemas:
+                if isinstance(schema, SchemaTablesResponse):
+                    valid_tables.update(table.table_name for table in schema.tables)
+                else:
+                    raise AttributeError(
+                        f"Expected SchemaTablesResponse object, but got {type(schema)}"
+                    )
 
         corrected_tables = []
         table_name_mapping = {}
@@ -74,19 +80,20 @@ class QueryScopePreparationService:
         query_scope.entities.columns = corrected_columns
 
     @staticmethod
-    async def prepare_query_scope(tenant_id: str, query_scope: QueryScope) -> List[SchemaTablesResponse]:
+    async def prepare_query_scope(tenant_id: str, query_scope: QueryScope) -> SchemaEntityIndex:
         """
-        Fetch schemas for a tenant, soft-preprocess table and column names,
+        Fetch the schema entity index of a tenant, soft-preprocess table and column names,
         then validate the existence of the tables in the schemas.
-        Returns a list of SchemaTablesResponse objects.
+        Returns the tenant's SchemaEntityIndex.
         """
-        schemas = await SchemaManagerService.get_schema_tables(tenant_id=tenant_id)
+        schemas = await SchemaManagerService.get_schema_entity_index(tenant_id=tenant_id)
         QueryScopePreparationService._soft_preprocess_tables(schemas, query_scope)
 
         tables_exist, unmatched_tables = ValidateQueryScopeUtils.validate_tables_exist_in_schemas(
             schemas, query_scope
         )
         if not tables_exist:
+            suggestion_index = FuzzyNameIndex(schemas.table_names)
             raise HTTPException(
                 status_code=400,
                 detail=QueryScopeResolutionErrorResponse(
@@ -97,7 +104,7 @@ class QueryScopePreparationService:
                         {
                             "type": "table_not_found",
                             "input": table,
-                            "suggestions": get_table_suggestions(table, schemas)
+                            "suggestions": get_table_suggestions(table, schemas, suggestion_index)
                         }
                         for table in unmatched_tables
                     ],
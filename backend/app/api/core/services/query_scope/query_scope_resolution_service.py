@@ -1,6 +1,5 @@
 # query_scope_resolution_service.py
 
-import difflib
 import logging
 from typing import List, Dict, Any, Union, Optional
 from fastapi import HTTPException
@@ -14,6 +13,8 @@ from model.tenant.tenant import Tenant
 from api.core.services.schema.schema_discovery_service import SchemaDiscoveryService
 from api.core.services.schema.schema_manager_service import SchemaManagerService
 from utils.tenant_manager.setting_utils import SettingUtils
+from utils.schema.schema_lookup_index import SchemaLookupIndex
+from utils.schema.schema_entity_index import SchemaEntityIndex
 from api.core.constants.tenant.settings_categories import POST_PROCESS_QUERYSCOPE_CATEGORY_KEY, SQL_GENERATION_KEY
 
 logger = logging.getLogger(__name__)
@@ -29,7 +30,7 @@ class QueryScopeResolutionService:
     @staticmethod
     async def match_schema(
         tenant_id: str,
-        schemas: List[SchemaTablesResponse],
+        schemas: Union[List[SchemaTablesResponse], SchemaEntityIndex],
         query_scope: QueryScope,
         tenant_settings: Dict[str, Any]
     ) -> Union[Dict[str, List[str]], Any]:
@@ -98,50 +99,19 @@ class QueryScopeResolutionService:
     @staticmethod
     def find_best_match_table(table_name: str, schema: Schema) -> Optional[str]:
         """
-        Find the best matching table name in the schema using synonyms and fuzzy matching.
-        Returns the corrected table name or None if no match is found.
+        Find the best matching table name in the schema using synonyms, plural/singular forms
+        and fuzzy matching. Returns the corrected table name or None if no match is found.
         """
-
-        # Direct table match
-        if table_name in schema.tables:
-            return table_name
-
-        # Build a mapping of synonyms -> actual table name
-        table_synonym_map = {}
-        table_candidates = list(schema.tables.keys())
-        for tbl_name, tbl_data in schema.tables.items():
-            for synonym in tbl_data.synonyms:
-                table_synonym_map[synonym] = tbl_name
-
-        # Synonym match
-        if table_name in table_synonym_map:
-            return table_synonym_map[table_name]
-
-        # Fuzzy match
-        best_match = difflib.get_close_matches(table_name, table_candidates, n=1, cutoff=0.7)
-        return best_match[0] if best_match else None
+        return SchemaLookupIndex.for_schema(schema).find_table(table_name)
 
     @staticmethod
     def find_best_match_column_using_synonyms(table_name: str, column_name: str, schema: Schema) -> Optional[str]:
         """
-        Find the closest matching column name for a given table using synonyms and fuzzy matching.
-        Returns 'table.column' or None if no match is found.
+        Find the closest matching column name for a given table using synonyms, plural/singular
+        forms and fuzzy matching. Returns 'table.column' or None if no match is found.
         """
-
-        if table_name not in schema.tables:
-            return None
-
-        table = schema.tables[table_name]
-        column_candidates = list(table.columns.keys())
-
-        # Check synonyms for exact match
-        for col_name, col_data in table.columns.items():
-            if column_name in col_data.synonyms:
-                return f"{table_name}.{col_name}"
-
-        # Fuzzy match
-        best_match = difflib.get_close_matches(column_name, column_candidates, n=1, cutoff=0.7)
-        return f"{table_name}.{best_match[0]}" if best_match else None
+        best_match = SchemaLookupIndex.for_schema(schema).find_column(table_name, column_name)
+        return f"{table_name}.{best_match}" if best_match else None
 
 
     @staticmethod
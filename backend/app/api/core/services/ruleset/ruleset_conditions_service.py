@@ -2,8 +2,9 @@ import logging
 from fastapi import HTTPException
 from utils.ruleset.ruleset_utils import resolve_field
 from utils.ruleset.ruleset_condition_utils import format_value, normalize_condition
+from utils.ruleset.ruleset_condition_compiler import compile_condition, expand_named_conditions
 import re
-from typing import Dict, Optional, Tuple, Set
+from typing import Any, Dict, Optional, Tuple, Set
 
 class RulesetConditionsService:
 
@@ -30,7 +31,7 @@ class RulesetConditionsService:
 
             resolved_condition = normalize_condition(resolved_condition)
             logging.debug(f"Final Resolved Condition: {resolved_condition}")
-            return eval(resolved_condition)
+            return compile_condition(resolved_condition).evaluate(session_data)
 
         except Exception as e:
             logging.error(f"Error evaluating condition: {condition} | Resolved: {resolved_condition} | Error: {e}")
@@ -56,18 +57,7 @@ class RulesetConditionsService:
             return "True"
 
         # Resolve named conditions like ${conditions.is_active_user}
-        while "${conditions." in condition:
-            matches = re.findall(r"\$\{conditions\.([a-zA-Z0-9_]+)\}", condition)
-            for match in matches:
-                condition_key = match.strip()
-                if not conditions_dict or condition_key not in conditions_dict:
-                    logging.error(f"Condition '{condition_key}' is not defined in the ruleset.")
-                    raise HTTPException(
-                        status_code=400,
-                        detail=f"Condition '{condition_key}' is not defined in the ruleset."
-                    )
-                resolved_value = conditions_dict[condition_key]
-                condition = condition.replace(f"${{conditions.{condition_key}}}", resolved_value)
+        condition = expand_named_conditions(condition, conditions_dict)
 
         # Resolve JWT placeholders like ${jwt.custom_fields.active}
         while "${jwt." in condition:
@@ -89,6 +79,35 @@ class RulesetConditionsService:
         logging.debug(f"Resolved Condition: {resolved_condition}")
         return resolved_condition
 
+    @staticmethod
+    def evaluate_ruleset_condition(condition: str, session_data: dict, conditions_dict: Optional[Dict[str, str]]) -> Any:
+        """
+        Evaluate a ruleset condition with its named conditions against session data.
+
+        The condition is compiled once per ruleset conditions and reused, so this gives the result of
+        evaluate_condition(resolve_condition(...)) without substituting and parsing text on every call.
+
+        Args:
+            condition (str): Condition string with placeholders (e.g., ${conditions.is_admin}).
+            session_data (dict): The session data containing JWT and user-specific information.
+            conditions_dict (dict): Named conditions dictionary from the ruleset.
+
+        Returns:
+            Any: The value of the condition, True if condition is None.
+        """
+        compiled_condition = compile_condition(condition, conditions_dict)
+        try:
+            return compiled_condition.evaluate(session_data)
+        except HTTPException:
+            raise
+        except Exception as e:
+            resolved_condition = RulesetConditionsService.resolve_condition(condition, session_data, conditions_dict)
+            logging.error(f"Error evaluating condition: {condition} | Resolved: {resolved_condition} | Error: {e}")
+            raise HTTPException(
+                status_code=400,
+                detail=f"Invalid condition: {resolved_condition} | Error: {str(e)}"
+            )
+
     @staticmethod
     def merge_column_access(global_rule, group_rule_columns, user_rule, table_schema) -> Tuple[Set[str], Set[str]]:
         """
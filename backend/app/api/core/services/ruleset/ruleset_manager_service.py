@@ -11,6 +11,7 @@ from model.responses.ruleset_manager.ruleset_response import RulesetResponse
 
 from api.core.services.tenant_manager.tenant_manager_service import TenantManagerService
 from utils.schema.schema_utils import schema_exists
+from utils.cache.schema_ruleset_cache import schema_ruleset_cache, RULESET_KIND
 
 class RulesetManagerService:
 
@@ -58,19 +59,25 @@ class RulesetManagerService:
 
     @staticmethod
     async def get_ruleset(tenant_id: str, ruleset_name: str):
-        # Call get_tenant to Check if tenant exists
-        tenant: Tenant = await TenantManagerService.get_tenant(tenant_id=tenant_id)
+        cached_ruleset = schema_ruleset_cache.get(RULESET_KIND, tenant_id, ruleset_name)
+        if cached_ruleset is not None:
+            return cached_ruleset
 
+        cache_version = schema_ruleset_cache.get_version(tenant_id)
         collection = mongodb.db["rulesets"]
         ruleset = await collection.find_one({"tenant_id": tenant_id, "ruleset_name": ruleset_name})
 
         if not ruleset:
+            # Rulesets are stored under existing tenants only, check the tenant just to report a missing one
+            tenant: Tenant = await TenantManagerService.get_tenant(tenant_id=tenant_id)
             raise HTTPException(
                 status_code=404,
                 detail=f"No Ruleset found with name '{ruleset_name}' for tenant '{tenant.tenant_id}'."
             )
 
-        return RulesetResponse(**ruleset)
+        parsed_ruleset = RulesetResponse(**ruleset)
+        schema_ruleset_cache.set(RULESET_KIND, tenant_id, ruleset_name, parsed_ruleset, cache_version, ruleset.get("_id"))
+        return parsed_ruleset
     
     @staticmethod
     async def get_rulesets_summary(tenant_id: str) -> List[Dict[str, Any]]:
@@ -231,9 +238,10 @@ class RulesetManagerService:
 
         try:
             if fields_to_update:
+                # The version bump invalidates the cached ruleset of the other instances
                 update_result = await collection_schema.update_one(
                     {"tenant_id": tenant.tenant_id, "ruleset_name": ruleset_name},
-                    {"$set": fields_to_update}
+                    {"$set": fields_to_update, "$inc": {"version": 1}}
                 )
 
                 if update_result.matched_count == 0:
@@ -242,6 +250,8 @@ class RulesetManagerService:
                         detail=f"Ruleset with name '{ruleset_name}' not found for tenant '{tenant.tenant_id}'."
                     )
 
+                schema_ruleset_cache.invalidate(RULESET_KIND, tenant_id, ruleset_name, fields_to_update.get("ruleset_name"))
+
             updated_ruleset_data = await collection_schema.find_one({"tenant_id": tenant.tenant_id, "ruleset_name": ruleset_name})
             updated_ruleset = RulesetResponse(**updated_ruleset_data)
 
@@ -266,6 +276,7 @@ class RulesetManagerService:
                 detail="Ruleset not found"
             )
 
+        schema_ruleset_cache.invalidate(RULESET_KIND, tenant_id, ruleset_name)
         return {"message": "Ruleset deleted successfully"}
 
 
@@ -12,6 +12,13 @@ from model.requests.schema_manager.add_schema_request import AddSchemaRequest
 from model.requests.schema_manager.update_schema_request import UpdateSchemaRequest
 from model.responses.schema.schema_tables_response import SchemaTablesResponse, ColumnResponse, TableResponse
 from utils.ruleset.ruleset_utils import ruleset_exists
+from utils.cache.query_scope_cache import query_scope_cache
+from utils.cache.schema_ruleset_cache import schema_ruleset_cache, SCHEMA_KIND
+from utils.cache.schema_entity_index_cache import schema_entity_index_cache
+from utils.schema.schema_lookup_index import SchemaLookupIndex
+from utils.schema.schema_entity_index import SchemaEntityIndex
+from api.core.services.schema.schema_retrieval_service import SchemaRetrievalService
+from api.core.services.tenant_manager.tenant_manager_service import TenantManagerService
 
 class SchemaManagerService:
     
@@ -58,6 +65,10 @@ class SchemaManagerService:
         
         try:
             await collection_schema.insert_one(schema_data.dict())
+            schema_entity_index_cache.upsert_schema(
+                tenant.tenant_id, SchemaManagerService._to_schema_tables_response(schema_data.dict())
+            )
+            await SchemaManagerService._prepare_schema_retrieval(tenant, schema_data.schema_name)
             return Schema(**schema_data.dict())
         except DuplicateKeyError:
             raise HTTPException(
@@ -67,6 +78,11 @@ class SchemaManagerService:
             
     @staticmethod
     async def get_schema(tenant_id: str, schema_name: str):
+        cached_schema = schema_ruleset_cache.get(SCHEMA_KIND, tenant_id, schema_name)
+        if cached_schema is not None:
+            return cached_schema
+
+        cache_version = schema_ruleset_cache.get_version(tenant_id)
         collection = mongodb.db["schemas"]
         schema = await collection.find_one({"tenant_id": tenant_id, "schema_name": schema_name})
         
@@ -76,7 +92,11 @@ class SchemaManagerService:
                 detail=f"No schema found with name '{schema_name}' for tenant '{tenant_id}'."
             )
         
-        return Schema(**schema)
+        parsed_schema = Schema(**schema)
+        # Built once here, the cached schema carries its lookup index to every later request
+        SchemaLookupIndex.for_schema(parsed_schema)
+        schema_ruleset_cache.set(SCHEMA_KIND, tenant_id, schema_name, parsed_schema, cache_version, schema.get("_id"))
+        return parsed_schema
 
     @staticmethod
     async def get_schemas(tenant_id: str) -> List[Schema]:
@@ -218,27 +238,7 @@ class SchemaManagerService:
 
         schemas = []
         async for schema_data in schemas_cursor:
-            tables = []
-            for table_name, table_obj in schema_data["tables"].items():
-                columns = [
-                    ColumnResponse(
-                        column_name=col_name,
-                        type=col_data.get("type", "UNKNOWN"),
-                        description=col_data.get("description"),
-                        constraints=col_data.get("constraints", []),
-                        is_sensitive_column=col_data.get("is_sensitive_column", False)
-                    )
-                    for col_name, col_data in table_obj["columns"].items()
-                ]
-                tables.append(TableResponse(
-                    table_name=table_name,
-                    columns=columns
-                ))
-
-            schemas.append(SchemaTablesResponse(
-                schema_name=schema_data["schema_name"],
-                tables=tables
-            ))
+            schemas.append(SchemaManagerService._to_schema_tables_response(schema_data))
 
         if not schemas:
             raise HTTPException(
@@ -248,6 +248,61 @@ class SchemaManagerService:
 
         return schemas
 
+    @staticmethod
+    async def get_schema_entity_index(tenant_id: str) -> SchemaEntityIndex:
+        """
+        Return the tenant's schema entity index, loading every schema of the tenant only on a cache miss.
+        """
+        schema_index = schema_entity_index_cache.get(tenant_id)
+        if schema_index is None:
+            cache_version = schema_entity_index_cache.get_version(tenant_id)
+            schema_index = SchemaEntityIndex(await SchemaManagerService.get_schema_tables(tenant_id=tenant_id))
+            schema_entity_index_cache.set(tenant_id, schema_index, cache_version)
+
+        if not schema_index.schema_names:
+            raise HTTPException(
+                status_code=404,
+                detail=f"No schemas found for tenant '{tenant_id}'."
+            )
+        return schema_index
+
+    @staticmethod
+    async def _prepare_schema_retrieval(tenant: Tenant, schema_name: str):
+        """
+        Build the table vectors of a saved schema now instead of on its first question, when the
+        tenant uses schema retrieval. The schema is loaded into the schema cache with them.
+        """
+        if not SchemaRetrievalService.get_retrieval_settings(tenant).enabled:
+            return
+        schema = await SchemaManagerService.get_schema(tenant_id=tenant.tenant_id, schema_name=schema_name)
+        await SchemaRetrievalService.prepare_schema_index(tenant, schema)
+
+    @staticmethod
+    def _to_schema_tables_response(schema_data: Dict[str, Any]) -> SchemaTablesResponse:
+        tables = []
+        for table_name, table_obj in schema_data["tables"].items():
+            columns = [
+                ColumnResponse(
+                    column_name=col_name,
+                    type=col_data.get("type", "UNKNOWN"),
+                    description=col_data.get("description"),
+                    constraints=col_data.get("constraints", []),
+                    is_sensitive_column=col_data.get("is_sensitive_column", False),
+                    synonyms=col_data.get("synonyms") or []
+                )
+                for col_name, col_data in table_obj["columns"].items()
+            ]
+            tables.append(TableResponse(
+                table_name=table_name,
+                columns=columns,
+                synonyms=table_obj.get("synonyms") or []
+            ))
+
+        return SchemaTablesResponse(
+            schema_name=schema_data["schema_name"],
+            tables=tables
+        )
+
     @staticmethod
     async def update_schema(tenant_id: str, schema_name: str, update_schema_request: UpdateSchemaRequest):
         collection = mongodb.db["schemas"]
@@ -279,9 +334,10 @@ class SchemaManagerService:
                 for table_name, table in update_schema_data["tables"].items()
             }
 
+        # The version bump invalidates the cached schema of the other instances
         result = await collection.update_one(
             {"tenant_id": tenant_id, "schema_name": schema_name},
-            {"$set": update_schema_data}
+            {"$set": update_schema_data, "$inc": {"version": 1}}
         )
 
         if result.matched_count == 0:
@@ -290,11 +346,20 @@ class SchemaManagerService:
                 detail=f"Schema '{schema_name}' not found for tenant '{tenant_id}' or no changes were made."
             )
 
+        query_scope_cache.invalidate_schema(tenant_id, schema_name)
+        schema_ruleset_cache.invalidate(SCHEMA_KIND, tenant_id, schema_name, new_schema_name)
+
         # Fetch the updated schema
         updated_schema = await collection.find_one(
             {"tenant_id": tenant_id, "schema_name": update_schema_data.get("schema_name", schema_name)},
             {"_id": 0}
         )
+        schema_entity_index_cache.upsert_schema(
+            tenant_id, SchemaManagerService._to_schema_tables_response(updated_schema), previous_schema_name=schema_name
+        )
+        await SchemaManagerService._prepare_schema_retrieval(
+            await TenantManagerService.get_tenant(tenant_id=tenant_id), updated_schema["schema_name"]
+        )
         
         return Schema(**updated_schema)
 
@@ -307,5 +372,8 @@ class SchemaManagerService:
                 status_code=404,
                 detail="Schema not found"
             )
-        
+
+        query_scope_cache.invalidate_schema(tenant_id, schema_name)
+        schema_ruleset_cache.invalidate(SCHEMA_KIND, tenant_id, schema_name)
+        schema_entity_index_cache.remove_schema(tenant_id, schema_name)
         return {"message": "Schema deleted successfully"}
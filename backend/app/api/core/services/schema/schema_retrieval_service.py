@@ -0,0 +1,130 @@
+import asyncio
+import logging
+from typing import Any, NamedTuple, Optional
+
+from model.schema.schema import Schema
+from model.tenant.tenant import Tenant
+from model.query_scope.query_scope import QueryScope
+from model.responses.sql_generation.schema_retrieval_report import SchemaRetrievalReport
+
+from utils.schema.schema_embedder import HASHING_EMBEDDER, SchemaEmbedder, get_schema_embedder
+from utils.schema.schema_table_index import SchemaTableIndex
+from utils.tenant_manager.setting_utils import SettingUtils
+from api.core.constants.tenant.settings_categories import SCHEMA_RESOLVER_CATEGORY_KEY
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_TOP_K = 10
+_DEFAULT_MIN_TABLES = 50
+
+class RetrievalSettings(NamedTuple):
+    enabled: bool
+    top_k: int
+    min_tables: int
+    include_join_neighbours: bool
+    embedder: str
+
+class RetrievedSchema(NamedTuple):
+    """Schema to resolve for the prompt, with the report of the tables retrieval left out if it ran."""
+    schema: Schema
+    report: Optional[SchemaRetrievalReport] = None
+
+class SchemaRetrievalService:
+    """
+    Retrieval of the tables of very large schemas relevant to a question, so the prompts carry
+    only the top-k most similar tables and the tables joined to them instead of the whole schema.
+    """
+
+    @staticmethod
+    def get_retrieval_settings(tenant: Tenant) -> RetrievalSettings:
+        def _read(setting_key: str, default: Any) -> Any:
+            value = SettingUtils.get_setting_value(
+                settings=tenant.settings,
+                category_key=SCHEMA_RESOLVER_CATEGORY_KEY,
+                setting_key=setting_key
+            )
+            return default if value in (None, "") else value
+
+        def _read_bool(setting_key: str, default: bool) -> bool:
+            value = _read(setting_key, default)
+            if isinstance(value, str):
+                return value.strip().lower() == "true"
+            return bool(value)
+
+        return RetrievalSettings(
+            enabled=_read_bool("SCHEMA_RETRIEVAL_ENABLED", False),
+            top_k=max(1, int(_read("SCHEMA_RETRIEVAL_TOP_K", _DEFAULT_TOP_K))),
+            min_tables=int(_read("SCHEMA_RETRIEVAL_MIN_TABLES", _DEFAULT_MIN_TABLES)),
+            include_join_neighbours=_read_bool("SCHEMA_RETRIEVAL_INCLUDE_JOIN_NEIGHBOURS", True),
+            embedder=str(_read("SCHEMA_RETRIEVAL_EMBEDDER", HASHING_EMBEDDER))
+        )
+
+    @staticmethod
+    async def prepare_schema_index(tenant: Tenant, schema: Schema) -> Optional[SchemaTableIndex]:
+        """
+        Build the table vectors of the schema ahead of the first question, when the tenant retrieves
+        tables of schemas this large.
+        """
+        retrieval_settings = SchemaRetrievalService.get_retrieval_settings(tenant)
+        if not retrieval_settings.enabled or len(schema.tables) < retrieval_settings.min_tables:
+            return None
+        return await SchemaRetrievalService._get_table_index(schema, get_schema_embedder(retrieval_settings.embedder))
+
+    @staticmethod
+    async def retrieve_schema(tenant: Tenant, schema: Schema, user_input: str,
+                        query_scope: Optional[QueryScope] = None) -> RetrievedSchema:
+        """
+        Return the schema reduced to the tables relevant to the question.
+
+        The schema is returned whole when retrieval is disabled, the schema has fewer than
+        SCHEMA_RETRIEVAL_MIN_TABLES tables, or the QueryScope already lists at most top-k tables.
+        When the QueryScope lists more, the tables are retrieved among them.
+        """
+        retrieval_settings = SchemaRetrievalService.get_retrieval_settings(tenant)
+        if not retrieval_settings.enabled or len(schema.tables) < retrieval_settings.min_tables:
+            return RetrievedSchema(schema=schema)
+
+        scope_tables = [table_name for table_name in (query_scope.entities.tables if query_scope else []) if table_name in schema.tables]
+        if scope_tables and len(scope_tables) <= retrieval_settings.top_k:
+            return RetrievedSchema(schema=schema)
+
+        table_index = await SchemaRetrievalService._get_table_index(schema, get_schema_embedder(retrieval_settings.embedder))
+        candidates = scope_tables or list(schema.tables)
+        selection = table_index.select_tables(
+            user_input,
+            top_k=retrieval_settings.top_k,
+            candidates=candidates,
+            include_neighbours=retrieval_settings.include_join_neighbours
+        )
+
+        kept_tables = set(selection.tables)
+        retrieved_schema = schema.copy(update={
+            "tables": {table_name: table for table_name, table in schema.tables.items() if table_name in kept_tables}
+        })
+        # The copy shares the private attributes, its indexes must not replace the full schema's
+        retrieved_schema._lookup_index = None
+        retrieved_schema._table_indexes = None
+
+        report = SchemaRetrievalReport(
+            embedder=table_index.embedder.name,
+            total_tables=len(schema.tables),
+            candidate_tables=len(candidates),
+            retrieved_tables=selection.retrieved_tables,
+            neighbour_tables=selection.neighbour_tables,
+            prompt_tokens_saved=table_index.count_table_tokens(
+                table_name for table_name in candidates if table_name not in kept_tables
+            )
+        )
+        logger.info(
+            f"Schema retrieval kept {len(kept_tables)} of {len(candidates)} tables of '{schema.schema_name}', "
+            f"saving about {report.prompt_tokens_saved} prompt tokens"
+        )
+        return RetrievedSchema(schema=retrieved_schema, report=report)
+
+    @staticmethod
+    async def _get_table_index(schema: Schema, embedder: SchemaEmbedder) -> SchemaTableIndex:
+        table_index = SchemaTableIndex.get_cached(schema, embedder)
+        if table_index is None:
+            # Embedding hundreds of tables takes a noticeable fraction of a second, off the event loop
+            table_index = await asyncio.to_thread(SchemaTableIndex.for_schema, schema, embedder)
+        return table_index
@@ -0,0 +1,155 @@
+import asyncio
+import json
+import logging
+from typing import AsyncIterator, Dict, List, Tuple
+
+from fastapi import HTTPException
+
+from api.core.services.tenant_manager.tenant_manager_service import TenantManagerService
+from api.core.services.schema.schema_manager_service import SchemaManagerService
+from api.core.services.ruleset.ruleset_manager_service import RulesetManagerService
+from api.core.services.sql_generation.sql_generation_pipeline_service import SqlGenerationPipelineService
+
+from model.tenant.tenant import Tenant
+from model.requests.sql_generation.user_input_request import UserInputRequest
+from model.external_system_integration.external_user_session_data import ExternalSessionData
+from model.responses.sql_generation.batch_sql_generation_response import (
+    BatchItemError, BatchSqlGenerationItem, BatchSqlGenerationResponse
+)
+
+from config import settings
+from utils.tenant_manager.setting_utils import SettingUtils
+from utils.metrics.prometheus_metrics import record_error
+from api.core.constants.tenant.settings_categories import SQL_GENERATION_KEY
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_BATCH_MAX_CONCURRENCY = 4
+
+# Semaphore of each tenant with the concurrency it was created for, shared by all of its batches
+_tenant_semaphores: Dict[str, Tuple[int, asyncio.Semaphore]] = {}
+
+class SqlGenerationBatchService:
+
+    @staticmethod
+    def get_max_concurrency(tenant: Tenant) -> int:
+        """
+        Read the tenant's SQL_GENERATION.BATCH_MAX_CONCURRENCY, capped at SQL_GENERATION_BATCH_MAX_CONCURRENCY.
+        """
+        value = SettingUtils.get_setting_value(
+            settings=tenant.settings,
+            category_key=SQL_GENERATION_KEY,
+            setting_key="BATCH_MAX_CONCURRENCY"
+        )
+        max_concurrency = int(value) if value not in (None, "") else _DEFAULT_BATCH_MAX_CONCURRENCY
+        return max(1, min(max_concurrency, settings.SQL_GENERATION_BATCH_MAX_CONCURRENCY))
+
+    @staticmethod
+    def get_semaphore(tenant_id: str, max_concurrency: int) -> asyncio.Semaphore:
+        """
+        Semaphore bounding the pipelines of all running batches of the tenant. A new one replaces
+        it once the tenant's batch concurrency changes.
+        """
+        entry = _tenant_semaphores.get(tenant_id)
+        if entry is None or entry[0] != max_concurrency:
+            entry = _tenant_semaphores[tenant_id] = (max_concurrency, asyncio.Semaphore(max_concurrency))
+        return entry[1]
+
+    @staticmethod
+    def clear_semaphores():
+        _tenant_semaphores.clear()
+
+    @staticmethod
+    async def generate_batch(tenant_id: str, schema_name: str, user_requests: List[UserInputRequest],
+                             session: ExternalSessionData, run_sql: bool = True) -> AsyncIterator[BatchSqlGenerationItem]:
+        """
+        Generate, and optionally run, the SQL of every question and yield each item as soon as it
+        completes.
+
+        The tenant, schema and ruleset are loaded once for the whole batch. At most the tenant's
+        batch concurrency of questions go through the pipeline at the same time, across all of the
+        tenant's running batches, and a failing
+        question yields an item with its error instead of failing the batch. Closing the iterator
+        cancels the questions still running.
+
+        Raises:
+            HTTPException: 400 if the batch is larger than SQL_GENERATION_BATCH_MAX_ITEMS, or the
+                error of loading the tenant, schema or ruleset.
+        """
+        if len(user_requests) > settings.SQL_GENERATION_BATCH_MAX_ITEMS:
+            raise HTTPException(
+                status_code=400,
+                detail=f"A batch can contain at most {settings.SQL_GENERATION_BATCH_MAX_ITEMS} inputs, got {len(user_requests)}."
+            )
+
+        tenant, schema = await asyncio.gather(
+            TenantManagerService.get_tenant(tenant_id=tenant_id),
+            SchemaManagerService.get_schema(tenant_id=tenant_id, schema_name=schema_name)
+        )
+        # Supports only single ruleset
+        ruleset = await RulesetManagerService.get_ruleset(tenant_id=tenant_id, ruleset_name=schema.filter_rules[0])
+
+        semaphore = SqlGenerationBatchService.get_semaphore(
+            tenant_id, SqlGenerationBatchService.get_max_concurrency(tenant)
+        )
+
+        async def generate_item(index: int, user_request: UserInputRequest) -> BatchSqlGenerationItem:
+            async with semaphore:
+                pipeline = SqlGenerationPipelineService.build_pipeline(
+                    tenant_id=tenant_id,
+                    schema_name=schema_name,
+                    user_request=user_request,
+                    session=session,
+                    run_sql=run_sql,
+                    tenant=tenant,
+                    schema=schema,
+                    ruleset=ruleset
+                )
+                try:
+                    results = await pipeline.run()
+                    return BatchSqlGenerationItem(
+                        index=index,
+                        user_input=user_request.input,
+                        result=SqlGenerationPipelineService.build_response(pipeline, results, user_request)
+                    )
+                except HTTPException as e:
+                    error = BatchItemError(status_code=e.status_code, detail=e.detail)
+                except Exception as e:
+                    logger.exception("Batch item %s failed", index)
+                    error = BatchItemError(status_code=500, detail=f"An unexpected error occurred: {str(e)}")
+                # Item errors are part of the batch response and never reach the HTTP exception handler
+                record_error(tenant_id, error.status_code, error.detail)
+                return BatchSqlGenerationItem(index=index, user_input=user_request.input, error=error)
+
+        tasks = [
+            asyncio.create_task(generate_item(index, user_request))
+            for index, user_request in enumerate(user_requests)
+        ]
+        try:
+            for completed in asyncio.as_completed(tasks):
+                yield await completed
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    @staticmethod
+    async def collect_batch(items: AsyncIterator[BatchSqlGenerationItem]) -> BatchSqlGenerationResponse:
+        collected = sorted([item async for item in items], key=lambda item: item.index)
+        failed = sum(1 for item in collected if item.error is not None)
+        return BatchSqlGenerationResponse(items=collected, succeeded=len(collected) - failed, failed=failed)
+
+    @staticmethod
+    async def encode_ndjson(items: AsyncIterator[BatchSqlGenerationItem]) -> AsyncIterator[bytes]:
+        """
+        Encode the items as NDJSON in completion order, one line per item and a summary line.
+        """
+        succeeded = failed = 0
+        async for item in items:
+            if item.error is None:
+                succeeded += 1
+            else:
+                failed += 1
+            yield (json.dumps({"type": "item", **item.dict()}, default=str) + "\n").encode("utf-8")
+        yield (json.dumps({"type": "summary", "succeeded": succeeded, "failed": failed}) + "\n").encode("utf-8")
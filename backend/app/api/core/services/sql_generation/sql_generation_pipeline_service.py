@@ -0,0 +1,334 @@
+import logging
+from typing import Any, Awaitable, Dict, FrozenSet, NamedTuple, Optional, Tuple
+from fastapi import HTTPException
+
+from api.core.services.llm_wrapper.llm_service_wrapper import LLMServiceWrapper
+from api.core.services.tenant_manager.tenant_manager_service import TenantManagerService
+from api.core.services.sql_runner.sql_runner_service import SqlRunnerService
+from api.core.services.sql_runner.sql_cost_guard_service import SqlCostGuardService, SqlCostGuardResult
+from api.core.services.sql_runner.sql_pagination_service import SqlPaginationService
+from api.core.services.schema.schema_manager_service import SchemaManagerService
+from api.core.services.schema.schema_retrieval_service import SchemaRetrievalService, RetrievedSchema
+from api.core.services.ruleset.ruleset_manager_service import RulesetManagerService
+from api.core.resolvers.query_scope.query_scope_resolver import QueryScopeResolver
+from api.core.resolvers.access_control.user_access_control_resolver import AccessControlResolver
+from api.core.resolvers.schema.schema_resolver import SchemaResolver
+from api.core.resolvers.access_control.injector_resolver import InjectorResolver
+
+from model.tenant.tenant import Tenant
+from model.schema.schema import Schema
+from model.ruleset.ruleset import Ruleset
+from model.query_scope.query_scope import QueryScope
+from model.requests.sql_generation.user_input_request import UserInputRequest
+from model.responses.sql_generation.sql_generation_response import SqlGenerationResponse
+from model.responses.sql_generation.sql_page import SqlPageResponse
+from model.responses.sql_generation.schema_retrieval_report import SchemaRetrievalReport
+from model.external_system_integration.external_user_session_data import ExternalSessionData
+
+from utils.pipeline.stage_graph import StageGraph
+from utils.sql_runner.expensive_query_queue import expensive_query_queue
+from utils.sql_runner.sql_statement_utils import SqlStatementUtils
+from utils.tenant_manager.setting_utils import SettingUtils
+from api.core.constants.tenant.settings_categories import SQL_INJECTORS, SQL_GENERATION_KEY
+
+logger = logging.getLogger(__name__)
+
+TWO_STEP_GENERATION_MODE = "two_step"
+SINGLE_ROUND_TRIP_GENERATION_MODE = "single_round_trip"
+
+class CandidateSql(NamedTuple):
+    """SQL returned with the QueryScope in single round trip mode, with the scope it was written for."""
+    sql: str
+    tables: FrozenSet[str]
+    columns: FrozenSet[str]
+
+class GenerationIntent(NamedTuple):
+    query_scope: QueryScope
+    candidate_sql: Optional[CandidateSql] = None
+    schema_retrieval: Optional[SchemaRetrievalReport] = None
+
+class SqlGenerationPipelineService:
+
+    @staticmethod
+    def build_pipeline(tenant_id: str, schema_name: str,
+                       user_request: UserInputRequest,
+                       session: ExternalSessionData,
+                       run_sql: bool = False,
+                       guard_sql: bool = False,
+                       tenant: Optional[Tenant] = None,
+                       schema: Optional[Schema] = None,
+                       ruleset: Optional[Ruleset] = None) -> StageGraph:
+        """
+        Build the SQL generation stage graph for a request on a given schema.
+
+        The schema and ruleset fetches do not depend on the intent model output and overlap
+        with the query scope LLM call. The stages and their results are:
+            tenant, schema, ruleset, intent, query_scope, resolved_query_scope, access_control,
+            retrieved_schema (RetrievedSchema), resolved_schema, generated_sql, injected_sql (sql, injected_str), guarded_sql
+            (SqlCostGuardResult) when run_sql or guard_sql is set and, when run_sql is set, sql_response.
+            sql_response is a SqlPageResponse with the first page when the tenant's SQL_PAGINATION_ENABLED
+            is set, otherwise the whole result set.
+
+        A tenant, schema or ruleset already loaded by the caller (e.g. once for a whole batch) is used
+        as the result of its stage instead of being fetched again.
+
+        With the tenant's SQL_GENERATION.GENERATION_MODE set to single_round_trip, the intent stage
+        also returns a candidate SQL query. The candidate is used once the QueryScope passed resolution
+        and access control unchanged and the tables and columns the SQL references are all part of it,
+        otherwise the SQL is generated again for the resolved scope.
+
+        With the tenant's SCHEMA_RESOLVER.SCHEMA_RETRIEVAL_ENABLED set, the schema sent to the model
+        is reduced to the tables most similar to the question and their join neighbours, see
+        SchemaRetrievalService.
+        """
+        pipeline = StageGraph(name="sql_generation", tenant_id=tenant_id, span_attributes={"schema_name": schema_name})
+
+        prefetched_tenant, prefetched_schema, prefetched_ruleset = tenant, schema, ruleset
+
+        async def fetch_tenant() -> Tenant:
+            if prefetched_tenant is not None:
+                return prefetched_tenant
+            return await TenantManagerService.get_tenant(tenant_id=tenant_id)
+
+        async def fetch_schema() -> Schema:
+            if prefetched_schema is not None:
+                return prefetched_schema
+            return await SchemaManagerService.get_schema(tenant_id=tenant_id, schema_name=schema_name)
+
+        async def fetch_ruleset(schema: Schema) -> Ruleset:
+            if prefetched_ruleset is not None:
+                return prefetched_ruleset
+            # Supports only single ruleset
+            return await RulesetManagerService.get_ruleset(tenant_id=tenant_id, ruleset_name=schema.filter_rules[0])
+
+        async def extract_intent(tenant: Tenant, schema: Awaitable[Schema]) -> GenerationIntent:
+            generation_mode = SettingUtils.get_setting_value(
+                settings=tenant.settings,
+                category_key=SQL_GENERATION_KEY,
+                setting_key="GENERATION_MODE"
+            ) or TWO_STEP_GENERATION_MODE
+            if generation_mode != SINGLE_ROUND_TRIP_GENERATION_MODE:
+                return GenerationIntent(query_scope=await LLMServiceWrapper.get_query_scope_with_cache(
+                    user_input=user_request,
+                    tenant=tenant,
+                    schema_name=schema_name
+                ))
+
+            # Without a QueryScope the resolver keeps the whole schema, minus sensitive and excluded columns
+            retrieved_schema = await SchemaRetrievalService.retrieve_schema(
+                tenant=tenant,
+                schema=await schema,
+                user_input=user_request.input
+            )
+            full_schema = SchemaResolver(
+                session_data=session,
+                tenant=tenant,
+                matched_schema=retrieved_schema.schema,
+                query_scope=None
+            ).resolve_schema()
+            query_scope, sql = await LLMServiceWrapper.get_query_scope_and_sql(
+                user_input=user_request,
+                resolved_schema=full_schema,
+                tenant=tenant
+            )
+            return GenerationIntent(
+                query_scope=query_scope,
+                candidate_sql=CandidateSql(
+                    sql=sql,
+                    tables=frozenset(query_scope.entities.tables),
+                    columns=frozenset(query_scope.entities.columns)
+                ),
+                schema_retrieval=retrieved_schema.report
+            )
+
+        def get_query_scope(intent: GenerationIntent) -> QueryScope:
+            return intent.query_scope
+
+        def resolve_query_scope(tenant: Tenant, schema: Schema, query_scope: QueryScope) -> QueryScope:
+            query_scope_resolver = QueryScopeResolver(
+                session_data=session,
+                settings=tenant.settings,
+                query_scope=query_scope,
+                tenant=tenant
+            )
+            try:
+                return query_scope_resolver.resolve_query_scope(matched_schema=schema)
+            except HTTPException as e:
+                logger.error(f"QueryScope Resolution Failed: {e.detail}")
+                logger.info(f"Original Query Scope: {query_scope.dict()}")
+                raise e
+
+        def check_access_control(schema: Schema, ruleset: Ruleset, resolved_query_scope: QueryScope) -> bool:
+            access_resolver = AccessControlResolver(session_data=session, ruleset=ruleset, matched_schema=schema)
+            return access_resolver.has_access_to_scope(resolved_query_scope)
+
+        async def retrieve_schema(tenant: Tenant, schema: Schema, resolved_query_scope: QueryScope) -> RetrievedSchema:
+            return await SchemaRetrievalService.retrieve_schema(
+                tenant=tenant,
+                schema=schema,
+                user_input=user_request.input,
+                query_scope=resolved_query_scope
+            )
+
+        def resolve_schema(tenant: Tenant, retrieved_schema: RetrievedSchema, resolved_query_scope: QueryScope):
+            schema_resolver = SchemaResolver(
+                session_data=session,
+                tenant=tenant,
+                matched_schema=retrieved_schema.schema,
+                query_scope=resolved_query_scope
+            )
+            return schema_resolver.resolve_schema()
+
+        async def generate_sql(tenant: Tenant, schema: Schema, intent: GenerationIntent, resolved_query_scope: QueryScope,
+                               resolved_schema, access_control: bool) -> str:
+            candidate_sql = intent.candidate_sql
+            if candidate_sql is not None:
+                scope_tables = frozenset(resolved_query_scope.entities.tables)
+                scope_columns = frozenset(resolved_query_scope.entities.columns)
+                if candidate_sql.tables != scope_tables or candidate_sql.columns != scope_columns:
+                    logger.info("QueryScope changed during resolution, generating SQL for the resolved QueryScope.")
+                else:
+                    # Access control only checked the declared QueryScope, the SQL was written against the whole schema
+                    sql_tables, sql_columns = SqlGenerationPipelineService.get_referenced_entities(candidate_sql.sql, schema)
+                    if sql_tables <= scope_tables and sql_columns <= scope_columns:
+                        return candidate_sql.sql
+                    logger.warning(
+                        "Candidate SQL references entities outside of its QueryScope, generating SQL for the resolved QueryScope: "
+                        f"{sorted((sql_tables - scope_tables) | (sql_columns - scope_columns))}"
+                    )
+
+            return await LLMServiceWrapper.generate_sql_query(
+                user_input=user_request,
+                resolved_schema=resolved_schema,
+                tenant=tenant,
+                query_scope=resolved_query_scope
+            )
+
+        def inject_sql(tenant: Tenant, ruleset: Ruleset, generated_sql: str):
+            injector_enabled = SettingUtils.get_setting_value(
+                settings=tenant.settings,
+                category_key=SQL_INJECTORS,
+                setting_key="DYNAMIC_INJECTION"
+            )
+            if not injector_enabled:
+                return generated_sql, None
+
+            injector_resolver = InjectorResolver(session_data=session, ruleset=ruleset)
+            return injector_resolver.apply_injectors(
+                sql_query=generated_sql,
+                tenant=tenant
+            )
+
+        async def check_sql_cost(tenant: Tenant, resolved_query_scope: QueryScope, injected_sql) -> SqlCostGuardResult:
+            updated_sql, _ = injected_sql
+            return await SqlCostGuardService.guard_sql(
+                sql=updated_sql,
+                tenant=tenant,
+                schema_name=schema_name,
+                query_scope=resolved_query_scope,
+                user_input=user_request.input
+            )
+
+        async def execute_sql(tenant: Tenant, schema: Schema, query_scope: QueryScope, resolved_query_scope: QueryScope,
+                              guarded_sql: SqlCostGuardResult):
+            def run_query():
+                # Only the rows of a SELECT are paged
+                if SqlPaginationService.get_page_settings(tenant).enabled and SqlStatementUtils.is_select(guarded_sql.sql):
+                    return SqlPaginationService.fetch_first_page(
+                        sql=guarded_sql.sql,
+                        tenant=tenant,
+                        schema_name=schema_name,
+                        schema=schema,
+                        query_scope=resolved_query_scope,
+                        session=session,
+                        user_input=user_request.input
+                    )
+                return SqlRunnerService.run_sql_async(
+                    orginal_user_input=user_request.input,
+                    query_scope=resolved_query_scope,
+                    query=guarded_sql.sql,
+                    tenant=tenant,
+                    schema_name=schema_name,
+                    params={}
+                )
+
+            try:
+                if guarded_sql.queued:
+                    # Queries over the cost guard thresholds wait for a slot of the tenant's expensive query queue
+                    async with expensive_query_queue.slot(tenant.tenant_id, guarded_sql.queue_timeout_seconds):
+                        return await run_query()
+                return await run_query()
+            except HTTPException as e:
+                logger.error(f"SQL Execution Failed: {e.detail}")
+                logger.info(f"Original Query Scope: {query_scope.dict()}")
+                raise e
+
+        pipeline.add_stage("tenant", fetch_tenant)
+        pipeline.add_stage("schema", fetch_schema)
+        pipeline.add_stage("ruleset", fetch_ruleset, depends_on=["schema"])
+        pipeline.add_stage("intent", extract_intent, depends_on=["tenant"], lazy_depends_on=["schema"])
+        pipeline.add_stage("query_scope", get_query_scope, depends_on=["intent"])
+        pipeline.add_stage("resolved_query_scope", resolve_query_scope, depends_on=["tenant", "schema", "query_scope"])
+        pipeline.add_stage("access_control", check_access_control, depends_on=["schema", "ruleset", "resolved_query_scope"])
+        pipeline.add_stage("retrieved_schema", retrieve_schema, depends_on=["tenant", "schema", "resolved_query_scope"])
+        pipeline.add_stage("resolved_schema", resolve_schema, depends_on=["tenant", "retrieved_schema", "resolved_query_scope"])
+        pipeline.add_stage("generated_sql", generate_sql, depends_on=["tenant", "schema", "intent", "resolved_query_scope", "resolved_schema", "access_control"])
+        pipeline.add_stage("injected_sql", inject_sql, depends_on=["tenant", "ruleset", "generated_sql"])
+        if run_sql or guard_sql:
+            pipeline.add_stage("guarded_sql", check_sql_cost, depends_on=["tenant", "resolved_query_scope", "injected_sql"])
+        if run_sql:
+            pipeline.add_stage("sql_response", execute_sql, depends_on=["tenant", "schema", "query_scope", "resolved_query_scope", "guarded_sql"])
+
+        return pipeline
+
+    @staticmethod
+    def get_referenced_entities(sql: str, schema: Schema) -> Tuple[FrozenSet[str], FrozenSet[str]]:
+        """
+        Tables and table.column names of the schema the SQL may read. Any identifier matching a
+        column of a referenced table counts, so aliases or join keys sharing a column name are
+        over-reported rather than missed. A wildcard select references every column.
+        """
+        identifiers = SqlStatementUtils.get_identifiers(sql)
+        tables = frozenset(table_name for table_name in schema.tables if table_name.lower() in identifiers)
+        columns = frozenset(
+            f"{table_name}.{column_name}"
+            for table_name in tables
+            for column_name in schema.tables[table_name].columns
+            if "*" in identifiers or column_name.lower() in identifiers
+        )
+        return tables, columns
+
+    @staticmethod
+    def build_response(pipeline: StageGraph, results: Dict[str, Any], user_request: UserInputRequest) -> SqlGenerationResponse:
+        """
+        Assemble the SqlGenerationResponse of a pipeline run.
+        """
+        updated_sql, injected_str = results["injected_sql"]
+        # The cost guard may have rewritten the query with a LIMIT
+        guarded_sql = results.get("guarded_sql")
+        if guarded_sql is not None:
+            updated_sql = guarded_sql.sql
+
+        # Paged results carry the first page and the token to fetch the next ones
+        sql_response = results.get("sql_response")
+        page = None
+        if isinstance(sql_response, SqlPageResponse):
+            sql_response, page = sql_response.rows, sql_response.page
+
+        # Tables left out of the prompt the final SQL was generated with
+        intent, retrieved_schema = results.get("intent"), results.get("retrieved_schema")
+        schema_retrieval = retrieved_schema.report if retrieved_schema is not None else None
+        if intent is not None and intent.candidate_sql is not None and intent.candidate_sql.sql == results.get("generated_sql"):
+            schema_retrieval = intent.schema_retrieval
+
+        return SqlGenerationResponse(
+            query_scope=results["resolved_query_scope"],
+            user_input=user_request.input,
+            sql_query=updated_sql,
+            sql_response=sql_response,
+            injected_str=injected_str,
+            stage_timings=pipeline.get_timings(),
+            query_plan=guarded_sql.query_plan if guarded_sql is not None else None,
+            page=page,
+            schema_retrieval=schema_retrieval
+        )
@@ -0,0 +1,321 @@
+import json
+import logging
+import re
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from fastapi import HTTPException
+
+from api.core.services.sql_runner.sql_runner_service import SqlRunnerService
+from model.query_scope.query_scope import QueryScope
+from model.responses.sql_generation.query_plan_summary import QueryPlanSummary
+from model.responses.sql_generation.sql_generation_error import QueryCostErrorResponse
+from model.tenant.tenant import Tenant
+
+from utils.tenant_manager.setting_utils import SettingUtils
+from utils.sql_runner.sql_statement_utils import SqlStatementUtils
+from api.core.constants.tenant.settings_categories import SQL_RUNNER, EXTERNAL_SYSTEM_DB_SETTING
+
+logger = logging.getLogger(__name__)
+
+ALLOW_ACTION = "allow"
+REJECT_ACTION = "reject"
+LIMIT_ACTION = "limit"
+QUEUE_ACTION = "queue"
+COST_GUARD_ACTIONS = (REJECT_ACTION, LIMIT_ACTION, QUEUE_ACTION)
+
+EXPLAIN_PREFIXES = {
+    "postgresql": "EXPLAIN (FORMAT JSON) ",
+    "mysql": "EXPLAIN FORMAT=JSON ",
+    "sqlite": "EXPLAIN QUERY PLAN ",
+}
+
+# Plans of queries with hundreds of joins are cut in the response, the estimates still cover the whole plan
+MAX_PLAN_LINES = 50
+
+_SQLITE_SCAN_PATTERN = re.compile(r"^SCAN (?:TABLE )?(\w+)")
+
+class CostGuardSettings(NamedTuple):
+    enabled: bool
+    max_estimated_rows: float
+    max_estimated_cost: float
+    action: str
+    limit_rows: int
+    queue_timeout_seconds: float
+
+class SqlCostGuardResult(NamedTuple):
+    """
+    SQL query to run after the cost guard, with the plan it was judged on. queue_timeout_seconds
+    is set when the query has to wait for a slot of the tenant's expensive query queue.
+    """
+    sql: str
+    query_plan: Optional[QueryPlanSummary] = None
+    queue_timeout_seconds: Optional[float] = None
+
+    @property
+    def queued(self) -> bool:
+        return self.queue_timeout_seconds is not None
+
+class SqlCostGuardService:
+
+    @staticmethod
+    def get_guard_settings(tenant: Tenant) -> CostGuardSettings:
+        """
+        Read the tenant's cost guard settings from the SQL_RUNNER settings, 0 disables a threshold.
+        """
+        def _read(setting_key: str, default: Any) -> Any:
+            value = SettingUtils.get_setting_value(
+                settings=tenant.settings,
+                category_key=SQL_RUNNER,
+                setting_key=setting_key
+            )
+            return default if value in (None, "") else value
+
+        enabled = _read("SQL_COST_GUARD_ENABLED", False)
+        if isinstance(enabled, str):
+            enabled = enabled.strip().lower() == "true"
+
+        action = str(_read("SQL_COST_GUARD_ACTION", REJECT_ACTION)).strip().lower()
+        if action not in COST_GUARD_ACTIONS:
+            logger.warning("Unknown SQL_COST_GUARD_ACTION '%s', rejecting expensive queries.", action)
+            action = REJECT_ACTION
+
+        return CostGuardSettings(
+            enabled=bool(enabled),
+            max_estimated_rows=float(_read("SQL_COST_GUARD_MAX_ESTIMATED_ROWS", 0)),
+            max_estimated_cost=float(_read("SQL_COST_GUARD_MAX_ESTIMATED_COST", 0)),
+            action=action,
+            limit_rows=int(_read("SQL_COST_GUARD_LIMIT_ROWS", 1000)),
+            queue_timeout_seconds=float(_read("SQL_COST_GUARD_QUEUE_TIMEOUT_SECONDS", 30))
+        )
+
+    @staticmethod
+    async def guard_sql(sql: str, tenant: Tenant, schema_name: str = None,
+                        query_scope: QueryScope = None, user_input: str = None) -> SqlCostGuardResult:
+        """
+        Run EXPLAIN on the query and reject it, rewrite it with a LIMIT or queue it when the
+        planner estimates exceed the tenant's thresholds.
+
+        The guard fails open: when the plan cannot be read the query runs as it would without the
+        guard, and a broken query then fails on execution with the usual error.
+
+        Raises:
+            HTTPException: 400 with a QueryCostErrorResponse when the action is reject.
+        """
+        guard_settings = SqlCostGuardService.get_guard_settings(tenant)
+        if not guard_settings.enabled:
+            return SqlCostGuardResult(sql=sql)
+
+        try:
+            query_plan = await SqlCostGuardService.explain_sql(sql=sql, tenant=tenant, schema_name=schema_name)
+        except Exception as e:
+            logger.warning("Cost guard skipped, the query plan could not be read: %s", e)
+            return SqlCostGuardResult(sql=sql)
+
+        query_plan.exceeded_thresholds = SqlCostGuardService.get_exceeded_thresholds(query_plan, guard_settings)
+        if not query_plan.exceeded_thresholds:
+            return SqlCostGuardResult(sql=sql, query_plan=query_plan)
+
+        action = guard_settings.action
+        if action == LIMIT_ACTION and not SqlStatementUtils.is_select(sql):
+            # Only a SELECT can be capped with a LIMIT
+            action = REJECT_ACTION
+        query_plan.action = action
+        logger.info("Cost guard %s query over %s", action, ", ".join(query_plan.exceeded_thresholds))
+
+        if action == LIMIT_ACTION:
+            return SqlCostGuardResult(
+                sql=SqlCostGuardService.apply_limit(sql, guard_settings.limit_rows),
+                query_plan=query_plan
+            )
+        if action == QUEUE_ACTION:
+            return SqlCostGuardResult(
+                sql=sql,
+                query_plan=query_plan,
+                queue_timeout_seconds=guard_settings.queue_timeout_seconds
+            )
+
+        error_response = QueryCostErrorResponse(
+            message="The query was rejected because its estimated cost exceeds the tenant's limits.",
+            user_query_scope=query_scope,
+            user_input=user_input,
+            sql_query=sql,
+            query_plan=query_plan
+        )
+        raise HTTPException(
+            status_code=400,
+            detail=error_response.dict()
+        )
+
+    @staticmethod
+    async def explain_sql(sql: str, tenant: Tenant, schema_name: str = None) -> QueryPlanSummary:
+        """
+        Read the planner's estimates for the query from the tenant database.
+        """
+        dialect = SettingUtils.get_setting_value(
+            settings=tenant.settings,
+            category_key=EXTERNAL_SYSTEM_DB_SETTING,
+            setting_key="EXTERNAL_TENANT_DB_DIALECT"
+        )
+        if dialect not in EXPLAIN_PREFIXES:
+            raise ValueError(f"Unsupported SQL flavor: {dialect}")
+
+        rows = await SqlRunnerService.run_sql_async(
+            query=EXPLAIN_PREFIXES[dialect] + SqlCostGuardService._strip_sql(sql),
+            tenant=tenant,
+            schema_name=schema_name
+        )
+        if not isinstance(rows, list) or not rows:
+            raise ValueError(f"Unexpected EXPLAIN result: {rows}")
+
+        if dialect == "postgresql":
+            estimated_rows, estimated_cost, plan = SqlCostGuardService.parse_postgres_plan(rows)
+        elif dialect == "mysql":
+            estimated_rows, estimated_cost, plan = SqlCostGuardService.parse_mysql_plan(rows)
+        else:
+            table_rows = await SqlCostGuardService._get_sqlite_table_rows(tenant, schema_name)
+            estimated_rows, estimated_cost, plan = SqlCostGuardService.parse_sqlite_plan(rows, table_rows)
+
+        return QueryPlanSummary(
+            dialect=dialect,
+            estimated_rows=estimated_rows,
+            estimated_cost=estimated_cost,
+            plan=plan[:MAX_PLAN_LINES],
+            action=ALLOW_ACTION
+        )
+
+    @staticmethod
+    def get_exceeded_thresholds(query_plan: QueryPlanSummary, guard_settings: CostGuardSettings) -> List[str]:
+        exceeded = []
+        if (guard_settings.max_estimated_rows and query_plan.estimated_rows is not None
+                and query_plan.estimated_rows > guard_settings.max_estimated_rows):
+            exceeded.append(f"estimated_rows {query_plan.estimated_rows:g} > {guard_settings.max_estimated_rows:g}")
+        if (guard_settings.max_estimated_cost and query_plan.estimated_cost is not None
+                and query_plan.estimated_cost > guard_settings.max_estimated_cost):
+            exceeded.append(f"estimated_cost {query_plan.estimated_cost:g} > {guard_settings.max_estimated_cost:g}")
+        return exceeded
+
+    @staticmethod
+    def apply_limit(sql: str, limit_rows: int) -> str:
+        """
+        Cap the SELECT at limit_rows rows, whatever LIMIT it already has. The LIMIT is added or
+        lowered in place; the query is only wrapped in a derived table when its own clauses do
+        not allow that, since MySQL rejects derived tables whose columns share a name.
+        Statements other than a SELECT are returned unchanged.
+        """
+        sql = SqlCostGuardService._strip_sql(sql)
+        if not SqlStatementUtils.is_select(sql):
+            return f"{sql};"
+        limited_sql = SqlStatementUtils.with_limit(sql, limit_rows)
+        if limited_sql is None:
+            limited_sql = f"SELECT * FROM ({sql}) AS cost_guard_limited LIMIT {int(limit_rows)}"
+        return f"{limited_sql};"
+
+    @staticmethod
+    def parse_postgres_plan(rows: List[Dict[str, Any]]) -> Tuple[Optional[float], Optional[float], List[str]]:
+        """
+        Parse the output of EXPLAIN (FORMAT JSON), returned as text or already decoded depending on the driver.
+        """
+        document = SqlCostGuardService._first_value(rows)
+        if isinstance(document, str):
+            document = json.loads(document)
+        root = document[0]["Plan"]
+
+        lines = []
+        for depth, node in SqlCostGuardService._walk_postgres_nodes(root):
+            relation = f" on {node['Relation Name']}" if node.get("Relation Name") else ""
+            lines.append(f"{'  ' * depth}{node.get('Node Type')}{relation} (rows={node.get('Plan Rows')}, cost={node.get('Total Cost')})")
+        return float(root.get("Plan Rows", 0)), float(root.get("Total Cost", 0)), lines
+
+    @staticmethod
+    def parse_mysql_plan(rows: List[Dict[str, Any]]) -> Tuple[Optional[float], Optional[float], List[str]]:
+        """
+        Parse the output of EXPLAIN FORMAT=JSON. The rows produced by the last table of the join
+        order are the planner's estimate for the whole query.
+        """
+        document = SqlCostGuardService._first_value(rows)
+        if isinstance(document, str):
+            document = json.loads(document)
+        query_block = document["query_block"]
+        query_cost = query_block.get("cost_info", {}).get("query_cost")
+
+        tables = list(SqlCostGuardService._walk_mysql_tables(query_block))
+        lines = [
+            f"{table.get('access_type', 'ALL')} on {table.get('table_name')} (rows={table.get('rows_examined_per_scan')})"
+            for table in tables
+        ]
+        estimated_rows = None
+        if tables:
+            last_table = tables[-1]
+            produced = last_table.get("rows_produced_per_join", last_table.get("rows_examined_per_scan"))
+            estimated_rows = float(produced) if produced is not None else None
+        return estimated_rows, float(query_cost) if query_cost is not None else None, lines
+
+    @staticmethod
+    def parse_sqlite_plan(rows: List[Dict[str, Any]], table_rows: Dict[str, int]) -> Tuple[Optional[float], Optional[float], List[str]]:
+        """
+        Parse the output of EXPLAIN QUERY PLAN. SQLite reports no estimates, the row estimate is the
+        product of the sizes of the fully scanned tables, known once ANALYZE filled sqlite_stat1.
+        SQLite has no cost figure.
+        """
+        depths: Dict[Any, int] = {}
+        lines = []
+        scanned_table_sizes = []
+        for row in rows:
+            depth = depths.get(row.get("parent"), -1) + 1
+            depths[row.get("id")] = depth
+            detail = str(row.get("detail", ""))
+            lines.append(f"{'  ' * depth}{detail}")
+
+            scan = _SQLITE_SCAN_PATTERN.match(detail)
+            if scan:
+                scanned_table_sizes.append(table_rows.get(scan.group(1)))
+
+        if not scanned_table_sizes or None in scanned_table_sizes:
+            return None, None, lines
+        estimated_rows = 1.0
+        for table_size in scanned_table_sizes:
+            estimated_rows *= table_size
+        return estimated_rows, None, lines
+
+    @staticmethod
+    async def _get_sqlite_table_rows(tenant: Tenant, schema_name: str = None) -> Dict[str, int]:
+        try:
+            rows = await SqlRunnerService.run_sql_async(
+                query="SELECT tbl, stat FROM sqlite_stat1",
+                tenant=tenant,
+                schema_name=schema_name
+            )
+        except HTTPException:
+            # No sqlite_stat1 before the first ANALYZE
+            return {}
+        table_rows: Dict[str, int] = {}
+        for row in rows if isinstance(rows, list) else []:
+            stat = str(row.get("stat") or "").split()
+            if stat and stat[0].isdigit():
+                table_rows[row["tbl"]] = max(table_rows.get(row["tbl"], 0), int(stat[0]))
+        return table_rows
+
+    @staticmethod
+    def _walk_postgres_nodes(node: Dict[str, Any], depth: int = 0) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        yield depth, node
+        for child in node.get("Plans", []):
+            yield from SqlCostGuardService._walk_postgres_nodes(child, depth + 1)
+
+    @staticmethod
+    def _walk_mysql_tables(node: Any) -> Iterator[Dict[str, Any]]:
+        if isinstance(node, dict):
+            for key, value in node.items():
+                if key == "table" and isinstance(value, dict):
+                    yield value
+                yield from SqlCostGuardService._walk_mysql_tables(value)
+        elif isinstance(node, list):
+            for item in node:
+                yield from SqlCostGuardService._walk_mysql_tables(item)
+
+    @staticmethod
+    def _first_value(rows: List[Dict[str, Any]]) -> Any:
+        return next(iter(rows[0].values()))
+
+    @staticmethod
+    def _strip_sql(sql: str) -> str:
+        return sql.strip().rstrip(";").strip()
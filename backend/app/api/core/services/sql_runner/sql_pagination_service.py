@@ -0,0 +1,301 @@
+import hashlib
+import logging
+import re
+import time
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from fastapi import HTTPException
+
+from api.core.services.sql_runner.sql_runner_service import SqlRunnerService
+from api.core.services.tenant_manager.tenant_manager_service import TenantManagerService
+from model.query_scope.query_scope import QueryScope
+from model.schema.schema import Schema
+from model.tenant.tenant import Tenant
+from model.external_system_integration.external_user_session_data import ExternalSessionData
+from model.responses.sql_generation.sql_page import SqlPageInfo, SqlPageResponse
+
+from config import settings
+from utils.tenant_manager.setting_utils import SettingUtils
+from utils.sql_runner.sql_statement_utils import SqlStatementUtils
+from utils.sql_runner.continuation_token_utils import (
+    encode_continuation_token, decode_continuation_token, encode_key_value, decode_key_value
+)
+from api.core.constants.tenant.settings_categories import SQL_RUNNER, EXTERNAL_SYSTEM_DB_SETTING
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_DIALECTS = {"postgresql", "mysql", "sqlite"}
+
+IDENTIFIER_QUOTES = {
+    "postgresql": '"',
+    "mysql": "`",
+    "sqlite": '"',
+}
+
+
+_DEFAULT_PAGE_SIZE = 500
+_DEFAULT_PAGE_TOKEN_TTL_SECONDS = 3600
+
+# Items of the query's top-level ORDER BY, only plain column items are kept as page keys
+_ORDER_ITEM_PATTERN = re.compile(r"^(?:\w+\.)?(\w+)(?:\s+(ASC|DESC))?$", re.IGNORECASE)
+
+# Shared by every worker and kept across restarts, continuation tokens are verified wherever they land
+_token_secret = settings.SQL_PAGINATION_TOKEN_SECRET.encode("utf-8") if settings.SQL_PAGINATION_TOKEN_SECRET else None
+
+class PageKey(NamedTuple):
+    column: str
+    descending: bool = False
+
+class PageSettings(NamedTuple):
+    enabled: bool
+    page_size: int
+    token_ttl_seconds: float
+
+class SqlPaginationService:
+    """
+    Keyset pagination of generated SQL results.
+
+    The final SQL is wrapped in a query ordered by key columns of its result, the primary key
+    columns of the QueryScope's tables (or every column when none is selected), after the columns
+    of a trailing ORDER BY of the query. A page ends after page_size rows, and the continuation
+    token carries the SQL, its hash and the keys of the last row, so the next page is a single
+    bounded query on the tenant database without running any LLM stage again.
+    """
+
+    @staticmethod
+    def check_token_secret():
+        """
+        Log an error on startup when no key is configured to sign continuation tokens with.
+        """
+        if _token_secret is None:
+            logger.error("SQL_PAGINATION_TOKEN_SECRET is not set, paged SQL results fail for tenants with SQL_PAGINATION_ENABLED.")
+
+    @staticmethod
+    def get_page_settings(tenant: Tenant) -> PageSettings:
+        def _read(setting_key: str, default: Any) -> Any:
+            value = SettingUtils.get_setting_value(
+                settings=tenant.settings,
+                category_key=SQL_RUNNER,
+                setting_key=setting_key
+            )
+            return default if value in (None, "") else value
+
+        enabled = _read("SQL_PAGINATION_ENABLED", False)
+        if isinstance(enabled, str):
+            enabled = enabled.strip().lower() == "true"
+        return PageSettings(
+            enabled=bool(enabled),
+            page_size=max(1, int(_read("SQL_PAGE_SIZE", _DEFAULT_PAGE_SIZE))),
+            token_ttl_seconds=float(_read("SQL_PAGE_TOKEN_TTL_SECONDS", _DEFAULT_PAGE_TOKEN_TTL_SECONDS))
+        )
+
+    @staticmethod
+    async def fetch_first_page(sql: str, tenant: Tenant, schema_name: str, schema: Schema,
+                               query_scope: QueryScope, session: ExternalSessionData,
+                               user_input: str = None) -> SqlPageResponse:
+        SqlPaginationService._get_token_secret()
+        page_settings = SqlPaginationService.get_page_settings(tenant)
+        base_sql = SqlPaginationService._strip_sql(sql)
+        columns = await SqlRunnerService.get_result_columns(query=base_sql, tenant=tenant, schema_name=schema_name)
+        if len(set(columns)) < len(columns):
+            # Keyset pages wrap the query in a derived table, which MySQL rejects for duplicate column names
+            logger.warning("Paged query has duplicate result column names, it is not wrapped for keyset pages.")
+            keys = []
+        else:
+            keys = SqlPaginationService.select_page_keys(base_sql, columns, query_scope, schema)
+
+        return await SqlPaginationService._fetch_page(
+            base_sql=base_sql,
+            keys=keys,
+            last_key=None,
+            page_size=page_settings.page_size,
+            token_ttl_seconds=page_settings.token_ttl_seconds,
+            tenant=tenant,
+            schema_name=schema_name,
+            session=session,
+            query_scope=query_scope,
+            user_input=user_input
+        )
+
+    @staticmethod
+    async def fetch_next_page(continuation_token: str, tenant_id: str, schema_name: str,
+                              session: ExternalSessionData) -> SqlPageResponse:
+        """
+        Fetch the page following the one the continuation token was returned with.
+
+        Raises:
+            HTTPException: 400 if the token is invalid, 403 if it was issued to another session, user,
+                tenant or schema, 410 if it has expired, 500 if SQL_PAGINATION_TOKEN_SECRET is not set.
+        """
+        payload = decode_continuation_token(continuation_token, SqlPaginationService._get_token_secret())
+        if hashlib.sha256(payload["sql"].encode("utf-8")).hexdigest() != payload["sql_hash"]:
+            raise HTTPException(status_code=400, detail="Invalid continuation token: SQL hash mismatch")
+        issued_for = (payload["tenant_id"], payload["tenant_id"], payload["schema_name"], payload["user_id"], payload["session_id"])
+        if issued_for != (tenant_id, session.tenant_id, schema_name, session.user_id, str(session.session_id)):
+            raise HTTPException(status_code=403, detail="The continuation token was not issued for this session, tenant and schema.")
+        if payload["expires_at"] < time.time():
+            raise HTTPException(status_code=410, detail="The continuation token has expired, run the query again.")
+
+        tenant = await TenantManagerService.get_tenant(tenant_id=tenant_id)
+        page_settings = SqlPaginationService.get_page_settings(tenant)
+        return await SqlPaginationService._fetch_page(
+            base_sql=payload["sql"],
+            keys=[PageKey(column, descending) for column, descending in payload["keys"]],
+            last_key=[decode_key_value(value) for value in payload["last_key"]],
+            page_size=payload["page_size"],
+            token_ttl_seconds=page_settings.token_ttl_seconds,
+            tenant=tenant,
+            schema_name=schema_name,
+            session=session
+        )
+
+    @staticmethod
+    def select_page_keys(base_sql: str, columns: Sequence[str], query_scope: QueryScope, schema: Schema) -> List[PageKey]:
+        """
+        Pick the result columns the pages are ordered by: the plain column items of a trailing
+        ORDER BY, then the primary key columns of the QueryScope's tables as tie breakers, or every
+        result column when the result has none.
+        """
+        # Ambiguous names (e.g. the id of two joined tables) cannot be referenced outside the query
+        unique_columns = [column for column in columns if list(columns).count(column) == 1]
+
+        order_keys = SqlPaginationService._get_order_by_keys(base_sql, set(unique_columns))
+        primary_keys = {
+            column_name
+            for table_name in query_scope.entities.tables if table_name in schema.tables
+            for column_name, column in schema.tables[table_name].columns.items()
+            if "PRIMARY KEY" in (column.constraints or [])
+        }
+        tie_breakers = [column for column in unique_columns if column in primary_keys] or unique_columns
+
+        ordered_columns = {key.column for key in order_keys}
+        return order_keys + [PageKey(column) for column in tie_breakers if column not in ordered_columns]
+
+    @staticmethod
+    def build_page_query(dialect: str, base_sql: str, keys: Sequence[PageKey],
+                         last_key: Optional[Sequence[Any]], limit: int) -> Tuple[str, Dict[str, Any]]:
+        """
+        Wrap the query so that it returns the rows after last_key in key order, at most limit of them.
+        Without keys only the LIMIT is applied, in place when the query's clauses allow it.
+        """
+        if not keys:
+            limited_sql = SqlStatementUtils.with_limit(base_sql, limit)
+            if limited_sql is not None:
+                return limited_sql, {}
+
+        quote = IDENTIFIER_QUOTES[dialect]
+
+        def quoted(column: str) -> str:
+            return f"{quote}{column.replace(quote, quote * 2)}{quote}"
+
+        params: Dict[str, Any] = {}
+        where_clause = ""
+        if last_key is not None:
+            # (k1 > v1) OR (k1 = v1 AND k2 > v2) OR ..., with < for descending keys
+            alternatives = []
+            for index, key in enumerate(keys):
+                params[f"page_key_{index}"] = last_key[index]
+                terms = [f"{quoted(previous.column)} = :page_key_{position}" for position, previous in enumerate(keys[:index])]
+                terms.append(f"{quoted(key.column)} {'<' if key.descending else '>'} :page_key_{index}")
+                alternatives.append(f"({' AND '.join(terms)})")
+            where_clause = f" WHERE {' OR '.join(alternatives)}"
+
+        order_by_clause = ""
+        if keys:
+            order_by_clause = " ORDER BY " + ", ".join(f"{quoted(key.column)} {'DESC' if key.descending else 'ASC'}" for key in keys)
+        return SqlStatementUtils.with_limit(f"SELECT * FROM ({base_sql}) AS paged_query{where_clause}{order_by_clause}", limit), params
+
+    @staticmethod
+    async def _fetch_page(base_sql: str, keys: List[PageKey], last_key: Optional[List[Any]],
+                          page_size: int, token_ttl_seconds: float, tenant: Tenant, schema_name: str,
+                          session: ExternalSessionData, query_scope: QueryScope = None, user_input: str = None) -> SqlPageResponse:
+        dialect = SettingUtils.get_setting_value(
+            settings=tenant.settings,
+            category_key=EXTERNAL_SYSTEM_DB_SETTING,
+            setting_key="EXTERNAL_TENANT_DB_DIALECT"
+        )
+        if dialect not in SUPPORTED_DIALECTS:
+            raise ValueError(f"Unsupported SQL flavor: {dialect}")
+
+        # One row past the page tells whether there is a next page
+        page_query, params = SqlPaginationService.build_page_query(dialect, base_sql, keys, last_key, page_size + 1)
+        rows = await SqlRunnerService.run_sql_async(
+            query=page_query,
+            tenant=tenant,
+            orginal_user_input=user_input,
+            query_scope=query_scope,
+            schema_name=schema_name,
+            params=params
+        )
+        if not isinstance(rows, list):
+            raise HTTPException(status_code=400, detail=f"An error occurred while executing the query: {rows}")
+
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        sql_hash = hashlib.sha256(base_sql.encode("utf-8")).hexdigest()
+
+        continuation_token = None
+        if has_more and not keys:
+            logger.warning("Paged query has no referenceable key column, only its first page is returned, sql_hash=%s", sql_hash)
+        elif has_more:
+            next_key = [rows[-1].get(key.column) for key in keys]
+            if any(value is None for value in next_key):
+                # NULL keys cannot be compared against, the remaining rows are not reachable by key
+                logger.warning("Paged query stopped at a row with a NULL key, sql_hash=%s", sql_hash)
+            else:
+                continuation_token = encode_continuation_token({
+                    "tenant_id": tenant.tenant_id,
+                    "schema_name": schema_name,
+                    "user_id": session.user_id,
+                    "session_id": str(session.session_id),
+                    "sql": base_sql,
+                    "sql_hash": sql_hash,
+                    "keys": [[key.column, key.descending] for key in keys],
+                    "last_key": [encode_key_value(value) for value in next_key],
+                    "page_size": page_size,
+                    "expires_at": time.time() + token_ttl_seconds,
+                }, SqlPaginationService._get_token_secret())
+
+        return SqlPageResponse(
+            rows=rows,
+            page=SqlPageInfo(
+                page_size=page_size,
+                row_count=len(rows),
+                has_more=has_more,
+                continuation_token=continuation_token,
+                key_columns=[key.column for key in keys],
+                sql_hash=sql_hash
+            )
+        )
+
+    @staticmethod
+    def _get_order_by_keys(base_sql: str, columns: set) -> List[PageKey]:
+        # ORDER BY inside window functions and subqueries does not order the result
+        order_by = SqlStatementUtils.get_order_by(base_sql)
+        if not order_by:
+            return []
+        masked = SqlStatementUtils.mask_nested(order_by)
+        bounds = [-1] + [index for index, char in enumerate(masked) if char == ","] + [len(order_by)]
+        keys = []
+        for start, end in zip(bounds, bounds[1:]):
+            item = order_by[start + 1:end].strip()
+            item_match = _ORDER_ITEM_PATTERN.match(item)
+            if not item_match or item_match.group(1) not in columns:
+                # An expression or a column outside the result, the query's order is not kept
+                logger.warning("Paged query is ordered by its key columns instead of its ORDER BY item '%s'", item)
+                return []
+            keys.append(PageKey(item_match.group(1), (item_match.group(2) or "").upper() == "DESC"))
+        return keys
+
+    @staticmethod
+    def _get_token_secret() -> bytes:
+        if _token_secret is None:
+            raise HTTPException(
+                status_code=500,
+                detail="SQL pagination is enabled but SQL_PAGINATION_TOKEN_SECRET is not configured."
+            )
+        return _token_secret
+
+    @staticmethod
+    def _strip_sql(sql: str) -> str:
+        return sql.strip().rstrip(";").strip()
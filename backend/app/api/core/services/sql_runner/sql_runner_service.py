@@ -1,22 +1,218 @@
+import asyncio
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, AsyncIterator, Dict, List
+
 from fastapi import HTTPException
-from sqlalchemy import create_engine, text
+from sqlalchemy import text
 from sqlalchemy.exc import SQLAlchemyError
 from model.query_scope.query_scope import QueryScope
 from model.responses.sql_generation.sql_generation_error import ErrorType, SqlRunErrorResponse
 from model.tenant.tenant import Tenant
 
+from config import settings
 from utils.tenant_manager.setting_utils import SettingUtils
 from api.core.constants.tenant.settings_categories import EXTERNAL_SYSTEM_DB_SETTING
-from utils.external_system_utils.external_system_db_utils import build_db_url_based_on_dialect
+from utils.external_system_utils.external_system_db_utils import build_db_url_based_on_dialect, build_async_db_url
+from utils.external_system_utils.external_system_engine_registry import engine_registry
+from utils.tracing.otel_tracing import start_span
+from utils.sql_runner.sql_statement_utils import SqlStatementUtils
+
+# Bounded pool used to run queries for tenants whose database has no asyncio driver available
+sql_executor = ThreadPoolExecutor(
+    max_workers=settings.EXTERNAL_DB_SYNC_EXECUTOR_MAX_WORKERS,
+    thread_name_prefix="sql-runner"
+)
 
 class SqlRunnerService:
-    
+
     @staticmethod
-    def run_sql(query: str, tenant: Tenant, 
-                orginal_user_input: str = None, 
-                query_scope: QueryScope = None, 
+    def run_sql(query: str, tenant: Tenant,
+                orginal_user_input: str = None,
+                query_scope: QueryScope = None,
                 schema_name: str = None,
                 params: dict = None):
+        sql_flavor, db_connection_url = SqlRunnerService._resolve_connection(tenant, schema_name)
+        # Engines are pooled per tenant and reused across requests, rebuilt when the connection settings change
+        engine = engine_registry.get_engine(
+            tenant_id=tenant.tenant_id,
+            dialect=sql_flavor,
+            db_url=db_connection_url,
+            schema_name=schema_name
+        )
+
+        try:
+            with SqlRunnerService._start_execution_span(tenant, sql_flavor, schema_name, query) as span, engine.connect() as connection:
+                result = connection.execute(text(query), params or {})
+                rows = [dict(row._mapping) for row in result]
+                span.set_attribute("db.row_count", len(rows))
+                return rows
+        except SQLAlchemyError as e:
+            SqlRunnerService._raise_sql_error(e, query, orginal_user_input, query_scope)
+        except Exception as e:
+            return f"An unexpected error occurred: {str(e)}"
+
+    @staticmethod
+    async def run_sql_async(query: str, tenant: Tenant,
+                            orginal_user_input: str = None,
+                            query_scope: QueryScope = None,
+                            schema_name: str = None,
+                            params: dict = None):
+        """
+        Non-blocking variant of run_sql for use inside request handlers.
+
+        Uses the asyncio driver of the tenant's dialect (asyncpg, aiomysql, aiosqlite) when installed,
+        otherwise runs the sync driver on the bounded sql_executor thread pool.
+        """
+        sql_flavor, db_connection_url = SqlRunnerService._resolve_connection(tenant, schema_name)
+        async_db_url = build_async_db_url(db_connection_url) if settings.EXTERNAL_DB_ASYNC_DRIVERS_ENABLED else None
+
+        if async_db_url is None:
+            loop = asyncio.get_running_loop()
+            # The copied context keeps the execution span under the request's span on the executor thread
+            return await loop.run_in_executor(
+                sql_executor,
+                partial(
+                    contextvars.copy_context().run,
+                    SqlRunnerService.run_sql,
+                    query=query,
+                    tenant=tenant,
+                    orginal_user_input=orginal_user_input,
+                    query_scope=query_scope,
+                    schema_name=schema_name,
+                    params=params
+                )
+            )
+
+        engine = engine_registry.get_async_engine(
+            tenant_id=tenant.tenant_id,
+            dialect=sql_flavor,
+            db_url=async_db_url,
+            schema_name=schema_name
+        )
+
+        try:
+            with SqlRunnerService._start_execution_span(tenant, sql_flavor, schema_name, query) as span:
+                async with engine.connect() as connection:
+                    result = await connection.execute(text(query), params or {})
+                    rows = [dict(row._mapping) for row in result]
+                    span.set_attribute("db.row_count", len(rows))
+                    return rows
+        except SQLAlchemyError as e:
+            SqlRunnerService._raise_sql_error(e, query, orginal_user_input, query_scope)
+        except Exception as e:
+            return f"An unexpected error occurred: {str(e)}"
+
+    @staticmethod
+    async def get_result_columns(query: str, tenant: Tenant, schema_name: str = None,
+                                 params: dict = None) -> List[str]:
+        """
+        Return the column names of the SELECT's result set without fetching any row, duplicate
+        names included.
+        """
+        sql_flavor, db_connection_url = SqlRunnerService._resolve_connection(tenant, schema_name)
+        async_db_url = build_async_db_url(db_connection_url) if settings.EXTERNAL_DB_ASYNC_DRIVERS_ENABLED else None
+        query = query.strip().rstrip(";")
+        # A derived table would fail on MySQL and rename the columns on SQLite when names repeat
+        statement = text(SqlStatementUtils.with_limit(query, 0) or f"SELECT * FROM ({query}) AS result_columns LIMIT 0")
+
+        try:
+            if async_db_url is not None:
+                engine = engine_registry.get_async_engine(
+                    tenant_id=tenant.tenant_id,
+                    dialect=sql_flavor,
+                    db_url=async_db_url,
+                    schema_name=schema_name
+                )
+                async with engine.connect() as connection:
+                    result = await connection.execute(statement, params or {})
+                    return list(result.keys())
+
+            engine = engine_registry.get_engine(
+                tenant_id=tenant.tenant_id,
+                dialect=sql_flavor,
+                db_url=db_connection_url,
+                schema_name=schema_name
+            )
+
+            def _get_columns() -> List[str]:
+                with engine.connect() as connection:
+                    return list(connection.execute(statement, params or {}).keys())
+
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(sql_executor, _get_columns)
+        except SQLAlchemyError as e:
+            SqlRunnerService._raise_sql_error(e, query)
+
+    @staticmethod
+    async def stream_sql(query: str, tenant: Tenant,
+                         batch_size: int,
+                         orginal_user_input: str = None,
+                         query_scope: QueryScope = None,
+                         schema_name: str = None,
+                         params: dict = None) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Execute the query with a server-side cursor and yield the rows in batches of batch_size.
+        Stopping the iteration early closes the cursor without fetching the remaining rows.
+        """
+        sql_flavor, db_connection_url = SqlRunnerService._resolve_connection(tenant, schema_name)
+        async_db_url = build_async_db_url(db_connection_url) if settings.EXTERNAL_DB_ASYNC_DRIVERS_ENABLED else None
+        statement = text(query).execution_options(stream_results=True, yield_per=batch_size)
+
+        if async_db_url is not None:
+            engine = engine_registry.get_async_engine(
+                tenant_id=tenant.tenant_id,
+                dialect=sql_flavor,
+                db_url=async_db_url,
+                schema_name=schema_name
+            )
+            try:
+                async with engine.connect() as connection:
+                    result = await connection.stream(statement, params or {})
+                    try:
+                        async for partition in result.partitions(batch_size):
+                            yield [dict(row._mapping) for row in partition]
+                    finally:
+                        await result.close()
+            except SQLAlchemyError as e:
+                SqlRunnerService._raise_sql_error(e, query, orginal_user_input, query_scope)
+            return
+
+        # Sync driver, each blocking cursor call runs on the bounded executor
+        engine = engine_registry.get_engine(
+            tenant_id=tenant.tenant_id,
+            dialect=sql_flavor,
+            db_url=db_connection_url,
+            schema_name=schema_name
+        )
+        loop = asyncio.get_running_loop()
+        connection = None
+        try:
+            connection = await loop.run_in_executor(sql_executor, engine.connect)
+            result = await loop.run_in_executor(sql_executor, connection.execute, statement, params or {})
+            while True:
+                rows = await loop.run_in_executor(sql_executor, result.fetchmany, batch_size)
+                if not rows:
+                    break
+                yield [dict(row._mapping) for row in rows]
+        except SQLAlchemyError as e:
+            SqlRunnerService._raise_sql_error(e, query, orginal_user_input, query_scope)
+        finally:
+            if connection is not None:
+                await loop.run_in_executor(sql_executor, connection.close)
+
+    @staticmethod
+    def _start_execution_span(tenant: Tenant, sql_flavor: str, schema_name: str, query: str):
+        return start_span("sql_runner.execute", {
+            "tenant_id": tenant.tenant_id,
+            "schema_name": schema_name,
+            "db.system": sql_flavor,
+            "db.statement": query
+        })
+
+    @staticmethod
+    def _resolve_connection(tenant: Tenant, schema_name: str = None):
         sql_flavor = SettingUtils.get_setting_value(
             settings=tenant.settings,
             category_key=EXTERNAL_SYSTEM_DB_SETTING,
@@ -25,40 +221,28 @@ class SqlRunnerService:
 
         if sql_flavor not in ["postgresql", "mysql", "sqlite"]:
             raise ValueError(f"Unsupported SQL flavor: {sql_flavor}")
-        
-        db_connection_url = build_db_url_based_on_dialect(tenant, sql_flavor, schema=schema_name)
-        print(db_connection_url)
-        # Conditionally exclude pool settings for SQLite:
-        if "sqlite" in db_connection_url.lower():
-            engine = create_engine(db_connection_url)
-        else:
-            engine = create_engine(db_connection_url, pool_size=10, max_overflow=20)
 
+        return sql_flavor, build_db_url_based_on_dialect(tenant, sql_flavor, schema=schema_name)
 
-        try:
-            with engine.connect() as connection:
-                result = connection.execute(text(query), params or {})
-                return [dict(row._mapping) for row in result]
-        except SQLAlchemyError as e:
-            if query_scope is not None and orginal_user_input is not None:
-                error_response = SqlRunErrorResponse(
-                    error_type=ErrorType.RUNTIME_ERROR,
-                    message="An error occurred while executing the query.",
-                    user_query_scope=query_scope,
-                    user_input=orginal_user_input,
-                    sql_query=query,
-                    error_message=e._message()
-                )
-                raise HTTPException(
-                    status_code=400,
-                    detail=error_response.dict()  
-                )
-            else:
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"An error occurred while executing the query: {str(e)}"
-                )
-        except Exception as e:
-            return f"An unexpected error occurred: {str(e)}"
-        finally:
-            engine.dispose()
\ No newline at end of file
+    @staticmethod
+    def _raise_sql_error(e: SQLAlchemyError, query: str,
+                         orginal_user_input: str = None,
+                         query_scope: QueryScope = None):
+        if query_scope is not None and orginal_user_input is not None:
+            error_response = SqlRunErrorResponse(
+                error_type=ErrorType.RUNTIME_ERROR,
+                message="An error occurred while executing the query.",
+                user_query_scope=query_scope,
+                user_input=orginal_user_input,
+                sql_query=query,
+                error_message=e._message()
+            )
+            raise HTTPException(
+                status_code=400,
+                detail=error_response.dict()
+            )
+        else:
+            raise HTTPException(
+                status_code=400,
+                detail=f"An error occurred while executing the query: {str(e)}"
+            )
@@ -3,6 +3,7 @@ from typing import List
 from uuid import UUID
 from fastapi import HTTPException
 from utils.database import mongodb
+from utils.cache.tenant_cache import tenant_cache
 from model.tenant.tenant import Tenant, AdminUser
 from model.responses.tenant_manager.admin_response import GetAdminUserResponse
 from utils.hash_utils import hash_password
@@ -78,6 +79,7 @@ class AdminUserService:
         )
         if result.matched_count == 0:
             raise HTTPException(status_code=404, detail="Tenant not found")
+        await tenant_cache.mark_modified(tenant_id)
 
         return GetAdminUserResponse(user_id=admin.user_id, role=admin.role)
 
@@ -96,6 +98,7 @@ class AdminUserService:
         
         if result.matched_count == 0:
             raise HTTPException(status_code=404, detail="Admin not found or Tenant not found")
+        await tenant_cache.mark_modified(tenant_id)
         return GetAdminUserResponse(user_id=updated_admin.user_id, role=updated_admin.role)
 
     @staticmethod
@@ -109,3 +112,4 @@ class AdminUserService:
         )
         if result.matched_count == 0:
             raise HTTPException(status_code=404, detail="Admin not found or Tenant not found")
+        await tenant_cache.mark_modified(tenant_id)
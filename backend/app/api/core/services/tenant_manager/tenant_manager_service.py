@@ -9,6 +9,13 @@ from model.requests.tenant_manager.update_tenant_request import UpdateTenantRequ
 from model.responses.tenant_manager.add_tenant_response import AddTenantResponse
 from utils.tenant_manager.setting_utils import SettingUtils
 from utils.tenant_manager.tenant_utils import TenantUtils
+from utils.external_system_utils.external_system_engine_registry import engine_registry
+from utils.external_system_utils.external_api_client_registry import external_api_client_registry
+from utils.cache.query_scope_cache import query_scope_cache
+from utils.cache.schema_ruleset_cache import schema_ruleset_cache
+from utils.cache.schema_entity_index_cache import schema_entity_index_cache
+from utils.cache.tenant_cache import tenant_cache
+from utils.cache.sql_generation_cache import sql_generation_cache
 
 class TenantManagerService:
     
@@ -43,6 +50,12 @@ class TenantManagerService:
 
     @staticmethod
     async def get_tenant(tenant_id: str):
+        cached_tenant = tenant_cache.get(tenant_id)
+        if cached_tenant is not None:
+            return cached_tenant
+
+        # Captured before the read so a concurrent update is not cached over
+        cache_version = tenant_cache.get_version(tenant_id)
         collection = mongodb.db["tenants"]
         tenant = await collection.find_one({"tenant_id": tenant_id})
         if not tenant:
@@ -51,7 +64,7 @@ class TenantManagerService:
                 detail="Tenant not found"
             )
         
-        return Tenant(**tenant)
+        return tenant_cache.set(tenant_id, tenant, cache_version)
     
     @staticmethod
     async def delete_tenant(tenant_id: str):
@@ -79,6 +92,15 @@ class TenantManagerService:
         if tenant_delete_result.deleted_count == 0:
             raise HTTPException(status_code=404, detail="Tenant not found")
 
+        # Release pooled connections to the tenant's external database
+        tenant_cache.invalidate(tenant_id)
+        engine_registry.invalidate_tenant(tenant_id)
+        await external_api_client_registry.invalidate_tenant(tenant_id)
+        query_scope_cache.invalidate_tenant(tenant_id)
+        schema_ruleset_cache.invalidate_tenant(tenant_id)
+        schema_entity_index_cache.invalidate_tenant(tenant_id)
+        await sql_generation_cache.invalidate_tenant(tenant_id)
+
         return {
             "message": "Tenant and associated orphan data deleted successfully",
             "schemas_deleted": schema_delete_result.deleted_count,
@@ -92,7 +114,7 @@ class TenantManagerService:
         collection = mongodb.db["tenants"]
         result = await collection.update_one(
             {"tenant_id": tenant_id}, 
-            {"$set": tenant_data_dict}  
+            {"$set": tenant_data_dict, "$inc": {"version": 1}}
         )
 
         if result.matched_count == 0:
@@ -100,5 +122,6 @@ class TenantManagerService:
                 status_code=404,
                 detail="Tenant not found"
             )
+        tenant_cache.invalidate(tenant_id)
 
         return {"message": "Tenant updated successfully"}
\ No newline at end of file
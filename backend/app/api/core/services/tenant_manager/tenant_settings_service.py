@@ -4,6 +4,7 @@ from fastapi import HTTPException
 from pymongo import ASCENDING
 
 from api.core.services.tenant_manager.tenant_manager_service import TenantManagerService
+from utils.cache.tenant_cache import tenant_cache
 from model.tenant.tenant import Tenant
 from model.tenant.setting import Setting
 from model.requests.tenant_manager.add_setting_to_tenant_request import AddSettingToTenantRequest
@@ -97,6 +98,7 @@ class TenantSettingsService:
                 status_code=400,
                 detail="Failed to insert or append settings into tenant"
             )
+        await tenant_cache.mark_modified(tenant_id)
 
         return {
             "new_settings": tenant.settings
@@ -126,6 +128,8 @@ class TenantSettingsService:
 
         if result.matched_count == 0:
             raise HTTPException(status_code=400, detail="No matching tenant found.")
+        if result.modified_count:
+            await tenant_cache.mark_modified(tenant_id)
 
         updated_tenant = await collection.find_one({"tenant_id": tenant_id}, {"settings": 1})
         updated_settings = updated_tenant["settings"].get(category_key, {})
@@ -229,6 +233,7 @@ class TenantSettingsService:
 
         if result.modified_count == 0:
             raise HTTPException(status_code=400, detail="Failed to delete setting for tenant")
+        await tenant_cache.mark_modified(tenant_id)
 
         return {
             "message": f"Setting '{setting_key}' deleted successfully from category '{setting_category}'",
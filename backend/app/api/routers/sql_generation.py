@@ -1,28 +1,25 @@
 import logging
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
 
-from api.core.services.llm_wrapper.llm_service_wrapper import LLMServiceWrapper
-from api.core.services.tenant_manager.tenant_manager_service import TenantManagerService
 from api.core.services.sql_runner.sql_runner_service import SqlRunnerService
-from api.core.services.schema.schema_manager_service import SchemaManagerService
-from api.core.services.ruleset.ruleset_manager_service import RulesetManagerService
-from api.core.resolvers.query_scope.query_scope_resolver import QueryScopeResolver
-from api.core.resolvers.access_control.user_access_control_resolver import AccessControlResolver
-from api.core.resolvers.schema.schema_resolver import SchemaResolver
-from api.core.resolvers.access_control.injector_resolver import InjectorResolver
+from api.core.services.sql_generation.sql_generation_pipeline_service import SqlGenerationPipelineService
+from api.core.services.sql_runner.sql_pagination_service import SqlPaginationService
+from api.core.services.sql_generation.sql_generation_batch_service import SqlGenerationBatchService
 
 from model.tenant.tenant import Tenant
-from model.schema.schema import Schema
-from model.ruleset.ruleset import Ruleset
 from model.requests.sql_generation.user_input_request import UserInputRequest
+from model.requests.sql_generation.sql_page_request import SqlPageRequest
+from model.requests.sql_generation.batch_user_input_request import BatchUserInputRequest
 from model.external_system_integration.external_user_session_data import ExternalSessionData
 from model.responses.sql_generation.sql_generation_response import SqlGenerationResponse
+from model.responses.sql_generation.sql_page import SqlPageResponse
+from model.responses.sql_generation.batch_sql_generation_response import BatchSqlGenerationResponse
 
 from utils.auth_utils import authenticate_session
 from utils.ruleset.ruleset_utils import extract_ruleset_name
-from utils.tenant_manager.setting_utils import SettingUtils
-
-from api.core.constants.tenant.settings_categories import SQL_INJECTORS
+from utils.sql_runner.sql_result_stream_utils import SqlResultStreamUtils, STREAM_MEDIA_TYPES, NDJSON_FORMAT
+from utils.sql_runner.expensive_query_queue import expensive_query_queue
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -111,83 +108,88 @@ router = APIRouter()
 @router.post("/{tenant_id}/{schema_name}")
 async def generate_sql_given_schema(tenant_id: str, schema_name: str, 
                                     user_request: UserInputRequest, run_sql: bool = True,
+                                    stream: bool = False, stream_format: str = NDJSON_FORMAT,
                                     session: ExternalSessionData = Depends(authenticate_session)):
-    # Fetch tenant and schema details
-    tenant: Tenant = await TenantManagerService.get_tenant(tenant_id=tenant_id)
-    schema: Schema = await SchemaManagerService.get_schema(tenant_id=tenant_id, schema_name=schema_name)
-    
-    # Resolve query scope
-    user_query_scope = await LLMServiceWrapper.get_query_scope_using_default_mode(
-        user_input=user_request
-    )
-    query_scope_resolver = QueryScopeResolver(
-        session_data=session,
-        settings=tenant.settings,
-        query_scope=user_query_scope,
-        tenant=tenant
-    )
-    injector_enabled = SettingUtils.get_setting_value(
-        settings=tenant.settings,
-        category_key=SQL_INJECTORS,
-        setting_key="DYNAMIC_INJECTION"
-    )
+    if stream:
+        SqlResultStreamUtils.validate_stream_format(stream_format)
 
-    try:
-        resolved_user_query_scope = query_scope_resolver.resolve_query_scope(matched_schema=schema)
-    except HTTPException as e:
-        logger.error(f"QueryScope Resolution Failed: {e.detail}")
-        logger.info(f"Original Query Scope: {user_query_scope.dict()}")
-        raise e
-    
-    # Get ruleset from Schema, Supports only single ruleset.
-    matched_ruleset: Ruleset = await RulesetManagerService.get_ruleset(tenant_id=tenant_id, ruleset_name=schema.filter_rules[0])
-    
-    access_resolver = AccessControlResolver(session_data=session, ruleset=matched_ruleset, matched_schema=schema)
-    schema_resolver = SchemaResolver(session_data=session, tenant=tenant, matched_schema=schema, query_scope=resolved_user_query_scope)
-    
-    access_resolver.has_access_to_scope(resolved_user_query_scope)
-    
-    generated_sql = await LLMServiceWrapper.generate_sql_query(
-        user_input=user_request,
-        resolved_schema=schema_resolver.resolve_schema(),
-        tenant=tenant,
-        query_scope=resolved_user_query_scope
+    # Independent stages (tenant, schema and ruleset fetches, the intent LLM call) run concurrently
+    pipeline = SqlGenerationPipelineService.build_pipeline(
+        tenant_id=tenant_id,
+        schema_name=schema_name,
+        user_request=user_request,
+        session=session,
+        run_sql=run_sql and not stream,
+        guard_sql=run_sql
     )
+    results = await pipeline.run()
 
-    # Apply injectors if enabled
-    updated_sql = generated_sql
-    injected_str = None
-    if injector_enabled:
-        injector_resolver = InjectorResolver(session_data=session, ruleset=matched_ruleset)
-        updated_sql, injected_str = injector_resolver.apply_injectors(
-            sql_query=generated_sql,
-            tenant=tenant
+    # Stream the result set incrementally instead of materializing it in the response body
+    if run_sql and stream:
+        tenant: Tenant = results["tenant"]
+        resolved_user_query_scope = results["resolved_query_scope"]
+        _, injected_str = results["injected_sql"]
+        # The cost guard may have rewritten the query with a LIMIT
+        guarded_sql = results["guarded_sql"]
+        updated_sql, query_plan = guarded_sql.sql, guarded_sql.query_plan
+        batch_size, max_rows, max_bytes = SqlResultStreamUtils.get_stream_limits(tenant)
+        batches = SqlRunnerService.stream_sql(
+            orginal_user_input=user_request.input,
+            query_scope=resolved_user_query_scope,
+            query=updated_sql,
+            tenant=tenant,
+            schema_name=schema_name,
+            batch_size=batch_size,
+            params={}
         )
-
-    # Run SQL if specified
-    run_sql_result = None
-    if run_sql:
-        try:
-            run_sql_result = SqlRunnerService.run_sql(
-                orginal_user_input=user_request.input,
-                query_scope=resolved_user_query_scope,
-                query=updated_sql, 
-                tenant=tenant, 
-                schema_name=schema_name,
-                params={}
-            )
-        except HTTPException as e:
-            logger.error(f"SQL Execution Failed: {e.detail}")
-            logger.info(f"Original Query Scope: {user_query_scope.dict()}")
-            raise e
+        if guarded_sql.queued:
+            batches = expensive_query_queue.hold_while_streaming(tenant.tenant_id, guarded_sql.queue_timeout_seconds, batches)
+        batches = await SqlResultStreamUtils.prime(batches)
+        header = {
+            "query_scope": resolved_user_query_scope.dict(),
+            "user_input": user_request.input,
+            "sql_query": updated_sql,
+            "injected_str": injected_str,
+            "stage_timings": [timing.dict() for timing in pipeline.get_timings()],
+            "query_plan": query_plan.dict() if query_plan is not None else None
+        }
+        if stream_format == NDJSON_FORMAT:
+            content = SqlResultStreamUtils.encode_ndjson(batches, header, max_rows=max_rows, max_bytes=max_bytes)
+        else:
+            content = SqlResultStreamUtils.encode_arrow(batches, header, max_rows=max_rows, max_bytes=max_bytes)
+        return StreamingResponse(content, media_type=STREAM_MEDIA_TYPES[stream_format])
 
     # Construct the response
-    sql_generation_response = SqlGenerationResponse(
-        query_scope=resolved_user_query_scope,
-        user_input=user_request.input,
-        sql_query=updated_sql,
-        sql_response=run_sql_result,
-        injected_str=injected_str
+    return SqlGenerationPipelineService.build_response(pipeline, results, user_request)
+
+@router.post("/{tenant_id}/{schema_name}/page", response_model=SqlPageResponse)
+async def get_sql_result_page(tenant_id: str, schema_name: str, page_request: SqlPageRequest,
+                              session: ExternalSessionData = Depends(authenticate_session)):
+    # Runs the SQL carried by the token for the next page, without any LLM stage
+    return await SqlPaginationService.fetch_next_page(
+        continuation_token=page_request.continuation_token,
+        tenant_id=tenant_id,
+        schema_name=schema_name,
+        session=session
     )
-    
-    return sql_generation_response
\ No newline at end of file
+
+@router.post("/{tenant_id}/{schema_name}/batch", response_model=BatchSqlGenerationResponse)
+async def generate_sql_batch(tenant_id: str, schema_name: str,
+                             batch_request: BatchUserInputRequest, run_sql: bool = True,
+                             stream: bool = False,
+                             session: ExternalSessionData = Depends(authenticate_session)):
+    # Tenant, schema and ruleset are loaded once, the questions run concurrently up to the tenant's limit
+    items = SqlGenerationBatchService.generate_batch(
+        tenant_id=tenant_id,
+        schema_name=schema_name,
+        user_requests=batch_request.inputs,
+        session=session,
+        run_sql=run_sql
+    )
+
+    # Stream the items as NDJSON as they complete, errors of the shared loading are raised before the response starts
+    if stream:
+        items = await SqlResultStreamUtils.prime(items)
+        return StreamingResponse(SqlGenerationBatchService.encode_ndjson(items), media_type=STREAM_MEDIA_TYPES[NDJSON_FORMAT])
+
+    return await SqlGenerationBatchService.collect_batch(items)
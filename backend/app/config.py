@@ -1,3 +1,4 @@
+from typing import Optional
 from pydantic import BaseSettings, Field
 from dotenv import load_dotenv
 
@@ -17,6 +18,82 @@ class Settings(BaseSettings):
     
     FRONTEND_DEVELOPMENT_CONNECTION: str
 
+    # Shared OpenAI client
+    OPENAI_BASE_URL: Optional[str] = None
+    OPENAI_HTTP2_ENABLED: bool = True
+    OPENAI_MAX_CONNECTIONS: int = 200
+    OPENAI_MAX_KEEPALIVE_CONNECTIONS: int = 50
+    OPENAI_KEEPALIVE_EXPIRY_SECONDS: float = 30.0
+    OPENAI_CONNECT_TIMEOUT_SECONDS: float = 5.0
+    OPENAI_REQUEST_TIMEOUT_SECONDS: float = 60.0
+    OPENAI_MAX_RETRIES: int = 2
+    OPENAI_MAX_CONCURRENT_REQUESTS: int = 100
+
+    # Tenant document cache. API key and admin token checks read the cached tenant, a rotated
+    # credential is still accepted by other instances until the change stream event or the TTL
+    TENANT_CACHE_MAX_SIZE: int = 1024
+    TENANT_CACHE_TTL_SECONDS: float = 60.0
+    TENANT_CACHE_CHANGE_STREAM_ENABLED: bool = True
+
+    # LLM result caches
+    QUERY_SCOPE_CACHE_MAX_SIZE: int = 2048
+    QUERY_SCOPE_CACHE_TTL_SECONDS: float = 3600.0
+    SQL_GENERATION_CACHE_MAX_SIZE: int = 2048
+    SQL_GENERATION_CACHE_TTL_SECONDS: float = 3600.0
+
+    # External session cache
+    SESSION_CACHE_MAX_SIZE: int = 10000
+    SESSION_CACHE_TTL_SECONDS: float = 30.0
+
+    # Parsed schema and ruleset cache. Without a replica set for the change stream, other instances
+    # enforce a superseded ruleset or access policy until the TTL
+    SCHEMA_RULESET_CACHE_MAX_SIZE: int = 1024
+    SCHEMA_RULESET_CACHE_TTL_SECONDS: float = 60.0
+    SCHEMA_RULESET_CACHE_CHANGE_STREAM_ENABLED: bool = True
+
+    # Per-tenant schema entity index used for schema routing
+    SCHEMA_ENTITY_INDEX_CACHE_MAX_SIZE: int = 256
+    SCHEMA_ENTITY_INDEX_CACHE_TTL_SECONDS: float = 300.0
+
+    # External system database connection pooling
+    EXTERNAL_DB_ENGINE_REGISTRY_MAX_SIZE: int = 64
+    EXTERNAL_DB_POOL_SIZE: int = 10
+    EXTERNAL_DB_MAX_OVERFLOW: int = 20
+    EXTERNAL_DB_POOL_RECYCLE_SECONDS: int = 1800
+    EXTERNAL_DB_ASYNC_DRIVERS_ENABLED: bool = True
+    EXTERNAL_DB_SYNC_EXECUTOR_MAX_WORKERS: int = 16
+
+    # Queries the cost guard queues run at most this many at a time per tenant
+    SQL_COST_GUARD_QUEUE_MAX_CONCURRENCY: int = 1
+
+    # Batch SQL generation, the tenant's BATCH_MAX_CONCURRENCY is capped at the max concurrency
+    SQL_GENERATION_BATCH_MAX_ITEMS: int = 100
+    SQL_GENERATION_BATCH_MAX_CONCURRENCY: int = 16
+
+    # Key signing the continuation tokens of paged SQL results, required when a tenant enables SQL_PAGINATION_ENABLED
+    SQL_PAGINATION_TOKEN_SECRET: Optional[str] = None
+
+    # External system API context clients
+    EXTERNAL_API_CLIENT_REGISTRY_MAX_SIZE: int = 64
+    EXTERNAL_API_CONNECTOR_LIMIT: int = 100
+    EXTERNAL_API_CONNECTOR_LIMIT_PER_HOST: int = 20
+    EXTERNAL_API_KEEPALIVE_TIMEOUT_SECONDS: float = 30.0
+    EXTERNAL_API_DNS_CACHE_TTL_SECONDS: int = 300
+    EXTERNAL_API_REQUEST_TIMEOUT_SECONDS: float = 10.0
+
+    # Prometheus metrics exposed on /metrics. The endpoint is unauthenticated and its labels name tenants,
+    # schemas and database pools, only enable it where the API port is not reachable from outside
+    METRICS_ENABLED: bool = False
+
+    # OpenTelemetry tracing, spans are exported over OTLP/HTTP or appended as JSON lines to TRACING_FILE_PATH
+    TRACING_ENABLED: bool = False
+    TRACING_EXPORTER: str = "otlp"
+    TRACING_OTLP_ENDPOINT: Optional[str] = None
+    TRACING_FILE_PATH: str = "traces.jsonl"
+    TRACING_SAMPLE_RATIO: float = 1.0
+    # Pipeline stage timings returned in the Server-Timing response header
+    SERVER_TIMING_ENABLED: bool = True
+
     @property
     def mongodb_uri(self) -> str:
         return f"mongodb+srv://{self.DEV_USERNAME}:{self.DEV_SERVICE_ACCOUNT_PASSWORD}@{self.CLUSTER_DB_URL}"
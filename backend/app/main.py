@@ -3,8 +3,18 @@ from fastapi.exceptions import RequestValidationError
 from pydantic import ValidationError  
 from pymongo.errors import PyMongoError 
 from utils.database import mongodb
+from utils.llm_wrapper.openai_client import openai_client
+from utils.cache.sql_generation_cache import sql_generation_cache
+from utils.cache.tenant_cache import tenant_cache
+from utils.cache.schema_ruleset_cache import schema_ruleset_cache
+from utils.external_system_utils.external_system_engine_registry import engine_registry
+from utils.external_system_utils.external_api_client_registry import external_api_client_registry
 from config import settings 
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response
+from utils.metrics.prometheus_metrics import render_metrics
+from utils.tracing.otel_tracing import configure_tracing, shutdown_tracing
+from utils.tracing.server_timing import trace_request
 
 from api.routers.tenant_manager import router as tenant_manager_router
 from api.routers.schema_manager import router as schema_manager_router
@@ -23,6 +33,7 @@ from api.core.services.tenant_manager.admin_user_manager_service import AdminUse
 from api.core.services.external_system.external_session_manager_service import SessionManagerService
 from api.core.services.authentication.admin_authentication_service import AdminAuthenticationService
 from api.core.services.authentication.admin_session_manager_service import AdminSessionManagerService
+from api.core.services.sql_runner.sql_pagination_service import SqlPaginationService
 
 from utils.auth_utils import authenticate_session, validate_api_key, authenticate_admin_session
 
@@ -33,6 +44,8 @@ app = FastAPI(
 
 @app.on_event("startup")
 async def startup_db_client():
+    # Tracing instruments the MongoDB client, so it is configured before connecting
+    configure_tracing()
     # Establish MongoDB connection first
     await mongodb.connect()  
     # Initialize indexes
@@ -41,10 +54,21 @@ async def startup_db_client():
     # await TenantSettingsService.create_indexes()
     await SessionManagerService.initialize_ttl_index()
     await AdminSessionManagerService.initialize_ttl_index()
+    await sql_generation_cache.create_indexes()
+    await tenant_cache.start_change_stream()
+    await schema_ruleset_cache.start_change_stream()
+    await openai_client.connect()
+    SqlPaginationService.check_token_secret()
 
 @app.on_event("shutdown")
 async def shutdown_db_client():
+    await tenant_cache.stop_change_stream()
+    await schema_ruleset_cache.stop_change_stream()
     await mongodb.disconnect()  
+    await openai_client.disconnect()
+    await engine_registry.dispose_all_async()
+    await external_api_client_registry.close_all()
+    shutdown_tracing()
 
 @app.get("/")
 async def health_check():
@@ -52,15 +76,25 @@ async def health_check():
         await mongodb.client.admin.command('ping')
         return {
             "backend_status": f"{settings.APP_NAME} is running in {settings.APP_ENV} mode",
-            "mongodb_status": "SQLExecutor is connected to MongoDB"
+            "mongodb_status": "SQLExecutor is connected to MongoDB",
+            "external_db_pool_status": engine_registry.get_summary(),
+            "external_api_client_status": external_api_client_registry.get_summary()
         }
     except Exception as e:
         print(f"Healthcheck failed: {e}")
         return {
             "backend_status": f"{settings.APP_NAME} is running in {settings.APP_ENV} mode",
-            "mongodb_status": "Failed to connect to MongoDB"
+            "mongodb_status": "Failed to connect to MongoDB",
+            "external_db_pool_status": engine_registry.get_summary(),
+            "external_api_client_status": external_api_client_registry.get_summary()
         }
 
+if settings.METRICS_ENABLED:
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        content, content_type = render_metrics()
+        return Response(content=content, media_type=content_type)
+
 # Register Exceptions here
 app.add_exception_handler(PyMongoError, database_exception_handler)
 app.add_exception_handler(HTTPException, http_exception_handler)
@@ -99,6 +133,9 @@ app.include_router(
     dependencies=[Depends(validate_api_key)]
 )
 
+# Request spans and the Server-Timing header of the pipeline stages
+app.middleware("http")(trace_request)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],  # Use ["http://localhost:3000"] in production for security
@@ -1,5 +1,6 @@
 from typing import Optional, Dict, List
 from pydantic import BaseModel, Field, root_validator
+import ast
 import re
 
 from model.ruleset.group_access_policy import GroupAccessPolicy
@@ -124,10 +125,10 @@ class AddRulesetRequest(BaseModel):
 
         # Support arrays (e.g., "[1, 2, 3]" or "['admin', 'user']")
         try:
-            eval_value = eval(value)
+            eval_value = ast.literal_eval(value)
             if isinstance(eval_value, (list, int, float, bool)):
                 return True
-        except (SyntaxError, NameError):
+        except (SyntaxError, ValueError):
             pass
 
         return False
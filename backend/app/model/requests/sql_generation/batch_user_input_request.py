@@ -0,0 +1,7 @@
+from pydantic import BaseModel, Field
+from typing import List
+
+from model.requests.sql_generation.user_input_request import UserInputRequest
+
+class BatchUserInputRequest(BaseModel):
+    inputs: List[UserInputRequest] = Field(..., min_items=1, description="Questions to generate SQL for, answered independently.")
@@ -0,0 +1,4 @@
+from pydantic import BaseModel, Field
+
+class SqlPageRequest(BaseModel):
+    continuation_token: str = Field(..., description="Token returned with the previous page of the query.")
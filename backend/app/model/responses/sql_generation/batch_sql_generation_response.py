@@ -0,0 +1,19 @@
+from pydantic import BaseModel, Field
+from typing import Any, List, Optional
+
+from model.responses.sql_generation.sql_generation_response import SqlGenerationResponse
+
+class BatchItemError(BaseModel):
+    status_code: int = Field(..., description="HTTP status the item would have failed with as a single request.")
+    detail: Any = Field(..., description="Error detail, in the format of the single request error.")
+
+class BatchSqlGenerationItem(BaseModel):
+    index: int = Field(..., description="Position of the item in the request inputs.")
+    user_input: str
+    result: Optional[SqlGenerationResponse] = None
+    error: Optional[BatchItemError] = None
+
+class BatchSqlGenerationResponse(BaseModel):
+    items: List[BatchSqlGenerationItem] = Field(..., description="One entry per input, in request order.")
+    succeeded: int
+    failed: int
@@ -0,0 +1,10 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+
+class QueryPlanSummary(BaseModel):
+    dialect: str = Field(..., description="SQL dialect of the tenant database the plan was read from.")
+    estimated_rows: Optional[float] = Field(None, description="Rows the planner expects the query to produce, if it reports them.")
+    estimated_cost: Optional[float] = Field(None, description="Total planner cost of the query, in the planner's own units, if it reports one.")
+    plan: List[str] = Field(default_factory=list, description="One line per plan node, indented by depth.")
+    exceeded_thresholds: List[str] = Field(default_factory=list, description="Tenant thresholds the estimates exceed.")
+    action: str = Field(..., description="What the cost guard did with the query: allow, reject, limit or queue.")
@@ -0,0 +1,10 @@
+from pydantic import BaseModel, Field
+from typing import List
+
+class SchemaRetrievalReport(BaseModel):
+    embedder: str = Field(..., description="Embedder the tables were ranked with.")
+    total_tables: int = Field(..., description="Tables of the schema.")
+    candidate_tables: int = Field(..., description="Tables the retrieval chose from, the QueryScope's tables when it lists any.")
+    retrieved_tables: List[str] = Field(default_factory=list, description="Tables most similar to the question, best first.")
+    neighbour_tables: List[str] = Field(default_factory=list, description="Tables joined to the retrieved tables.")
+    prompt_tokens_saved: int = Field(..., description="Estimated schema prompt tokens of the tables left out.")
@@ -3,6 +3,7 @@ from pydantic import BaseModel
 from typing import Any, List, Optional, Dict
 
 from model.query_scope.query_scope import QueryScope
+from model.responses.sql_generation.query_plan_summary import QueryPlanSummary
 
 class ErrorType(str, Enum):
     """
@@ -13,6 +14,7 @@ class ErrorType(str, Enum):
     SCHEMA_DISCOVERY_ERROR = "schema_discovery_error"
     VALIDATION_ERROR = "validation_error"
     RUNTIME_ERROR = "runtime_error"
+    COST_LIMIT_EXCEEDED = "cost_limit_exceeded"
 
 class AccessViolationType(str, Enum):
     """
@@ -139,4 +141,24 @@ class SqlRunErrorResponse(BaseModel):
     user_query_scope: Optional[QueryScope] = None
     user_input: Optional[str] = None
     sql_query: Optional[str] = None
-    error_message: Optional[str] = None
\ No newline at end of file
+    error_message: Optional[str] = None
+
+class QueryCostErrorResponse(BaseModel):
+    """
+    QueryCostErrorResponse represents the response model for queries rejected by the cost guard
+    before reaching the tenant database.
+
+    Attributes:
+        error_type (ErrorType): The type of error that occurred.
+        message (str): A high-level summary of the error.
+        user_query_scope (Optional[QueryScope]): The scope of the user's query.
+        user_input (Optional[str]): The original user input of the query.
+        sql_query (str): The SQL query that was rejected.
+        query_plan (QueryPlanSummary): The planner estimates and the thresholds they exceed.
+    """
+    error_type: ErrorType = ErrorType.COST_LIMIT_EXCEEDED
+    message: str
+    user_query_scope: Optional[QueryScope] = None
+    user_input: Optional[str] = None
+    sql_query: str
+    query_plan: QueryPlanSummary
@@ -1,11 +1,19 @@
 from pydantic import BaseModel
-from typing import Any
+from typing import Any, List, Optional
 
 from model.query_scope.query_scope import QueryScope
+from model.responses.sql_generation.stage_timing import StageTiming
+from model.responses.sql_generation.query_plan_summary import QueryPlanSummary
+from model.responses.sql_generation.sql_page import SqlPageInfo
+from model.responses.sql_generation.schema_retrieval_report import SchemaRetrievalReport
 
 class SqlGenerationResponse(BaseModel):
     query_scope: QueryScope
     user_input: str
     sql_query: str
     sql_response: Any
-    injected_str: str = None
\ No newline at end of file
+    injected_str: str = None
+    stage_timings: Optional[List[StageTiming]] = None
+    query_plan: Optional[QueryPlanSummary] = None
+    page: Optional[SqlPageInfo] = None
+    schema_retrieval: Optional[SchemaRetrievalReport] = None
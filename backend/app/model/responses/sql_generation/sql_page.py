@@ -0,0 +1,14 @@
+from pydantic import BaseModel, Field
+from typing import Any, Dict, List, Optional
+
+class SqlPageInfo(BaseModel):
+    page_size: int = Field(..., description="Maximum number of rows per page.")
+    row_count: int = Field(..., description="Number of rows of this page.")
+    has_more: bool = Field(..., description="Whether the query has rows after this page.")
+    continuation_token: Optional[str] = Field(None, description="Token to fetch the next page, absent on the last page.")
+    key_columns: List[str] = Field(default_factory=list, description="Result columns the pages are ordered and split by.")
+    sql_hash: str = Field(..., description="SHA-256 of the paged SQL query, the same for every page of the query.")
+
+class SqlPageResponse(BaseModel):
+    rows: List[Dict[str, Any]]
+    page: SqlPageInfo
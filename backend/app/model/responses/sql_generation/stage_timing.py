@@ -0,0 +1,6 @@
+from pydantic import BaseModel, Field
+
+class StageTiming(BaseModel):
+    stage: str = Field(..., description="Name of the pipeline stage.")
+    started_at_ms: float = Field(..., description="Start offset from the beginning of the pipeline, in milliseconds.")
+    duration_ms: float = Field(..., description="Time spent in the stage, in milliseconds.")
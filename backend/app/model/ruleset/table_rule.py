@@ -1,5 +1,6 @@
 from pydantic import BaseModel, Field, root_validator
 from typing import Dict, List, Union
+import ast
 import re
 
 from model.ruleset.column_rule import ColumnRule
@@ -45,10 +46,10 @@ class TableRule(BaseModel):
 
         # Support arrays (e.g., "[1, 2, 3]" or "['admin', 'user']")
         try:
-            eval_value = eval(value)
+            eval_value = ast.literal_eval(value)
             if isinstance(eval_value, (list, int, float, bool)):
                 return True
-        except (SyntaxError, NameError):
+        except (SyntaxError, ValueError):
             pass
 
         return False
\ No newline at end of file
@@ -1,5 +1,5 @@
-from pydantic import BaseModel, Field, root_validator
-from typing import Optional, Dict, List
+from pydantic import BaseModel, Field, PrivateAttr, root_validator
+from typing import Any, Optional, Dict, List
 from bson import ObjectId
 from model.schema.context import ContextSetting
 from model.schema.schema_chat_interface_integration_setting import SchemaChatInterfaceIntegrationSetting
@@ -17,6 +17,10 @@ class Schema(BaseModel):
     context_type: str
     context_setting: ContextSetting
     schema_chat_interface_integration: Optional[SchemaChatInterfaceIntegrationSetting] = None
+    # SchemaLookupIndex of the tables and columns, see utils/schema/schema_lookup_index.py
+    _lookup_index: Any = PrivateAttr(default=None)
+    # SchemaTableIndex of each embedder, see utils/schema/schema_table_index.py
+    _table_indexes: Any = PrivateAttr(default=None)
 
 
     class Config:
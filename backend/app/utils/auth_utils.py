@@ -13,6 +13,8 @@ from model.tenant.tenant import Tenant
 from model.authentication.admin_session_data import AdminSessionData
 from model.external_system_integration.external_user_session_data import ExternalSessionData
 from utils.tenant_manager.setting_utils import SettingUtils
+from utils.cache.session_cache import session_cache
+from api.core.services.tenant_manager.tenant_manager_service import TenantManagerService
 from api.core.constants.tenant.settings_categories import API_KEYS, ADMIN_AUTH
 
 logger = logging.getLogger(__name__)
@@ -34,6 +36,11 @@ async def authenticate_session(x_session_id: str = Header(...)) -> ExternalSessi
         logger.warning("Invalid session ID format: %s", x_session_id)
         raise HTTPException(status_code=400, detail="Invalid session ID format")
 
+    # Cached sessions are evicted at expires_at, a hit is always a valid session
+    cached_session = session_cache.get(session_uuid)
+    if cached_session is not None:
+        return cached_session
+
     # Retrieve session from MongoDB
     session = await mongodb.db["sessions"].find_one({"session_id": session_uuid})
     if not session:
@@ -46,11 +53,14 @@ async def authenticate_session(x_session_id: str = Header(...)) -> ExternalSessi
         raise HTTPException(status_code=401, detail="Session has expired")
 
     try:
-        return ExternalSessionData(**session)
+        session_data = ExternalSessionData(**session)
     except ValidationError as e:
         logger.error("Invalid session data: %s", e)
         raise HTTPException(status_code=500, detail="Invalid session data format")
 
+    session_cache.set(session_data)
+    return session_data
+
 async def authenticate_admin_session(authorization: str = Header(...)) -> AdminSessionData:
     if not authorization.startswith("Bearer "):
         raise HTTPException(status_code=401, detail="Invalid authorization header")
@@ -60,11 +70,7 @@ async def authenticate_admin_session(authorization: str = Header(...)) -> AdminS
         unverified_payload = jwt.decode(token, options={"verify_signature": False})
         tenant_id = unverified_payload.get("tenant_id")
 
-        tenant_data = await mongodb.db["tenants"].find_one({"tenant_id": tenant_id})
-        if not tenant_data:
-            raise HTTPException(status_code=404, detail="Tenant not found")
-
-        tenant = Tenant(**tenant_data)
+        tenant: Tenant = await TenantManagerService.get_tenant(tenant_id=tenant_id)
         ADMIN_AUTH_KEY = SettingUtils.get_setting_value(
             settings=tenant.settings,
             category_key=ADMIN_AUTH,
@@ -97,12 +103,7 @@ async def validate_api_key(x_api_key: str = Header(...), tenant_id: str | None =
             raise HTTPException(status_code=403, detail="Invalid API Key")
         return
         
-    tenant_data = await mongodb.db["tenants"].find_one({"tenant_id": tenant_id})
-    if not tenant_data:
-        logger.warning("Tenant not found: %s", tenant_id)
-        raise HTTPException(status_code=404, detail="Tenant not found")
-
-    tenant = Tenant(**tenant_data)
+    tenant: Tenant = await TenantManagerService.get_tenant(tenant_id=tenant_id)
     api_key_setting = SettingUtils.get_setting_value(
         settings=tenant.settings,
         category_key=API_KEYS,
@@ -115,14 +116,7 @@ async def validate_api_key(x_api_key: str = Header(...), tenant_id: str | None =
 
 async def validate_client_request(x_api_key: str = Header(...), tenant_id: str = None):
     """Validate client request using HMAC and tenant settings."""
-    tenant_data = await mongodb.db["tenants"].find_one({"tenant_id": tenant_id})
-    
-    
-    if not tenant_data:
-        logger.warning("Tenant not found: %s", tenant_id)
-        raise HTTPException(status_code=404, detail="Tenant not found")
-
-    tenant = Tenant(**tenant_data)
+    tenant: Tenant = await TenantManagerService.get_tenant(tenant_id=tenant_id)
     encryption_key = SettingUtils.get_setting_value(
         settings=tenant.settings,
         category_key="DEV_SQL_CONTEXT",
@@ -0,0 +1,106 @@
+import hashlib
+import math
+import re
+from typing import Dict, Optional
+
+from config import settings
+from model.query_scope.query_scope import QueryScope
+from utils.cache.ttl_lru_cache import TTLLRUCache
+from utils.metrics.prometheus_metrics import record_cache_lookup
+
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+_TRAILING_PUNCTUATION_PATTERN = re.compile(r"[\s?.!;]+$")
+_EMBEDDING_DIMENSIONS = 512
+
+class QueryScopeCache:
+    """
+    Cache of the QueryScope extracted by the intent LLM call, keyed by tenant, schema and
+    normalized user input. An optional similarity tier matches near-duplicate questions
+    of the same tenant and schema using hashed character trigram vectors.
+
+    Cached scopes are copied on the way in and out, since QueryScopeResolver mutates them.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self._cache = TTLLRUCache(max_size=max_size, ttl_seconds=ttl_seconds)
+        self.similarity_hits = 0
+
+    @staticmethod
+    def normalize_input(user_input: str) -> str:
+        normalized = _WHITESPACE_PATTERN.sub(" ", user_input.strip().lower())
+        return _TRAILING_PUNCTUATION_PATTERN.sub("", normalized)
+
+    def get(self, tenant_id: str, schema_name: str, user_input: str,
+            similarity_threshold: Optional[float] = None) -> Optional[QueryScope]:
+        """
+        Return a copy of the cached QueryScope, or None on a miss. When similarity_threshold
+        is given, fall back to the most similar cached input above the threshold.
+        """
+        normalized_input = self.normalize_input(user_input)
+        entry = self._cache.get((tenant_id, schema_name, normalized_input))
+        if entry is not None:
+            record_cache_lookup(tenant_id, "query_scope", hit=True)
+            return entry[0].copy(deep=True)
+
+        if similarity_threshold is None:
+            record_cache_lookup(tenant_id, "query_scope", hit=False)
+            return None
+
+        query_vector = self._embed(normalized_input)
+        best_score, best_scope = 0.0, None
+        for (entry_tenant_id, entry_schema_name, _), (query_scope, vector) in self._cache.items():
+            if entry_tenant_id != tenant_id or entry_schema_name != schema_name:
+                continue
+            score = self._cosine_similarity(query_vector, vector)
+            if score > best_score:
+                best_score, best_scope = score, query_scope
+
+        if best_scope is not None and best_score >= similarity_threshold:
+            self.similarity_hits += 1
+            record_cache_lookup(tenant_id, "query_scope_similarity", hit=True)
+            return best_scope.copy(deep=True)
+
+        record_cache_lookup(tenant_id, "query_scope", hit=False)
+        return None
+
+    def set(self, tenant_id: str, schema_name: str, user_input: str, query_scope: QueryScope):
+        normalized_input = self.normalize_input(user_input)
+        self._cache.set(
+            (tenant_id, schema_name, normalized_input),
+            (query_scope.copy(deep=True), self._embed(normalized_input))
+        )
+
+    def invalidate_schema(self, tenant_id: str, schema_name: str) -> int:
+        return self._cache.delete_where(lambda key: key[0] == tenant_id and key[1] == schema_name)
+
+    def invalidate_tenant(self, tenant_id: str) -> int:
+        return self._cache.delete_where(lambda key: key[0] == tenant_id)
+
+    def clear(self):
+        self._cache.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {**self._cache.stats(), "similarity_hits": self.similarity_hits}
+
+    @staticmethod
+    def _embed(normalized_input: str) -> Dict[int, float]:
+        padded = f"  {normalized_input} "
+        counts: Dict[int, float] = {}
+        for i in range(len(padded) - 2):
+            digest = hashlib.md5(padded[i:i + 3].encode("utf-8")).digest()
+            bucket = int.from_bytes(digest[:4], "little") % _EMBEDDING_DIMENSIONS
+            counts[bucket] = counts.get(bucket, 0.0) + 1.0
+
+        norm = math.sqrt(sum(value * value for value in counts.values())) or 1.0
+        return {bucket: value / norm for bucket, value in counts.items()}
+
+    @staticmethod
+    def _cosine_similarity(left: Dict[int, float], right: Dict[int, float]) -> float:
+        if len(left) > len(right):
+            left, right = right, left
+        return sum(value * right.get(bucket, 0.0) for bucket, value in left.items())
+
+query_scope_cache = QueryScopeCache(
+    max_size=settings.QUERY_SCOPE_CACHE_MAX_SIZE,
+    ttl_seconds=settings.QUERY_SCOPE_CACHE_TTL_SECONDS
+)
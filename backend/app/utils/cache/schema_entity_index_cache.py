@@ -0,0 +1,79 @@
+import threading
+from typing import Dict, Optional
+
+from config import settings
+from model.responses.schema.schema_tables_response import SchemaTablesResponse
+from utils.cache.ttl_lru_cache import TTLLRUCache
+from utils.schema.schema_entity_index import SchemaEntityIndex
+
+class SchemaEntityIndexCache:
+    """
+    In-process cache of each tenant's SchemaEntityIndex, built once from all the tenant's schemas
+    and then kept current by applying every schema save and delete of this instance to it.
+
+    As in SchemaRulesetCache, a per-tenant version counter bumped by every change stops an index
+    built from a read that raced with a change from being cached. Changes made by other instances
+    are bounded by the TTL.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self._cache = TTLLRUCache(max_size=max_size, ttl_seconds=ttl_seconds)
+        self._versions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get_version(self, tenant_id: str) -> int:
+        with self._lock:
+            return self._versions.get(tenant_id, 0)
+
+    def get(self, tenant_id: str) -> Optional[SchemaEntityIndex]:
+        return self._cache.get(tenant_id)
+
+    def set(self, tenant_id: str, schema_index: SchemaEntityIndex, version: int) -> bool:
+        """
+        Cache the index if no schema of the tenant changed since version was read.
+        """
+        with self._lock:
+            if self._versions.get(tenant_id, 0) != version:
+                return False
+            self._cache.set(tenant_id, schema_index)
+        return True
+
+    def upsert_schema(self, tenant_id: str, schema: SchemaTablesResponse, previous_schema_name: Optional[str] = None):
+        """
+        Apply a saved schema to the tenant's index, if it is loaded. previous_schema_name is the
+        name the schema had before a rename.
+        """
+        self._bump_version(tenant_id)
+        schema_index = self._cache.get(tenant_id)
+        if schema_index is None:
+            return
+        if previous_schema_name and previous_schema_name != schema.schema_name:
+            schema_index.remove_schema(previous_schema_name)
+        schema_index.add_schema(schema)
+
+    def remove_schema(self, tenant_id: str, schema_name: str):
+        self._bump_version(tenant_id)
+        schema_index = self._cache.get(tenant_id)
+        if schema_index is not None:
+            schema_index.remove_schema(schema_name)
+
+    def invalidate_tenant(self, tenant_id: str):
+        self._bump_version(tenant_id)
+        self._cache.delete(tenant_id)
+
+    def clear(self):
+        self._cache.clear()
+        with self._lock:
+            self._versions.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return self._cache.stats()
+
+    def _bump_version(self, tenant_id: str):
+        with self._lock:
+            self._versions[tenant_id] = self._versions.get(tenant_id, 0) + 1
+
+schema_entity_index_cache = SchemaEntityIndexCache(
+    max_size=settings.SCHEMA_ENTITY_INDEX_CACHE_MAX_SIZE,
+    ttl_seconds=settings.SCHEMA_ENTITY_INDEX_CACHE_TTL_SECONDS
+)
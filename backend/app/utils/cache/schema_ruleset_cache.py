@@ -0,0 +1,142 @@
+import asyncio
+import logging
+import threading
+from typing import Dict, List, Optional, Tuple, Union
+
+from pymongo.errors import PyMongoError
+
+from config import settings
+from model.schema.schema import Schema
+from model.responses.ruleset_manager.ruleset_response import RulesetResponse
+from utils.database import mongodb
+from utils.cache.ttl_lru_cache import TTLLRUCache
+from utils.metrics.prometheus_metrics import record_cache_lookup
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_KIND = "schema"
+RULESET_KIND = "ruleset"
+
+# Collection and name field of the documents of each kind
+_KIND_COLLECTIONS = {SCHEMA_KIND: ("schemas", "schema_name"), RULESET_KIND: ("rulesets", "ruleset_name")}
+
+CachedModel = Union[Schema, RulesetResponse]
+
+class SchemaRulesetCache:
+    """
+    In-process cache of parsed Schema and Ruleset models keyed by tenant, kind and name, so the
+    generation hot path skips re-validating the nested pydantic models on every request.
+
+    Each tenant has a version counter bumped by every invalidation. Readers capture the version
+    before loading from MongoDB and set only stores the result while that version is current,
+    so a read racing with an update never caches the superseded document.
+    Updates also bump the document's version field, other application instances pick them up
+    through a change stream when MongoDB runs as a replica set, otherwise the entry TTL bounds
+    how long they enforce a superseded ruleset.
+    Cached models are shared between requests and must be treated as read-only.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self._cache = TTLLRUCache(max_size=max_size, ttl_seconds=ttl_seconds)
+        self._versions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._keys_by_object_id: Dict[str, Tuple[str, str, str]] = {}
+        self._watch_tasks: List[asyncio.Task] = []
+
+    def get_version(self, tenant_id: str) -> int:
+        with self._lock:
+            return self._versions.get(tenant_id, 0)
+
+    def get(self, kind: str, tenant_id: str, name: str) -> Optional[CachedModel]:
+        entry = self._cache.get((kind, tenant_id, name))
+        if entry is None:
+            record_cache_lookup(tenant_id, kind, hit=False)
+            return None
+
+        version, model = entry
+        if version != self.get_version(tenant_id):
+            self._cache.delete((kind, tenant_id, name))
+            record_cache_lookup(tenant_id, kind, hit=False)
+            return None
+        record_cache_lookup(tenant_id, kind, hit=True)
+        return model
+
+    def set(self, kind: str, tenant_id: str, name: str, model: CachedModel, version: int,
+            object_id: Optional[str] = None) -> bool:
+        """
+        Cache the model if no invalidation happened for the tenant since version was read.
+        object_id is the document's _id, used to resolve change stream delete events.
+        """
+        with self._lock:
+            if self._versions.get(tenant_id, 0) != version:
+                return False
+            self._cache.set((kind, tenant_id, name), (version, model))
+            if object_id is not None:
+                self._keys_by_object_id[str(object_id)] = (kind, tenant_id, name)
+        return True
+
+    def invalidate(self, kind: str, tenant_id: str, *names: str):
+        self._bump_version(tenant_id)
+        for name in names:
+            if name:
+                self._cache.delete((kind, tenant_id, name))
+
+    def invalidate_tenant(self, tenant_id: str) -> int:
+        self._bump_version(tenant_id)
+        return self._cache.delete_where(lambda key: key[1] == tenant_id)
+
+    def clear(self):
+        self._cache.clear()
+        with self._lock:
+            self._versions.clear()
+            self._keys_by_object_id.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return self._cache.stats()
+
+    async def start_change_stream(self):
+        if settings.SCHEMA_RULESET_CACHE_CHANGE_STREAM_ENABLED and not self._watch_tasks:
+            self._watch_tasks = [asyncio.create_task(self._watch(kind)) for kind in _KIND_COLLECTIONS]
+
+    async def stop_change_stream(self):
+        for task in self._watch_tasks:
+            task.cancel()
+        await asyncio.gather(*self._watch_tasks, return_exceptions=True)
+        self._watch_tasks = []
+
+    async def _watch(self, kind: str):
+        collection_name, _ = _KIND_COLLECTIONS[kind]
+        try:
+            pipeline = [{"$match": {"$or": [
+                {"operationType": {"$in": ["delete", "replace"]}},
+                {"updateDescription.updatedFields.version": {"$exists": True}}
+            ]}}]
+            async with mongodb.db[collection_name].watch(pipeline, full_document="updateLookup") as stream:
+                logger.info(f"{kind.capitalize()} cache change stream started")
+                async for change in stream:
+                    self._handle_change(kind, change)
+        except PyMongoError as e:
+            # Change streams require a replica set, fall back to TTL based expiry
+            logger.info(f"{kind.capitalize()} cache change stream unavailable, relying on TTL expiry: {e}")
+
+    def _handle_change(self, kind: str, change: Dict):
+        _, name_field = _KIND_COLLECTIONS[kind]
+        full_document = change.get("fullDocument") or {}
+        object_id = str(change.get("documentKey", {}).get("_id"))
+
+        with self._lock:
+            # The cached key holds the name before a rename, the full document the one after it
+            keys = {self._keys_by_object_id.pop(object_id, None)}
+        if full_document.get("tenant_id"):
+            keys.add((kind, full_document["tenant_id"], full_document.get(name_field)))
+        for key in keys - {None}:
+            self.invalidate(*key)
+
+    def _bump_version(self, tenant_id: str):
+        with self._lock:
+            self._versions[tenant_id] = self._versions.get(tenant_id, 0) + 1
+
+schema_ruleset_cache = SchemaRulesetCache(
+    max_size=settings.SCHEMA_RULESET_CACHE_MAX_SIZE,
+    ttl_seconds=settings.SCHEMA_RULESET_CACHE_TTL_SECONDS
+)
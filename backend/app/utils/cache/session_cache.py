@@ -0,0 +1,48 @@
+from datetime import datetime, timezone
+from typing import Dict, Optional
+from uuid import UUID
+
+from config import settings
+from model.external_system_integration.external_user_session_data import ExternalSessionData
+from utils.cache.ttl_lru_cache import TTLLRUCache
+
+class SessionCache:
+    """
+    In-process cache of external sessions keyed by session UUID, used by authenticate_session.
+
+    An entry never outlives its session's expires_at. Within this instance the session mutation
+    paths invalidate entries explicitly, changes made by other instances are bounded by the TTL.
+    Callers receive deep copies so request handlers cannot alter the cached session.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self._cache = TTLLRUCache(max_size=max_size, ttl_seconds=ttl_seconds)
+
+    def get(self, session_id: UUID) -> Optional[ExternalSessionData]:
+        session_data = self._cache.get(session_id)
+        if session_data is None:
+            return None
+        return session_data.copy(deep=True)
+
+    def set(self, session_data: ExternalSessionData):
+        seconds_to_expiry = (self._to_utc(session_data.expires_at) - datetime.now(timezone.utc)).total_seconds()
+        ttl_seconds = min(self._cache.ttl_seconds, seconds_to_expiry) if self._cache.ttl_seconds else seconds_to_expiry
+        self._cache.set(session_data.session_id, session_data.copy(deep=True), ttl_seconds=ttl_seconds)
+
+    def invalidate(self, session_id: UUID):
+        self._cache.delete(session_id)
+
+    def clear(self):
+        self._cache.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return self._cache.stats()
+
+    @staticmethod
+    def _to_utc(value: datetime) -> datetime:
+        return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+session_cache = SessionCache(
+    max_size=settings.SESSION_CACHE_MAX_SIZE,
+    ttl_seconds=settings.SESSION_CACHE_TTL_SECONDS
+)
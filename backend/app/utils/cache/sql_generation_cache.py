@@ -0,0 +1,110 @@
+import hashlib
+import json
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from pymongo import ASCENDING
+from pymongo.errors import PyMongoError
+
+from config import settings
+from utils.database import mongodb
+from utils.cache.ttl_lru_cache import TTLLRUCache
+from utils.metrics.prometheus_metrics import record_cache_lookup
+
+logger = logging.getLogger(__name__)
+
+_COLLECTION_NAME = "sql_generation_cache"
+
+class SqlGenerationCache:
+    """
+    Cache of LLM generated SQL keyed by a hash of the full generation prompt: the prompt
+    instruction, the resolved schema JSON, the QueryScope entities and the user input.
+
+    The in-memory tier is per process, the optional MongoDB tier is shared between workers
+    and expires entries through a TTL index. Only the raw generated SQL is cached, injectors
+    are applied by the caller on every request since they depend on the session.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._cache = TTLLRUCache(max_size=max_size, ttl_seconds=ttl_seconds)
+        self.persistent_hits = 0
+        self.persistent_misses = 0
+
+    @staticmethod
+    def build_key(model: str, messages: List[Dict[str, Any]]) -> str:
+        payload = json.dumps({"model": model, "messages": messages}, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    async def create_indexes(self):
+        collection = mongodb.db[_COLLECTION_NAME]
+        await collection.create_index([("tenant_id", ASCENDING), ("cache_key", ASCENDING)], unique=True)
+        await collection.create_index("expires_at", expireAfterSeconds=0)
+
+    async def get(self, tenant_id: str, cache_key: str, use_persistent: bool = False) -> Optional[str]:
+        generated_sql = self._cache.get((tenant_id, cache_key))
+        record_cache_lookup(tenant_id, "sql_generation", hit=generated_sql is not None)
+        if generated_sql is not None or not use_persistent:
+            return generated_sql
+
+        try:
+            document = await mongodb.db[_COLLECTION_NAME].find_one(
+                {
+                    "tenant_id": tenant_id,
+                    "cache_key": cache_key,
+                    "expires_at": {"$gt": datetime.now(timezone.utc)}
+                },
+                {"_id": 0, "sql_query": 1}
+            )
+        except PyMongoError as e:
+            logger.warning(f"SQL generation cache lookup failed: {e}")
+            return None
+
+        record_cache_lookup(tenant_id, "sql_generation_persistent", hit=document is not None)
+        if document is None:
+            self.persistent_misses += 1
+            return None
+
+        self.persistent_hits += 1
+        self._cache.set((tenant_id, cache_key), document["sql_query"])
+        return document["sql_query"]
+
+    async def set(self, tenant_id: str, cache_key: str, generated_sql: str, use_persistent: bool = False):
+        self._cache.set((tenant_id, cache_key), generated_sql)
+        if not use_persistent:
+            return
+
+        now = datetime.now(timezone.utc)
+        try:
+            await mongodb.db[_COLLECTION_NAME].update_one(
+                {"tenant_id": tenant_id, "cache_key": cache_key},
+                {"$set": {
+                    "sql_query": generated_sql,
+                    "created_at": now,
+                    "expires_at": now + timedelta(seconds=self.ttl_seconds)
+                }},
+                upsert=True
+            )
+        except PyMongoError as e:
+            logger.warning(f"SQL generation cache write failed: {e}")
+
+    async def invalidate_tenant(self, tenant_id: str) -> int:
+        removed = self._cache.delete_where(lambda key: key[0] == tenant_id)
+        try:
+            await mongodb.db[_COLLECTION_NAME].delete_many({"tenant_id": tenant_id})
+        except PyMongoError as e:
+            logger.warning(f"SQL generation cache invalidation failed: {e}")
+        return removed
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            **self._cache.stats(),
+            "persistent_hits": self.persistent_hits,
+            "persistent_misses": self.persistent_misses
+        }
+
+sql_generation_cache = SqlGenerationCache(
+    max_size=settings.SQL_GENERATION_CACHE_MAX_SIZE,
+    ttl_seconds=settings.SQL_GENERATION_CACHE_TTL_SECONDS
+)
@@ -0,0 +1,130 @@
+import asyncio
+import logging
+import threading
+from typing import Dict, Optional
+
+from pymongo.errors import PyMongoError
+
+from config import settings
+from model.tenant.tenant import Tenant
+from utils.database import mongodb
+from utils.cache.ttl_lru_cache import TTLLRUCache
+from utils.metrics.prometheus_metrics import record_cache_lookup
+
+logger = logging.getLogger(__name__)
+
+class TenantCache:
+    """
+    In-process cache of parsed Tenant models keyed by tenant_id.
+
+    Services writing to the tenants collection call mark_modified, which drops the local entry and
+    bumps the document's version field. Other application instances pick up version bumps through
+    a change stream when MongoDB runs as a replica set, otherwise the entry TTL bounds how stale
+    a cached tenant can get.
+    Locally, every invalidation bumps a per-tenant counter. Readers capture it with get_version before
+    loading from MongoDB and set only caches the document while it is unchanged, so a read racing
+    with an update never caches the superseded tenant.
+    Callers receive deep copies since several services mutate the returned Tenant.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self._cache = TTLLRUCache(max_size=max_size, ttl_seconds=ttl_seconds)
+        self._versions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._tenant_ids_by_object_id: Dict[str, str] = {}
+        self._watch_task: Optional[asyncio.Task] = None
+
+    def get(self, tenant_id: str) -> Optional[Tenant]:
+        entry = self._cache.get(tenant_id)
+        # A miss may be for a tenant_id that does not exist, it is not used as a metric label
+        record_cache_lookup(tenant_id if entry is not None else None, "tenant", hit=entry is not None)
+        if entry is None:
+            return None
+        return entry.copy(deep=True)
+
+    def is_loaded(self, tenant_id: str) -> bool:
+        """
+        Whether the tenant was loaded from MongoDB and is cached, without counting a lookup.
+        """
+        return tenant_id in self._cache
+
+    def get_version(self, tenant_id: str) -> int:
+        with self._lock:
+            return self._versions.get(tenant_id, 0)
+
+    def set(self, tenant_id: str, tenant_document: Dict, version: int) -> Tenant:
+        """
+        Parse the raw tenant document and return a copy safe to mutate. The tenant is cached only
+        if it was not invalidated since version was read.
+        """
+        tenant = Tenant(**tenant_document)
+        with self._lock:
+            if self._versions.get(tenant_id, 0) == version:
+                self._cache.set(tenant_id, tenant)
+                if tenant_document.get("_id") is not None:
+                    self._tenant_ids_by_object_id[str(tenant_document["_id"])] = tenant_id
+        return tenant.copy(deep=True)
+
+    def invalidate(self, tenant_id: str):
+        with self._lock:
+            self._versions[tenant_id] = self._versions.get(tenant_id, 0) + 1
+            self._cache.delete(tenant_id)
+
+    async def mark_modified(self, tenant_id: str):
+        """
+        Invalidate the tenant locally and bump its version so other instances drop it too.
+        """
+        self.invalidate(tenant_id)
+        await mongodb.db["tenants"].update_one({"tenant_id": tenant_id}, {"$inc": {"version": 1}})
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+            self._versions.clear()
+            self._tenant_ids_by_object_id.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {**self._cache.stats(), "change_stream_active": int(self._watch_task is not None and not self._watch_task.done())}
+
+    async def start_change_stream(self):
+        if settings.TENANT_CACHE_CHANGE_STREAM_ENABLED and self._watch_task is None:
+            self._watch_task = asyncio.create_task(self._watch_tenants())
+
+    async def stop_change_stream(self):
+        if self._watch_task is not None:
+            self._watch_task.cancel()
+            try:
+                await self._watch_task
+            except asyncio.CancelledError:
+                pass
+            self._watch_task = None
+
+    async def _watch_tenants(self):
+        try:
+            pipeline = [{"$match": {"$or": [
+                {"operationType": {"$in": ["delete", "replace"]}},
+                {"updateDescription.updatedFields.version": {"$exists": True}}
+            ]}}]
+            async with mongodb.db["tenants"].watch(pipeline, full_document="updateLookup") as stream:
+                logger.info("Tenant cache change stream started")
+                async for change in stream:
+                    self._handle_change(change)
+        except PyMongoError as e:
+            # Change streams require a replica set, fall back to TTL based expiry
+            logger.info(f"Tenant cache change stream unavailable, relying on TTL expiry: {e}")
+
+    def _handle_change(self, change: Dict):
+        full_document = change.get("fullDocument") or {}
+        object_id = str(change.get("documentKey", {}).get("_id"))
+        tenant_id = full_document.get("tenant_id") or self._tenant_ids_by_object_id.get(object_id)
+
+        if tenant_id is None:
+            return
+        if change.get("operationType") == "delete":
+            self._tenant_ids_by_object_id.pop(object_id, None)
+        self.invalidate(tenant_id)
+
+tenant_cache = TenantCache(
+    max_size=settings.TENANT_CACHE_MAX_SIZE,
+    ttl_seconds=settings.TENANT_CACHE_TTL_SECONDS
+)
@@ -0,0 +1,103 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+class TTLLRUCache:
+    """
+    Thread-safe in-memory cache with per-entry TTL and least recently used eviction.
+    Records hit, miss and eviction counters for observability.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: Optional[float] = None):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, Tuple[Any, Optional[float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                self.misses += 1
+                return default
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None):
+        """
+        Store a value. ttl_seconds overrides the cache default for this entry, a non-positive
+        value means the entry is already expired and is not stored.
+        """
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        if ttl is not None and ttl <= 0:
+            self.delete(key)
+            return
+
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key: Hashable) -> bool:
+        with self._lock:
+            return self._entries.pop(key, None) is not None
+
+    def delete_where(self, predicate: Callable[[Hashable], bool]) -> int:
+        """
+        Remove every entry whose key matches the predicate. Returns the number of removed entries.
+        """
+        with self._lock:
+            keys = [key for key in self._entries if predicate(key)]
+            for key in keys:
+                del self._entries[key]
+        return len(keys)
+
+    def __contains__(self, key: Hashable) -> bool:
+        """
+        Whether a non-expired entry exists for key, without touching the LRU order or counters.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and (entry[1] is None or entry[1] > time.monotonic())
+
+    def items(self):
+        """
+        Snapshot of the non-expired (key, value) pairs, without touching the LRU order or counters.
+        """
+        now = time.monotonic()
+        with self._lock:
+            return [
+                (key, value) for key, (value, expires_at) in self._entries.items()
+                if expires_at is None or expires_at > now
+            ]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions
+        }
@@ -1,5 +1,6 @@
 from motor.motor_asyncio import AsyncIOMotorClient
 from config import settings
+from utils.metrics.prometheus_metrics import mongo_pool_listener
 
 class MongoDB:
     def __init__(self):
@@ -7,7 +8,7 @@ class MongoDB:
         self.db = None
 
     async def connect(self):
-        self.client = AsyncIOMotorClient(settings.mongodb_uri)
+        self.client = AsyncIOMotorClient(settings.mongodb_uri, event_listeners=[mongo_pool_listener])
         self.db = self.client[settings.MONGO_DB_NAME]
         print(f"Connected to MongoDB database: {settings.MONGO_DB_NAME}")
 
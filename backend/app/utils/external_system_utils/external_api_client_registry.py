@@ -0,0 +1,176 @@
+import logging
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Set, Tuple
+from urllib.parse import urlsplit
+
+import aiohttp
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+ClientKey = Tuple[str, str]
+
+class ExternalApiClientRegistry:
+    """
+    Process-wide registry of long-lived aiohttp sessions for the tenants' API context endpoints.
+
+    Sessions are keyed by (tenant_id, endpoint origin) so keep-alive connections, the DNS cache and
+    TLS sessions are reused across calls. Each session is created on the first call to its endpoint
+    and every session is closed on application shutdown. The registry is bounded, the least
+    recently used session is closed once max_size is reached. Sessions evicted or invalidated
+    while requests still use them are closed once the last of those requests releases them.
+    Connection reuse is counted through aiohttp request tracing.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._sessions: "OrderedDict[ClientKey, aiohttp.ClientSession]" = OrderedDict()
+        self._stats: Dict[ClientKey, Dict[str, int]] = {}
+        # Users of each session acquired through session(), and the removed sessions still in use
+        self._users: Dict[aiohttp.ClientSession, int] = {}
+        self._retired: Set[aiohttp.ClientSession] = set()
+        self.sessions_created = 0
+        self.sessions_closed = 0
+
+    async def get_session(self, tenant_id: str, endpoint: str) -> aiohttp.ClientSession:
+        """
+        Return the pooled session for the endpoint's origin, creating it on first use.
+        Callers that hold the session across awaits should use session() so that it is not
+        closed under them when evicted.
+        """
+        key = (tenant_id, self._get_origin(endpoint))
+        session = self._sessions.get(key)
+        if session is not None and not session.closed:
+            self._sessions.move_to_end(key)
+            return session
+
+        session = self._create_session(key)
+        self._sessions[key] = session
+        self.sessions_created += 1
+
+        while len(self._sessions) > self.max_size:
+            evicted_key, evicted_session = self._sessions.popitem(last=False)
+            logger.debug("Closing least recently used API client session for %s", evicted_key)
+            self._stats.pop(evicted_key, None)
+            await self._retire(evicted_session)
+
+        return session
+
+    @asynccontextmanager
+    async def session(self, tenant_id: str, endpoint: str) -> AsyncIterator[aiohttp.ClientSession]:
+        """
+        Drop-in replacement for `async with aiohttp.ClientSession()`, the pooled session stays open on exit.
+        """
+        session = await self.get_session(tenant_id, endpoint)
+        self._users[session] = self._users.get(session, 0) + 1
+        try:
+            yield session
+        finally:
+            self._users[session] -= 1
+            if not self._users[session]:
+                del self._users[session]
+                if session in self._retired:
+                    self._retired.discard(session)
+                    await self._close(session)
+
+    async def invalidate_tenant(self, tenant_id: str) -> int:
+        """
+        Close every session held for the tenant. Returns the number of closed sessions.
+        """
+        keys = [key for key in self._sessions if key[0] == tenant_id]
+        for key in keys:
+            self._stats.pop(key, None)
+            await self._retire(self._sessions.pop(key))
+        return len(keys)
+
+    async def close_all(self):
+        """
+        Close every session. Used on application shutdown.
+        """
+        sessions = list(self._sessions.values()) + list(self._retired)
+        self._sessions.clear()
+        self._stats.clear()
+        self._retired.clear()
+        for session in sessions:
+            await self._close(session)
+
+    def get_client_stats(self) -> List[Dict[str, Any]]:
+        """
+        Return request and connection reuse counters of every pooled session.
+        """
+        return [
+            {"tenant_id": tenant_id, "origin": origin, **self._stats.get((tenant_id, origin), {})}
+            for tenant_id, origin in self._sessions
+        ]
+
+    def get_summary(self) -> Dict[str, int]:
+        """
+        Return registry-wide totals, safe to expose without tenant details.
+        """
+        summary = {
+            "sessions": len(self._sessions),
+            "sessions_created": self.sessions_created,
+            "sessions_closed": self.sessions_closed,
+            "requests": 0,
+            "connections_created": 0,
+            "connections_reused": 0
+        }
+        for stats in self._stats.values():
+            for counter in ("requests", "connections_created", "connections_reused"):
+                summary[counter] += stats[counter]
+        return summary
+
+    def _create_session(self, key: ClientKey) -> aiohttp.ClientSession:
+        stats = {"requests": 0, "connections_created": 0, "connections_reused": 0}
+        self._stats[key] = stats
+
+        async def on_request_start(session, context, params):
+            stats["requests"] += 1
+
+        async def on_connection_create_end(session, context, params):
+            stats["connections_created"] += 1
+
+        async def on_connection_reuseconn(session, context, params):
+            stats["connections_reused"] += 1
+
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_request_start.append(on_request_start)
+        trace_config.on_connection_create_end.append(on_connection_create_end)
+        trace_config.on_connection_reuseconn.append(on_connection_reuseconn)
+
+        connector = aiohttp.TCPConnector(
+            limit=settings.EXTERNAL_API_CONNECTOR_LIMIT,
+            limit_per_host=settings.EXTERNAL_API_CONNECTOR_LIMIT_PER_HOST,
+            keepalive_timeout=settings.EXTERNAL_API_KEEPALIVE_TIMEOUT_SECONDS,
+            ttl_dns_cache=settings.EXTERNAL_API_DNS_CACHE_TTL_SECONDS
+        )
+        # The session is shared by every user of the tenant, a cookie set for one must not be sent for another
+        return aiohttp.ClientSession(
+            connector=connector,
+            cookie_jar=aiohttp.DummyCookieJar(),
+            timeout=aiohttp.ClientTimeout(total=settings.EXTERNAL_API_REQUEST_TIMEOUT_SECONDS),
+            trace_configs=[trace_config]
+        )
+
+    async def _retire(self, session: aiohttp.ClientSession):
+        if self._users.get(session):
+            # In-flight requests keep the session, the last one to release it closes it
+            self._retired.add(session)
+            return
+        await self._close(session)
+
+    async def _close(self, session: aiohttp.ClientSession):
+        try:
+            await session.close()
+        except Exception as e:
+            logger.warning("Failed to close API client session: %s", e)
+        self.sessions_closed += 1
+
+    @staticmethod
+    def _get_origin(endpoint: str) -> str:
+        parts = urlsplit(endpoint)
+        return f"{parts.scheme}://{parts.netloc}".lower()
+
+external_api_client_registry = ExternalApiClientRegistry(max_size=settings.EXTERNAL_API_CLIENT_REGISTRY_MAX_SIZE)
@@ -1,3 +1,4 @@
+import importlib.util
 from typing import Optional
 from utils.tenant_manager.setting_utils import SettingUtils
 from model.tenant.tenant import Tenant
@@ -59,4 +60,27 @@ def build_db_url_based_on_dialect(tenant: Tenant, dialect: str, schema: Optional
         )
         return f"mysql+pymysql://{EXTERNAL_TENANT_DB_USERNAME}:{EXTERNAL_TENANT_DB_PASSWORD}@{EXTERNAL_TENANT_DB_HOST}:{EXTERNAL_TENANT_DB_PORT}/{schema}"
     
-    return None
\ No newline at end of file
+    return None
+
+# Maps the sync URL prefix produced above to the asyncio driver that can serve the same database
+_ASYNC_DRIVERS = {
+    "postgresql://": ("asyncpg", "postgresql+asyncpg://"),
+    "mysql+pymysql://": ("aiomysql", "mysql+aiomysql://"),
+    "sqlite://": ("aiosqlite", "sqlite+aiosqlite://"),
+}
+
+def build_async_db_url(db_url: Optional[str]) -> Optional[str]:
+    """
+    Convert a sync database URL to its asyncio driver equivalent.
+    Returns None when the URL has no async counterpart or the driver is not installed.
+    """
+    if not db_url:
+        return None
+
+    for sync_prefix, (driver_module, async_prefix) in _ASYNC_DRIVERS.items():
+        if db_url.startswith(sync_prefix):
+            if importlib.util.find_spec(driver_module) is None:
+                return None
+            return async_prefix + db_url[len(sync_prefix):]
+
+    return None
@@ -0,0 +1,207 @@
+import asyncio
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+EngineKey = Tuple[str, str, Optional[str], bool]
+AnyEngine = Union[Engine, AsyncEngine]
+
+class ExternalSystemEngineRegistry:
+    """
+    Process-wide registry of pooled SQLAlchemy engines for the tenants' external databases.
+
+    Engines are keyed by (tenant_id, dialect, schema_name, is_async) and remember the resolved URL they
+    were built from. When the tenant's EXTERNAL_SYSTEM_*_DB_SETTING values change, the resolved
+    URL changes with them and the stale engine is disposed and rebuilt on the next request.
+    The registry is bounded, the least recently used engine is disposed once max_size is reached.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._engines: "OrderedDict[EngineKey, Tuple[str, AnyEngine]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.engines_created = 0
+        self.engines_disposed = 0
+        # Disposals of evicted asyncio engines scheduled on the event loop, referenced until they finish
+        self._dispose_tasks: "set[asyncio.Task]" = set()
+
+    def get_engine(self, tenant_id: str, dialect: str, db_url: str, schema_name: Optional[str] = None) -> Engine:
+        """
+        Return the pooled engine for the tenant database, creating or rebuilding it when needed.
+        """
+        return self._get_or_create((tenant_id, dialect, schema_name, False), db_url)
+
+    def get_async_engine(self, tenant_id: str, dialect: str, db_url: str, schema_name: Optional[str] = None) -> AsyncEngine:
+        """
+        Return the pooled asyncio engine for the tenant database. db_url must use an async driver.
+        """
+        return self._get_or_create((tenant_id, dialect, schema_name, True), db_url)
+
+    def _get_or_create(self, key: EngineKey, db_url: str) -> AnyEngine:
+        tenant_id, dialect = key[0], key[1]
+        stale_engines: List[AnyEngine] = []
+
+        with self._lock:
+            entry = self._engines.get(key)
+            if entry and entry[0] == db_url:
+                self._engines.move_to_end(key)
+                return entry[1]
+
+            if entry:
+                logger.info("Connection settings changed for tenant '%s' (%s), rebuilding engine.", tenant_id, dialect)
+                stale_engines.append(self._engines.pop(key)[1])
+
+            engine = self._create_async_engine(db_url) if key[3] else self._create_engine(db_url)
+            self._engines[key] = (db_url, engine)
+            self.engines_created += 1
+
+            while len(self._engines) > self.max_size:
+                evicted_key, (_, evicted_engine) = self._engines.popitem(last=False)
+                logger.debug("Evicting least recently used engine for %s", evicted_key)
+                stale_engines.append(evicted_engine)
+
+        for stale_engine in stale_engines:
+            self._dispose(stale_engine)
+
+        return engine
+
+    def invalidate_tenant(self, tenant_id: str) -> int:
+        """
+        Dispose every engine held for the tenant. Returns the number of disposed engines.
+        """
+        with self._lock:
+            keys = [key for key in self._engines if key[0] == tenant_id]
+            engines = [self._engines.pop(key)[1] for key in keys]
+
+        for engine in engines:
+            self._dispose(engine)
+        return len(engines)
+
+    def dispose_all(self):
+        with self._lock:
+            engines = [engine for _, engine in self._engines.values()]
+            self._engines.clear()
+
+        for engine in engines:
+            self._dispose(engine)
+
+    async def dispose_all_async(self):
+        """
+        Dispose every engine, closing asyncio pools gracefully. Used on application shutdown.
+        """
+        with self._lock:
+            engines = [engine for _, engine in self._engines.values()]
+            self._engines.clear()
+
+        for engine in engines:
+            if isinstance(engine, AsyncEngine):
+                await self._dispose_async(engine)
+            else:
+                self._dispose(engine)
+        if self._dispose_tasks:
+            await asyncio.gather(*list(self._dispose_tasks), return_exceptions=True)
+
+    def get_pool_stats(self) -> List[Dict[str, Any]]:
+        """
+        Return checkout and overflow statistics of every pooled engine.
+        """
+        with self._lock:
+            entries = list(self._engines.items())
+
+        stats = []
+        for (tenant_id, dialect, schema_name, is_async), (_, engine) in entries:
+            pool = engine.pool
+            stats.append({
+                "tenant_id": tenant_id,
+                "dialect": dialect,
+                "schema_name": schema_name,
+                "is_async": is_async,
+                "pool_class": type(pool).__name__,
+                "pool_size": pool.size() if hasattr(pool, "size") else None,
+                "checked_out": pool.checkedout() if hasattr(pool, "checkedout") else None,
+                "checked_in": pool.checkedin() if hasattr(pool, "checkedin") else None,
+                "overflow": pool.overflow() if hasattr(pool, "overflow") else None
+            })
+        return stats
+
+    def get_summary(self) -> Dict[str, int]:
+        """
+        Return registry-wide totals, safe to expose without tenant details.
+        """
+        stats = self.get_pool_stats()
+        return {
+            "engines": len(stats),
+            "engines_created": self.engines_created,
+            "engines_disposed": self.engines_disposed,
+            "checked_out": sum(s["checked_out"] or 0 for s in stats),
+            "overflow": sum(max(s["overflow"] or 0, 0) for s in stats)
+        }
+
+    def _create_engine(self, db_url: str) -> Engine:
+        # SQLite uses its own single-connection pools and does not accept pool sizing arguments
+        if "sqlite" in db_url.lower():
+            return create_engine(db_url)
+
+        return create_engine(
+            db_url,
+            pool_size=settings.EXTERNAL_DB_POOL_SIZE,
+            max_overflow=settings.EXTERNAL_DB_MAX_OVERFLOW,
+            pool_recycle=settings.EXTERNAL_DB_POOL_RECYCLE_SECONDS,
+            pool_pre_ping=True
+        )
+
+    def _create_async_engine(self, db_url: str) -> AsyncEngine:
+        if "sqlite" in db_url.lower():
+            return create_async_engine(db_url)
+
+        return create_async_engine(
+            db_url,
+            pool_size=settings.EXTERNAL_DB_POOL_SIZE,
+            max_overflow=settings.EXTERNAL_DB_MAX_OVERFLOW,
+            pool_recycle=settings.EXTERNAL_DB_POOL_RECYCLE_SECONDS,
+            pool_pre_ping=True
+        )
+
+    def _dispose(self, engine: AnyEngine):
+        if isinstance(engine, AsyncEngine):
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                loop = None
+            if loop is not None:
+                # Async connections are closed on the event loop, checked out ones once they are returned
+                task = loop.create_task(self._dispose_async(engine))
+                self._dispose_tasks.add(task)
+                task.add_done_callback(self._dispose_tasks.discard)
+                return
+
+        try:
+            if isinstance(engine, AsyncEngine):
+                # No event loop to close async connections on, dereference the pool instead
+                logger.warning("Async engine disposed outside the event loop, its connections are not closed.")
+                engine.sync_engine.dispose(close=False)
+            else:
+                engine.dispose()
+        except Exception as e:
+            logger.warning("Failed to dispose engine: %s", e)
+        with self._lock:
+            self.engines_disposed += 1
+
+    async def _dispose_async(self, engine: AsyncEngine):
+        try:
+            await engine.dispose()
+        except Exception as e:
+            logger.warning("Failed to dispose async engine: %s", e)
+        with self._lock:
+            self.engines_disposed += 1
+
+engine_registry = ExternalSystemEngineRegistry(max_size=settings.EXTERNAL_DB_ENGINE_REGISTRY_MAX_SIZE)
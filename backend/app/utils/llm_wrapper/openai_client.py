@@ -0,0 +1,77 @@
+import asyncio
+import importlib.util
+import logging
+
+import httpx
+from openai import AsyncOpenAI
+
+from config import settings
+from utils.tracing.otel_tracing import start_span, set_span_attributes
+
+logger = logging.getLogger(__name__)
+
+class OpenAIClient:
+    """
+    Shared AsyncOpenAI client for the process, created on startup like the MongoDB client.
+
+    The underlying httpx pool keeps connections alive between generations (HTTP/2 when the
+    h2 package is installed) and a semaphore bounds how many completions are in flight.
+    """
+
+    def __init__(self):
+        self.client = None
+        self._semaphore = None
+
+    async def connect(self):
+        if self.client is not None:
+            return
+
+        http2_enabled = settings.OPENAI_HTTP2_ENABLED and importlib.util.find_spec("h2") is not None
+        http_client = httpx.AsyncClient(
+            http2=http2_enabled,
+            limits=httpx.Limits(
+                max_connections=settings.OPENAI_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.OPENAI_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=settings.OPENAI_KEEPALIVE_EXPIRY_SECONDS
+            ),
+            timeout=httpx.Timeout(
+                settings.OPENAI_REQUEST_TIMEOUT_SECONDS,
+                connect=settings.OPENAI_CONNECT_TIMEOUT_SECONDS
+            )
+        )
+        self.client = AsyncOpenAI(
+            api_key=settings.OPENAI_API_KEY,
+            base_url=settings.OPENAI_BASE_URL,
+            max_retries=settings.OPENAI_MAX_RETRIES,
+            http_client=http_client
+        )
+        self._semaphore = asyncio.Semaphore(settings.OPENAI_MAX_CONCURRENT_REQUESTS)
+        logger.info(f"OpenAI client initialized (http2={http2_enabled}, max_connections={settings.OPENAI_MAX_CONNECTIONS})")
+
+    async def disconnect(self):
+        if self.client:
+            await self.client.close()
+            self.client = None
+            self._semaphore = None
+            logger.info("OpenAI client closed")
+
+    async def create_chat_completion(self, **kwargs):
+        """
+        Run a chat completion on the shared client, waiting for a free slot when the
+        concurrency limit is reached. Accepts the arguments of chat.completions.create.
+        """
+        if self.client is None:
+            await self.connect()
+
+        kwargs.setdefault("timeout", settings.OPENAI_REQUEST_TIMEOUT_SECONDS)
+        with start_span("openai.chat_completion", {"gen_ai.system": "openai", "gen_ai.request.model": kwargs.get("model")}) as span:
+            async with self._semaphore:
+                response = await self.client.chat.completions.create(**kwargs)
+            usage = getattr(response, "usage", None)
+            set_span_attributes(span, {
+                "gen_ai.usage.input_tokens": getattr(usage, "prompt_tokens", None),
+                "gen_ai.usage.output_tokens": getattr(usage, "completion_tokens", None)
+            })
+            return response
+
+openai_client = OpenAIClient()
@@ -0,0 +1,111 @@
+import importlib.util
+import json
+from typing import Callable, Dict, List, Tuple
+
+JSON_SCHEMA_PROMPT_FORMAT = "json"
+DDL_SCHEMA_PROMPT_FORMAT = "ddl"
+COMPACT_SCHEMA_PROMPT_FORMAT = "compact"
+
+# Average characters per token of English and SQL identifiers on the OpenAI tokenizers
+_CHARS_PER_TOKEN = 4
+
+if importlib.util.find_spec("tiktoken") is not None:
+    import tiktoken
+else:
+    tiktoken = None
+
+class SchemaPromptUtils:
+    """
+    Encodings of a resolved schema (SchemaResolver.resolve_schema) for the SQL generation prompts.
+
+    json is the resolved schema as is. ddl writes each table as a CREATE TABLE statement with
+    descriptions and synonyms as comments and joins as comment lines. compact writes each table
+    on one line as table(column:TYPE, ...) and the joins as edges, dropping the repeated keys of
+    the JSON encoding.
+    """
+
+    @staticmethod
+    def encode(resolved_schema: Dict, schema_format: str = JSON_SCHEMA_PROMPT_FORMAT) -> str:
+        encoders: Dict[str, Callable[[Dict], str]] = {
+            JSON_SCHEMA_PROMPT_FORMAT: SchemaPromptUtils.to_json,
+            DDL_SCHEMA_PROMPT_FORMAT: SchemaPromptUtils.to_ddl,
+            COMPACT_SCHEMA_PROMPT_FORMAT: SchemaPromptUtils.to_compact,
+        }
+        if schema_format not in encoders:
+            raise ValueError(f"Unsupported schema prompt format: {schema_format}")
+        return encoders[schema_format](resolved_schema)
+
+    @staticmethod
+    def to_json(resolved_schema: Dict) -> str:
+        return json.dumps(resolved_schema)
+
+    @staticmethod
+    def to_ddl(resolved_schema: Dict) -> str:
+        lines: List[str] = []
+        joins: List[str] = []
+        for table_name, table in resolved_schema.get("tables", {}).items():
+            lines.append(f"CREATE TABLE {table_name} ({SchemaPromptUtils._comment(table)}".rstrip())
+            columns = list(table.get("columns", {}).items())
+            for index, (column_name, column) in enumerate(columns):
+                separator = "," if index < len(columns) - 1 else ""
+                lines.append(f"  {column_name} {column['type']}{separator}{SchemaPromptUtils._comment(column)}".rstrip())
+            lines.append(");")
+            for join in (table.get("relationships") or {}).values():
+                joins.append(f"-- {table_name} {join['type']} JOIN {join['table']} ON {join['on']}{SchemaPromptUtils._describe(join)}")
+        return "\n".join(lines + joins)
+
+    @staticmethod
+    def to_compact(resolved_schema: Dict) -> str:
+        lines: List[str] = []
+        edges: List[str] = []
+        for table_name, table in resolved_schema.get("tables", {}).items():
+            columns = ", ".join(
+                f"{column_name}:{column['type']}{SchemaPromptUtils._annotate(column)}"
+                for column_name, column in table.get("columns", {}).items()
+            )
+            lines.append(f"{table_name}({columns}){SchemaPromptUtils._annotate(table)}")
+            for join in (table.get("relationships") or {}).values():
+                edges.append(f"{table_name} -{join['type']}-> {join['table']} ON {join['on']}{SchemaPromptUtils._annotate(join)}")
+        if edges:
+            lines.append("joins:")
+            lines.extend(edges)
+        return "\n".join(lines)
+
+    @staticmethod
+    def _comment(entity: Dict) -> str:
+        text = SchemaPromptUtils._describe(entity).lstrip(" ;")
+        return f" -- {text}" if text else ""
+
+    @staticmethod
+    def _describe(entity: Dict) -> str:
+        parts = []
+        if entity.get("description"):
+            parts.append(entity["description"])
+        if entity.get("synonyms"):
+            parts.append(f"synonyms: {', '.join(entity['synonyms'])}")
+        return f"; {'; '.join(parts)}" if parts else ""
+
+    @staticmethod
+    def _annotate(entity: Dict) -> str:
+        annotation = ""
+        if entity.get("description"):
+            annotation += f" \"{entity['description']}\""
+        if entity.get("synonyms"):
+            annotation += f" ~{'|'.join(entity['synonyms'])}"
+        return annotation
+
+def count_tokens(text: str, model: str) -> Tuple[int, str]:
+    """
+    Count the tokens of text with the model's tiktoken encoding, or estimate them from its length
+    when tiktoken is not installed.
+
+    Returns:
+        Tuple[int, str]: The token count and how it was counted, "tiktoken" or "estimate".
+    """
+    if tiktoken is not None:
+        try:
+            encoding = tiktoken.encoding_for_model(model)
+        except KeyError:
+            encoding = tiktoken.get_encoding("o200k_base")
+        return len(encoding.encode(text)), "tiktoken"
+    return -(-len(text) // _CHARS_PER_TOKEN), "estimate"
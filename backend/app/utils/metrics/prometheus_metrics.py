@@ -0,0 +1,173 @@
+import threading
+from collections import defaultdict
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from prometheus_client import CollectorRegistry, Counter, Histogram, generate_latest, CONTENT_TYPE_LATEST
+from prometheus_client.core import GaugeMetricFamily
+from pymongo import monitoring
+
+from utils.external_system_utils.external_system_engine_registry import engine_registry
+
+UNKNOWN_TENANT = "unknown"
+
+# Dedicated registry, /metrics exposes only the application metrics and not the process collectors twice
+metrics_registry = CollectorRegistry(auto_describe=True)
+
+stage_duration_seconds = Histogram(
+    "sqlexecutor_pipeline_stage_duration_seconds",
+    "Duration of each pipeline stage (Mongo fetches, LLM calls, resolvers, SQL execution).",
+    ["tenant_id", "pipeline", "stage", "status"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60),
+    registry=metrics_registry
+)
+
+llm_tokens = Counter(
+    "sqlexecutor_llm_tokens",
+    "Tokens used by the LLM calls, by call and token type (prompt or completion).",
+    ["tenant_id", "model", "call", "token_type"],
+    registry=metrics_registry
+)
+
+cache_requests = Counter(
+    "sqlexecutor_cache_requests",
+    "Lookups of the in-process and persistent caches, by cache and result (hit or miss).",
+    ["tenant_id", "cache", "result"],
+    registry=metrics_registry
+)
+
+errors = Counter(
+    "sqlexecutor_errors",
+    "Errors returned to clients, by ErrorType and by the QueryScope or schema discovery error type.",
+    ["tenant_id", "error_type", "error_subtype", "status_code"],
+    registry=metrics_registry
+)
+
+def _tenant_label(tenant_id: Optional[str]) -> str:
+    return tenant_id or UNKNOWN_TENANT
+
+def observe_stage(tenant_id: Optional[str], pipeline: str, stage: str, duration_seconds: float, status: str):
+    stage_duration_seconds.labels(_tenant_label(tenant_id), pipeline, stage, status).observe(duration_seconds)
+
+def record_llm_usage(tenant_id: Optional[str], model: str, call: str, usage: Any):
+    """
+    Count the prompt and completion tokens of an OpenAI usage object, skipping calls without usage.
+    """
+    if usage is None:
+        return
+    for token_type in ("prompt", "completion"):
+        tokens = getattr(usage, f"{token_type}_tokens", None)
+        if isinstance(tokens, int):
+            llm_tokens.labels(_tenant_label(tenant_id), model, call, token_type).inc(tokens)
+
+def record_cache_lookup(tenant_id: Optional[str], cache: str, hit: bool):
+    cache_requests.labels(_tenant_label(tenant_id), cache, "hit" if hit else "miss").inc()
+
+def record_error(tenant_id: Optional[str], status_code: int, detail: Any):
+    """
+    Count an error response. Structured details (the error responses of
+    model/responses/sql_generation/sql_generation_error.py) are labelled with their error_type
+    and scope_error_type or discovery_error_type, other errors with http_error.
+    """
+    error_type, error_subtype = "http_error", ""
+    if isinstance(detail, dict) and detail.get("error_type"):
+        error_type = str(getattr(detail["error_type"], "value", detail["error_type"]))
+        subtype = detail.get("scope_error_type") or detail.get("discovery_error_type") or ""
+        error_subtype = str(getattr(subtype, "value", subtype))
+    errors.labels(_tenant_label(tenant_id), error_type, error_subtype, str(status_code)).inc()
+
+class MongoPoolListener(monitoring.ConnectionPoolListener):
+    """
+    Tracks the open and checked out connections of the MongoDB client's pools, one per server.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._open: Dict[str, int] = defaultdict(int)
+        self._checked_out: Dict[str, int] = defaultdict(int)
+
+    def get_stats(self) -> Dict[str, Tuple[int, int]]:
+        with self._lock:
+            return {address: (self._open[address], self._checked_out[address]) for address in self._open}
+
+    def _add(self, counts: Dict[str, int], event, delta: int):
+        address = "%s:%s" % event.address
+        with self._lock:
+            counts[address] = max(counts[address] + delta, 0)
+            self._open.setdefault(address, 0)
+
+    def pool_created(self, event):
+        self._add(self._open, event, 0)
+
+    def pool_cleared(self, event):
+        address = "%s:%s" % event.address
+        with self._lock:
+            self._checked_out[address] = 0
+
+    def pool_closed(self, event):
+        address = "%s:%s" % event.address
+        with self._lock:
+            self._open.pop(address, None)
+            self._checked_out.pop(address, None)
+
+    def connection_created(self, event):
+        self._add(self._open, event, 1)
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        self._add(self._open, event, -1)
+
+    def connection_check_out_started(self, event):
+        pass
+
+    def connection_check_out_failed(self, event):
+        pass
+
+    def connection_checked_out(self, event):
+        self._add(self._checked_out, event, 1)
+
+    def connection_checked_in(self, event):
+        self._add(self._checked_out, event, -1)
+
+mongo_pool_listener = MongoPoolListener()
+
+class ConnectionPoolCollector:
+    """
+    Reads the external database engine pools and the MongoDB pools on every scrape.
+    """
+
+    def collect(self) -> Iterator[GaugeMetricFamily]:
+        db_pool = GaugeMetricFamily(
+            "sqlexecutor_external_db_pool_connections",
+            "Connections of the pooled engines of the tenants' external databases, by state.",
+            labels=["tenant_id", "dialect", "schema_name", "is_async", "state"]
+        )
+        for stats in engine_registry.get_pool_stats():
+            for state in ("pool_size", "checked_out", "checked_in", "overflow"):
+                if stats[state] is None:
+                    continue
+                db_pool.add_metric(
+                    [stats["tenant_id"], stats["dialect"], stats["schema_name"] or "", str(stats["is_async"]).lower(), state],
+                    stats[state]
+                )
+        yield db_pool
+
+        mongo_pool = GaugeMetricFamily(
+            "sqlexecutor_mongo_pool_connections",
+            "Connections of the MongoDB client pools, by server and state.",
+            labels=["address", "state"]
+        )
+        for address, (open_connections, checked_out) in mongo_pool_listener.get_stats().items():
+            mongo_pool.add_metric([address, "open"], open_connections)
+            mongo_pool.add_metric([address, "checked_out"], checked_out)
+        yield mongo_pool
+
+    def describe(self) -> Iterator[GaugeMetricFamily]:
+        # Described without reading the pools, registering the collector must not touch them
+        return iter(())
+
+metrics_registry.register(ConnectionPoolCollector())
+
+def render_metrics() -> Tuple[bytes, str]:
+    return generate_latest(metrics_registry), CONTENT_TYPE_LATEST
@@ -62,12 +62,40 @@ class DefaultPromptInstructionsUtil:
         "additionalProperties": False
     }
 
+    QUERY_SCOPE_AND_SQL_INSTRUCTION = """
+    Identify intent (fetch_data, update_data, delete_data, insert_data, schema_info), extract relevant tables/columns
+    and generate the SQL query for the request in one response.
+    - Use 'table.column'; 'table.*' only if "all columns" is explicitly requested.
+    - Exclude SQL functions (COUNT, SUM, AVG) and keywords from columns.
+    - List all required tables explicitly, including primary/foreign keys if referenced.
+    - The SQL must use only the listed tables and columns, with the Schema as reference.
+    - Follow defined table relationships; use intermediates if needed.
+    - Use table aliases. Avoid '*'; list only required columns.
+    - Put only the SQL query in 'sql'.
+    """
+
+    QUERY_SCOPE_AND_SQL_JSON_SCHEMA = {
+        "type": "object",
+        "properties": {
+            **INTENT_JSON_SCHEMA["properties"],
+            "sql": {
+                "type": "string"
+            }
+        },
+        "required": ["intent", "entities", "sql"],
+        "additionalProperties": False
+    }
+
 
     @staticmethod
     def get_intent_json_schema_and_content_instruction():
         """Return precomputed static content"""
         return DefaultPromptInstructionsUtil.INTENT_JSON_SCHEMA, DefaultPromptInstructionsUtil.INTENT_INSTRUCTION
     
+    @staticmethod
+    def get_query_scope_and_sql_json_schema_and_content_instruction():
+        return DefaultPromptInstructionsUtil.QUERY_SCOPE_AND_SQL_JSON_SCHEMA, DefaultPromptInstructionsUtil.QUERY_SCOPE_AND_SQL_INSTRUCTION
+
     @staticmethod
     def get_sql_generation_instructions():
         return DefaultPromptInstructionsUtil.SQL_PROMPT_INSTRUCTION
@@ -1,17 +1,19 @@
-from typing import List, Tuple
+from typing import List, Tuple, Union
 from model.schema.schema import Schema
 from model.query_scope.query_scope import QueryScope
 from model.responses.schema.schema_tables_response import SchemaTablesResponse
+from utils.schema.schema_entity_index import SchemaEntityIndex
 
 class ValidateQueryScopeUtils:
     
     @staticmethod
-    def validate_tables_exist_in_schemas(schemas: List[SchemaTablesResponse], query_scope: QueryScope) -> Tuple[bool, List[str]]: 
+    def validate_tables_exist_in_schemas(schemas: Union[List[SchemaTablesResponse], SchemaEntityIndex], query_scope: QueryScope) -> Tuple[bool, List[str]]: 
         """
         Validates if all tables in the query_scope exist in the provided schema data.
 
         Args:
-            schemas (List[SchemaTablesResponse]): A list of simplified schema responses.
+            schemas (Union[List[SchemaTablesResponse], SchemaEntityIndex]): A list of simplified schema responses
+                or the tenant's schema entity index.
             query_scope (QueryScope): The query scope object defining the intent and entities.
 
         Returns:
@@ -20,7 +22,10 @@ class ValidateQueryScopeUtils:
         tables_to_validate = set(query_scope.entities.tables)
 
         # Create a set of all valid table names
-        valid_tables = {table.table_name for schema in schemas for table in schema.tables}
+        if isinstance(schemas, SchemaEntityIndex):
+            valid_tables = schemas.table_names
+        else:
+            valid_tables = {table.table_name for schema in schemas for table in schema.tables}
 
         unmatched = list(tables_to_validate - valid_tables)
         return (len(unmatched) == 0, unmatched)
\ No newline at end of file
@@ -0,0 +1,211 @@
+import ast
+import logging
+import operator
+import re
+from functools import lru_cache
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException
+
+from utils.ruleset.ruleset_utils import resolve_field
+from utils.ruleset.ruleset_condition_utils import format_value, normalize_condition
+
+CONDITION_PLACEHOLDER_PATTERN = re.compile(r"\$\{conditions\.([a-zA-Z0-9_]+)\}")
+JWT_PLACEHOLDER_PATTERN = re.compile(r"\$\{jwt\.([a-zA-Z0-9_.]+)\}")
+
+_COMPARE_OPERATORS: Dict[type, Callable[[Any, Any], Any]] = {
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+    ast.In: lambda left, right: left in right,
+    ast.NotIn: lambda left, right: left not in right,
+    ast.Is: operator.is_,
+    ast.IsNot: operator.is_not,
+}
+
+_BINARY_OPERATORS: Dict[type, Callable[[Any, Any], Any]] = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+}
+
+_UNARY_OPERATORS: Dict[type, Callable[[Any], Any]] = {
+    ast.Not: operator.not_,
+    ast.USub: operator.neg,
+    ast.UAdd: operator.pos,
+}
+
+Evaluator = Callable[[Sequence[Any]], Any]
+
+class CompiledCondition:
+    """
+    A ruleset condition parsed once into a tree of closures.
+
+    Named conditions are expanded and the ${jwt.*} placeholders replaced by slots when the condition
+    is compiled, so evaluating it only resolves the slots from the session data and calls the
+    closures. Only literals, boolean logic, comparisons, membership tests and basic arithmetic are
+    supported, anything else fails the evaluation as eval on an undefined name did.
+    """
+
+    def __init__(self, expanded_condition: str, field_paths: Tuple[str, ...], evaluator: Evaluator):
+        self.expanded_condition = expanded_condition
+        self.field_paths = field_paths
+        self._evaluator = evaluator
+
+    def evaluate(self, session_data: dict) -> Any:
+        """
+        Evaluate the condition against the session data.
+
+        Raises:
+            HTTPException: 400 if a placeholder field is not found in the session data.
+            Exception: Any error of the expression itself (e.g. an unsupported expression or a
+                comparison between incompatible types).
+        """
+        values = []
+        for field_path in self.field_paths:
+            value = resolve_field(session_data, field_path)
+            if value is None:
+                logging.error(f"Field '{field_path}' not found in session data.")
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Field '{field_path}' is not found in session data."
+                )
+            values.append(to_condition_value(value))
+        return self._evaluator(values)
+
+def expand_named_conditions(condition: str, conditions_dict: Optional[Dict[str, str]]) -> str:
+    """
+    Replace the ${conditions.*} placeholders with the named conditions of the ruleset, recursively.
+    """
+    while "${conditions." in condition:
+        for condition_key in CONDITION_PLACEHOLDER_PATTERN.findall(condition):
+            if not conditions_dict or condition_key not in conditions_dict:
+                logging.error(f"Condition '{condition_key}' is not defined in the ruleset.")
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Condition '{condition_key}' is not defined in the ruleset."
+                )
+            condition = condition.replace(f"${{conditions.{condition_key}}}", conditions_dict[condition_key])
+    return condition
+
+def compile_condition(condition: Optional[str], conditions_dict: Optional[Dict[str, str]] = None) -> CompiledCondition:
+    """
+    Compile a ruleset condition, reusing the compiled form for the same condition and named conditions.
+    Editing the ruleset's conditions changes the cache key, so stale compiled forms are never used.
+    """
+    return _compile_condition(condition or "", frozenset((conditions_dict or {}).items()))
+
+@lru_cache(maxsize=1024)
+def _compile_condition(condition: str, conditions: FrozenSet[Tuple[str, str]]) -> CompiledCondition:
+    if not condition:
+        return CompiledCondition("True", (), lambda values: True)
+
+    expanded_condition = expand_named_conditions(condition, dict(conditions))
+
+    field_paths: List[str] = []
+
+    def to_slot(match: re.Match) -> str:
+        field_path = match.group(1)
+        if field_path not in field_paths:
+            field_paths.append(field_path)
+        return f"__jwt_{field_paths.index(field_path)}"
+
+    source = normalize_condition(JWT_PLACEHOLDER_PATTERN.sub(to_slot, expanded_condition))
+    try:
+        evaluator = _compile_node(ast.parse(source.strip(), mode="eval").body)
+    except SyntaxError as error:
+        evaluator = _raise(error)
+    return CompiledCondition(expanded_condition, tuple(field_paths), evaluator)
+
+def to_condition_value(value: Any) -> Any:
+    """
+    Return the value a session field had in the textually substituted condition, e.g. 'TRUE' inside a
+    list read back as 'True', so compiled conditions give the results the eval based ones gave.
+    """
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    return _literal_from_text(format_value(value))
+
+@lru_cache(maxsize=4096)
+def _literal_from_text(text: str) -> Any:
+    return ast.literal_eval(normalize_condition(text).strip())
+
+def _raise(error: Exception) -> Evaluator:
+    def evaluator(values):
+        raise error
+    return evaluator
+
+def _compile_node(node: ast.AST) -> Evaluator:
+    if isinstance(node, ast.Constant):
+        constant = node.value
+        return lambda values: constant
+
+    if isinstance(node, ast.Name):
+        if node.id.startswith("__jwt_"):
+            slot = int(node.id[len("__jwt_"):])
+            return lambda values: values[slot]
+        return _raise(NameError(f"name '{node.id}' is not defined"))
+
+    if isinstance(node, (ast.List, ast.Tuple, ast.Set)):
+        elements = [_compile_node(element) for element in node.elts]
+        container = {ast.List: list, ast.Tuple: tuple, ast.Set: set}[type(node)]
+        return lambda values: container(element(values) for element in elements)
+
+    if isinstance(node, ast.BoolOp):
+        operands = [_compile_node(operand) for operand in node.values]
+        if isinstance(node.op, ast.And):
+            def evaluate_and(values):
+                result = True
+                for operand in operands:
+                    result = operand(values)
+                    if not result:
+                        return result
+                return result
+            return evaluate_and
+
+        def evaluate_or(values):
+            result = False
+            for operand in operands:
+                result = operand(values)
+                if result:
+                    return result
+            return result
+        return evaluate_or
+
+    if isinstance(node, ast.Compare) and all(type(op) in _COMPARE_OPERATORS for op in node.ops):
+        left = _compile_node(node.left)
+        comparisons = [
+            (_COMPARE_OPERATORS[type(op)], _compile_node(comparator))
+            for op, comparator in zip(node.ops, node.comparators)
+        ]
+        if len(comparisons) == 1:
+            compare, right = comparisons[0]
+            return lambda values: compare(left(values), right(values))
+
+        def evaluate_chain(values):
+            left_value = left(values)
+            for compare, right in comparisons:
+                right_value = right(values)
+                if not compare(left_value, right_value):
+                    return False
+                left_value = right_value
+            return True
+        return evaluate_chain
+
+    if isinstance(node, ast.UnaryOp) and type(node.op) in _UNARY_OPERATORS:
+        apply_operator = _UNARY_OPERATORS[type(node.op)]
+        operand = _compile_node(node.operand)
+        return lambda values: apply_operator(operand(values))
+
+    if isinstance(node, ast.BinOp) and type(node.op) in _BINARY_OPERATORS:
+        apply_operator = _BINARY_OPERATORS[type(node.op)]
+        left, right = _compile_node(node.left), _compile_node(node.right)
+        return lambda values: apply_operator(left(values), right(values))
+
+    return _raise(ValueError(f"Unsupported expression in condition: {ast.unparse(node)}"))
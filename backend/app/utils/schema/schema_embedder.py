@@ -0,0 +1,88 @@
+import hashlib
+import re
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from utils.schema.schema_lookup_index import singularize
+
+HASHING_EMBEDDER = "hashing"
+
+_CAMEL_CASE_PATTERN = re.compile(r"([a-z0-9])([A-Z])")
+_WORD_PATTERN = re.compile(r"[a-z0-9]+")
+
+class SchemaEmbedder:
+    """
+    Turns schema documents (a table or a column with its description and synonyms) and user
+    questions into vectors for the schema table retrieval. Embedders return one row per text,
+    the SchemaTableIndex weights and normalizes them.
+    """
+
+    name: str = ""
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        raise NotImplementedError
+
+class HashingEmbedder(SchemaEmbedder):
+    """
+    Local embedder hashing the words of a text, split on underscores and camel case and
+    singularized, and their character trigrams into a fixed number of buckets. Counts are
+    dampened with log(1 + count). Needs no model and no network, and matches the questions
+    that name the tables and columns, their synonyms or close spellings of them.
+    """
+
+    name = HASHING_EMBEDDER
+
+    def __init__(self, dimensions: int = 2048, trigram_weight: float = 0.5):
+        self.dimensions = dimensions
+        self.trigram_weight = trigram_weight
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        rows: List[int] = []
+        buckets: List[int] = []
+        weights: List[float] = []
+        for row, text in enumerate(texts):
+            for word, count in Counter(self.split_words(text)).items():
+                word_buckets, word_weights = _get_word_features(word, self.dimensions, self.trigram_weight)
+                rows.extend([row] * len(word_buckets))
+                buckets.extend(word_buckets)
+                weights.extend(weight * count for weight in word_weights)
+
+        flat_index = np.asarray(rows, dtype=np.int64) * self.dimensions + np.asarray(buckets, dtype=np.int64)
+        vectors = np.bincount(flat_index, weights=weights, minlength=len(texts) * self.dimensions)
+        return np.log1p(vectors.reshape(len(texts), self.dimensions)).astype(np.float32)
+
+    @staticmethod
+    def split_words(text: str) -> List[str]:
+        return _WORD_PATTERN.findall(_CAMEL_CASE_PATTERN.sub(r"\1 \2", text or "").lower())
+
+@lru_cache(maxsize=65536)
+def _get_word_features(word: str, dimensions: int, trigram_weight: float) -> Tuple[Tuple[int, ...], Tuple[float, ...]]:
+    # Schemas repeat the same column names in most tables, the cache skips rehashing them
+    word = singularize(word)
+    padded = f" {word} "
+    features = [(f"w:{word}", 1.0)] + [(f"t:{padded[i:i + 3]}", trigram_weight) for i in range(len(padded) - 2)]
+    buckets = tuple(
+        int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "little") % dimensions
+        for feature, _ in features
+    )
+    return buckets, tuple(weight for _, weight in features)
+
+schema_embedders: Dict[str, SchemaEmbedder] = {
+    HASHING_EMBEDDER: HashingEmbedder(),
+}
+
+def register_schema_embedder(embedder: SchemaEmbedder):
+    """
+    Make an embedder selectable with the tenant's SCHEMA_RESOLVER.SCHEMA_RETRIEVAL_EMBEDDER setting.
+    """
+    if not embedder.name:
+        raise ValueError("Schema embedders must have a name")
+    schema_embedders[embedder.name] = embedder
+
+def get_schema_embedder(name: str) -> SchemaEmbedder:
+    if name not in schema_embedders:
+        raise ValueError(f"Unknown schema embedder: {name}")
+    return schema_embedders[name]
@@ -0,0 +1,151 @@
+from collections import defaultdict
+from typing import AbstractSet, Dict, Iterable, List, Set, Tuple, Union
+
+from model.query_scope.query_scope import QueryScope
+from model.responses.schema.schema_tables_response import SchemaTablesResponse
+
+class SchemaEntityIndex:
+    """
+    Inverted index of a tenant's schemas from table, column and synonym names to the schemas
+    holding them, used to route a QueryScope to its schema.
+
+    Scoring a QueryScope costs one lookup per table and column of the QueryScope, whatever the
+    number of schemas. Each posting carries its weight through the map it lives in:
+        - 2 points for each matching table name.
+        - 1 point for each matching column name.
+        - 2 bonus points for each table matched by name or synonym.
+        - 1 bonus point for each column matched by name or synonym.
+    Schemas are added, replaced and removed one at a time as they are saved or deleted.
+    """
+
+    def __init__(self, schemas: Iterable[SchemaTablesResponse] = ()):
+        # Schema name -> routing order, ties keep the order the schemas were loaded in
+        self._schema_order: Dict[str, int] = {}
+        self._schemas: Dict[str, SchemaTablesResponse] = {}
+        self._next_order = 0
+        self._tables: Dict[str, Set[str]] = defaultdict(set)
+        self._columns: Dict[str, Set[str]] = defaultdict(set)
+        self._table_terms: Dict[str, Set[Tuple[str, str]]] = defaultdict(set)
+        self._column_terms: Dict[str, Set[Tuple[str, str, str]]] = defaultdict(set)
+        self._table_column_counts: Dict[str, Dict[str, int]] = defaultdict(dict)
+        for schema in schemas:
+            self.add_schema(schema)
+
+    @property
+    def schema_names(self) -> List[str]:
+        return sorted(self._schema_order, key=self._schema_order.get)
+
+    @property
+    def table_names(self) -> AbstractSet[str]:
+        """Live read-only view of the table names of every indexed schema."""
+        return self._tables.keys()
+
+    def has_table(self, table_name: str) -> bool:
+        return table_name in self._tables
+
+    def add_schema(self, schema: SchemaTablesResponse):
+        """
+        Index the schema, replacing the entries of a previously indexed schema with the same name.
+        """
+        if not isinstance(schema, SchemaTablesResponse):
+            raise AttributeError(f"Expected SchemaTablesResponse object, but got {type(schema)}")
+        schema_name = schema.schema_name
+        if schema_name in self._schemas:
+            self._unindex(self._schemas[schema_name])
+        else:
+            self._schema_order[schema_name] = self._next_order
+            self._next_order += 1
+        self._schemas[schema_name] = schema
+
+        for table in schema.tables:
+            table_name = table.table_name
+            self._tables[table_name].add(schema_name)
+            self._table_column_counts[table_name][schema_name] = len(table.columns)
+            for term in {table_name, *table.synonyms}:
+                self._table_terms[term].add((schema_name, table_name))
+            for column in table.columns:
+                self._columns[f"{table_name}.{column.column_name}"].add(schema_name)
+                for term in {column.column_name, *column.synonyms}:
+                    self._column_terms[term].add((schema_name, table_name, column.column_name))
+
+    def remove_schema(self, schema_name: str) -> bool:
+        schema = self._schemas.pop(schema_name, None)
+        if schema is None:
+            return False
+        self._unindex(schema)
+        del self._schema_order[schema_name]
+        return True
+
+    def get_best_matching_schemas(self, query_scope: QueryScope, ignore_wildcards: bool = True) -> Union[str, List[str]]:
+        """
+        Return the single best matching schema name, the names of the schemas tied for the best
+        score, or an empty list when no schema scores.
+        """
+        query_tables = set(query_scope.entities.tables)
+        query_columns = set(query_scope.entities.columns)
+        scores: Dict[str, int] = defaultdict(int)
+
+        for table_name in query_tables:
+            for schema_name in self._tables.get(table_name, ()):
+                scores[schema_name] += 2
+
+        wildcard_tables = set()
+        if not ignore_wildcards:
+            wildcard_tables = {column.split(".*")[0] for column in query_columns if column.endswith(".*")}
+            for table_name in wildcard_tables:
+                for schema_name, column_count in self._table_column_counts.get(table_name, {}).items():
+                    scores[schema_name] += column_count
+
+        for column in query_columns:
+            if column.endswith(".*") and not ignore_wildcards:
+                continue
+            # Columns of wildcard tables were already counted by the expansion
+            if column.split(".", 1)[0] in wildcard_tables:
+                continue
+            for schema_name in self._columns.get(column, ()):
+                scores[schema_name] += 1
+
+        matched_tables = {match for term in query_tables for match in self._table_terms.get(term, ())}
+        for schema_name, _ in matched_tables:
+            scores[schema_name] += 2
+
+        matched_columns = {match for term in query_columns for match in self._column_terms.get(term, ())}
+        for schema_name, _, _ in matched_columns:
+            scores[schema_name] += 1
+
+        matches = sorted(
+            (schema_name for schema_name, score in scores.items() if score > 0),
+            key=lambda schema_name: (-scores[schema_name], self._schema_order[schema_name])
+        )
+        if not matches:
+            return []
+        if len(matches) == 1:
+            return matches[0]
+
+        max_score = scores[matches[0]]
+        return [schema_name for schema_name in matches if scores[schema_name] == max_score]
+
+    def _unindex(self, schema: SchemaTablesResponse):
+        schema_name = schema.schema_name
+        for table in schema.tables:
+            table_name = table.table_name
+            self._discard(self._tables, table_name, schema_name)
+            self._discard(self._table_column_counts, table_name, schema_name)
+            for term in {table_name, *table.synonyms}:
+                self._discard(self._table_terms, term, (schema_name, table_name))
+            for column in table.columns:
+                self._discard(self._columns, f"{table_name}.{column.column_name}", schema_name)
+                for term in {column.column_name, *column.synonyms}:
+                    self._discard(self._column_terms, term, (schema_name, table_name, column.column_name))
+
+    @staticmethod
+    def _discard(postings: Dict, key, value):
+        posting = postings.get(key)
+        if posting is None:
+            return
+        if isinstance(posting, dict):
+            posting.pop(value, None)
+        else:
+            posting.discard(value)
+        if not posting:
+            del postings[key]
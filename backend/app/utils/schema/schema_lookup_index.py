@@ -0,0 +1,136 @@
+import difflib
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set
+
+from model.schema.schema import Schema
+from model.schema.table import Table
+
+def singularize(name: str) -> str:
+    """
+    Return a lowercased singular form of a table or column name, e.g. 'categories' -> 'category'.
+    Only the common English plural endings are handled, it is a lookup key and not a grammar tool.
+    """
+    word = name.lower()
+    if len(word) > 3 and word.endswith("ies"):
+        return word[:-3] + "y"
+    if word.endswith(("sses", "xes", "ches", "shes")):
+        return word[:-2]
+    if len(word) > 1 and word.endswith("s") and not word.endswith("ss"):
+        return word[:-1]
+    return word
+
+class FuzzyNameIndex:
+    """
+    Trigram index over a set of names for approximate lookups.
+
+    Instead of running difflib over every name, only the names sharing the most trigrams with the
+    looked up word are scored, so a lookup costs the same on a schema of ten or ten thousand tables.
+    The final scoring is difflib's, so matches and cutoffs are the ones of difflib.get_close_matches.
+    """
+
+    max_candidates = 64
+    # Trigrams shared by more than this share of the names (e.g. a common 'tbl_' prefix) do not narrow the search
+    common_trigram_ratio = 0.1
+
+    def __init__(self, names: Iterable[str]):
+        self._trigrams: Dict[str, Set[str]] = defaultdict(set)
+        self._size = 0
+        for name in names:
+            self._size += 1
+            for trigram in self._get_trigrams(name):
+                self._trigrams[trigram].add(name)
+
+    def get_close_matches(self, word: str, n: int = 1, cutoff: float = 0.7) -> List[str]:
+        postings = [self._trigrams[trigram] for trigram in self._get_trigrams(word) if trigram in self._trigrams]
+        max_posting_size = max(self.max_candidates, int(self._size * self.common_trigram_ratio))
+        selective_postings = [names for names in postings if len(names) <= max_posting_size] or postings
+
+        shared_counts: Dict[str, int] = defaultdict(int)
+        for names in selective_postings:
+            for name in names:
+                shared_counts[name] += 1
+
+        candidates = sorted(shared_counts, key=lambda name: (-shared_counts[name], name))[:self.max_candidates]
+        return difflib.get_close_matches(word, candidates, n=n, cutoff=cutoff)
+
+    @staticmethod
+    def _get_trigrams(word: str) -> Set[str]:
+        padded = f"  {word.lower()} "
+        return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+class NameLookup:
+    """
+    Exact, synonym, plural/singular and fuzzy lookups over one namespace (the tables of a schema
+    or the columns of a table), tried in that order.
+    """
+
+    def __init__(self, names_with_synonyms: Dict[str, List[str]], last_synonym_wins: bool = False):
+        self.names = set(names_with_synonyms)
+        self.synonyms: Dict[str, str] = {}
+        self.singulars: Dict[str, str] = {}
+        for name, synonyms in names_with_synonyms.items():
+            for synonym in synonyms or []:
+                if last_synonym_wins:
+                    self.synonyms[synonym] = name
+                else:
+                    self.synonyms.setdefault(synonym, name)
+            self.singulars.setdefault(singularize(name), name)
+        self.fuzzy_index = FuzzyNameIndex(self.names)
+
+    def find(self, word: str, cutoff: float = 0.7) -> Optional[str]:
+        if word in self.names:
+            return word
+        if word in self.synonyms:
+            return self.synonyms[word]
+        if singularize(word) in self.singulars:
+            return self.singulars[singularize(word)]
+        best_match = self.fuzzy_index.get_close_matches(word, n=1, cutoff=cutoff)
+        return best_match[0] if best_match else None
+
+class SchemaLookupIndex:
+    """
+    Name lookup structures of a schema, built once per loaded Schema and kept on the model so
+    resolving a QueryScope costs time proportional to the QueryScope and not to the schema.
+    Column lookups are built on first use of each table.
+    """
+
+    def __init__(self, schema: Schema):
+        self._tables: Dict[str, Table] = schema.tables
+        # Duplicate table synonyms resolve to the last table, as the previous map-building code did
+        self.table_lookup = NameLookup(
+            {table_name: table.synonyms for table_name, table in schema.tables.items()},
+            last_synonym_wins=True
+        )
+        self._column_lookups: Dict[str, NameLookup] = {}
+
+    @staticmethod
+    def for_schema(schema: Schema) -> "SchemaLookupIndex":
+        lookup_index = getattr(schema, "_lookup_index", None)
+        if not isinstance(lookup_index, SchemaLookupIndex) or lookup_index._tables is not schema.tables:
+            lookup_index = SchemaLookupIndex(schema)
+            schema._lookup_index = lookup_index
+        return lookup_index
+
+    def find_table(self, table_name: str) -> Optional[str]:
+        return self.table_lookup.find(table_name)
+
+    def find_column(self, table_name: str, column_name: str) -> Optional[str]:
+        """
+        Return the best matching column name of the table, or None if the table or column is unknown.
+        """
+        column_lookup = self.get_column_lookup(table_name)
+        if column_lookup is None:
+            return None
+        return column_lookup.find(column_name)
+
+    def get_column_lookup(self, table_name: str) -> Optional[NameLookup]:
+        if table_name not in self._tables:
+            return None
+        column_lookup = self._column_lookups.get(table_name)
+        if column_lookup is None:
+            column_lookup = NameLookup({
+                column_name: column.synonyms
+                for column_name, column in self._tables[table_name].columns.items()
+            })
+            self._column_lookups[table_name] = column_lookup
+        return column_lookup
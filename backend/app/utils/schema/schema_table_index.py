@@ -0,0 +1,136 @@
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set
+
+import numpy as np
+
+from config import settings
+from model.schema.schema import Schema
+from model.schema.table import Table
+from utils.schema.schema_embedder import SchemaEmbedder
+from utils.llm_wrapper.schema_prompt_utils import SchemaPromptUtils, count_tokens
+
+class SchemaTableSelection(NamedTuple):
+    retrieved_tables: List[str]
+    neighbour_tables: List[str]
+
+    @property
+    def tables(self) -> List[str]:
+        return self.retrieved_tables + self.neighbour_tables
+
+class SchemaTableIndex:
+    """
+    Vectors of the tables and columns of a schema for retrieving the tables relevant to a question.
+
+    Each table is embedded with its name, description and synonyms and the names, descriptions
+    and synonyms of its columns, so a question naming a column ranks its table. The vectors are
+    weighted with the inverse document frequency over the tables, so names shared by most tables
+    (id, created_at) count little, and normalized so a product with the question vector is a
+    cosine. One row per table keeps the matrix small on schemas with tens of thousands of columns.
+
+    Built once per loaded Schema and embedder and kept on the model, like the SchemaLookupIndex.
+    """
+
+    def __init__(self, schema: Schema, embedder: SchemaEmbedder):
+        self.embedder = embedder
+        self._tables: Dict[str, Table] = schema.tables
+        self.table_names: List[str] = list(schema.tables)
+
+        table_counts = embedder.embed([self._get_table_document(table_name, table) for table_name, table in schema.tables.items()])
+        document_frequency = np.count_nonzero(table_counts, axis=0)
+        self._idf = (np.log((1 + len(self.table_names)) / (1 + document_frequency)) + 1).astype(np.float32)
+
+        self._table_matrix = self._normalize(table_counts * self._idf)
+
+        # Joins are followed both ways, a table is a neighbour of the tables it joins and of the ones joining it
+        self.neighbours: Dict[str, Set[str]] = {table_name: set() for table_name in self.table_names}
+        for table_name, table in schema.tables.items():
+            for relationship in (table.relationships or {}).values():
+                if relationship.table in self.neighbours and relationship.table != table_name:
+                    self.neighbours[table_name].add(relationship.table)
+                    self.neighbours[relationship.table].add(table_name)
+
+        # JSON prompt tokens of each table before resolution, the estimate of what dropping it saves
+        self.table_tokens: Dict[str, int] = {
+            table_name: count_tokens(
+                SchemaPromptUtils.to_json({"tables": {table_name: self._get_prompt_table(table)}}),
+                settings.DEFAULT_APP_LLM_MODEL
+            )[0]
+            for table_name, table in schema.tables.items()
+        }
+
+    @staticmethod
+    def get_cached(schema: Schema, embedder: SchemaEmbedder) -> Optional["SchemaTableIndex"]:
+        """
+        Return the index already built for the schema and embedder, None when it has to be built.
+        """
+        table_index = (schema._table_indexes or {}).get(embedder.name)
+        if not isinstance(table_index, SchemaTableIndex) or table_index._tables is not schema.tables:
+            return None
+        return table_index
+
+    @staticmethod
+    def for_schema(schema: Schema, embedder: SchemaEmbedder) -> "SchemaTableIndex":
+        table_index = SchemaTableIndex.get_cached(schema, embedder)
+        if table_index is None:
+            table_index = SchemaTableIndex(schema, embedder)
+            if schema._table_indexes is None:
+                schema._table_indexes = {}
+            schema._table_indexes[embedder.name] = table_index
+        return table_index
+
+    def score_tables(self, question: str) -> Dict[str, float]:
+        question_vector = self._normalize(self.embedder.embed([question]) * self._idf)[0]
+        return dict(zip(self.table_names, (self._table_matrix @ question_vector).tolist()))
+
+    def select_tables(self, question: str, top_k: int, candidates: Optional[Iterable[str]] = None,
+                      include_neighbours: bool = True) -> SchemaTableSelection:
+        """
+        Return the top_k tables most similar to the question and, with include_neighbours, the
+        tables joined to them. Only candidates are considered when given.
+        """
+        scores = self.score_tables(question)
+        candidate_set = set(candidates) if candidates is not None else None
+        candidate_tables = [table_name for table_name in self.table_names if candidate_set is None or table_name in candidate_set]
+        ranked = sorted(candidate_tables, key=lambda table_name: -scores[table_name])
+        retrieved_tables = [table_name for table_name in ranked[:top_k] if scores[table_name] > 0] or ranked[:top_k]
+
+        neighbour_tables: List[str] = []
+        if include_neighbours:
+            retrieved = set(retrieved_tables)
+            allowed = set(candidate_tables)
+            neighbour_tables = sorted({
+                neighbour
+                for table_name in retrieved_tables
+                for neighbour in self.neighbours[table_name]
+                if neighbour not in retrieved and neighbour in allowed
+            })
+        return SchemaTableSelection(retrieved_tables=retrieved_tables, neighbour_tables=neighbour_tables)
+
+    def count_table_tokens(self, table_names: Iterable[str]) -> int:
+        return sum(self.table_tokens.get(table_name, 0) for table_name in table_names)
+
+    @staticmethod
+    def _get_table_document(table_name: str, table: Table) -> str:
+        words = [table_name, table.description or "", *(table.synonyms or [])]
+        for column_name, column in table.columns.items():
+            words.extend([column_name, column.description or "", *(column.synonyms or [])])
+        return " ".join(words)
+
+    @staticmethod
+    def _get_prompt_table(table: Table) -> Dict:
+        return {
+            "description": table.description,
+            "synonyms": table.synonyms,
+            "columns": {
+                column_name: {"type": column.type, "description": column.description, "synonyms": column.synonyms}
+                for column_name, column in table.columns.items()
+            },
+            "relationships": {
+                relationship_name: {"table": relationship.table, "on": relationship.on, "type": relationship.type}
+                for relationship_name, relationship in (table.relationships or {}).items()
+            }
+        }
+
+    @staticmethod
+    def _normalize(matrix: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return matrix / np.where(norms == 0, 1, norms)
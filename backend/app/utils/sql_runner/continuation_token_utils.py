@@ -0,0 +1,75 @@
+import base64
+import hashlib
+import hmac
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any, Dict
+from uuid import UUID
+
+from fastapi import HTTPException
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).decode("ascii").rstrip("=")
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+def encode_continuation_token(payload: Dict[str, Any], secret: bytes) -> str:
+    """
+    Serialize the payload as an opaque URL-safe token signed with HMAC-SHA256.
+    """
+    body = _b64encode(json.dumps(payload, separators=(",", ":"), sort_keys=True).encode("utf-8"))
+    signature = hmac.new(secret, body.encode("ascii"), hashlib.sha256).digest()
+    return f"{body}.{_b64encode(signature)}"
+
+def decode_continuation_token(token: str, secret: bytes) -> Dict[str, Any]:
+    """
+    Verify the token's signature and return its payload.
+
+    Raises:
+        HTTPException: 400 if the token is malformed or was not signed with secret.
+    """
+    try:
+        body, signature = token.split(".")
+        expected_signature = hmac.new(secret, body.encode("ascii"), hashlib.sha256).digest()
+        if not hmac.compare_digest(_b64decode(signature), expected_signature):
+            raise ValueError("signature mismatch")
+        return json.loads(_b64decode(body))
+    except (ValueError, UnicodeError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid continuation token: {e}")
+
+def encode_key_value(value: Any) -> Any:
+    """
+    Convert a key value read from the tenant database to JSON, tagging the types JSON has no
+    literal for so that decode_key_value binds them back with the same type.
+    """
+    if isinstance(value, datetime):
+        return {"$datetime": value.isoformat()}
+    if isinstance(value, date):
+        return {"$date": value.isoformat()}
+    if isinstance(value, time):
+        return {"$time": value.isoformat()}
+    if isinstance(value, Decimal):
+        return {"$decimal": str(value)}
+    if isinstance(value, UUID):
+        return {"$uuid": str(value)}
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return {"$bytes": _b64encode(bytes(value))}
+    return value
+
+def decode_key_value(value: Any) -> Any:
+    if not isinstance(value, dict) or len(value) != 1:
+        return value
+    (tag, text), = value.items()
+    decoders = {
+        "$datetime": datetime.fromisoformat,
+        "$date": date.fromisoformat,
+        "$time": time.fromisoformat,
+        "$decimal": Decimal,
+        "$uuid": UUID,
+        "$bytes": _b64decode,
+    }
+    if tag not in decoders:
+        raise HTTPException(status_code=400, detail=f"Invalid continuation token: unknown key type '{tag}'")
+    return decoders[tag](text)
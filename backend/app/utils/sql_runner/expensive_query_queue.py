@@ -0,0 +1,53 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict
+
+from fastapi import HTTPException
+
+from config import settings
+
+class ExpensiveQueryQueue:
+    """
+    Per-tenant queue for the queries the cost guard flags as expensive. Only max_concurrency of
+    them run at a time for a tenant, the others wait their turn instead of piling up on the
+    tenant's database. Cheap queries never go through the queue.
+    """
+
+    def __init__(self, max_concurrency: int):
+        self._max_concurrency = max(1, max_concurrency)
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    @asynccontextmanager
+    async def slot(self, tenant_id: str, timeout_seconds: float):
+        """
+        Wait for a free slot of the tenant, failing with a 503 once timeout_seconds have passed.
+        """
+        semaphore = self._semaphores.setdefault(tenant_id, asyncio.Semaphore(self._max_concurrency))
+        try:
+            await asyncio.wait_for(semaphore.acquire(), timeout=timeout_seconds)
+        except asyncio.TimeoutError:
+            raise HTTPException(
+                status_code=503,
+                detail=f"Query queued by the cost guard did not start within {timeout_seconds} seconds, try again later."
+            )
+        try:
+            yield
+        finally:
+            semaphore.release()
+
+    async def hold_while_streaming(self, tenant_id: str, timeout_seconds: float,
+                                   batches: AsyncIterator[Any]) -> AsyncIterator[Any]:
+        """
+        Keep a slot of the tenant for as long as the streamed query is being read.
+        """
+        async with self.slot(tenant_id, timeout_seconds):
+            try:
+                async for batch in batches:
+                    yield batch
+            finally:
+                await batches.aclose()
+
+    def clear(self):
+        self._semaphores.clear()
+
+expensive_query_queue = ExpensiveQueryQueue(max_concurrency=settings.SQL_COST_GUARD_QUEUE_MAX_CONCURRENCY)
@@ -0,0 +1,267 @@
+import io
+import json
+import logging
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from fastapi import HTTPException
+
+from model.tenant.tenant import Tenant
+from utils.tenant_manager.setting_utils import SettingUtils
+from api.core.constants.tenant.settings_categories import SQL_RUNNER
+
+logger = logging.getLogger(__name__)
+
+NDJSON_FORMAT = "ndjson"
+ARROW_FORMAT = "arrow"
+
+STREAM_MEDIA_TYPES = {
+    NDJSON_FORMAT: "application/x-ndjson",
+    ARROW_FORMAT: "application/vnd.apache.arrow.stream",
+}
+
+_DEFAULT_STREAM_BATCH_SIZE = 1000
+_DEFAULT_STREAM_MAX_ROWS = 100000
+_DEFAULT_STREAM_MAX_BYTES = 50 * 1024 * 1024
+
+RowBatches = AsyncIterator[List[Dict[str, Any]]]
+
+class SqlResultStreamUtils:
+
+    @staticmethod
+    def get_stream_limits(tenant: Tenant) -> Tuple[int, int, int]:
+        """
+        Read the tenant's streaming limits from the SQL_RUNNER settings.
+
+        Returns:
+            Tuple[int, int, int]: batch size, row cap and byte cap.
+        """
+        def _read(setting_key: str, default: int) -> int:
+            value = SettingUtils.get_setting_value(
+                settings=tenant.settings,
+                category_key=SQL_RUNNER,
+                setting_key=setting_key
+            )
+            return int(value) if value not in (None, "") else default
+
+        return (
+            _read("SQL_STREAM_BATCH_SIZE", _DEFAULT_STREAM_BATCH_SIZE),
+            _read("SQL_STREAM_MAX_ROWS", _DEFAULT_STREAM_MAX_ROWS),
+            _read("SQL_STREAM_MAX_BYTES", _DEFAULT_STREAM_MAX_BYTES),
+        )
+
+    @staticmethod
+    def validate_stream_format(stream_format: str):
+        """
+        Reject unknown formats and Arrow output without pyarrow before the response starts.
+        """
+        if stream_format not in STREAM_MEDIA_TYPES:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Invalid stream format: {stream_format}. Allowed values are {', '.join(STREAM_MEDIA_TYPES)}."
+            )
+        if stream_format == ARROW_FORMAT:
+            SqlResultStreamUtils._import_pyarrow()
+
+    @staticmethod
+    async def prime(batches: RowBatches) -> RowBatches:
+        """
+        Fetch the first batch before the response starts, so that query errors are still
+        raised as regular HTTP errors instead of breaking an already started stream.
+        """
+        try:
+            first_batch = await batches.__anext__()
+        except StopAsyncIteration:
+            first_batch = None
+
+        async def _chained() -> RowBatches:
+            try:
+                if first_batch is not None:
+                    yield first_batch
+                    async for batch in batches:
+                        yield batch
+            finally:
+                await batches.aclose()
+
+        return _chained()
+
+    @staticmethod
+    async def encode_ndjson(batches: RowBatches, header: Dict[str, Any],
+                            max_rows: int, max_bytes: int) -> AsyncIterator[bytes]:
+        """
+        Encode row batches as NDJSON: a header line, one line per row and a trailer line
+        with the row count and the limit that truncated the result, if any.
+        """
+        row_count = 0
+        sent_bytes = 0
+        truncated_by: Optional[str] = None
+
+        header_line = SqlResultStreamUtils._to_json_line({"type": "header", **header})
+        sent_bytes += len(header_line)
+        yield header_line
+
+        try:
+            async for batch in batches:
+                chunk = bytearray()
+                for row in batch:
+                    if row_count >= max_rows:
+                        truncated_by = "max_rows"
+                        break
+                    line = SqlResultStreamUtils._to_json_line({"type": "row", "row": row})
+                    if sent_bytes + len(chunk) + len(line) > max_bytes:
+                        truncated_by = "max_bytes"
+                        break
+                    chunk += line
+                    row_count += 1
+
+                if chunk:
+                    sent_bytes += len(chunk)
+                    yield bytes(chunk)
+                if truncated_by:
+                    break
+        except Exception as e:
+            logger.error(f"SQL result stream failed after {row_count} rows: {e}")
+            yield SqlResultStreamUtils._to_json_line({"type": "error", "message": str(e)})
+            return
+        finally:
+            await batches.aclose()
+
+        yield SqlResultStreamUtils._to_json_line({
+            "type": "trailer",
+            "row_count": row_count,
+            "truncated": truncated_by is not None,
+            "truncated_by": truncated_by
+        })
+
+    @staticmethod
+    async def encode_arrow(batches: RowBatches, metadata: Dict[str, Any],
+                           max_rows: int, max_bytes: int) -> AsyncIterator[bytes]:
+        """
+        Encode row batches as an Arrow IPC stream, one record batch per fetched batch.
+        The schema is inferred from the first batches, the header fields and limits are
+        attached as schema metadata. Arrow streams have no trailer, the last record batch is
+        empty and carries the NDJSON trailer fields (row_count, truncated, truncated_by) as
+        its custom metadata, read with RecordBatchStreamReader.read_next_batch_with_custom_metadata.
+
+        Batches are held back while a column is NULL in every row so far, and column types
+        are promoted across the held batches. Later batches are cast to the sent schema; a
+        batch that cannot be cast aborts the stream without its end-of-stream marker, so the
+        client fails to read it instead of receiving a silently truncated result.
+        """
+        pa = SqlResultStreamUtils._import_pyarrow()
+
+        sink = io.BytesIO()
+        writer = None
+        schema = None
+        held_batches: List[List[Dict[str, Any]]] = []
+        held_rows = 0
+        row_count = 0
+        sent_bytes = 0
+        truncated_by: Optional[str] = None
+
+        def _drain() -> bytes:
+            data = sink.getvalue()
+            sink.seek(0)
+            sink.truncate()
+            return data
+
+        def _schema_metadata() -> Dict[str, str]:
+            return {
+                key: json.dumps(value, default=str)
+                for key, value in {**metadata, "max_rows": max_rows, "max_bytes": max_bytes}.items()
+            }
+
+        def _infer_schema() -> Any:
+            return pa.unify_schemas(
+                [pa.Table.from_pylist(held).schema for held in held_batches],
+                promote_options="permissive"
+            ).with_metadata(_schema_metadata())
+
+        def _write(rows: List[Dict[str, Any]]) -> bytes:
+            table = pa.Table.from_pylist(rows)
+            if not table.schema.equals(schema):
+                try:
+                    table = table.select(schema.names).cast(schema)
+                except (pa.ArrowInvalid, pa.ArrowNotImplementedError, KeyError) as e:
+                    logger.error(f"SQL result stream aborted after {row_count} rows, a batch does not fit the Arrow schema: {e}")
+                    raise
+            writer.write_table(table)
+            return _drain()
+
+        def _start() -> bytes:
+            nonlocal writer, schema
+            schema = _infer_schema()
+            writer = pa.ipc.new_stream(sink, schema)
+            return _drain()
+
+        try:
+            async for batch in batches:
+                allowed_rows = max_rows - row_count - held_rows
+                if len(batch) > allowed_rows:
+                    truncated_by = "max_rows"
+                    batch = batch[:allowed_rows]
+                if not batch:
+                    break
+
+                if writer is None:
+                    held_batches.append(batch)
+                    held_rows += len(batch)
+                    if not truncated_by and any(pa.types.is_null(field.type) for field in _infer_schema()):
+                        continue
+                    schema_message = _start()
+                    sent_bytes += len(schema_message)
+                    yield schema_message
+                    pending, held_batches, held_rows = held_batches, [], 0
+                else:
+                    pending = [batch]
+
+                for rows in pending:
+                    data = _write(rows)
+                    # A batch over the byte cap is dropped whole, the stream stays readable without it
+                    if sent_bytes + len(data) > max_bytes:
+                        truncated_by = "max_bytes"
+                        break
+                    sent_bytes += len(data)
+                    row_count += len(rows)
+                    yield data
+                if truncated_by:
+                    break
+        finally:
+            await batches.aclose()
+
+        if writer is None and held_batches:
+            # The result ended while a column was still NULL in every row
+            yield _start()
+            for rows in held_batches:
+                data = _write(rows)
+                if sent_bytes + len(data) > max_bytes:
+                    truncated_by = "max_bytes"
+                    break
+                sent_bytes += len(data)
+                row_count += len(rows)
+                yield data
+        if writer is None:
+            schema = pa.schema([]).with_metadata(_schema_metadata())
+            writer = pa.ipc.new_stream(sink, schema)
+        writer.write_batch(pa.RecordBatch.from_pylist([], schema=schema), custom_metadata={
+            key: json.dumps(value)
+            for key, value in {"type": "trailer", "row_count": row_count,
+                               "truncated": truncated_by is not None, "truncated_by": truncated_by}.items()
+        })
+        writer.close()
+        yield _drain()
+
+    @staticmethod
+    def _to_json_line(payload: Dict[str, Any]) -> bytes:
+        return (json.dumps(payload, default=str) + "\n").encode("utf-8")
+
+    @staticmethod
+    def _import_pyarrow():
+        try:
+            import pyarrow as pa
+            import pyarrow.ipc  # noqa: F401
+        except ImportError:
+            raise HTTPException(
+                status_code=400,
+                detail="Arrow streaming is not available, pyarrow is not installed."
+            )
+        return pa
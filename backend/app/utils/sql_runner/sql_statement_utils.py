@@ -0,0 +1,143 @@
+import re
+from typing import Optional, Set
+
+_SELECT_START_PATTERN = re.compile(r"^\s*\(*\s*(SELECT|WITH)\b", re.IGNORECASE)
+# Not followed by a parenthesis, REPLACE() and MySQL's INSERT() are string functions
+_DATA_MODIFYING_PATTERN = re.compile(r"\b(INSERT|UPDATE|DELETE|MERGE|REPLACE)\b(?!\s*\()", re.IGNORECASE)
+_ORDER_BY_PATTERN = re.compile(r"\bORDER\s+BY\b", re.IGNORECASE)
+_LIMIT_PATTERN = re.compile(r"\bLIMIT\b", re.IGNORECASE)
+# LIMIT count, LIMIT count OFFSET skip or MySQL's LIMIT skip, count, ending the statement
+_TRAILING_LIMIT_PATTERN = re.compile(
+    r"\s+LIMIT\s+(\d+)(?:\s*,\s*(\d+))?(?:\s+OFFSET\s+\d+)?\s*$", re.IGNORECASE
+)
+# Clauses a LIMIT cannot simply be appended after
+_LIMIT_BLOCKING_PATTERN = re.compile(r"\b(OFFSET|FETCH|FOR\s+UPDATE|FOR\s+SHARE|LOCK\s+IN)\b", re.IGNORECASE)
+# String literals and comments are skipped, quoted and bare identifiers are captured
+_TOKEN_PATTERN = re.compile(
+    r"'(?:[^']|'')*'?|--[^\n]*|/\*.*?(?:\*/|$)"
+    r'|"((?:[^"]|"")*)"?|`((?:[^`]|``)*)`?|\[([^\]]*)\]?'
+    r"|([A-Za-z_][\w$]*)|(\*)|([.,(])",
+    re.DOTALL
+)
+# Tokens after which a * selects every column instead of multiplying
+_WILDCARD_PRECEDING_TOKENS = {"select", "distinct", "all", ",", "."}
+
+class SqlStatementUtils:
+    """
+    Clause lookups on the top level of a generated SQL statement, outside of parentheses,
+    string literals, quoted identifiers and comments, so that subqueries, window functions
+    and CTE bodies are not mistaken for clauses of the statement itself.
+    """
+
+    @staticmethod
+    def mask_nested(sql: str) -> str:
+        """
+        Return the statement with everything inside parentheses, quotes and comments replaced
+        by spaces. The outer parentheses are kept and positions match the original statement.
+        """
+        masked = list(sql)
+        depth = 0
+        index = 0
+        while index < len(sql):
+            char = sql[index]
+            if char in ("'", '"', "`"):
+                end = index + 1
+                while end < len(sql):
+                    if sql[end] == char:
+                        # A doubled quote is an escaped quote inside the literal
+                        if end + 1 < len(sql) and sql[end + 1] == char:
+                            end += 2
+                            continue
+                        break
+                    end += 1
+                masked[index:end + 1] = " " * (min(end, len(sql) - 1) - index + 1)
+                index = end + 1
+                continue
+            if sql.startswith("--", index) or sql.startswith("/*", index):
+                end = sql.find("\n" if char == "-" else "*/", index + 2)
+                end = len(sql) if end == -1 else end + (0 if char == "-" else 2)
+                masked[index:end] = " " * (end - index)
+                index = end
+                continue
+            if char == "(":
+                depth += 1
+                if depth > 1:
+                    masked[index] = " "
+            elif char == ")":
+                depth -= 1
+                if depth > 0:
+                    masked[index] = " "
+            elif depth > 0:
+                masked[index] = " "
+            index += 1
+        return "".join(masked)
+
+    @staticmethod
+    def is_select(sql: str) -> bool:
+        """
+        Whether the statement only reads rows, a SELECT or a WITH ... SELECT.
+        """
+        if not _SELECT_START_PATTERN.match(sql):
+            return False
+        return not _DATA_MODIFYING_PATTERN.search(SqlStatementUtils.mask_nested(sql))
+
+    @staticmethod
+    def get_order_by(sql: str) -> Optional[str]:
+        """
+        Return the items of the statement's top-level ORDER BY, without a trailing LIMIT, or
+        None when the statement has none.
+        """
+        masked = SqlStatementUtils.mask_nested(sql)
+        matches = list(_ORDER_BY_PATTERN.finditer(masked))
+        if not matches:
+            return None
+        end = len(sql)
+        limit = _TRAILING_LIMIT_PATTERN.search(masked, matches[-1].end())
+        if limit:
+            end = limit.start()
+        return sql[matches[-1].end():end].strip()
+
+    @staticmethod
+    def with_limit(sql: str, limit: int) -> Optional[str]:
+        """
+        Cap the rows the statement returns at limit by appending a LIMIT, or lowering the count
+        of its trailing LIMIT. Returns None when the statement has a LIMIT, OFFSET or locking
+        clause this cannot be done for in place.
+        """
+        masked = SqlStatementUtils.mask_nested(sql)
+        trailing_limit = _TRAILING_LIMIT_PATTERN.search(masked)
+        if trailing_limit:
+            group = 2 if trailing_limit.group(2) else 1
+            count = min(int(trailing_limit.group(group)), int(limit))
+            return f"{sql[:trailing_limit.start(group)]}{count}{sql[trailing_limit.end(group):]}"
+        if _LIMIT_PATTERN.search(masked) or _LIMIT_BLOCKING_PATTERN.search(masked):
+            return None
+        return f"{sql.rstrip()} LIMIT {int(limit)}"
+
+    @staticmethod
+    def get_identifiers(sql: str) -> Set[str]:
+        """
+        Return the lower-cased words and quoted identifiers of the statement outside of string
+        literals and comments, keywords included. Contains "*" when the statement selects all
+        columns of a table, SELECT * or alias.*.
+        """
+        identifiers = set()
+        previous_token = None
+        for match in _TOKEN_PATTERN.finditer(sql):
+            quoted_double, quoted_backtick, quoted_bracket, word, wildcard, punctuation = match.groups()
+            if wildcard:
+                if previous_token in _WILDCARD_PRECEDING_TOKENS:
+                    identifiers.add("*")
+                previous_token = "*"
+                continue
+            if punctuation:
+                previous_token = punctuation
+                continue
+            identifier = next((token for token in (quoted_double, quoted_backtick, quoted_bracket, word) if token is not None), None)
+            if identifier is None:
+                # String literal or comment
+                previous_token = None
+                continue
+            previous_token = identifier.lower()
+            identifiers.add(previous_token)
+        return identifiers
@@ -7,6 +7,7 @@ from typing import Dict
 from model.tenant.tenant import Tenant
 from model.tenant.setting import Setting
 from config import settings
+from utils.cache.tenant_cache import tenant_cache
 
 _DEFAULT_SETTINGS_PATH = '/app/resources/settings/default_settings.json'
 
@@ -95,6 +96,7 @@ class SettingUtils:
                 status_code=400,
                 detail="Failed to initialize default settings for tenant"
             )
+        await tenant_cache.mark_modified(tenant_id)
 
         return {"settings": tenant.settings}
 
@@ -1,6 +1,7 @@
 import secrets
 
 from utils.database import mongodb
+from utils.cache.tenant_cache import tenant_cache
 from fastapi import HTTPException
 
 from model.authentication.admin_user import AdminUser
@@ -36,6 +37,7 @@ class TenantUtils:
                 status_code=400,
                 detail="Failed to initialize default admins for tenant"
             )
+        await tenant_cache.mark_modified(tenant_id)
 
         return {"message": "Default admins initialized successfully"}
 
@@ -93,3 +95,4 @@ class TenantUtils:
                 status_code=400,
                 detail="Failed to initialize tokens for tenant"
             )
+        await tenant_cache.mark_modified(tenant_id)
@@ -0,0 +1,148 @@
+import contextlib
+import importlib.util
+import json
+import logging
+import threading
+from typing import Any, Dict, Iterator, Optional, Sequence
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+OTLP_TRACE_EXPORTER = "otlp"
+FILE_TRACE_EXPORTER = "file"
+
+TRACER_NAME = "sqlexecutor"
+
+def _find_module(name: str) -> bool:
+    try:
+        return importlib.util.find_spec(name) is not None
+    except ModuleNotFoundError:
+        return False
+
+if _find_module("opentelemetry.sdk"):
+    from opentelemetry import trace
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor, SpanExportResult
+    from opentelemetry.sdk.trace.sampling import ParentBasedTraceIdRatio
+else:
+    trace = None
+
+class _NoopSpan:
+    """
+    Stands in for a span when tracing is disabled or OpenTelemetry is not installed.
+    """
+
+    def set_attribute(self, key: str, value: Any):
+        pass
+
+    def update_name(self, name: str):
+        pass
+
+    def set_attributes(self, attributes: Dict[str, Any]):
+        pass
+
+    def record_exception(self, exception: BaseException, **kwargs):
+        pass
+
+_NOOP_SPAN = _NoopSpan()
+
+class FileSpanExporter:
+    """
+    Span exporter appending each finished span as one JSON line to a local file, for reading the
+    traces of a single instance without an OTLP collector.
+    """
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self._lock = threading.Lock()
+
+    def export(self, spans: Sequence[Any]):
+        lines = [json.dumps(json.loads(span.to_json())) for span in spans]
+        with self._lock, open(self.file_path, "a", encoding="utf-8") as trace_file:
+            trace_file.write("".join(f"{line}\n" for line in lines))
+        return SpanExportResult.SUCCESS
+
+    def shutdown(self):
+        pass
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        return True
+
+class TracingState:
+    def __init__(self):
+        self.enabled = False
+        self.provider = None
+
+tracing_state = TracingState()
+
+def configure_tracing() -> bool:
+    """
+    Install the process tracer provider and the MongoDB command instrumentation. Must run before
+    the MongoDB client is created. Returns whether tracing is enabled, tracing stays off with a
+    warning when the OpenTelemetry SDK or the selected exporter is not installed.
+    """
+    if not settings.TRACING_ENABLED or tracing_state.enabled:
+        return tracing_state.enabled
+    if trace is None:
+        logger.warning("TRACING_ENABLED is set but opentelemetry-sdk is not installed, tracing is disabled")
+        return False
+
+    exporter = _build_exporter()
+    if exporter is None:
+        return False
+
+    provider = TracerProvider(
+        resource=Resource.create({"service.name": settings.APP_NAME, "service.version": settings.APP_VERSION}),
+        sampler=ParentBasedTraceIdRatio(settings.TRACING_SAMPLE_RATIO)
+    )
+    provider.add_span_processor(BatchSpanProcessor(exporter))
+    trace.set_tracer_provider(provider)
+
+    # Motor runs its commands through pymongo, so the pymongo command listener covers it
+    if _find_module("opentelemetry.instrumentation.pymongo"):
+        from opentelemetry.instrumentation.pymongo import PymongoInstrumentor
+        PymongoInstrumentor().instrument()
+
+    tracing_state.enabled = True
+    tracing_state.provider = provider
+    logger.info(f"Tracing enabled with the {settings.TRACING_EXPORTER} exporter")
+    return True
+
+def shutdown_tracing():
+    if tracing_state.provider is not None:
+        tracing_state.provider.shutdown()
+    tracing_state.enabled = False
+    tracing_state.provider = None
+
+def _build_exporter():
+    if settings.TRACING_EXPORTER == FILE_TRACE_EXPORTER:
+        return FileSpanExporter(settings.TRACING_FILE_PATH)
+    if settings.TRACING_EXPORTER == OTLP_TRACE_EXPORTER:
+        if not _find_module("opentelemetry.exporter.otlp.proto.http"):
+            logger.warning("opentelemetry-exporter-otlp-proto-http is not installed, tracing is disabled")
+            return None
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        # Without an endpoint the exporter reads OTEL_EXPORTER_OTLP_ENDPOINT
+        return OTLPSpanExporter(endpoint=settings.TRACING_OTLP_ENDPOINT) if settings.TRACING_OTLP_ENDPOINT else OTLPSpanExporter()
+    logger.warning(f"Unknown TRACING_EXPORTER '{settings.TRACING_EXPORTER}', tracing is disabled")
+    return None
+
+@contextlib.contextmanager
+def start_span(name: str, attributes: Optional[Dict[str, Any]] = None) -> Iterator[Any]:
+    """
+    Start a span as a child of the current one. Attributes set to None are left out. Yields a
+    no-op span when tracing is disabled, so callers set attributes unconditionally.
+    """
+    if not tracing_state.enabled:
+        yield _NOOP_SPAN
+        return
+    with trace.get_tracer(TRACER_NAME).start_as_current_span(name, attributes=_drop_none(attributes)) as span:
+        yield span
+
+def set_span_attributes(span: Any, attributes: Dict[str, Any]):
+    span.set_attributes(_drop_none(attributes))
+
+def _drop_none(attributes: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    return {key: value for key, value in (attributes or {}).items() if value is not None}
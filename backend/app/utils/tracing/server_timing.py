@@ -0,0 +1,70 @@
+import re
+import time
+from contextvars import ContextVar
+from typing import Dict, Iterable, List, Optional
+
+from fastapi import Request
+
+from config import settings
+from model.responses.sql_generation.stage_timing import StageTiming
+from utils.tracing.otel_tracing import start_span, set_span_attributes
+
+SERVER_TIMING_HEADER = "Server-Timing"
+
+_INVALID_METRIC_NAME_PATTERN = re.compile(r"[^A-Za-z0-9_.-]")
+
+# Stage timings of the pipelines run for the current request, set by trace_request
+_request_timings: ContextVar[Optional[List[StageTiming]]] = ContextVar("request_timings", default=None)
+
+def record_stage_timings(timings: Iterable[StageTiming]):
+    """
+    Add pipeline stage timings to the Server-Timing header of the current request, if any.
+    """
+    request_timings = _request_timings.get()
+    if request_timings is not None:
+        request_timings.extend(timings)
+
+def format_server_timing(timings: Iterable[StageTiming], total_ms: Optional[float] = None) -> str:
+    """
+    Format stage timings as a Server-Timing header value. Stages run by several pipelines of
+    the request, like the items of a batch, are summed under one metric.
+    """
+    durations: Dict[str, float] = {}
+    for timing in timings:
+        metric_name = _INVALID_METRIC_NAME_PATTERN.sub("_", timing.stage)
+        durations[metric_name] = durations.get(metric_name, 0.0) + timing.duration_ms
+    metrics = [f"{metric_name};dur={round(duration, 3)}" for metric_name, duration in durations.items()]
+    if total_ms is not None:
+        metrics.append(f"total;dur={round(total_ms, 3)}")
+    return ", ".join(metrics)
+
+async def trace_request(request: Request, call_next):
+    """
+    HTTP middleware wrapping each request in a server span labelled with the route, tenant_id and
+    schema_name, and returning the stage timings of the pipelines it ran in a Server-Timing header.
+    """
+    request_timings: List[StageTiming] = []
+    token = _request_timings.set(request_timings)
+    started_at = time.perf_counter()
+    try:
+        with start_span(f"{request.method} {request.url.path}", {"http.method": request.method}) as span:
+            response = await call_next(request)
+            # Path parameters and the matched route are only known once the router ran
+            route = request.scope.get("route")
+            path_params = request.scope.get("path_params") or {}
+            if route is not None:
+                span.update_name(f"{request.method} {route.path}")
+            set_span_attributes(span, {
+                "http.route": getattr(route, "path", None),
+                "http.status_code": response.status_code,
+                "tenant_id": path_params.get("tenant_id"),
+                "schema_name": path_params.get("schema_name")
+            })
+    finally:
+        _request_timings.reset(token)
+
+    if settings.SERVER_TIMING_ENABLED and request_timings:
+        response.headers[SERVER_TIMING_HEADER] = format_server_timing(
+            request_timings, total_ms=(time.perf_counter() - started_at) * 1000
+        )
+    return response
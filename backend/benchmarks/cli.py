@@ -0,0 +1,191 @@
+"""
+Benchmark CLI. Every command prints one JSON document with the run metadata (git commit, Python
+version, parameters) and its results, or writes it to --output, so runs on two commits can be
+compared with the compare command.
+
+Usage, from the backend directory:
+    PYTHONPATH=app python -m benchmarks.cli resolvers --tables 10 --tables 100 --output before.json
+    PYTHONPATH=app python -m benchmarks.cli resolvers --tables 10 --tables 100 --output after.json
+    PYTHONPATH=app python -m benchmarks.cli compare before.json after.json --threshold 1.2
+"""
+import json
+import logging
+import platform
+import subprocess
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import typer
+
+from benchmarks import access_control_benchmark, condition_benchmark, resolver_benchmark, schema_prompt_benchmark
+
+app = typer.Typer(help="Micro-benchmarks of the SQL generation hot paths on synthetic schemas and rulesets.")
+
+# Fields left out when matching results across runs, the timings and what is derived from them or from the run length
+_TIMING_SUFFIXES = ("_ms", "_us")
+_DERIVED_FIELDS = {"speedup", "tokens_vs_json", "result", "repeat"}
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def _emit(benchmark: str, parameters: Dict[str, Any], results: List[Dict[str, Any]], output: Optional[Path]):
+    document = {
+        "benchmark": benchmark,
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "parameters": parameters,
+        "results": results,
+    }
+    content = json.dumps(document, indent=2)
+    if output is None:
+        typer.echo(content)
+    else:
+        output.write_text(content + "\n", encoding="utf-8")
+        typer.echo(f"Wrote {len(results)} results to {output}", err=True)
+
+@app.callback()
+def main():
+    # Debug logging of the resolvers would dominate the timings
+    logging.disable(logging.INFO)
+
+@app.command()
+def resolvers(
+    tables: List[int] = typer.Option([10, 100], help="Tables per schema, repeat the option for several sizes."),
+    columns: List[int] = typer.Option([20], help="Columns per table, repeat the option for several sizes."),
+    synonyms: int = typer.Option(1, help="Synonyms per table and per column."),
+    groups: int = typer.Option(10, help="Group access policies of the ruleset."),
+    injectors: int = typer.Option(10, help="Injectors of the ruleset."),
+    schemas: int = typer.Option(5, help="Schemas of the tenant, for schema discovery."),
+    scope_tables: int = typer.Option(5, help="Tables named by the QueryScope."),
+    repeat: int = typer.Option(50, help="Timed calls per resolver and size."),
+    resolver: List[str] = typer.Option([], help=f"Resolvers to run, all by default: {', '.join(resolver_benchmark.RESOLVERS)}."),
+    output: Optional[Path] = typer.Option(None, help="Write the JSON document to this file instead of stdout."),
+):
+    """
+    Time each resolver in isolation on synthetic schemas and rulesets.
+    """
+    parameters = {
+        "tables": tables, "columns": columns, "synonyms": synonyms, "groups": groups, "injectors": injectors,
+        "schemas": schemas, "scope_tables": scope_tables, "repeat": repeat, "resolvers": resolver or resolver_benchmark.RESOLVERS
+    }
+    try:
+        results = resolver_benchmark.run_benchmark(
+            tables, columns, synonym_count=synonyms, group_count=groups, injector_count=injectors,
+            schema_count=schemas, scope_table_count=scope_tables, repeat=repeat, resolvers=resolver or None
+        )
+    except ValueError as e:
+        raise typer.BadParameter(str(e), param_hint="--resolver")
+    _emit("resolvers", parameters, results, output)
+
+@app.command("access-control")
+def access_control(
+    groups: List[int] = typer.Option([10, 100, 500], help="Group access policies, repeat the option for several sizes."),
+    columns: List[int] = typer.Option([20, 200], help="Columns per table, repeat the option for several sizes."),
+    tables: int = typer.Option(20),
+    scope_tables: int = typer.Option(5),
+    repeat: int = typer.Option(50),
+    skip_per_column: bool = typer.Option(False, help="Skip the per-column baseline."),
+    output: Optional[Path] = typer.Option(None),
+):
+    """
+    Compiled AccessControlResolver against the per-column baseline.
+    """
+    parameters = {"groups": groups, "columns": columns, "tables": tables, "scope_tables": scope_tables, "repeat": repeat}
+    results = access_control_benchmark.run_benchmark(
+        groups, columns, tables, scope_tables, repeat, include_per_column=not skip_per_column
+    )
+    _emit("access-control", parameters, results, output)
+
+@app.command()
+def conditions(
+    repeat: int = typer.Option(5000),
+    output: Optional[Path] = typer.Option(None),
+):
+    """
+    Compiled ruleset conditions against the eval of the substituted condition text.
+    """
+    _emit("conditions", {"repeat": repeat}, condition_benchmark.run_benchmark(repeat), output)
+
+@app.command("schema-prompt")
+def schema_prompt(
+    tables: List[int] = typer.Option([10, 50]),
+    columns: List[int] = typer.Option([20, 100]),
+    repeat: int = typer.Option(20),
+    model_latency: bool = typer.Option(False, help="Also time one model call per encoding, needs OPENAI_API_KEY."),
+    output: Optional[Path] = typer.Option(None),
+):
+    """
+    Size and encoding time of the schema prompt encodings.
+    """
+    parameters = {"tables": tables, "columns": columns, "repeat": repeat, "model_latency": model_latency}
+    results = schema_prompt_benchmark.run_benchmark(tables, columns, repeat, model_latency=model_latency)
+    _emit("schema-prompt", parameters, results, output)
+
+def _result_key(result: Dict[str, Any]) -> Tuple:
+    return tuple(sorted(
+        (field, json.dumps(value)) for field, value in result.items()
+        if not field.endswith(_TIMING_SUFFIXES) and field not in _DERIVED_FIELDS
+    ))
+
+def _median_field(result: Dict[str, Any]) -> Optional[str]:
+    return next((field for field in result if field.endswith(("median_ms", "median_us"))), None)
+
+def compare_results(baseline: List[Dict[str, Any]], current: List[Dict[str, Any]], threshold: float,
+                    min_delta_ms: float = 0.0) -> List[Dict[str, Any]]:
+    """
+    Match the results of two runs on everything but their timings and return the ratio of the
+    first median timing of each. A result regressed when the ratio is above threshold and the
+    median grew by more than min_delta_ms, the calls of a few microseconds vary more than that
+    between identical runs.
+    """
+    baseline_by_key = {_result_key(result): result for result in baseline}
+    comparisons = []
+    for result in current:
+        previous = baseline_by_key.get(_result_key(result))
+        field = _median_field(result)
+        if previous is None or field is None or field not in previous:
+            continue
+        ratio = result[field] / max(previous[field], 1e-9)
+        delta_ms = (result[field] - previous[field]) / (1000 if field.endswith("_us") else 1)
+        comparisons.append({
+            **{key: value for key, value in result.items() if not key.endswith(_TIMING_SUFFIXES) and key not in _DERIVED_FIELDS},
+            "field": field,
+            "baseline": previous[field],
+            "current": result[field],
+            "ratio": round(ratio, 3),
+            "regression": ratio > threshold and delta_ms > min_delta_ms,
+        })
+    return comparisons
+
+@app.command()
+def compare(
+    baseline: Path = typer.Argument(..., exists=True, dir_okay=False, help="JSON document of the baseline run."),
+    current: Path = typer.Argument(..., exists=True, dir_okay=False, help="JSON document of the run to check."),
+    threshold: float = typer.Option(1.2, help="Median ratio above which a result is a regression."),
+    min_delta_ms: float = typer.Option(0.05, help="Smallest growth of the median, in milliseconds, counted as a regression."),
+):
+    """
+    Compare two runs of the same command, exits with status 1 when a result regressed.
+    """
+    baseline_document = json.loads(baseline.read_text(encoding="utf-8"))
+    current_document = json.loads(current.read_text(encoding="utf-8"))
+    comparisons = compare_results(baseline_document["results"], current_document["results"], threshold, min_delta_ms)
+    typer.echo(json.dumps({
+        "baseline_commit": baseline_document.get("git_commit"),
+        "current_commit": current_document.get("git_commit"),
+        "threshold": threshold,
+        "min_delta_ms": min_delta_ms,
+        "comparisons": comparisons,
+    }, indent=2))
+    if any(comparison["regression"] for comparison in comparisons):
+        raise typer.Exit(code=1)
+
+if __name__ == "__main__":
+    app()
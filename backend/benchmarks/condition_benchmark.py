@@ -0,0 +1,82 @@
+"""
+Benchmark of ruleset condition evaluation on representative conditions.
+
+The compiled path (RulesetConditionsService.evaluate_ruleset_condition) is compared against the
+text path the resolvers used before it, which substitutes the named conditions and session fields
+into the condition text, normalizes it and evaluates it with eval on every call.
+
+Usage, from the backend directory:
+    PYTHONPATH=app python -m benchmarks.condition_benchmark --repeat 20000
+"""
+import argparse
+import json
+import logging
+import statistics
+import time
+from typing import Any, Callable, Dict, List
+
+from api.core.services.ruleset.ruleset_conditions_service import RulesetConditionsService
+from benchmarks.synthetic import build_session
+
+CONDITIONS = {
+    "is_active": "${jwt.custom_fields.active} == 'TRUE' OR ${jwt.custom_fields.active} == True",
+    "is_admin": "'admin' IN ${jwt.roles}",
+    "can_read": "${jwt.custom_fields.permissions} IN [['read_only'], ['read_write']]",
+}
+
+CASES = {
+    "literal": "TRUE",
+    "named": "${conditions.is_admin}",
+    "membership": "'viewer' IN ${jwt.roles} AND ${jwt.custom_fields.region} IN ['eu', 'us']",
+    "composite": "${conditions.is_active} AND (${conditions.is_admin} OR ${conditions.can_read})",
+}
+
+def _text_evaluate(condition: str, session_data: dict, conditions_dict: Dict[str, str]) -> Any:
+    resolved_condition = RulesetConditionsService.resolve_condition(condition, session_data, conditions_dict)
+    return eval(resolved_condition)
+
+def _time_calls(evaluate: Callable, condition: str, session_data: dict, repeat: int) -> List[float]:
+    durations = []
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        evaluate(condition, session_data, CONDITIONS)
+        durations.append((time.perf_counter() - started_at) * 1_000_000)
+    return durations
+
+def run_benchmark(repeat: int) -> List[Dict[str, Any]]:
+    session = build_session()
+    session_data = session.dict()
+    session_data["roles"] = ["viewer", "admin"]
+    session_data["custom_fields"].update({"region": "eu", "permissions": ["read_only"]})
+
+    results = []
+    for case_name, condition in CASES.items():
+        expected = _text_evaluate(condition, session_data, CONDITIONS)
+        actual = RulesetConditionsService.evaluate_ruleset_condition(condition, session_data, CONDITIONS)
+        if actual != expected:
+            raise AssertionError(f"Compiled result {actual!r} differs from eval result {expected!r} for '{condition}'")
+
+        compiled = _time_calls(RulesetConditionsService.evaluate_ruleset_condition, condition, session_data, repeat)
+        text = _time_calls(_text_evaluate, condition, session_data, repeat)
+        results.append({
+            "benchmark": "ruleset_condition",
+            "case": case_name,
+            "result": actual,
+            "compiled_median_us": round(statistics.median(compiled), 2),
+            "eval_median_us": round(statistics.median(text), 2),
+            "speedup": round(statistics.median(text) / max(statistics.median(compiled), 1e-6), 1),
+        })
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5000)
+    args = parser.parse_args()
+
+    # Debug logging of the condition service would dominate the timings
+    logging.disable(logging.INFO)
+    for result in run_benchmark(args.repeat):
+        print(json.dumps(result))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+Benchmark of each resolver of the SQL generation pipeline in isolation on synthetic schemas and
+rulesets: QueryScopeResolver, SchemaDiscoveryService, AccessControlResolver,
+RulesetConditionsService, SchemaResolver and InjectorResolver.
+
+Inputs are built once per size outside the timed section, resolvers that mutate their input get
+a fresh copy before every call. Run it through the benchmark CLI:
+    PYTHONPATH=app python -m benchmarks.cli resolvers --tables 10 --tables 100 --columns 20
+"""
+import statistics
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from api.core.resolvers.query_scope.query_scope_resolver import QueryScopeResolver
+from api.core.resolvers.access_control.user_access_control_resolver import AccessControlResolver
+from api.core.resolvers.access_control.injector_resolver import InjectorResolver
+from api.core.resolvers.schema.schema_resolver import SchemaResolver
+from api.core.services.schema.schema_discovery_service import SchemaDiscoveryService
+from api.core.services.ruleset.ruleset_conditions_service import RulesetConditionsService
+from utils.schema.schema_entity_index import SchemaEntityIndex
+from benchmarks.synthetic import (
+    build_query_scope, build_ruleset, build_schema, build_schema_tables, build_session, build_tenant, table_name
+)
+
+QUERY_SCOPE_RESOLVER = "query_scope"
+SCHEMA_DISCOVERY = "schema_discovery"
+SCHEMA_ENTITY_INDEX = "schema_entity_index"
+ACCESS_CONTROL_RESOLVER = "access_control"
+RULESET_CONDITIONS = "ruleset_conditions"
+SCHEMA_RESOLVER = "schema_resolver"
+INJECTOR_RESOLVER = "injector"
+
+RESOLVERS = [
+    QUERY_SCOPE_RESOLVER, SCHEMA_DISCOVERY, SCHEMA_ENTITY_INDEX, ACCESS_CONTROL_RESOLVER,
+    RULESET_CONDITIONS, SCHEMA_RESOLVER, INJECTOR_RESOLVER
+]
+
+def _time_calls(call: Callable[[Any], Any], prepare: Callable[[], Any], repeat: int) -> List[float]:
+    durations = []
+    for _ in range(repeat):
+        argument = prepare()
+        started_at = time.perf_counter()
+        call(argument)
+        durations.append((time.perf_counter() - started_at) * 1000)
+    return durations
+
+def _summarize(durations: List[float]) -> Dict[str, float]:
+    ordered = sorted(durations)
+    return {
+        "median_ms": round(statistics.median(ordered), 4),
+        "p95_ms": round(ordered[int(0.95 * (len(ordered) - 1))], 4),
+        "min_ms": round(ordered[0], 4),
+    }
+
+def _build_cases(table_count: int, column_count: int, synonym_count: int, group_count: int,
+                 injector_count: int, schema_count: int, scope_table_count: int) -> Dict[str, Any]:
+    """
+    Callables of every resolver, each a (call, prepare) pair where prepare returns the argument of call.
+    """
+    session = build_session()
+    session_data = session.dict()
+    tenant = build_tenant()
+    schema = build_schema(table_count, column_count, synonym_count=synonym_count)
+    ruleset = build_ruleset(table_count, column_count, group_count, injector_count=injector_count)
+    query_scope = build_query_scope(min(scope_table_count, table_count), column_count)
+    # Questions name the tables by synonym, so the resolver has to map them back
+    synonym_query_scope = query_scope.copy(deep=True)
+    synonym_query_scope.entities.tables = [f"entity_{table_index}" for table_index in range(len(query_scope.entities.tables))]
+    synonym_query_scope.entities.columns = [
+        f"entity_{table_index}.{column.split('.', 1)[1]}"
+        for table_index, table in enumerate(query_scope.entities.tables)
+        for column in query_scope.entities.columns if column.startswith(f"{table}.")
+    ]
+    schema_tables = build_schema_tables(schema_count, table_count, column_count, synonym_count=synonym_count)
+    schema_index = SchemaEntityIndex(schema_tables)
+    group_conditions = [group.criteria.condition for group in (ruleset.group_access_policy or {}).values()]
+    sql_query = f"SELECT * FROM {table_name(0)};"
+
+    return {
+        QUERY_SCOPE_RESOLVER: (
+            lambda scope: QueryScopeResolver(session_data=session, settings={}, query_scope=scope, tenant=tenant).resolve_query_scope(schema),
+            lambda: synonym_query_scope.copy(deep=True)
+        ),
+        SCHEMA_DISCOVERY: (
+            lambda scope: SchemaDiscoveryService.get_best_matching_schemas(scope, schema_index, tenant_settings={}),
+            lambda: query_scope
+        ),
+        SCHEMA_ENTITY_INDEX: (
+            lambda tables: SchemaEntityIndex(tables),
+            lambda: schema_tables
+        ),
+        ACCESS_CONTROL_RESOLVER: (
+            lambda scope: AccessControlResolver(session_data=session, ruleset=ruleset, matched_schema=schema).has_access_to_scope(scope),
+            lambda: query_scope.copy(deep=True)
+        ),
+        RULESET_CONDITIONS: (
+            lambda conditions: [
+                RulesetConditionsService.evaluate_ruleset_condition(condition, session_data, ruleset.conditions)
+                for condition in conditions
+            ],
+            lambda: group_conditions
+        ),
+        SCHEMA_RESOLVER: (
+            lambda scope: SchemaResolver(session_data=session, tenant=tenant, matched_schema=schema, query_scope=scope).resolve_schema(),
+            lambda: query_scope
+        ),
+        INJECTOR_RESOLVER: (
+            lambda query: InjectorResolver(session_data=session, ruleset=ruleset).apply_injectors(query, tenant),
+            lambda: sql_query
+        ),
+    }
+
+def run_benchmark(table_counts: List[int], column_counts: List[int], synonym_count: int = 1,
+                  group_count: int = 10, injector_count: int = 10, schema_count: int = 5,
+                  scope_table_count: int = 5, repeat: int = 50,
+                  resolvers: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    selected = resolvers or RESOLVERS
+    unknown = [resolver for resolver in selected if resolver not in RESOLVERS]
+    if unknown:
+        raise ValueError(f"Unknown resolvers: {', '.join(unknown)}. Choose from {', '.join(RESOLVERS)}")
+
+    results = []
+    for table_count in table_counts:
+        for column_count in column_counts:
+            cases = _build_cases(table_count, column_count, synonym_count, group_count,
+                                 injector_count, schema_count, scope_table_count)
+            for resolver in selected:
+                call, prepare = cases[resolver]
+                # One untimed call warms the compiled conditions and lookup indexes kept on the models
+                call(prepare())
+                results.append({
+                    "benchmark": "resolver",
+                    "resolver": resolver,
+                    "tables": table_count,
+                    "columns_per_table": column_count,
+                    "synonyms": synonym_count,
+                    "groups": group_count,
+                    "injectors": injector_count,
+                    "schemas": schema_count,
+                    "scope_tables": min(scope_table_count, table_count),
+                    "repeat": repeat,
+                    **_summarize(_time_calls(call, prepare, repeat)),
+                })
+    return results
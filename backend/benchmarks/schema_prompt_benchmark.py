@@ -0,0 +1,109 @@
+"""
+Benchmark of the schema prompt encodings (SchemaPromptUtils) on synthetic wide schemas.
+
+Every encoding of the resolved schema is compared on its size in characters and tokens and on
+the time to encode it. With --model-latency the SQL generation model is also called once per
+encoding with the same question, which needs OPENAI_API_KEY and spends tokens.
+
+Usage, from the backend directory:
+    PYTHONPATH=app python -m benchmarks.schema_prompt_benchmark --tables 10 50 --columns 20 100
+"""
+import argparse
+import asyncio
+import json
+import logging
+import statistics
+import time
+from typing import Any, Dict, List
+
+from config import settings
+from api.core.resolvers.schema.schema_resolver import SchemaResolver
+from utils.prompt_instructions_utils import DefaultPromptInstructionsUtil
+from utils.llm_wrapper.openai_client import openai_client
+from utils.llm_wrapper.schema_prompt_utils import (
+    SchemaPromptUtils, JSON_SCHEMA_PROMPT_FORMAT, DDL_SCHEMA_PROMPT_FORMAT, COMPACT_SCHEMA_PROMPT_FORMAT, count_tokens
+)
+from benchmarks.synthetic import build_query_scope, build_schema, build_session, build_tenant
+
+SCHEMA_PROMPT_FORMATS = [JSON_SCHEMA_PROMPT_FORMAT, DDL_SCHEMA_PROMPT_FORMAT, COMPACT_SCHEMA_PROMPT_FORMAT]
+
+QUESTION = "List the first column of table_0 with the second column of table_1"
+
+def resolve_schema(table_count: int, column_count: int) -> Dict:
+    return SchemaResolver(
+        session_data=build_session(),
+        tenant=build_tenant(),
+        matched_schema=build_schema(table_count, column_count),
+        query_scope=build_query_scope(table_count, column_count)
+    ).resolve_schema()
+
+async def _time_model_calls(encoded_schemas: List[str]) -> List[float]:
+    durations = []
+    try:
+        for encoded_schema in encoded_schemas:
+            started_at = time.perf_counter()
+            await openai_client.create_chat_completion(
+                model=settings.DEFAULT_APP_LLM_MODEL,
+                messages=[
+                    {"role": "system", "content": f"{DefaultPromptInstructionsUtil.get_sql_generation_instructions()}\nSchema: {encoded_schema}"},
+                    {"role": "user", "content": QUESTION}
+                ],
+                temperature=0,
+                max_tokens=256
+            )
+            durations.append((time.perf_counter() - started_at) * 1000)
+    finally:
+        await openai_client.disconnect()
+    return durations
+
+def run_benchmark(table_counts: List[int], column_counts: List[int], repeat: int,
+                  model_latency: bool = False) -> List[Dict[str, Any]]:
+    results = []
+    encoded_schemas = []
+    for table_count in table_counts:
+        for column_count in column_counts:
+            resolved_schema = resolve_schema(table_count, column_count)
+            json_tokens = None
+            for schema_format in SCHEMA_PROMPT_FORMATS:
+                durations = []
+                for _ in range(repeat):
+                    started_at = time.perf_counter()
+                    encoded_schema = SchemaPromptUtils.encode(resolved_schema, schema_format)
+                    durations.append((time.perf_counter() - started_at) * 1000)
+
+                tokens, counted_with = count_tokens(encoded_schema, settings.DEFAULT_APP_LLM_MODEL)
+                json_tokens = json_tokens or tokens
+                result = {
+                    "benchmark": "schema_prompt",
+                    "format": schema_format,
+                    "tables": table_count,
+                    "columns_per_table": column_count,
+                    "chars": len(encoded_schema),
+                    "tokens": tokens,
+                    "counted_with": counted_with,
+                    "tokens_vs_json": round(tokens / max(json_tokens, 1), 3),
+                    "encode_median_ms": round(statistics.median(durations), 3),
+                }
+                results.append(result)
+                encoded_schemas.append(encoded_schema)
+
+    if model_latency:
+        for result, duration in zip(results, asyncio.run(_time_model_calls(encoded_schemas))):
+            result["model_latency_ms"] = round(duration, 1)
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tables", type=int, nargs="+", default=[10, 50])
+    parser.add_argument("--columns", type=int, nargs="+", default=[20, 100])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--model-latency", action="store_true")
+    args = parser.parse_args()
+
+    # Debug logging of the resolver would dominate the timings
+    logging.disable(logging.INFO)
+    for result in run_benchmark(args.tables, args.columns, args.repeat, model_latency=args.model_latency):
+        print(json.dumps(result))
+
+if __name__ == "__main__":
+    main()
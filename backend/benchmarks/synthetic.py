@@ -0,0 +1,177 @@
+"""
+Synthetic Schema, Ruleset and session generators for the benchmarks.
+Run the benchmarks from the backend directory with PYTHONPATH=app.
+"""
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List
+from uuid import uuid4
+
+from model.schema.schema import Schema
+from model.tenant.tenant import Tenant
+from model.ruleset.ruleset import Ruleset
+from model.query_scope.query_scope import QueryScope
+from model.query_scope.entities import Entities
+from model.external_system_integration.external_user_session_data import ExternalSessionData
+from model.responses.schema.schema_tables_response import SchemaTablesResponse
+
+def table_name(index: int) -> str:
+    return f"table_{index}"
+
+def column_name(index: int) -> str:
+    return f"column_{index}"
+
+def synonyms(prefix: str, index: int, synonym_count: int) -> List[str]:
+    return [f"{prefix}_{index}"] + [f"{prefix}_{index}_alias_{alias_index}" for alias_index in range(1, synonym_count)]
+
+def build_schema(table_count: int, column_count: int, tenant_id: str = "BENCHMARK",
+                 synonym_count: int = 1, schema_name: str = "benchmark_schema") -> Schema:
+    """
+    Schema of table_count tables with column_count columns each, every table joined to the next one.
+    Tables and columns have synonym_count synonyms each.
+    """
+    tables: Dict[str, Any] = {}
+    for table_index in range(table_count):
+        next_table = table_name((table_index + 1) % table_count)
+        tables[table_name(table_index)] = {
+            "description": f"Synthetic table {table_index}",
+            "synonyms": synonyms("entity", table_index, synonym_count),
+            "exclude_description_on_generate_sql": False,
+            "columns": {
+                column_name(column_index): {
+                    "type": "INTEGER" if column_index == 0 else "TEXT",
+                    "description": f"Synthetic column {column_index}",
+                    "constraints": ["PRIMARY KEY"] if column_index == 0 else [],
+                    "synonyms": synonyms("field", column_index, synonym_count),
+                    "exclude_description_on_generate_sql": False,
+                    "is_sensitive_column": column_index == column_count - 1
+                }
+                for column_index in range(column_count)
+            },
+            "relationships": {
+                next_table: {
+                    "description": f"Join to {next_table}",
+                    "table": next_table,
+                    "on": f"{table_name(table_index)}.column_0 = {next_table}.column_0",
+                    "type": "LEFT",
+                    "exclude_description_on_generate_sql": False
+                }
+            } if table_count > 1 else {}
+        }
+
+    return Schema(
+        tenant_id=tenant_id,
+        schema_name=schema_name,
+        description="Synthetic schema for benchmarks",
+        exclude_description_on_generate_sql=False,
+        tables=tables,
+        filter_rules=["benchmark_ruleset"],
+        context_type="sql",
+        context_setting={}
+    )
+
+def build_schema_tables(schema_count: int, table_count: int, column_count: int,
+                        synonym_count: int = 1) -> List[SchemaTablesResponse]:
+    """
+    Table listings of schema_count schemas, as loaded for schema discovery. Every schema has the
+    same table names, only the last one has all the columns named by build_query_scope, so
+    discovery scores every schema before picking it.
+    """
+    schema_tables = []
+    for schema_index in range(schema_count):
+        is_matching_schema = schema_index == schema_count - 1
+        schema_column_count = column_count if is_matching_schema else max(1, column_count // 2)
+        schema = build_schema(table_count, schema_column_count, synonym_count=synonym_count, schema_name=f"schema_{schema_index}")
+        schema_tables.append(SchemaTablesResponse(
+            schema_name=schema.schema_name,
+            tables=[
+                {
+                    "table_name": table_name,
+                    "synonyms": table.synonyms or [],
+                    "columns": [
+                        {"column_name": column_name, "type": column.type, "synonyms": column.synonyms or []}
+                        for column_name, column in table.columns.items()
+                    ]
+                }
+                for table_name, table in schema.tables.items()
+            ]
+        ))
+    return schema_tables
+
+def build_ruleset(table_count: int, column_count: int, group_count: int, tenant_id: str = "BENCHMARK",
+                  injector_count: int = 0) -> Ruleset:
+    """
+    Ruleset with group_count group policies over every table. Only the last group matches
+    the session of build_session, so resolving the group policy scans all of them.
+    Each of the injector_count injectors filters one table on the session's user_id.
+    """
+    all_columns = [column_name(column_index) for column_index in range(column_count)]
+    group_access_policy = {}
+    for group_index in range(group_count):
+        is_matching_group = group_index == group_count - 1
+        group_access_policy[f"group_{group_index}"] = {
+            "description": f"Synthetic group {group_index}",
+            "criteria": {
+                "matching_criteria": {"roles": ["analyst" if is_matching_group else f"role_{group_index}"]},
+                "condition": "${conditions.is_active_user}"
+            },
+            "tables": {
+                table_name(table_index): {"columns": {"allow": all_columns[:-1], "deny": all_columns[-1:]}}
+                for table_index in range(table_count)
+            }
+        }
+
+    return Ruleset(
+        tenant_id=tenant_id,
+        ruleset_name="benchmark_ruleset",
+        connected_schema_name="benchmark_schema",
+        description="Synthetic ruleset for benchmarks",
+        is_ruleset_enabled=True,
+        conditions={"is_active_user": "${jwt.custom_fields.active} == True"},
+        global_access_policy={
+            "tables": {
+                table_name(table_index): {"columns": {"allow": [], "deny": []}, "condition": "True"}
+                for table_index in range(table_count)
+            }
+        },
+        group_access_policy=group_access_policy,
+        injectors={
+            f"injector_{injector_index}": {
+                "enabled": True,
+                "condition": "${conditions.is_active_user}",
+                "tables": {
+                    table_name(injector_index % table_count): {
+                        "filters": f"{table_name(injector_index % table_count)}.column_{injector_index % column_count} = ${{jwt.user_id}}"
+                    }
+                }
+            }
+            for injector_index in range(injector_count)
+        }
+    )
+
+def build_tenant(tenant_id: str = "BENCHMARK") -> Tenant:
+    """
+    Tenant without settings, every resolver runs with its defaults.
+    """
+    return Tenant(tenant_id=tenant_id, tenant_name="Benchmark", settings={})
+
+def build_session(tenant_id: str = "BENCHMARK") -> ExternalSessionData:
+    now = datetime.now(timezone.utc)
+    return ExternalSessionData(
+        session_id=uuid4(),
+        tenant_id=tenant_id,
+        user_id="analyst@example.com",
+        custom_fields={"roles": "analyst", "active": True},
+        created_at=now,
+        expires_at=now + timedelta(hours=1)
+    )
+
+def build_query_scope(table_count: int, column_count: int) -> QueryScope:
+    """
+    Query scope selecting every allowed column of the first table_count tables.
+    """
+    tables: List[str] = [table_name(table_index) for table_index in range(table_count)]
+    columns = [
+        f"{table}.{column_name(column_index)}"
+        for table in tables for column_index in range(column_count - 1)
+    ]
+    return QueryScope(intent="fetch_data", entities=Entities(tables=tables, columns=columns))
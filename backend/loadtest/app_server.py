@@ -0,0 +1,66 @@
+"""
+The SQLExecutor application wired to the load test stand-ins, started by uvicorn in its own
+processes (one per worker) with PYTHONPATH=app:. from the backend directory.
+
+MongoDB is an in-memory mongomock database seeded with the tenant fixture on startup, or the
+database at LOADTEST_MONGO_URI when set (the fixture documents are upserted into it). The OpenAI
+client points at the mock server through OPENAI_BASE_URL. The fixture tenant's SQLite database is
+injected as its external database URL, tenants cannot configure a database file themselves.
+
+Environment variables:
+    LOADTEST_FIXTURE: the TenantFixtureSpec JSON
+    LOADTEST_MONGO_URI: optional MongoDB to use instead of mongomock
+"""
+import os
+from pathlib import Path
+
+# Settings are read on import of the application, the stand-ins need none of the real credentials
+for _name, _value in {
+    "DEV_SERVICE_ACCOUNT_PASSWORD": "loadtest",
+    "DEV_USERNAME": "loadtest",
+    "CLUSTER_DB_URL": "localhost",
+    "MONGO_DB_NAME": "sqlexecutor_loadtest",
+    "OPENAI_API_KEY": "sk-loadtest",
+    "FRONTEND_DEVELOPMENT_CONNECTION": "http://localhost:3000",
+    # mongomock has no change streams
+    "TENANT_CACHE_CHANGE_STREAM_ENABLED": "false",
+    "SCHEMA_RULESET_CACHE_CHANGE_STREAM_ENABLED": "false",
+    # Continuation tokens have to verify on every worker
+    "SQL_PAGINATION_TOKEN_SECRET": "loadtest",
+}.items():
+    os.environ.setdefault(_name, _value)
+
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from config import settings
+from utils.database import mongodb
+from main import app
+from api.core.services.sql_runner import sql_runner_service
+from loadtest.tenant_fixture import TENANT_ID, TenantFixtureSpec, seed_tenant
+
+_mongo_uri = os.environ.get("LOADTEST_MONGO_URI")
+_fixture = TenantFixtureSpec.from_json(os.environ["LOADTEST_FIXTURE"])
+_build_db_url_based_on_dialect = sql_runner_service.build_db_url_based_on_dialect
+
+def _build_fixture_db_url(tenant, dialect, schema=None):
+    if tenant.tenant_id == TENANT_ID and dialect == "sqlite":
+        return f"sqlite:///{Path(_fixture.sqlite_path).resolve()}"
+    return _build_db_url_based_on_dialect(tenant, dialect, schema=schema)
+
+# Every tenant database connection of the application is resolved through the SQL runner
+sql_runner_service.build_db_url_based_on_dialect = _build_fixture_db_url
+
+async def _connect_stand_in():
+    if _mongo_uri:
+        mongodb.client = AsyncIOMotorClient(_mongo_uri)
+    else:
+        from mongomock_motor import AsyncMongoMockClient
+        mongodb.client = AsyncMongoMockClient()
+    mongodb.db = mongodb.client[settings.MONGO_DB_NAME]
+
+# Replaces the Atlas connection of the startup handler
+mongodb.connect = _connect_stand_in
+
+@app.on_event("startup")
+async def seed_fixture():
+    await seed_tenant(mongodb.db, _fixture)
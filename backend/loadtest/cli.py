@@ -0,0 +1,187 @@
+"""
+End-to-end load test of the SQL generation endpoint. The run command builds the SQLite tenant
+database, starts the mock OpenAI server and the application (uvicorn, --workers processes) as
+subprocesses, then drives POST /v1/sql-generation at each concurrency level and prints one JSON
+document with the throughput and latency percentiles per level.
+
+Usage, from the backend directory:
+    pip install -r loadtest/requirements.txt
+    python -m loadtest.cli run --concurrency 1 --concurrency 8 --concurrency 32 --workers 2
+    python -m loadtest.cli run --llm-latency-ms 800 --no-run-sql --output report.json
+    python -m loadtest.cli serve-llm --latency-ms 300
+"""
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+import httpx
+import typer
+
+from loadtest import driver
+from loadtest.mock_openai_server import DEFAULT_RESPONSES_PATH, load_responses
+from loadtest.tenant_fixture import (
+    BACKEND_DIR, DEFAULT_RULESET_PATH, DEFAULT_SCHEMA_PATH, SCHEMA_NAME, TENANT_ID,
+    TenantFixtureSpec, build_sqlite_database
+)
+
+app = typer.Typer(help="End-to-end load test of the SQL generation flow against local stand-ins.")
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def _uvicorn_command(app_path: str, port: int, workers: int = 1) -> List[str]:
+    return [
+        sys.executable, "-m", "uvicorn", app_path, "--host", "127.0.0.1", "--port", str(port),
+        "--workers", str(workers), "--log-level", "warning", "--no-access-log"
+    ]
+
+@contextmanager
+def _process(command: List[str], env: Dict[str, str], log_path: Path) -> Iterator[subprocess.Popen]:
+    with open(log_path, "wb") as log_file:
+        process = subprocess.Popen(command, cwd=BACKEND_DIR, env=env, stdout=log_file, stderr=subprocess.STDOUT)
+        try:
+            yield process
+        finally:
+            process.terminate()
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+
+def _wait_until_ready(url: str, process: subprocess.Popen, log_path: Path, timeout_seconds: float):
+    deadline = time.monotonic() + timeout_seconds
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"{url} exited with status {process.returncode}, see {log_path}:\n{log_path.read_text(errors='replace')[-2000:]}")
+        try:
+            if httpx.get(url, timeout=1).status_code < 500:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"{url} not ready after {timeout_seconds}s, see {log_path}")
+
+@app.command()
+def run(
+    concurrency: List[int] = typer.Option([1, 2, 4, 8, 16, 32], help="Requests in flight, repeat the option for several levels."),
+    duration: float = typer.Option(20.0, help="Measured seconds per concurrency level."),
+    warmup: float = typer.Option(2.0, help="Seconds per level before measuring."),
+    workers: int = typer.Option(1, help="Application worker processes."),
+    llm_latency_ms: float = typer.Option(300.0, help="Latency of each mock LLM completion."),
+    llm_jitter_ms: float = typer.Option(50.0, help="Uniform +/- jitter of the mock LLM latency."),
+    rows: int = typer.Option(1000, help="Rows per table of the SQLite tenant database."),
+    schema: Path = typer.Option(DEFAULT_SCHEMA_PATH, exists=True, dir_okay=False, help="Schema JSON from tests/resources/schemas."),
+    ruleset: Path = typer.Option(DEFAULT_RULESET_PATH, exists=True, dir_okay=False, help="Ruleset JSON from tests/resources/rulesets."),
+    responses: Path = typer.Option(DEFAULT_RESPONSES_PATH, exists=True, dir_okay=False, help="Canned questions, QueryScopes and SQL."),
+    run_sql: bool = typer.Option(True, help="Execute the generated SQL on the SQLite database."),
+    llm_cache: bool = typer.Option(False, help="Keep the tenant's LLM caches on, repeated questions then skip the mock LLM."),
+    mongo_uri: Optional[str] = typer.Option(None, help="MongoDB to seed and use instead of the in-memory mongomock, needed to share caches across workers."),
+    app_port: int = typer.Option(8765),
+    llm_port: int = typer.Option(8766),
+    request_timeout: float = typer.Option(60.0, help="Seconds before a request counts as failed."),
+    output: Optional[Path] = typer.Option(None, help="Write the JSON document to this file instead of stdout."),
+):
+    """
+    Start the stand-ins and the application, then load it at each concurrency level.
+    """
+    payloads = [{"input": response["input"]} for response in load_responses(responses)]
+    parameters = {
+        "concurrency": concurrency, "duration": duration, "warmup": warmup, "workers": workers,
+        "llm_latency_ms": llm_latency_ms, "llm_jitter_ms": llm_jitter_ms, "rows": rows,
+        "schema": schema.name, "ruleset": ruleset.name, "run_sql": run_sql, "llm_cache": llm_cache,
+        "mongo": "external" if mongo_uri else "mongomock",
+    }
+
+    with tempfile.TemporaryDirectory(prefix="sqlexecutor-loadtest-") as work_dir:
+        work_dir = Path(work_dir)
+        spec = TenantFixtureSpec(
+            sqlite_path=str(work_dir / "tenant.sqlite3"), schema_path=str(schema.resolve()),
+            ruleset_path=str(ruleset.resolve()), rows_per_table=rows, llm_cache_enabled=llm_cache
+        )
+        build_sqlite_database(spec)
+
+        base_env = {**os.environ, "PYTHONPATH": os.pathsep.join([str(BACKEND_DIR / "app"), str(BACKEND_DIR)])}
+        llm_env = {
+            **base_env,
+            "LOADTEST_LLM_LATENCY_MS": str(llm_latency_ms),
+            "LOADTEST_LLM_JITTER_MS": str(llm_jitter_ms),
+            "LOADTEST_LLM_RESPONSES": str(responses.resolve()),
+        }
+        app_env = {
+            **base_env,
+            "OPENAI_BASE_URL": f"http://127.0.0.1:{llm_port}/v1",
+            "LOADTEST_FIXTURE": spec.to_json(),
+        }
+        if mongo_uri:
+            app_env["LOADTEST_MONGO_URI"] = mongo_uri
+
+        llm_log, app_log = work_dir / "mock_llm.log", work_dir / "app.log"
+        with _process(_uvicorn_command("loadtest.mock_openai_server:app", llm_port), llm_env, llm_log) as llm_process, \
+             _process(_uvicorn_command("loadtest.app_server:app", app_port, workers), app_env, app_log) as app_process:
+            _wait_until_ready(f"http://127.0.0.1:{llm_port}/health", llm_process, llm_log, timeout_seconds=30)
+            _wait_until_ready(f"http://127.0.0.1:{app_port}/docs", app_process, app_log, timeout_seconds=60)
+
+            typer.echo(f"Loading {TENANT_ID}/{SCHEMA_NAME} with {workers} worker(s) at concurrency {concurrency}", err=True)
+            results = asyncio.run(driver.run_levels(
+                base_url=f"http://127.0.0.1:{app_port}",
+                path=f"/v1/sql-generation/{TENANT_ID}/{SCHEMA_NAME}?run_sql={str(run_sql).lower()}",
+                headers=spec.request_headers(),
+                payloads=payloads,
+                concurrency_levels=concurrency,
+                duration_seconds=duration,
+                warmup_seconds=warmup,
+                timeout_seconds=request_timeout,
+            ))
+            llm_completions = httpx.get(f"http://127.0.0.1:{llm_port}/health").json()["completions"]
+
+    document = {
+        "benchmark": "sql-generation-load",
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "parameters": parameters,
+        "llm_completions": llm_completions,
+        "results": results,
+    }
+    content = json.dumps(document, indent=2)
+    if output is None:
+        typer.echo(content)
+    else:
+        output.write_text(content + "\n", encoding="utf-8")
+        typer.echo(f"Wrote {len(results)} results to {output}", err=True)
+    if any(result["failed"] for result in results):
+        typer.echo("Some requests failed, see status_codes and errors of the results", err=True)
+
+@app.command("serve-llm")
+def serve_llm(
+    latency_ms: float = typer.Option(300.0),
+    jitter_ms: float = typer.Option(50.0),
+    responses: Path = typer.Option(DEFAULT_RESPONSES_PATH, exists=True, dir_okay=False),
+    port: int = typer.Option(8766),
+):
+    """
+    Only run the mock OpenAI server, to point a locally started application at it with
+    OPENAI_BASE_URL=http://127.0.0.1:<port>/v1.
+    """
+    import uvicorn
+    from loadtest.mock_openai_server import create_app
+
+    uvicorn.run(create_app(latency_ms, jitter_ms, responses), host="127.0.0.1", port=port, log_level="warning")
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,99 @@
+"""
+Concurrent request driver: keeps a fixed number of requests in flight against the SQL generation
+endpoint for a duration and reports the throughput and latency percentiles of the completed ones.
+"""
+import asyncio
+import itertools
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+@dataclass
+class LevelResult:
+    concurrency: int
+    duration_seconds: float
+    latencies_ms: List[float] = field(default_factory=list)
+    status_codes: Counter = field(default_factory=Counter)
+    errors: Counter = field(default_factory=Counter)
+    # First response body of each failing status, to tell a misconfigured fixture from overload
+    error_samples: Dict[int, str] = field(default_factory=dict)
+
+    def summary(self) -> Dict[str, Any]:
+        ordered = sorted(self.latencies_ms)
+        completed = len(ordered)
+        failed = sum(count for status, count in self.status_codes.items() if status >= 400) + sum(self.errors.values())
+        return {
+            "concurrency": self.concurrency,
+            "requests": completed,
+            "failed": failed,
+            "throughput_rps": round(completed / self.duration_seconds, 2) if self.duration_seconds else 0.0,
+            "mean_ms": round(sum(ordered) / completed, 2) if completed else None,
+            "p50_ms": percentile(ordered, 50),
+            "p95_ms": percentile(ordered, 95),
+            "p99_ms": percentile(ordered, 99),
+            "max_ms": round(ordered[-1], 2) if ordered else None,
+            "status_codes": {str(status): count for status, count in sorted(self.status_codes.items())},
+            "errors": dict(self.errors),
+            "error_samples": {str(status): body for status, body in sorted(self.error_samples.items())},
+        }
+
+def percentile(ordered: List[float], rank: float) -> Optional[float]:
+    """
+    Nearest-rank percentile of sorted values.
+    """
+    if not ordered:
+        return None
+    index = max(0, min(len(ordered) - 1, int(round(rank / 100 * len(ordered) + 0.5)) - 1))
+    return round(ordered[index], 2)
+
+async def run_level(client: httpx.AsyncClient, url: str, payloads: List[Dict[str, Any]], concurrency: int,
+                    duration_seconds: float, warmup_seconds: float = 0.0) -> LevelResult:
+    """
+    Run concurrency workers sending the payloads in turn until duration_seconds elapsed. Requests
+    completing during the warmup are not counted, requests still running at the end are awaited.
+    """
+    payload_cycle = itertools.cycle(payloads)
+    started_at = time.perf_counter()
+    measure_from = started_at + warmup_seconds
+    stop_at = measure_from + duration_seconds
+    result = LevelResult(concurrency=concurrency, duration_seconds=duration_seconds)
+
+    async def worker():
+        while time.perf_counter() < stop_at:
+            payload = next(payload_cycle)
+            request_started_at = time.perf_counter()
+            try:
+                response = await client.post(url, json=payload)
+                status, error = response.status_code, None
+                if status >= 400 and status not in result.error_samples:
+                    result.error_samples[status] = response.text[:500]
+            except httpx.HTTPError as e:
+                status, error = None, type(e).__name__
+            finished_at = time.perf_counter()
+            if request_started_at < measure_from:
+                continue
+            if error is not None:
+                result.errors[error] += 1
+                continue
+            result.status_codes[status] += 1
+            if status < 400:
+                result.latencies_ms.append((finished_at - request_started_at) * 1000)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    # The last requests finish after stop_at, the measured window covers them
+    result.duration_seconds = time.perf_counter() - measure_from
+    return result
+
+async def run_levels(base_url: str, path: str, headers: Dict[str, str], payloads: List[Dict[str, Any]],
+                     concurrency_levels: List[int], duration_seconds: float, warmup_seconds: float,
+                     timeout_seconds: float) -> List[Dict[str, Any]]:
+    summaries = []
+    for concurrency in concurrency_levels:
+        limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+        async with httpx.AsyncClient(base_url=base_url, headers=headers, limits=limits, timeout=timeout_seconds) as client:
+            level = await run_level(client, path, payloads, concurrency, duration_seconds, warmup_seconds)
+        summaries.append(level.summary())
+    return summaries
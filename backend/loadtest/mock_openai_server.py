@@ -0,0 +1,102 @@
+"""
+Local OpenAI-compatible chat completions server answering with canned QueryScope and SQL
+responses after a configurable latency.
+
+The response is picked by the user message of the request, the first canned response answers
+questions it does not know. The kind of answer follows the request like the real API would:
+    - response_format query_scope_schema: the QueryScope JSON (intent call)
+    - response_format query_scope_and_sql_schema: the QueryScope JSON with the sql (single round trip)
+    - no response_format: the SQL text (SQL generation call)
+
+Configured through environment variables, so uvicorn can start it in its own process:
+    LOADTEST_LLM_LATENCY_MS, LOADTEST_LLM_JITTER_MS, LOADTEST_LLM_RESPONSES (canned responses JSON file)
+"""
+import asyncio
+import json
+import os
+import random
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List
+
+from fastapi import FastAPI, Request
+
+DEFAULT_RESPONSES_PATH = Path(__file__).resolve().parent / "resources" / "canned_responses.json"
+
+QUERY_SCOPE_FORMAT = "query_scope_schema"
+QUERY_SCOPE_AND_SQL_FORMAT = "query_scope_and_sql_schema"
+
+# Same estimate as the schema prompt token counts when tiktoken is not installed
+_CHARS_PER_TOKEN = 4
+
+def load_responses(path: Path) -> List[Dict[str, Any]]:
+    responses = json.loads(Path(path).read_text(encoding="utf-8"))
+    if not responses:
+        raise ValueError(f"No canned responses in {path}")
+    return responses
+
+def _count_tokens(text: str) -> int:
+    return -(-len(text) // _CHARS_PER_TOKEN)
+
+def build_completion(request_body: Dict[str, Any], responses_by_input: Dict[str, Dict[str, Any]],
+                     fallback: Dict[str, Any]) -> Dict[str, Any]:
+    messages = request_body.get("messages", [])
+    user_input = next((message["content"] for message in reversed(messages) if message.get("role") == "user"), "")
+    canned = responses_by_input.get(user_input.strip().lower(), fallback)
+
+    response_format = (request_body.get("response_format") or {}).get("json_schema", {}).get("name")
+    if response_format == QUERY_SCOPE_FORMAT:
+        content = json.dumps(canned["query_scope"])
+    elif response_format == QUERY_SCOPE_AND_SQL_FORMAT:
+        content = json.dumps({**canned["query_scope"], "sql": canned["sql"]})
+    else:
+        content = canned["sql"]
+
+    prompt_tokens = sum(_count_tokens(str(message.get("content", ""))) for message in messages)
+    completion_tokens = _count_tokens(content)
+    return {
+        "id": f"chatcmpl-{uuid.uuid4().hex}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": request_body.get("model", "mock"),
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": content},
+            "finish_reason": "stop",
+        }],
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        },
+    }
+
+def create_app(latency_ms: float = 0.0, jitter_ms: float = 0.0,
+               responses_path: Path = DEFAULT_RESPONSES_PATH) -> FastAPI:
+    responses = load_responses(responses_path)
+    responses_by_input = {response["input"].strip().lower(): response for response in responses}
+    app = FastAPI(title="Mock OpenAI")
+    app.state.completions = 0
+
+    @app.post("/v1/chat/completions")
+    @app.post("/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        delay_ms = latency_ms + (random.uniform(-jitter_ms, jitter_ms) if jitter_ms else 0.0)
+        if delay_ms > 0:
+            await asyncio.sleep(delay_ms / 1000)
+        app.state.completions += 1
+        return build_completion(body, responses_by_input, responses[0])
+
+    @app.get("/health")
+    async def health():
+        return {"status": "ok", "completions": app.state.completions}
+
+    return app
+
+app = create_app(
+    latency_ms=float(os.environ.get("LOADTEST_LLM_LATENCY_MS", "0")),
+    jitter_ms=float(os.environ.get("LOADTEST_LLM_JITTER_MS", "0")),
+    responses_path=Path(os.environ.get("LOADTEST_LLM_RESPONSES", str(DEFAULT_RESPONSES_PATH)))
+)
@@ -0,0 +1,170 @@
+"""
+Tenant stand-in for the load tests: the tenant, schema, ruleset and session documents built from
+tests/resources, and a SQLite database with the schema's tables filled with synthetic rows.
+
+The documents are derived from the fixture spec alone (fixed session id and API key), so every
+worker process of the application seeds an identical in-memory MongoDB.
+"""
+import json
+import sqlite3
+import uuid
+from contextlib import closing
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+RESOURCES_DIR = BACKEND_DIR / "tests" / "resources"
+
+DEFAULT_SCHEMA_PATH = RESOURCES_DIR / "schemas" / "valid" / "three_tables_all_fields_filled_up.json"
+DEFAULT_RULESET_PATH = RESOURCES_DIR / "rulesets" / "valid" / "ecommerce_ruleset_without_user_specific_policy.json"
+# SettingUtils reads the copy of the Docker image at /app, outside of it the one of the repo is used
+DEFAULT_SETTINGS_PATH = BACKEND_DIR / "app" / "resources" / "settings" / "default_settings.json"
+
+TENANT_ID = "LOADTEST"
+SCHEMA_NAME = "loadtest_schema"
+RULESET_NAME = "loadtest_ruleset"
+API_KEY = "loadtest-api-key"
+
+_SESSION_NAMESPACE = uuid.UUID("6f1c2a4e-3b1d-4c55-9a7e-2d8f0c1b5e90")
+
+@dataclass
+class TenantFixtureSpec:
+    """
+    Everything the application workers need to seed the same tenant, passed to them as JSON.
+    """
+    sqlite_path: str
+    schema_path: str = str(DEFAULT_SCHEMA_PATH)
+    ruleset_path: str = str(DEFAULT_RULESET_PATH)
+    rows_per_table: int = 1000
+    llm_cache_enabled: bool = False
+    session_custom_fields: Dict[str, Any] = field(default_factory=lambda: {"roles": "admin", "active": True})
+
+    @property
+    def session_id(self) -> uuid.UUID:
+        return uuid.uuid5(_SESSION_NAMESPACE, f"{TENANT_ID}:{self.sqlite_path}")
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self))
+
+    @staticmethod
+    def from_json(content: str) -> "TenantFixtureSpec":
+        return TenantFixtureSpec(**json.loads(content))
+
+    def request_headers(self) -> Dict[str, str]:
+        return {"X-Session-Id": str(self.session_id), "X-API-Key": API_KEY}
+
+def load_schema_document(spec: TenantFixtureSpec) -> Dict[str, Any]:
+    schema = json.loads(Path(spec.schema_path).read_text(encoding="utf-8"))
+    schema.update({"tenant_id": TENANT_ID, "schema_name": SCHEMA_NAME, "filter_rules": [RULESET_NAME]})
+    schema.setdefault("context_type", "sql")
+    schema.setdefault("context_setting", {})
+    # The test resources predate the description and sensitivity flags of the Schema model
+    schema.setdefault("exclude_description_on_generate_sql", False)
+    for table in schema["tables"].values():
+        table.setdefault("exclude_description_on_generate_sql", False)
+        table["relationships"] = table.get("relationships") or {}
+        for join in table["relationships"].values():
+            join.setdefault("exclude_description_on_generate_sql", False)
+        for column in table["columns"].values():
+            column.setdefault("exclude_description_on_generate_sql", False)
+            column.setdefault("is_sensitive_column", False)
+    return schema
+
+def load_ruleset_document(spec: TenantFixtureSpec) -> Dict[str, Any]:
+    ruleset = json.loads(Path(spec.ruleset_path).read_text(encoding="utf-8"))
+    ruleset.update({"tenant_id": TENANT_ID, "ruleset_name": RULESET_NAME, "connected_schema_name": SCHEMA_NAME})
+    return ruleset
+
+def _sqlite_value(column_type: str, column_name: str, row_index: int) -> Any:
+    column_type = column_type.upper()
+    if column_type.startswith(("INT", "BIGINT", "SMALLINT")):
+        return row_index + 1
+    if column_type.startswith(("DECIMAL", "NUMERIC", "FLOAT", "DOUBLE", "REAL")):
+        return round((row_index + 1) * 1.25, 2)
+    if column_type.startswith("BOOL"):
+        return row_index % 2
+    if column_type.startswith(("DATE", "TIMESTAMP")):
+        return (datetime(2024, 1, 1) + timedelta(hours=row_index)).isoformat()
+    return f"{column_name}_{row_index + 1}"
+
+def build_sqlite_database(spec: TenantFixtureSpec):
+    """
+    Create the schema's tables in the SQLite file, replacing it, with rows_per_table rows each.
+    Integer keys run from 1 to rows_per_table in every table, so the joins of the schema match.
+    """
+    schema = load_schema_document(spec)
+    sqlite_path = Path(spec.sqlite_path)
+    sqlite_path.parent.mkdir(parents=True, exist_ok=True)
+    sqlite_path.unlink(missing_ok=True)
+
+    with closing(sqlite3.connect(sqlite_path)) as connection, connection:
+        for table_name, table in schema["tables"].items():
+            columns = table["columns"]
+            column_definitions = ", ".join(f'"{column_name}" {column["type"]}' for column_name, column in columns.items())
+            connection.execute(f'CREATE TABLE "{table_name}" ({column_definitions})')
+            placeholders = ", ".join("?" for _ in columns)
+            connection.executemany(
+                f'INSERT INTO "{table_name}" VALUES ({placeholders})',
+                (
+                    [_sqlite_value(column["type"], column_name, row_index) for column_name, column in columns.items()]
+                    for row_index in range(spec.rows_per_table)
+                )
+            )
+        # Table statistics for the cost guard's row estimates
+        connection.execute("ANALYZE")
+
+def _set(settings: Dict[str, Dict[str, Any]], category: str, key: str, value: Any):
+    settings.setdefault(category, {}).setdefault(key, {
+        "setting_basic_name": key,
+        "setting_description": "",
+        "setting_default_value": "",
+        "is_custom_setting": False,
+    })["setting_value"] = value
+
+def build_tenant_document(spec: TenantFixtureSpec, default_settings: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Tenant with the default settings, the sqlite dialect and, unless llm_cache_enabled is set,
+    the LLM caches off so every request runs the whole flow. The application has no setting for
+    a SQLite file, app_server injects the database URL.
+    """
+    settings = json.loads(json.dumps(default_settings))
+    _set(settings, "EXTERNAL_SYSTEM_DB_SETTING", "EXTERNAL_TENANT_DB_DIALECT", "sqlite")
+    _set(settings, "API_KEYS", "TENANT_APPLICATION_TOKEN", API_KEY)
+    _set(settings, "LLM_CACHE", "QUERY_SCOPE_CACHE_ENABLED", str(spec.llm_cache_enabled).lower())
+    _set(settings, "LLM_CACHE", "SQL_GENERATION_CACHE_ENABLED", str(spec.llm_cache_enabled).lower())
+    return {"tenant_id": TENANT_ID, "tenant_name": "Load Test", "admins": [], "settings": settings}
+
+def build_session_document(spec: TenantFixtureSpec) -> Dict[str, Any]:
+    now = datetime.now(timezone.utc)
+    return {
+        "session_id": spec.session_id,
+        "tenant_id": TENANT_ID,
+        "user_id": "loadtest@example.com",
+        "custom_fields": spec.session_custom_fields,
+        "created_at": now,
+        "expires_at": now + timedelta(days=1),
+        "session_settings": {},
+    }
+
+async def seed_tenant(db, spec: TenantFixtureSpec):
+    """
+    Upsert the fixture documents into the application database. Runs inside the application
+    process, the documents go through the application models so they are stored exactly like
+    the ones its services write.
+    """
+    from model.tenant.tenant import Tenant
+    from model.schema.schema import Schema
+    from model.ruleset.ruleset import Ruleset
+    from model.external_system_integration.external_user_session_data import ExternalSessionData
+
+    default_settings = json.loads(DEFAULT_SETTINGS_PATH.read_text(encoding="utf-8")).get("settings", {})
+    documents = {
+        "tenants": ({"tenant_id": TENANT_ID}, Tenant(**build_tenant_document(spec, default_settings)).dict()),
+        "schemas": ({"tenant_id": TENANT_ID, "schema_name": SCHEMA_NAME}, Schema(**load_schema_document(spec)).dict()),
+        "rulesets": ({"tenant_id": TENANT_ID, "ruleset_name": RULESET_NAME}, Ruleset(**load_ruleset_document(spec)).dict()),
+        "sessions": ({"session_id": spec.session_id}, ExternalSessionData(**build_session_document(spec)).dict()),
+    }
+    for collection_name, (query, document) in documents.items():
+        await db[collection_name].replace_one(query, document, upsert=True)
@@ -0,0 +1,152 @@
+import pytest
+from unittest import mock
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+from fastapi import HTTPException
+
+from model.schema.schema import Schema
+from model.ruleset.ruleset import Ruleset
+from model.query_scope.query_scope import QueryScope
+from model.query_scope.entities import Entities
+from model.external_system_integration.external_user_session_data import ExternalSessionData
+from api.core.resolvers.access_control.user_access_control_resolver import AccessControlResolver
+from api.core.services.ruleset.ruleset_conditions_service import RulesetConditionsService
+
+class TestAccessControlResolver:
+
+    def init_mock_session(self, roles):
+        now = datetime.now(timezone.utc)
+        return ExternalSessionData(
+            session_id=uuid4(),
+            tenant_id="TENANT_A",
+            user_id="user@example.com",
+            custom_fields={"roles": roles, "active": True},
+            created_at=now,
+            expires_at=now + timedelta(hours=1)
+        )
+
+    def init_mock_schema(self):
+        column = {"type": "TEXT", "exclude_description_on_generate_sql": False, "is_sensitive_column": False}
+        return Schema(
+            tenant_id="TENANT_A",
+            schema_name="ecommerce",
+            description="E-commerce schema",
+            exclude_description_on_generate_sql=False,
+            context_type="sql",
+            context_setting={},
+            tables={
+                "users": {
+                    "exclude_description_on_generate_sql": False,
+                    "columns": {name: column for name in ["user_id", "name", "email", "password"]}
+                },
+                "orders": {
+                    "exclude_description_on_generate_sql": False,
+                    "columns": {name: column for name in ["order_id", "amount", "status"]}
+                }
+            }
+        )
+
+    def init_mock_ruleset(self):
+        return Ruleset(
+            tenant_id="TENANT_A",
+            ruleset_name="ecommerce_ruleset",
+            connected_schema_name="ecommerce",
+            description="Ruleset for the e-commerce schema",
+            is_ruleset_enabled=True,
+            conditions={"is_active_user": "${jwt.custom_fields.active} == True"},
+            global_access_policy={
+                "tables": {"users": {"columns": {"allow": [], "deny": ["password"]}, "condition": "True"}}
+            },
+            group_access_policy={
+                "user_group": {
+                    "description": "Access control for user-related data.",
+                    "criteria": {
+                        "matching_criteria": {"roles": ["user"]},
+                        "condition": "${conditions.is_active_user}"
+                    },
+                    "tables": {
+                        "users": {"columns": {"allow": ["user_id", "name", "email"], "deny": []}},
+                        "orders": {"columns": {"allow": ["order_id", "amount"], "deny": ["status"]}}
+                    }
+                }
+            }
+        )
+
+    def init_query_scope(self, tables, columns):
+        return QueryScope(intent="fetch_data", entities=Entities(tables=tables, columns=columns))
+
+    def test_compile_decision_table_matches_group_policy_once(self):
+        # Arrange
+        resolver = AccessControlResolver(
+            session_data=self.init_mock_session(roles="user"),
+            ruleset=self.init_mock_ruleset(),
+            matched_schema=self.init_mock_schema()
+        )
+
+        # Act
+        with mock.patch.object(
+            RulesetConditionsService, "evaluate_ruleset_condition", wraps=RulesetConditionsService.evaluate_ruleset_condition
+        ) as mock_evaluate_condition:
+            decision_table = resolver.compile_decision_table(["users", "orders"])
+            resolver.has_access_to_scope(self.init_query_scope(
+                tables=["users", "orders"],
+                columns=["users.user_id", "users.name", "orders.order_id", "orders.amount"]
+            ))
+
+        # Assert
+        assert mock_evaluate_condition.call_count == 1
+        assert decision_table["users"].allowed_columns == {"user_id", "name", "email"}
+        assert decision_table["users"].denied_columns == {"password": ("global", None)}
+        assert decision_table["orders"].denied_columns == {"status": ("group", "Access control for user-related data.")}
+
+    def test_has_access_to_scope_reports_denied_and_missing_columns(self):
+        # Arrange
+        resolver = AccessControlResolver(
+            session_data=self.init_mock_session(roles="user"),
+            ruleset=self.init_mock_ruleset(),
+            matched_schema=self.init_mock_schema()
+        )
+        query_scope = self.init_query_scope(
+            tables=["users", "orders"],
+            columns=["users.password", "orders.status"]
+        )
+
+        # Act
+        with pytest.raises(HTTPException) as exc_info:
+            resolver.has_access_to_scope(query_scope)
+
+        # Assert
+        assert exc_info.value.status_code == 403
+        assert exc_info.value.detail["denied_columns"] == ["users.password", "orders.status"]
+
+    def test_validate_column_access_missing_permission(self):
+        # Arrange
+        ruleset = self.init_mock_ruleset()
+        ruleset.group_access_policy["user_group"].tables["orders"].columns.deny = []
+        resolver = AccessControlResolver(
+            session_data=self.init_mock_session(roles="user"),
+            ruleset=ruleset,
+            matched_schema=self.init_mock_schema()
+        )
+
+        # Act
+        violation = resolver._validate_column_access("orders", "status")
+
+        # Assert
+        assert violation.policy_type == "access"
+        assert "status" in violation.failed_condition
+
+    def test_has_access_to_scope_denies_table_without_matching_policy(self):
+        # Arrange
+        resolver = AccessControlResolver(
+            session_data=self.init_mock_session(roles="guest"),
+            ruleset=self.init_mock_ruleset(),
+            matched_schema=self.init_mock_schema()
+        )
+
+        # Act
+        with pytest.raises(HTTPException) as exc_info:
+            resolver.has_access_to_scope(self.init_query_scope(tables=["orders"], columns=["orders.order_id"]))
+
+        # Assert
+        assert exc_info.value.detail["denied_tables"] == ["orders"]
@@ -13,6 +13,9 @@ class TestLLMServiceWrapper:
     def init_mock_user_input(self, query: str) -> UserInputRequest:
         return UserInputRequest(input=query)
 
+    def init_mock_tenant(self) -> mock.Mock:
+        return mock.Mock(settings={})
+
     def init_mock_resolved_schema(self) -> dict:
         return {
             "tables": {
@@ -34,13 +37,12 @@ class TestLLMServiceWrapper:
             }
         }
 
-    @mock.patch("api.core.services.llm_wrapper.llm_service_wrapper.OpenAI")
+    @mock.patch("api.core.services.llm_wrapper.llm_service_wrapper.openai_client")
     async def test_get_query_scope_using_default_mode_success(self, mock_openai):
         # Arrange
         user_input = self.init_mock_user_input("Fetch orders and customer details")
 
-        mock_client = mock.Mock()
-        mock_openai.return_value = mock_client
+        mock_openai.create_chat_completion = mock.AsyncMock()
 
         mock_response = mock.Mock()
         mock_response.choices = [mock.Mock(message=mock.Mock(content=json.dumps({
@@ -51,7 +53,7 @@ class TestLLMServiceWrapper:
             }
         })))]
         mock_response.usage = mock.Mock(prompt_tokens=10, completion_tokens=5, total_tokens=15)
-        mock_client.chat.completions.create.return_value = mock_response
+        mock_openai.create_chat_completion.return_value = mock_response
 
         # Act
         query_scope = await LLMServiceWrapper.get_query_scope_using_default_mode(user_input)
@@ -60,19 +62,18 @@ class TestLLMServiceWrapper:
         assert query_scope.intent == "fetch_data"
         assert query_scope.entities.tables == ["orders", "customers"]
         assert query_scope.entities.columns == ["orders.order_id", "customers.customer_id"]
-        mock_client.chat.completions.create.assert_called_once()
+        mock_openai.create_chat_completion.assert_called_once()
 
-    @mock.patch("api.core.services.llm_wrapper.llm_service_wrapper.OpenAI")
+    @mock.patch("api.core.services.llm_wrapper.llm_service_wrapper.openai_client")
     async def test_get_query_scope_invalid_response(self, mock_openai):
         # Arrange
         user_input = self.init_mock_user_input("Invalid query")
 
-        mock_client = mock.Mock()
-        mock_openai.return_value = mock_client
+        mock_openai.create_chat_completion = mock.AsyncMock()
 
         mock_response = mock.Mock()
         mock_response.choices = [mock.Mock(message=mock.Mock(content="{invalid: json}"))]
-        mock_client.chat.completions.create.return_value = mock_response
+        mock_openai.create_chat_completion.return_value = mock_response
 
         # Act
         with pytest.raises(HTTPException) as exc_info:
@@ -83,44 +84,210 @@ class TestLLMServiceWrapper:
         assert "Failed to generate structured query scope" in str(exc_info.value.detail)
 
 
-    @mock.patch("api.core.services.llm_wrapper.llm_service_wrapper.OpenAI")
+    @mock.patch("api.core.services.llm_wrapper.llm_service_wrapper.openai_client")
     async def test_generate_sql_query_success(self, mock_openai):
         # Arrange
         user_input = self.init_mock_user_input("Get order_id and order_date from orders")
         resolved_schema = self.init_mock_resolved_schema()
 
-        mock_client = mock.Mock()
-        mock_openai.return_value = mock_client
+        mock_openai.create_chat_completion = mock.AsyncMock()
 
         mock_response = mock.Mock()
         mock_response.choices = [mock.Mock(message=mock.Mock(content="SELECT order_id, order_date FROM orders;"))]
         mock_response.usage = mock.Mock(prompt_tokens=10, completion_tokens=5, total_tokens=15)
-        mock_client.chat.completions.create.return_value = mock_response
+        mock_openai.create_chat_completion.return_value = mock_response
 
         # Act
-        generated_sql = await LLMServiceWrapper.generate_sql_query(user_input, resolved_schema)
+        generated_sql = await LLMServiceWrapper.generate_sql_query(user_input, resolved_schema, self.init_mock_tenant())
 
         # Assert
         assert generated_sql == "SELECT order_id, order_date FROM orders;"
-        mock_client.chat.completions.create.assert_called_once()
+        mock_openai.create_chat_completion.assert_called_once()
 
-    @mock.patch("api.core.services.llm_wrapper.llm_service_wrapper.OpenAI")
+    @mock.patch("api.core.services.llm_wrapper.llm_service_wrapper.openai_client")
     async def test_generate_sql_query_invalid_response(self, mock_openai):
         # Arrange
         user_input = self.init_mock_user_input("Invalid SQL query")
         resolved_schema = self.init_mock_resolved_schema()
 
-        mock_client = mock.Mock()
-        mock_openai.return_value = mock_client
+        mock_openai.create_chat_completion = mock.AsyncMock()
 
         mock_response = mock.Mock()
         mock_response.choices = [mock.Mock(message=mock.Mock(content="invalid sql response"))]
-        mock_client.chat.completions.create.return_value = mock_response
+        mock_openai.create_chat_completion.return_value = mock_response
 
         # Act
         with pytest.raises(HTTPException) as exc_info:
-            await LLMServiceWrapper.generate_sql_query(user_input, resolved_schema)
+            await LLMServiceWrapper.generate_sql_query(user_input, resolved_schema, self.init_mock_tenant())
 
         # Assert
         assert exc_info.value.status_code == 500
         assert "Failed to generate SQL query" in str(exc_info.value.detail)
+
+    @mock.patch("api.core.services.llm_wrapper.llm_service_wrapper.query_scope_cache")
+    @mock.patch("api.core.services.llm_wrapper.llm_service_wrapper.openai_client")
+    async def test_get_query_scope_with_cache_skips_llm_on_hit(self, mock_openai, mock_cache):
+        # Arrange
+        user_input = self.init_mock_user_input("Fetch orders")
+        tenant = mock.Mock(tenant_id="TENANT_A", settings={})
+        mock_openai.create_chat_completion = mock.AsyncMock()
+        mock_cache.get.return_value = QueryScope(**{
+            "intent": "fetch_data",
+            "entities": {"tables": ["orders"], "columns": ["orders.order_id"]}
+        })
+
+        # Act
+        query_scope = await LLMServiceWrapper.get_query_scope_with_cache(user_input, tenant, "orders_schema")
+
+        # Assert
+        assert query_scope.entities.tables == ["orders"]
+        mock_openai.create_chat_completion.assert_not_called()
+        mock_cache.set.assert_not_called()
+
+    @mock.patch("api.core.services.llm_wrapper.llm_service_wrapper.query_scope_cache")
+    @mock.patch("api.core.services.llm_wrapper.llm_service_wrapper.openai_client")
+    async def test_get_query_scope_with_cache_stores_on_miss(self, mock_openai, mock_cache):
+        # Arrange
+        user_input = self.init_mock_user_input("Fetch orders")
+        tenant = mock.Mock(tenant_id="TENANT_A", settings={})
+        mock_cache.get.return_value = None
+        mock_response = mock.Mock()
+        mock_response.choices = [mock.Mock(message=mock.Mock(content=json.dumps({
+            "intent": "fetch_data",
+            "entities": {"tables": ["orders"], "columns": ["orders.order_id"]}
+        })))]
+        mock_response.usage = mock.Mock(prompt_tokens=10, completion_tokens=5, total_tokens=15)
+        mock_openai.create_chat_completion = mock.AsyncMock(return_value=mock_response)
+
+        # Act
+        query_scope = await LLMServiceWrapper.get_query_scope_with_cache(user_input, tenant, "orders_schema")
+
+        # Assert
+        mock_openai.create_chat_completion.assert_called_once()
+        mock_cache.set.assert_called_once_with(
+            tenant_id="TENANT_A", schema_name="orders_schema", user_input="Fetch orders", query_scope=query_scope
+        )
+
+    @mock.patch("api.core.services.llm_wrapper.llm_service_wrapper.sql_generation_cache")
+    @mock.patch("api.core.services.llm_wrapper.llm_service_wrapper.openai_client")
+    async def test_generate_sql_query_returns_cached_sql(self, mock_openai, mock_cache):
+        # Arrange
+        user_input = self.init_mock_user_input("Get order_id and order_date from orders")
+        mock_openai.create_chat_completion = mock.AsyncMock()
+        mock_cache.build_key.return_value = "cache-key"
+        mock_cache.get = mock.AsyncMock(return_value="SELECT order_id, order_date FROM orders;")
+        mock_cache.set = mock.AsyncMock()
+
+        # Act
+        generated_sql = await LLMServiceWrapper.generate_sql_query(
+            user_input, self.init_mock_resolved_schema(), self.init_mock_tenant()
+        )
+
+        # Assert
+        assert generated_sql == "SELECT order_id, order_date FROM orders;"
+        mock_openai.create_chat_completion.assert_not_called()
+        mock_cache.set.assert_not_called()
+
+    @mock.patch("api.core.services.llm_wrapper.llm_service_wrapper.sql_generation_cache")
+    @mock.patch("api.core.services.llm_wrapper.llm_service_wrapper.openai_client")
+    async def test_generate_sql_query_caches_generated_sql(self, mock_openai, mock_cache):
+        # Arrange
+        user_input = self.init_mock_user_input("Get order_id and order_date from orders")
+        tenant = self.init_mock_tenant()
+        mock_response = mock.Mock()
+        mock_response.choices = [mock.Mock(message=mock.Mock(content="SELECT order_id, order_date FROM orders;"))]
+        mock_response.usage = mock.Mock(prompt_tokens=10, completion_tokens=5, total_tokens=15)
+        mock_openai.create_chat_completion = mock.AsyncMock(return_value=mock_response)
+        mock_cache.build_key.return_value = "cache-key"
+        mock_cache.get = mock.AsyncMock(return_value=None)
+        mock_cache.set = mock.AsyncMock()
+
+        # Act
+        await LLMServiceWrapper.generate_sql_query(user_input, self.init_mock_resolved_schema(), tenant)
+
+        # Assert
+        mock_cache.set.assert_called_once_with(
+            tenant.tenant_id, "cache-key", "SELECT order_id, order_date FROM orders;", use_persistent=False
+        )
+
+    @mock.patch("api.core.services.llm_wrapper.llm_service_wrapper.SettingUtils.get_setting_value")
+    @mock.patch("api.core.services.llm_wrapper.llm_service_wrapper.sql_generation_cache")
+    @mock.patch("api.core.services.llm_wrapper.llm_service_wrapper.openai_client")
+    async def test_generate_sql_query_uses_tenant_schema_prompt_format(self, mock_openai, mock_cache, mock_get_setting_value):
+        # Arrange
+        user_input = self.init_mock_user_input("Get order_id and order_date from orders")
+        mock_get_setting_value.side_effect = lambda settings, category_key, setting_key: {
+            "SCHEMA_PROMPT_FORMAT": "compact",
+            "SQL_GENERATION_CACHE_ENABLED": False,
+        }.get(setting_key)
+        mock_response = mock.Mock()
+        mock_response.choices = [mock.Mock(message=mock.Mock(content="SELECT order_id, order_date FROM orders;"))]
+        mock_response.usage = mock.Mock(prompt_tokens=10, completion_tokens=5, total_tokens=15)
+        mock_openai.create_chat_completion = mock.AsyncMock(return_value=mock_response)
+
+        # Act
+        await LLMServiceWrapper.generate_sql_query(user_input, self.init_mock_resolved_schema(), self.init_mock_tenant())
+
+        # Assert
+        system_prompt = mock_openai.create_chat_completion.call_args.kwargs["messages"][0]["content"]
+        assert system_prompt.endswith(
+            "Schema: orders(order_id:INTEGER, customer_id:INTEGER, order_date:DATE) ~purchases|transactions\n"
+            "joins:\n"
+            "orders -INNER-> customers ON orders.customer_id = customers.customer_id"
+        )
+        mock_cache.get.assert_not_called()
+
+    @mock.patch("api.core.services.llm_wrapper.llm_service_wrapper.openai_client")
+    async def test_get_query_scope_and_sql_returns_both_in_one_call(self, mock_openai):
+        # Arrange
+        user_input = self.init_mock_user_input("Get order_id and order_date from orders")
+        resolved_schema = self.init_mock_resolved_schema()
+
+        mock_openai.create_chat_completion = mock.AsyncMock()
+
+        mock_response = mock.Mock()
+        mock_response.choices = [mock.Mock(message=mock.Mock(content=json.dumps({
+            "intent": "fetch_data",
+            "entities": {
+                "tables": ["orders"],
+                "columns": ["orders.order_id", "orders.order_date"]
+            },
+            "sql": "SELECT o.order_id, o.order_date FROM orders o;"
+        })))]
+        mock_response.usage = mock.Mock(prompt_tokens=10, completion_tokens=5, total_tokens=15)
+        mock_openai.create_chat_completion.return_value = mock_response
+
+        # Act
+        query_scope, generated_sql = await LLMServiceWrapper.get_query_scope_and_sql(user_input, resolved_schema)
+
+        # Assert
+        assert query_scope.entities.columns == ["orders.order_id", "orders.order_date"]
+        assert generated_sql == "SELECT o.order_id, o.order_date FROM orders o;"
+        mock_openai.create_chat_completion.assert_called_once()
+        request = mock_openai.create_chat_completion.call_args.kwargs
+        assert request["response_format"]["json_schema"]["schema"]["required"] == ["intent", "entities", "sql"]
+        assert json.dumps(resolved_schema) in request["messages"][0]["content"]
+
+    @mock.patch("api.core.services.llm_wrapper.llm_service_wrapper.openai_client")
+    async def test_get_query_scope_and_sql_rejects_invalid_sql(self, mock_openai):
+        # Arrange
+        user_input = self.init_mock_user_input("Drop the orders table")
+
+        mock_openai.create_chat_completion = mock.AsyncMock()
+
+        mock_response = mock.Mock()
+        mock_response.choices = [mock.Mock(message=mock.Mock(content=json.dumps({
+            "intent": "fetch_data",
+            "entities": {"tables": ["orders"], "columns": ["orders.order_id"]},
+            "sql": "DROP TABLE orders;"
+        })))]
+        mock_response.usage = mock.Mock(prompt_tokens=10, completion_tokens=5, total_tokens=15)
+        mock_openai.create_chat_completion.return_value = mock_response
+
+        # Act
+        with pytest.raises(HTTPException) as exc_info:
+            await LLMServiceWrapper.get_query_scope_and_sql(user_input, self.init_mock_resolved_schema())
+
+        # Assert
+        assert exc_info.value.status_code == 500
+        assert "Failed to generate structured query scope and SQL query" in str(exc_info.value.detail)
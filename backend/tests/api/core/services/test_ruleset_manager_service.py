@@ -102,6 +102,31 @@ class TestRulesetManagerService:
         assert response.ruleset_name == ruleset_name
 
 
+    @mock.patch('api.core.services.tenant_manager.tenant_manager_service.TenantManagerService.get_tenant')
+    @mock.patch('utils.database.mongodb.db')
+    async def test_get_ruleset_cached_without_tenant_lookup(self, mock_db, mock_get_tenant):
+        # Arrange
+        tenant_id = "tenant_123"
+        ruleset_name = "ecommerce_ruleset_with_user_specific_policy"
+        with open(f'{RESOURCES_PATH}/rulesets/valid/ecommerce_ruleset_with_user_specific_policy.json', 'r') as file:
+            valid_json = json.load(file)
+
+        mock_collection = AsyncMock()
+        mock_db.__getitem__.return_value = mock_collection
+        valid_json["tenant_id"] = tenant_id
+        valid_json["ruleset_name"] = ruleset_name
+        valid_json["connected_schema_name"] = "ecommerce"
+        mock_collection.find_one = AsyncMock(return_value=valid_json)
+
+        # Act
+        first = await RulesetManagerService.get_ruleset(tenant_id, ruleset_name)
+        second = await RulesetManagerService.get_ruleset(tenant_id, ruleset_name)
+
+        # Assert
+        assert second is first
+        mock_collection.find_one.assert_awaited_once()
+        mock_get_tenant.assert_not_called()
+
     @mock.patch('api.core.services.tenant_manager.tenant_manager_service.TenantManagerService.get_tenant')
     @mock.patch('utils.database.mongodb.db')
     async def test_get_ruleset_not_found(self, mock_db, mock_get_tenant):
@@ -139,6 +139,63 @@ class TestSchemaManagerService:
         mock_collection_schema.find_one.assert_called_once_with({"tenant_id": tenant_id, "schema_name": schema_name})
         assert result == Schema(**schema_data)
 
+    @pytest.mark.asyncio
+    @mock.patch("utils.database.mongodb.db")
+    async def test_get_schema_uses_cache_until_deleted(self, mock_db):
+        # Arrange
+        tenant_id = "tenant1"
+        schema_name = "new_schema"
+        mock_collection_schema = mock.AsyncMock()
+        schema_data = {**self.init_mock_schema_data(), "context_type": "sql", "context_setting": {}}
+        mock_collection_schema.find_one.return_value = schema_data
+        mock_collection_schema.delete_one.return_value.deleted_count = 1
+        mock_db.__getitem__.side_effect = lambda key: mock_collection_schema if key == "schemas" else None
+
+        # Act
+        first = await SchemaManagerService.get_schema(tenant_id, schema_name)
+        second = await SchemaManagerService.get_schema(tenant_id, schema_name)
+        await SchemaManagerService.delete_schema(tenant_id, schema_name)
+        await SchemaManagerService.get_schema(tenant_id, schema_name)
+
+        # Assert
+        assert second is first
+        assert mock_collection_schema.find_one.await_count == 2
+
+    @pytest.mark.asyncio
+    @mock.patch("utils.database.mongodb.db")
+    async def test_get_schema_entity_index_loads_schemas_once(self, mock_db):
+        # Arrange
+        tenant_id = "tenant1"
+        schema_data = {
+            **self.init_mock_schema_data(),
+            "tables": {"orders": {"columns": {"order_id": {"type": "INTEGER"}}, "synonyms": ["purchases"]}}
+        }
+
+        class MockCursor:
+            def __aiter__(self):
+                async def iterate():
+                    yield schema_data
+                return iterate()
+
+        mock_collection_schema = mock.AsyncMock()
+        mock_collection_schema.find = mock.Mock(side_effect=lambda *args, **kwargs: MockCursor())
+        mock_collection_schema.delete_one.return_value.deleted_count = 1
+        mock_db.__getitem__.side_effect = lambda key: mock_collection_schema if key == "schemas" else None
+
+        # Act
+        first = await SchemaManagerService.get_schema_entity_index(tenant_id)
+        second = await SchemaManagerService.get_schema_entity_index(tenant_id)
+        has_orders_table = first.has_table("orders")
+        await SchemaManagerService.delete_schema(tenant_id, "new_schema")
+
+        # Assert
+        assert second is first
+        assert has_orders_table
+        assert mock_collection_schema.find.call_count == 1
+        with pytest.raises(HTTPException) as exc_info:
+            await SchemaManagerService.get_schema_entity_index(tenant_id)
+        assert exc_info.value.status_code == 404
+
     @pytest.mark.asyncio
     @mock.patch("utils.database.mongodb.db")
     async def test_get_schema_not_found(self, mock_db):
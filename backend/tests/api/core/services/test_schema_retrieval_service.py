@@ -0,0 +1,117 @@
+import asyncio
+import pytest
+from unittest import mock
+
+from api.core.services.schema.schema_retrieval_service import SchemaRetrievalService
+from model.tenant.tenant import Tenant, Setting
+from model.query_scope.query_scope import QueryScope
+from model.query_scope.entities import Entities
+from utils.schema.schema_table_index import SchemaTableIndex
+from utils.schema.schema_embedder import get_schema_embedder
+from api.core.constants.tenant.settings_categories import SCHEMA_RESOLVER_CATEGORY_KEY
+from tests.utils.schema.test_schema_table_index import init_schema
+
+class TestSchemaRetrievalService:
+
+    def init_mock_tenant(self, enabled: bool = True, top_k: int = 1, min_tables: int = 3) -> Tenant:
+        def setting(name, value):
+            return Setting(setting_basic_name=name, setting_value=value, setting_description=name, is_custom_setting=False)
+
+        return Tenant(
+            tenant_id="TENANT_TST",
+            tenant_name="Test Tenant",
+            admins=[],
+            settings={
+                SCHEMA_RESOLVER_CATEGORY_KEY: {
+                    "SCHEMA_RETRIEVAL_ENABLED": setting("SCHEMA_RETRIEVAL_ENABLED", enabled),
+                    "SCHEMA_RETRIEVAL_TOP_K": setting("SCHEMA_RETRIEVAL_TOP_K", top_k),
+                    "SCHEMA_RETRIEVAL_MIN_TABLES": setting("SCHEMA_RETRIEVAL_MIN_TABLES", min_tables)
+                }
+            }
+        )
+
+    def init_query_scope(self, tables) -> QueryScope:
+        return QueryScope(intent="fetch_data", entities=Entities(tables=tables, columns=[]))
+
+    @pytest.mark.asyncio
+    async def test_retrieve_schema_keeps_top_tables_and_join_neighbours(self):
+        # Arrange
+        schema = init_schema()
+
+        # Act
+        retrieved = await SchemaRetrievalService.retrieve_schema(
+            tenant=self.init_mock_tenant(), schema=schema, user_input="Which invoices are past their due date?"
+        )
+
+        # Assert
+        assert list(retrieved.schema.tables) == ["orders", "invoices"]
+        assert retrieved.report.retrieved_tables == ["invoices"]
+        assert retrieved.report.neighbour_tables == ["orders"]
+        assert (retrieved.report.total_tables, retrieved.report.candidate_tables) == (6, 6)
+        table_index = SchemaTableIndex.for_schema(schema, get_schema_embedder("hashing"))
+        assert retrieved.report.prompt_tokens_saved == table_index.count_table_tokens(
+            ["customers", "warehouses", "stockItems", "employees"]
+        )
+        assert len(schema.tables) == 6
+
+    @pytest.mark.asyncio
+    async def test_retrieve_schema_chooses_among_broad_query_scope_tables(self):
+        # Act
+        retrieved = await SchemaRetrievalService.retrieve_schema(
+            tenant=self.init_mock_tenant(),
+            schema=init_schema(),
+            user_input="Which invoices are past their due date?",
+            query_scope=self.init_query_scope(["invoices", "warehouses", "employees"])
+        )
+
+        # Assert
+        assert list(retrieved.schema.tables) == ["invoices"]
+        assert retrieved.report.candidate_tables == 3
+
+    @pytest.mark.asyncio
+    async def test_retrieve_schema_keeps_whole_schema(self):
+        # Arrange
+        schema = init_schema()
+
+        # Act
+        disabled = await SchemaRetrievalService.retrieve_schema(
+            tenant=self.init_mock_tenant(enabled=False), schema=schema, user_input="invoices"
+        )
+        small_schema = await SchemaRetrievalService.retrieve_schema(
+            tenant=self.init_mock_tenant(min_tables=10), schema=schema, user_input="invoices"
+        )
+        narrow_scope = await SchemaRetrievalService.retrieve_schema(
+            tenant=self.init_mock_tenant(), schema=schema, user_input="invoices",
+            query_scope=self.init_query_scope(["invoices"])
+        )
+
+        # Assert
+        for retrieved in (disabled, small_schema, narrow_scope):
+            assert retrieved.schema is schema
+            assert retrieved.report is None
+
+    @pytest.mark.asyncio
+    async def test_prepare_schema_index_builds_index_on_schema(self):
+        # Arrange
+        schema = init_schema()
+
+        # Act
+        table_index = await SchemaRetrievalService.prepare_schema_index(self.init_mock_tenant(), schema)
+
+        # Assert
+        assert table_index is SchemaTableIndex.for_schema(schema, table_index.embedder)
+        assert await SchemaRetrievalService.prepare_schema_index(self.init_mock_tenant(enabled=False), schema) is None
+
+    @pytest.mark.asyncio
+    async def test_retrieve_schema_builds_index_off_event_loop(self):
+        # Arrange
+        schema = init_schema()
+        module = "api.core.services.schema.schema_retrieval_service"
+
+        # Act
+        with mock.patch(f"{module}.asyncio.to_thread", wraps=asyncio.to_thread) as mock_to_thread:
+            await SchemaRetrievalService.retrieve_schema(tenant=self.init_mock_tenant(), schema=schema, user_input="invoices")
+            await SchemaRetrievalService.retrieve_schema(tenant=self.init_mock_tenant(), schema=schema, user_input="orders")
+
+        # Assert
+        mock_to_thread.assert_called_once_with(SchemaTableIndex.for_schema, schema, mock.ANY)
@@ -0,0 +1,272 @@
+import json
+import pytest
+from unittest import mock
+from sqlalchemy import create_engine, text
+from fastapi import HTTPException
+
+from api.core.services.sql_runner.sql_cost_guard_service import SqlCostGuardService
+from api.core.services.sql_runner.sql_runner_service import SqlRunnerService
+from model.tenant.tenant import Tenant, Setting
+from model.responses.sql_generation.sql_generation_error import ErrorType
+from utils.external_system_utils.external_system_engine_registry import engine_registry
+from utils.sql_runner.expensive_query_queue import ExpensiveQueryQueue
+from api.core.constants.tenant.settings_categories import EXTERNAL_SYSTEM_DB_SETTING, SQL_RUNNER
+
+POSTGRES_PLAN = [{
+    "Plan": {
+        "Node Type": "Hash Join", "Total Cost": 35210.5, "Plan Rows": 2500000,
+        "Plans": [
+            {"Node Type": "Seq Scan", "Relation Name": "orders", "Total Cost": 20000.0, "Plan Rows": 2500000},
+            {"Node Type": "Hash", "Total Cost": 12.5, "Plan Rows": 100, "Plans": [
+                {"Node Type": "Seq Scan", "Relation Name": "users", "Total Cost": 12.5, "Plan Rows": 100}
+            ]}
+        ]
+    }
+}]
+
+MYSQL_PLAN = {
+    "query_block": {
+        "select_id": 1,
+        "cost_info": {"query_cost": "1204.75"},
+        "nested_loop": [
+            {"table": {"table_name": "users", "access_type": "ALL", "rows_examined_per_scan": 100, "rows_produced_per_join": 100}},
+            {"table": {"table_name": "orders", "access_type": "ref", "rows_examined_per_scan": 12, "rows_produced_per_join": 1200}}
+        ]
+    }
+}
+
+class TestSqlCostGuardService:
+
+    @pytest.fixture(autouse=True)
+    def clear_engine_registry(self):
+        engine_registry.dispose_all()
+        yield
+        engine_registry.dispose_all()
+
+    def init_mock_tenant(self, db_url: str, dialect: str = "sqlite", **guard_settings) -> Tenant:
+        def setting(name, value):
+            return Setting(setting_basic_name=name, setting_value=value, setting_description=name, is_custom_setting=False)
+
+        return Tenant(
+            tenant_id="TENANT_TST2",
+            tenant_name="Test Tenant",
+            admins=[],
+            settings={
+                EXTERNAL_SYSTEM_DB_SETTING: {
+                    "EXTERNAL_TENANT_DB_DIALECT": setting("EXTERNAL_TENANT_DB_DIALECT", dialect),
+                    "EXTERNAL_SYSTEM_DB_CONNECTION_URL": setting("EXTERNAL_SYSTEM_DB_CONNECTION_URL", db_url)
+                },
+                SQL_RUNNER: {key: setting(key, value) for key, value in guard_settings.items()}
+            }
+        )
+
+    def _create_sqlite_database(self, tmp_path) -> str:
+        db_url = f"sqlite:///{tmp_path}/tenant.db"
+        engine = create_engine(db_url)
+        with engine.begin() as connection:
+            connection.execute(text("CREATE TABLE users (user_id INTEGER PRIMARY KEY, username TEXT)"))
+            connection.execute(text("CREATE TABLE orders (order_id INTEGER, user_id INTEGER)"))
+            connection.execute(text("INSERT INTO users VALUES (1, 'a'), (2, 'b'), (3, 'c')"))
+            connection.execute(text("INSERT INTO orders VALUES (1, 1), (2, 1), (3, 2), (4, 3)"))
+            connection.execute(text("ANALYZE"))
+        engine.dispose()
+        return db_url
+
+    @pytest.mark.asyncio
+    async def test_guard_sql_disabled_skips_explain(self):
+        # Arrange
+        tenant = self.init_mock_tenant("sqlite:///:memory:")
+
+        # Act
+        with mock.patch.object(SqlRunnerService, "run_sql_async") as mock_run_sql:
+            result = await SqlCostGuardService.guard_sql("SELECT 1;", tenant)
+
+        # Assert
+        assert result.sql == "SELECT 1;"
+        assert result.query_plan is None
+        mock_run_sql.assert_not_called()
+
+    @pytest.mark.asyncio
+    @mock.patch("api.core.services.sql_runner.sql_runner_service.build_db_url_based_on_dialect")
+    async def test_guard_sql_allows_query_under_thresholds(self, mock_build_db_url, tmp_path):
+        # Arrange
+        mock_build_db_url.return_value = self._create_sqlite_database(tmp_path)
+        tenant = self.init_mock_tenant(mock_build_db_url.return_value, SQL_COST_GUARD_ENABLED=True,
+                                       SQL_COST_GUARD_MAX_ESTIMATED_ROWS=100)
+
+        # Act
+        result = await SqlCostGuardService.guard_sql("SELECT * FROM orders;", tenant)
+
+        # Assert
+        assert result.sql == "SELECT * FROM orders;"
+        assert result.query_plan.action == "allow"
+        assert result.query_plan.estimated_rows == 4
+        assert result.query_plan.plan == ["SCAN orders"]
+        assert not result.queued
+        await engine_registry.dispose_all_async()
+
+    @pytest.mark.asyncio
+    @mock.patch("api.core.services.sql_runner.sql_runner_service.build_db_url_based_on_dialect")
+    async def test_guard_sql_rejects_query_over_thresholds(self, mock_build_db_url, tmp_path):
+        # Arrange
+        mock_build_db_url.return_value = self._create_sqlite_database(tmp_path)
+        tenant = self.init_mock_tenant(mock_build_db_url.return_value, SQL_COST_GUARD_ENABLED=True,
+                                       SQL_COST_GUARD_MAX_ESTIMATED_ROWS=10)
+
+        # Act
+        with pytest.raises(HTTPException) as exc_info:
+            await SqlCostGuardService.guard_sql("SELECT * FROM orders, users;", tenant, user_input="all orders")
+
+        # Assert
+        assert exc_info.value.status_code == 400
+        assert exc_info.value.detail["error_type"] == ErrorType.COST_LIMIT_EXCEEDED
+        assert exc_info.value.detail["query_plan"]["estimated_rows"] == 12
+        assert exc_info.value.detail["query_plan"]["exceeded_thresholds"] == ["estimated_rows 12 > 10"]
+        await engine_registry.dispose_all_async()
+
+    @pytest.mark.asyncio
+    @mock.patch("api.core.services.sql_runner.sql_runner_service.build_db_url_based_on_dialect")
+    async def test_guard_sql_rewrites_query_with_limit(self, mock_build_db_url, tmp_path):
+        # Arrange
+        mock_build_db_url.return_value = self._create_sqlite_database(tmp_path)
+        tenant = self.init_mock_tenant(mock_build_db_url.return_value, SQL_COST_GUARD_ENABLED=True,
+                                       SQL_COST_GUARD_MAX_ESTIMATED_ROWS=2, SQL_COST_GUARD_ACTION="limit",
+                                       SQL_COST_GUARD_LIMIT_ROWS=2)
+
+        # Act
+        result = await SqlCostGuardService.guard_sql("SELECT * FROM orders ORDER BY order_id;", tenant)
+        rows = await SqlRunnerService.run_sql_async(result.sql, tenant)
+
+        # Assert
+        assert result.query_plan.action == "limit"
+        assert result.sql == "SELECT * FROM orders ORDER BY order_id LIMIT 2;"
+        assert rows == [{"order_id": 1, "user_id": 1}, {"order_id": 2, "user_id": 1}]
+        await engine_registry.dispose_all_async()
+
+    @pytest.mark.asyncio
+    @mock.patch("api.core.services.sql_runner.sql_runner_service.build_db_url_based_on_dialect")
+    async def test_guard_sql_limits_join_with_duplicate_column_names(self, mock_build_db_url, tmp_path):
+        # Arrange
+        mock_build_db_url.return_value = self._create_sqlite_database(tmp_path)
+        tenant = self.init_mock_tenant(mock_build_db_url.return_value, SQL_COST_GUARD_ENABLED=True,
+                                       SQL_COST_GUARD_MAX_ESTIMATED_ROWS=2, SQL_COST_GUARD_ACTION="limit",
+                                       SQL_COST_GUARD_LIMIT_ROWS=2)
+        sql = "SELECT * FROM orders JOIN users ON orders.user_id = users.user_id ORDER BY order_id"
+
+        # Act
+        result = await SqlCostGuardService.guard_sql(sql, tenant)
+        rows = await SqlRunnerService.run_sql_async(result.sql, tenant)
+
+        # Assert
+        assert result.sql == f"{sql} LIMIT 2;"
+        assert [row["order_id"] for row in rows] == [1, 2]
+        await engine_registry.dispose_all_async()
+
+    @pytest.mark.asyncio
+    @mock.patch("api.core.services.sql_runner.sql_runner_service.build_db_url_based_on_dialect")
+    async def test_guard_sql_rejects_statement_it_cannot_limit(self, mock_build_db_url, tmp_path):
+        # Arrange
+        mock_build_db_url.return_value = self._create_sqlite_database(tmp_path)
+        tenant = self.init_mock_tenant(mock_build_db_url.return_value, SQL_COST_GUARD_ENABLED=True,
+                                       SQL_COST_GUARD_MAX_ESTIMATED_ROWS=2, SQL_COST_GUARD_ACTION="limit")
+
+        # Act
+        with pytest.raises(HTTPException) as exc_info:
+            await SqlCostGuardService.guard_sql("DELETE FROM orders WHERE user_id IN (SELECT user_id FROM users);", tenant)
+
+        # Assert
+        assert exc_info.value.detail["query_plan"]["action"] == "reject"
+        await engine_registry.dispose_all_async()
+
+    @pytest.mark.parametrize("sql, expected", [
+        ("SELECT * FROM orders LIMIT 500;", "SELECT * FROM orders LIMIT 10;"),
+        ("SELECT * FROM orders LIMIT 5", "SELECT * FROM orders LIMIT 5;"),
+        ("SELECT * FROM orders LIMIT 20, 500", "SELECT * FROM orders LIMIT 20, 10;"),
+        ("SELECT * FROM (SELECT * FROM orders LIMIT 500) o", "SELECT * FROM (SELECT * FROM orders LIMIT 500) o LIMIT 10;"),
+        ("SELECT * FROM orders FETCH FIRST 500 ROWS ONLY", "SELECT * FROM (SELECT * FROM orders FETCH FIRST 500 ROWS ONLY) AS cost_guard_limited LIMIT 10;"),
+        ("UPDATE orders SET user_id = 1", "UPDATE orders SET user_id = 1;"),
+    ])
+    def test_apply_limit(self, sql, expected):
+        # Act & Assert
+        assert SqlCostGuardService.apply_limit(sql, 10) == expected
+
+    @pytest.mark.asyncio
+    @mock.patch("api.core.services.sql_runner.sql_runner_service.build_db_url_based_on_dialect")
+    async def test_guard_sql_queues_query_over_thresholds(self, mock_build_db_url, tmp_path):
+        # Arrange
+        mock_build_db_url.return_value = self._create_sqlite_database(tmp_path)
+        tenant = self.init_mock_tenant(mock_build_db_url.return_value, SQL_COST_GUARD_ENABLED=True,
+                                       SQL_COST_GUARD_MAX_ESTIMATED_ROWS=2, SQL_COST_GUARD_ACTION="queue",
+                                       SQL_COST_GUARD_QUEUE_TIMEOUT_SECONDS=5)
+
+        # Act
+        result = await SqlCostGuardService.guard_sql("SELECT * FROM orders;", tenant)
+
+        # Assert
+        assert result.queued
+        assert result.queue_timeout_seconds == 5
+        assert result.sql == "SELECT * FROM orders;"
+        await engine_registry.dispose_all_async()
+
+    @pytest.mark.asyncio
+    async def test_guard_sql_fails_open_when_explain_fails(self):
+        # Arrange
+        tenant = self.init_mock_tenant("sqlite:///:memory:", SQL_COST_GUARD_ENABLED=True)
+
+        # Act
+        with mock.patch.object(SqlRunnerService, "run_sql_async", side_effect=HTTPException(status_code=400, detail="boom")):
+            result = await SqlCostGuardService.guard_sql("SELECT * FROM missing;", tenant)
+
+        # Assert
+        assert result.sql == "SELECT * FROM missing;"
+        assert result.query_plan is None
+
+    def test_parse_postgres_plan(self):
+        # Act
+        estimated_rows, estimated_cost, plan = SqlCostGuardService.parse_postgres_plan([{"QUERY PLAN": json.dumps(POSTGRES_PLAN)}])
+
+        # Assert
+        assert (estimated_rows, estimated_cost) == (2500000, 35210.5)
+        assert plan == [
+            "Hash Join (rows=2500000, cost=35210.5)",
+            "  Seq Scan on orders (rows=2500000, cost=20000.0)",
+            "  Hash (rows=100, cost=12.5)",
+            "    Seq Scan on users (rows=100, cost=12.5)",
+        ]
+
+    def test_parse_mysql_plan(self):
+        # Act
+        estimated_rows, estimated_cost, plan = SqlCostGuardService.parse_mysql_plan([{"EXPLAIN": json.dumps(MYSQL_PLAN)}])
+
+        # Assert
+        assert (estimated_rows, estimated_cost) == (1200, 1204.75)
+        assert plan == ["ALL on users (rows=100)", "ref on orders (rows=12)"]
+
+    def test_parse_sqlite_plan_without_statistics(self):
+        # Act
+        estimated_rows, estimated_cost, plan = SqlCostGuardService.parse_sqlite_plan(
+            [{"id": 2, "parent": 0, "detail": "SCAN orders"}], table_rows={}
+        )
+
+        # Assert
+        assert (estimated_rows, estimated_cost) == (None, None)
+        assert plan == ["SCAN orders"]
+
+class TestExpensiveQueryQueue:
+
+    @pytest.mark.asyncio
+    async def test_slot_times_out_while_tenant_slot_is_taken(self):
+        # Arrange
+        queue = ExpensiveQueryQueue(max_concurrency=1)
+
+        # Act & Assert
+        async with queue.slot("TENANT_A", timeout_seconds=1):
+            async with queue.slot("TENANT_B", timeout_seconds=1):
+                pass
+            with pytest.raises(HTTPException) as exc_info:
+                async with queue.slot("TENANT_A", timeout_seconds=0.01):
+                    pass
+
+        assert exc_info.value.status_code == 503
+        async with queue.slot("TENANT_A", timeout_seconds=0.01):
+            pass
@@ -0,0 +1,140 @@
+import asyncio
+import json
+import pytest
+from unittest import mock
+from unittest.mock import AsyncMock
+from fastapi import HTTPException
+
+from api.core.services.sql_generation.sql_generation_batch_service import SqlGenerationBatchService
+from model.query_scope.entities import Entities
+from model.query_scope.query_scope import QueryScope
+from model.requests.sql_generation.user_input_request import UserInputRequest
+from model.responses.sql_generation.sql_generation_response import SqlGenerationResponse
+
+BATCH_MODULE = "api.core.services.sql_generation.sql_generation_batch_service"
+
+
+@pytest.mark.asyncio
+@mock.patch(f"{BATCH_MODULE}.SettingUtils.get_setting_value", return_value=2)
+@mock.patch(f"{BATCH_MODULE}.RulesetManagerService.get_ruleset", new_callable=AsyncMock)
+@mock.patch(f"{BATCH_MODULE}.SchemaManagerService.get_schema", new_callable=AsyncMock)
+@mock.patch(f"{BATCH_MODULE}.TenantManagerService.get_tenant", new_callable=AsyncMock)
+class TestSqlGenerationBatchService:
+
+    def init_mock_pipeline_factory(self, delays, running, failing_input=None):
+        def build_pipeline(user_request, **kwargs):
+            async def run():
+                running["now"] += 1
+                running["max"] = max(running["max"], running["now"])
+                try:
+                    await asyncio.sleep(delays[user_request.input])
+                finally:
+                    running["now"] -= 1
+                if user_request.input == failing_input:
+                    raise HTTPException(status_code=403, detail={"message": "denied"})
+                return {}
+            return mock.Mock(run=run, kwargs=kwargs)
+        return build_pipeline
+
+    def build_response(self, pipeline, results, user_request):
+        return SqlGenerationResponse(
+            query_scope=QueryScope(intent="fetch_data", entities=Entities(tables=[], columns=[])),
+            user_input=user_request.input,
+            sql_query=f"SELECT '{user_request.input}'",
+            sql_response=None
+        )
+
+    async def test_generate_batch_bounds_concurrency_and_reports_item_errors(
+        self, mock_get_tenant, mock_get_schema, mock_get_ruleset, mock_get_setting_value
+    ):
+        # Arrange
+        mock_get_tenant.return_value = mock.Mock(settings={})
+        mock_get_schema.return_value = mock.Mock(filter_rules=["ecommerce_ruleset"])
+        running = {"now": 0, "max": 0}
+        delays = {"slow": 0.05, "denied": 0.01, "fast": 0.0, "last": 0.0}
+        requests = [UserInputRequest(input=question) for question in delays]
+
+        # Act
+        with mock.patch(f"{BATCH_MODULE}.SqlGenerationPipelineService.build_pipeline",
+                        side_effect=self.init_mock_pipeline_factory(delays, running, failing_input="denied")) as mock_build_pipeline, \
+                mock.patch(f"{BATCH_MODULE}.SqlGenerationPipelineService.build_response", side_effect=self.build_response):
+            items = [item async for item in SqlGenerationBatchService.generate_batch(
+                tenant_id="TENANT_A", schema_name="ecommerce", user_requests=requests, session=mock.Mock()
+            )]
+
+        # Assert
+        assert running["max"] == 2
+        assert [item.user_input for item in items][-1] == "slow"
+        assert {item.user_input: item.error.status_code for item in items if item.error} == {"denied": 403}
+        mock_get_tenant.assert_awaited_once_with(tenant_id="TENANT_A")
+        mock_get_ruleset.assert_awaited_once_with(tenant_id="TENANT_A", ruleset_name="ecommerce_ruleset")
+        assert all(call.kwargs["ruleset"] is mock_get_ruleset.return_value for call in mock_build_pipeline.call_args_list)
+
+    async def test_generate_batch_bounds_concurrency_across_batches_of_tenant(
+        self, mock_get_tenant, mock_get_schema, mock_get_ruleset, mock_get_setting_value
+    ):
+        # Arrange
+        mock_get_tenant.return_value = mock.Mock(settings={})
+        mock_get_schema.return_value = mock.Mock(filter_rules=["ecommerce_ruleset"])
+        running = {"now": 0, "max": 0}
+        delays = {"first": 0.02, "second": 0.02, "third": 0.02}
+        requests = [UserInputRequest(input=question) for question in delays]
+
+        async def run_batch():
+            return [item async for item in SqlGenerationBatchService.generate_batch(
+                tenant_id="TENANT_A", schema_name="ecommerce", user_requests=requests, session=mock.Mock()
+            )]
+
+        # Act
+        with mock.patch(f"{BATCH_MODULE}.SqlGenerationPipelineService.build_pipeline",
+                        side_effect=self.init_mock_pipeline_factory(delays, running)), \
+                mock.patch(f"{BATCH_MODULE}.SqlGenerationPipelineService.build_response", side_effect=self.build_response):
+            batches = await asyncio.gather(run_batch(), run_batch(), run_batch())
+
+        # Assert
+        assert running["max"] == 2
+        assert [len(items) for items in batches] == [3, 3, 3]
+
+    async def test_collect_batch_orders_items_by_input(
+        self, mock_get_tenant, mock_get_schema, mock_get_ruleset, mock_get_setting_value
+    ):
+        # Arrange
+        mock_get_tenant.return_value = mock.Mock(settings={})
+        mock_get_schema.return_value = mock.Mock(filter_rules=["ecommerce_ruleset"])
+        delays = {"first": 0.03, "second": 0.0}
+        requests = [UserInputRequest(input=question) for question in delays]
+
+        # Act
+        with mock.patch(f"{BATCH_MODULE}.SqlGenerationPipelineService.build_pipeline",
+                        side_effect=self.init_mock_pipeline_factory(delays, {"now": 0, "max": 0})), \
+                mock.patch(f"{BATCH_MODULE}.SqlGenerationPipelineService.build_response", side_effect=self.build_response):
+            response = await SqlGenerationBatchService.collect_batch(SqlGenerationBatchService.generate_batch(
+                tenant_id="TENANT_A", schema_name="ecommerce", user_requests=requests, session=mock.Mock()
+            ))
+            lines = [json.loads(line) async for line in SqlGenerationBatchService.encode_ndjson(
+                SqlGenerationBatchService.generate_batch(
+                    tenant_id="TENANT_A", schema_name="ecommerce", user_requests=requests, session=mock.Mock()
+                )
+            )]
+
+        # Assert
+        assert [item.index for item in response.items] == [0, 1]
+        assert (response.succeeded, response.failed) == (2, 0)
+        assert [line.get("user_input") for line in lines] == ["second", "first", None]
+        assert lines[-1] == {"type": "summary", "succeeded": 2, "failed": 0}
+
+    async def test_generate_batch_rejects_oversized_batch(
+        self, mock_get_tenant, mock_get_schema, mock_get_ruleset, mock_get_setting_value
+    ):
+        # Arrange
+        requests = [UserInputRequest(input="question")] * 3
+
+        # Act & Assert
+        with mock.patch(f"{BATCH_MODULE}.settings.SQL_GENERATION_BATCH_MAX_ITEMS", 2):
+            with pytest.raises(HTTPException) as exc_info:
+                await SqlGenerationBatchService.generate_batch(
+                    tenant_id="TENANT_A", schema_name="ecommerce", user_requests=requests, session=mock.Mock()
+                ).__anext__()
+
+        assert exc_info.value.status_code == 400
+        mock_get_tenant.assert_not_awaited()
@@ -0,0 +1,295 @@
+import asyncio
+import pytest
+from unittest import mock
+from unittest.mock import AsyncMock
+
+from api.core.services.sql_generation.sql_generation_pipeline_service import (
+    SqlGenerationPipelineService, SINGLE_ROUND_TRIP_GENERATION_MODE
+)
+from api.core.services.sql_runner.sql_cost_guard_service import SqlCostGuardResult
+from api.core.services.schema.schema_retrieval_service import RetrievedSchema
+from model.query_scope.entities import Entities
+from model.query_scope.query_scope import QueryScope
+from model.requests.sql_generation.user_input_request import UserInputRequest
+from model.responses.sql_generation.schema_retrieval_report import SchemaRetrievalReport
+
+PIPELINE_MODULE = "api.core.services.sql_generation.sql_generation_pipeline_service"
+
+
+@pytest.mark.asyncio
+class TestSqlGenerationPipelineService:
+
+    def init_mock_schema(self):
+        return mock.Mock(filter_rules=["ecommerce_ruleset"], tables={
+            "orders": mock.Mock(columns={"order_id": mock.Mock(), "credit_card": mock.Mock()}),
+            "purchases": mock.Mock(columns={"order_id": mock.Mock()})
+        })
+
+    @mock.patch(f"{PIPELINE_MODULE}.SqlRunnerService.run_sql_async", new_callable=AsyncMock)
+    @mock.patch(f"{PIPELINE_MODULE}.SettingUtils.get_setting_value", return_value=False)
+    @mock.patch(f"{PIPELINE_MODULE}.LLMServiceWrapper.generate_sql_query", new_callable=AsyncMock)
+    @mock.patch(f"{PIPELINE_MODULE}.SchemaResolver")
+    @mock.patch(f"{PIPELINE_MODULE}.AccessControlResolver")
+    @mock.patch(f"{PIPELINE_MODULE}.QueryScopeResolver")
+    @mock.patch(f"{PIPELINE_MODULE}.LLMServiceWrapper.get_query_scope_with_cache", new_callable=AsyncMock)
+    @mock.patch(f"{PIPELINE_MODULE}.RulesetManagerService.get_ruleset", new_callable=AsyncMock)
+    @mock.patch(f"{PIPELINE_MODULE}.SchemaManagerService.get_schema", new_callable=AsyncMock)
+    @mock.patch(f"{PIPELINE_MODULE}.TenantManagerService.get_tenant", new_callable=AsyncMock)
+    async def test_pipeline_overlaps_fetches_with_intent_call(
+        self, mock_get_tenant, mock_get_schema, mock_get_ruleset, mock_get_query_scope,
+        mock_query_scope_resolver, mock_access_resolver, mock_schema_resolver,
+        mock_generate_sql, mock_get_setting_value, mock_run_sql
+    ):
+        # Arrange
+        events = []
+        schema = self.init_mock_schema()
+
+        async def get_query_scope(**kwargs):
+            events.append("intent_started")
+            await asyncio.sleep(0.05)
+            events.append("intent_finished")
+            return mock.Mock()
+
+        async def get_ruleset(**kwargs):
+            events.append("ruleset_fetched")
+            return mock.Mock()
+
+        mock_get_tenant.return_value = mock.Mock(settings={})
+        mock_get_schema.return_value = schema
+        mock_get_ruleset.side_effect = get_ruleset
+        mock_get_query_scope.side_effect = get_query_scope
+        mock_generate_sql.return_value = "SELECT 1"
+        mock_run_sql.return_value = [{"value": 1}]
+
+        pipeline = SqlGenerationPipelineService.build_pipeline(
+            tenant_id="TENANT_A",
+            schema_name="ecommerce",
+            user_request=UserInputRequest(input="How many orders?"),
+            session=mock.Mock(),
+            run_sql=True
+        )
+
+        # Act
+        results = await pipeline.run()
+
+        # Assert
+        assert events.index("ruleset_fetched") < events.index("intent_finished")
+        mock_get_ruleset.assert_awaited_once_with(tenant_id="TENANT_A", ruleset_name="ecommerce_ruleset")
+        assert results["injected_sql"] == ("SELECT 1", None)
+        assert results["sql_response"] == [{"value": 1}]
+        assert {timing.stage for timing in pipeline.get_timings()} == set(results)
+
+    @mock.patch(f"{PIPELINE_MODULE}.SqlRunnerService.run_sql_async", new_callable=AsyncMock)
+    @mock.patch(f"{PIPELINE_MODULE}.SqlCostGuardService.guard_sql", new_callable=AsyncMock)
+    @mock.patch(f"{PIPELINE_MODULE}.SettingUtils.get_setting_value", return_value=False)
+    @mock.patch(f"{PIPELINE_MODULE}.LLMServiceWrapper.generate_sql_query", new_callable=AsyncMock)
+    @mock.patch(f"{PIPELINE_MODULE}.SchemaResolver")
+    @mock.patch(f"{PIPELINE_MODULE}.AccessControlResolver")
+    @mock.patch(f"{PIPELINE_MODULE}.QueryScopeResolver")
+    @mock.patch(f"{PIPELINE_MODULE}.LLMServiceWrapper.get_query_scope_with_cache", new_callable=AsyncMock)
+    @mock.patch(f"{PIPELINE_MODULE}.RulesetManagerService.get_ruleset", new_callable=AsyncMock)
+    @mock.patch(f"{PIPELINE_MODULE}.SchemaManagerService.get_schema", new_callable=AsyncMock)
+    @mock.patch(f"{PIPELINE_MODULE}.TenantManagerService.get_tenant", new_callable=AsyncMock)
+    async def test_pipeline_runs_sql_returned_by_cost_guard(
+        self, mock_get_tenant, mock_get_schema, mock_get_ruleset, mock_get_query_scope,
+        mock_query_scope_resolver, mock_access_resolver, mock_schema_resolver,
+        mock_generate_sql, mock_get_setting_value, mock_guard_sql, mock_run_sql
+    ):
+        # Arrange
+        limited_sql = "SELECT * FROM (SELECT 1) AS cost_guard_limited LIMIT 10;"
+        mock_get_tenant.return_value = mock.Mock(settings={}, tenant_id="TENANT_A")
+        mock_get_schema.return_value = self.init_mock_schema()
+        mock_generate_sql.return_value = "SELECT 1"
+        mock_guard_sql.return_value = SqlCostGuardResult(sql=limited_sql, queue_timeout_seconds=1)
+        mock_run_sql.return_value = [{"value": 1}]
+
+        pipeline = SqlGenerationPipelineService.build_pipeline(
+            tenant_id="TENANT_A",
+            schema_name="ecommerce",
+            user_request=UserInputRequest(input="How many orders?"),
+            session=mock.Mock(),
+            run_sql=True
+        )
+
+        # Act
+        results = await pipeline.run()
+
+        # Assert
+        assert mock_guard_sql.await_args.kwargs["sql"] == "SELECT 1"
+        assert mock_run_sql.await_args.kwargs["query"] == limited_sql
+        assert results["sql_response"] == [{"value": 1}]
+
+    def init_mock_query_scope(self, tables, columns):
+        return QueryScope(intent="fetch_data", entities=Entities(tables=tables, columns=columns))
+
+    def get_single_round_trip_setting(self, settings, category_key, setting_key):
+        return SINGLE_ROUND_TRIP_GENERATION_MODE if setting_key == "GENERATION_MODE" else False
+
+    def build_single_round_trip_pipeline(self):
+        return SqlGenerationPipelineService.build_pipeline(
+            tenant_id="TENANT_A",
+            schema_name="ecommerce",
+            user_request=UserInputRequest(input="List order ids"),
+            session=mock.Mock()
+        )
+
+    @mock.patch(f"{PIPELINE_MODULE}.SettingUtils.get_setting_value")
+    @mock.patch(f"{PIPELINE_MODULE}.LLMServiceWrapper.generate_sql_query", new_callable=AsyncMock)
+    @mock.patch(f"{PIPELINE_MODULE}.LLMServiceWrapper.get_query_scope_and_sql", new_callable=AsyncMock)
+    @mock.patch(f"{PIPELINE_MODULE}.SchemaResolver")
+    @mock.patch(f"{PIPELINE_MODULE}.AccessControlResolver")
+    @mock.patch(f"{PIPELINE_MODULE}.QueryScopeResolver")
+    @mock.patch(f"{PIPELINE_MODULE}.RulesetManagerService.get_ruleset", new_callable=AsyncMock)
+    @mock.patch(f"{PIPELINE_MODULE}.SchemaManagerService.get_schema", new_callable=AsyncMock)
+    @mock.patch(f"{PIPELINE_MODULE}.TenantManagerService.get_tenant", new_callable=AsyncMock)
+    async def test_single_round_trip_uses_candidate_sql_when_scope_unchanged(
+        self, mock_get_tenant, mock_get_schema, mock_get_ruleset, mock_query_scope_resolver,
+        mock_access_resolver, mock_schema_resolver, mock_get_query_scope_and_sql,
+        mock_generate_sql, mock_get_setting_value
+    ):
+        # Arrange
+        mock_get_setting_value.side_effect = self.get_single_round_trip_setting
+        mock_get_tenant.return_value = mock.Mock(settings={})
+        mock_get_schema.return_value = self.init_mock_schema()
+        mock_get_query_scope_and_sql.return_value = (
+            self.init_mock_query_scope(["orders"], ["orders.order_id"]), "SELECT o.order_id FROM orders o"
+        )
+        mock_query_scope_resolver.return_value.resolve_query_scope.return_value = self.init_mock_query_scope(
+            ["orders"], ["orders.order_id"]
+        )
+        mock_access_resolver.return_value.has_access_to_scope.return_value = True
+
+        # Act
+        results = await self.build_single_round_trip_pipeline().run()
+
+        # Assert
+        assert results["generated_sql"] == "SELECT o.order_id FROM orders o"
+        mock_get_query_scope_and_sql.assert_awaited_once()
+        mock_generate_sql.assert_not_awaited()
+        mock_access_resolver.return_value.has_access_to_scope.assert_called_once()
+
+    @mock.patch(f"{PIPELINE_MODULE}.SettingUtils.get_setting_value")
+    @mock.patch(f"{PIPELINE_MODULE}.LLMServiceWrapper.generate_sql_query", new_callable=AsyncMock)
+    @mock.patch(f"{PIPELINE_MODULE}.LLMServiceWrapper.get_query_scope_and_sql", new_callable=AsyncMock)
+    @mock.patch(f"{PIPELINE_MODULE}.SchemaResolver")
+    @mock.patch(f"{PIPELINE_MODULE}.AccessControlResolver")
+    @mock.patch(f"{PIPELINE_MODULE}.QueryScopeResolver")
+    @mock.patch(f"{PIPELINE_MODULE}.RulesetManagerService.get_ruleset", new_callable=AsyncMock)
+    @mock.patch(f"{PIPELINE_MODULE}.SchemaManagerService.get_schema", new_callable=AsyncMock)
+    @mock.patch(f"{PIPELINE_MODULE}.TenantManagerService.get_tenant", new_callable=AsyncMock)
+    async def test_single_round_trip_falls_back_when_scope_changed(
+        self, mock_get_tenant, mock_get_schema, mock_get_ruleset, mock_query_scope_resolver,
+        mock_access_resolver, mock_schema_resolver, mock_get_query_scope_and_sql,
+        mock_generate_sql, mock_get_setting_value
+    ):
+        # Arrange
+        resolved_query_scope = self.init_mock_query_scope(["orders"], ["orders.order_id"])
+        mock_get_setting_value.side_effect = self.get_single_round_trip_setting
+        mock_get_tenant.return_value = mock.Mock(settings={})
+        mock_get_schema.return_value = self.init_mock_schema()
+        mock_get_query_scope_and_sql.return_value = (
+            self.init_mock_query_scope(["purchases"], ["purchases.order_id"]), "SELECT p.order_id FROM purchases p"
+        )
+        mock_query_scope_resolver.return_value.resolve_query_scope.return_value = resolved_query_scope
+        mock_access_resolver.return_value.has_access_to_scope.return_value = True
+        mock_generate_sql.return_value = "SELECT o.order_id FROM orders o"
+
+        # Act
+        results = await self.build_single_round_trip_pipeline().run()
+
+        # Assert
+        assert results["generated_sql"] == "SELECT o.order_id FROM orders o"
+        mock_generate_sql.assert_awaited_once()
+        assert mock_generate_sql.call_args.kwargs["query_scope"] is resolved_query_scope
+
+    @mock.patch(f"{PIPELINE_MODULE}.SettingUtils.get_setting_value")
+    @mock.patch(f"{PIPELINE_MODULE}.LLMServiceWrapper.generate_sql_query", new_callable=AsyncMock)
+    @mock.patch(f"{PIPELINE_MODULE}.LLMServiceWrapper.get_query_scope_and_sql", new_callable=AsyncMock)
+    @mock.patch(f"{PIPELINE_MODULE}.SchemaResolver")
+    @mock.patch(f"{PIPELINE_MODULE}.AccessControlResolver")
+    @mock.patch(f"{PIPELINE_MODULE}.QueryScopeResolver")
+    @mock.patch(f"{PIPELINE_MODULE}.RulesetManagerService.get_ruleset", new_callable=AsyncMock)
+    @mock.patch(f"{PIPELINE_MODULE}.SchemaManagerService.get_schema", new_callable=AsyncMock)
+    @mock.patch(f"{PIPELINE_MODULE}.TenantManagerService.get_tenant", new_callable=AsyncMock)
+    async def test_single_round_trip_falls_back_when_sql_reads_column_outside_scope(
+        self, mock_get_tenant, mock_get_schema, mock_get_ruleset, mock_query_scope_resolver,
+        mock_access_resolver, mock_schema_resolver, mock_get_query_scope_and_sql,
+        mock_generate_sql, mock_get_setting_value
+    ):
+        # Arrange
+        # credit_card is denied by the ruleset, the declared scope leaves it out so access control passes
+        resolved_query_scope = self.init_mock_query_scope(["orders"], ["orders.order_id"])
+        mock_get_setting_value.side_effect = self.get_single_round_trip_setting
+        mock_get_tenant.return_value = mock.Mock(settings={})
+        mock_get_schema.return_value = self.init_mock_schema()
+        mock_get_query_scope_and_sql.return_value = (
+            self.init_mock_query_scope(["orders"], ["orders.order_id"]), "SELECT o.order_id, o.credit_card FROM orders o"
+        )
+        mock_query_scope_resolver.return_value.resolve_query_scope.return_value = resolved_query_scope
+        mock_access_resolver.return_value.has_access_to_scope.return_value = True
+        mock_generate_sql.return_value = "SELECT o.order_id FROM orders o"
+
+        # Act
+        results = await self.build_single_round_trip_pipeline().run()
+
+        # Assert
+        assert results["generated_sql"] == "SELECT o.order_id FROM orders o"
+        mock_generate_sql.assert_awaited_once()
+        assert mock_generate_sql.call_args.kwargs["query_scope"] is resolved_query_scope
+
+    @pytest.mark.parametrize("sql, expected_tables, expected_columns", [
+        ("SELECT o.order_id FROM orders o", {"orders"}, {"orders.order_id"}),
+        ("SELECT * FROM orders", {"orders"}, {"orders.order_id", "orders.credit_card"}),
+        ("SELECT p.order_id FROM purchases p WHERE 'credit_card' <> ''", {"purchases"}, {"purchases.order_id"}),
+    ])
+    async def test_get_referenced_entities(self, sql, expected_tables, expected_columns):
+        # Act
+        tables, columns = SqlGenerationPipelineService.get_referenced_entities(sql, self.init_mock_schema())
+
+        # Assert
+        assert tables == expected_tables
+        assert columns == expected_columns
+
+    @mock.patch(f"{PIPELINE_MODULE}.SchemaRetrievalService.retrieve_schema", new_callable=AsyncMock)
+    @mock.patch(f"{PIPELINE_MODULE}.SettingUtils.get_setting_value", return_value=False)
+    @mock.patch(f"{PIPELINE_MODULE}.LLMServiceWrapper.generate_sql_query", new_callable=AsyncMock)
+    @mock.patch(f"{PIPELINE_MODULE}.SchemaResolver")
+    @mock.patch(f"{PIPELINE_MODULE}.AccessControlResolver")
+    @mock.patch(f"{PIPELINE_MODULE}.QueryScopeResolver")
+    @mock.patch(f"{PIPELINE_MODULE}.LLMServiceWrapper.get_query_scope_with_cache", new_callable=AsyncMock)
+    @mock.patch(f"{PIPELINE_MODULE}.RulesetManagerService.get_ruleset", new_callable=AsyncMock)
+    @mock.patch(f"{PIPELINE_MODULE}.SchemaManagerService.get_schema", new_callable=AsyncMock)
+    @mock.patch(f"{PIPELINE_MODULE}.TenantManagerService.get_tenant", new_callable=AsyncMock)
+    async def test_pipeline_resolves_retrieved_schema(
+        self, mock_get_tenant, mock_get_schema, mock_get_ruleset, mock_get_query_scope,
+        mock_query_scope_resolver, mock_access_resolver, mock_schema_resolver,
+        mock_generate_sql, mock_get_setting_value, mock_retrieve_schema
+    ):
+        # Arrange
+        schema, retrieved_schema = self.init_mock_schema(), self.init_mock_schema()
+        resolved_query_scope = self.init_mock_query_scope(["orders"], ["orders.order_id"])
+        report = SchemaRetrievalReport(embedder="hashing", total_tables=800, candidate_tables=800,
+                                       retrieved_tables=["orders"], prompt_tokens_saved=120000)
+        mock_get_tenant.return_value = mock.Mock(settings={})
+        mock_get_schema.return_value = schema
+        mock_get_query_scope.return_value = resolved_query_scope
+        mock_query_scope_resolver.return_value.resolve_query_scope.return_value = resolved_query_scope
+        mock_retrieve_schema.return_value = RetrievedSchema(schema=retrieved_schema, report=report)
+        mock_generate_sql.return_value = "SELECT o.order_id FROM orders o"
+        user_request = UserInputRequest(input="List order ids")
+        pipeline = SqlGenerationPipelineService.build_pipeline(
+            tenant_id="TENANT_A",
+            schema_name="ecommerce",
+            user_request=user_request,
+            session=mock.Mock()
+        )
+
+        # Act
+        results = await pipeline.run()
+        response = SqlGenerationPipelineService.build_response(pipeline, results, user_request)
+
+        # Assert
+        assert mock_retrieve_schema.call_args.kwargs["schema"] is schema
+        assert mock_retrieve_schema.call_args.kwargs["query_scope"] is resolved_query_scope
+        assert mock_schema_resolver.call_args.kwargs["matched_schema"] is retrieved_schema
+        assert response.schema_retrieval == report
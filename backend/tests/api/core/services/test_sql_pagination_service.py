@@ -0,0 +1,320 @@
+import pytest
+from unittest import mock
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from uuid import uuid4
+from sqlalchemy import create_engine, text
+from fastapi import HTTPException
+
+from api.core.services.sql_runner.sql_pagination_service import SqlPaginationService, PageKey
+from api.core.services.sql_runner.sql_runner_service import SqlRunnerService
+from model.tenant.tenant import Tenant, Setting
+from model.schema.schema import Schema
+from model.query_scope.query_scope import QueryScope
+from model.query_scope.entities import Entities
+from model.external_system_integration.external_user_session_data import ExternalSessionData
+from utils.external_system_utils.external_system_engine_registry import engine_registry
+from utils.sql_runner.continuation_token_utils import encode_key_value, decode_key_value
+from api.core.constants.tenant.settings_categories import EXTERNAL_SYSTEM_DB_SETTING, SQL_RUNNER
+
+SERVICE_MODULE = "api.core.services.sql_runner.sql_pagination_service"
+
+class TestSqlPaginationService:
+
+    @pytest.fixture(autouse=True)
+    def clear_engine_registry(self):
+        engine_registry.dispose_all()
+        yield
+        engine_registry.dispose_all()
+
+    @pytest.fixture(autouse=True)
+    def token_secret(self):
+        with mock.patch(f"{SERVICE_MODULE}._token_secret", b"test-secret"):
+            yield
+
+    def init_mock_tenant(self, db_url: str, page_size: int = 2) -> Tenant:
+        def setting(name, value):
+            return Setting(setting_basic_name=name, setting_value=value, setting_description=name, is_custom_setting=False)
+
+        return Tenant(
+            tenant_id="TENANT_TST2",
+            tenant_name="Test Tenant",
+            admins=[],
+            settings={
+                EXTERNAL_SYSTEM_DB_SETTING: {
+                    "EXTERNAL_TENANT_DB_DIALECT": setting("EXTERNAL_TENANT_DB_DIALECT", "sqlite"),
+                    "EXTERNAL_SYSTEM_DB_CONNECTION_URL": setting("EXTERNAL_SYSTEM_DB_CONNECTION_URL", db_url)
+                },
+                SQL_RUNNER: {
+                    "SQL_PAGINATION_ENABLED": setting("SQL_PAGINATION_ENABLED", True),
+                    "SQL_PAGE_SIZE": setting("SQL_PAGE_SIZE", page_size)
+                }
+            }
+        )
+
+    def init_mock_session(self, user_id: str = "user@example.com", tenant_id: str = "TENANT_TST2") -> ExternalSessionData:
+        now = datetime.now(timezone.utc)
+        return ExternalSessionData(
+            session_id=uuid4(),
+            tenant_id=tenant_id,
+            user_id=user_id,
+            custom_fields={},
+            created_at=now,
+            expires_at=now + timedelta(hours=1)
+        )
+
+    def init_mock_schema(self) -> Schema:
+        def column(*constraints):
+            return {"type": "INTEGER", "constraints": list(constraints), "exclude_description_on_generate_sql": False, "is_sensitive_column": False}
+
+        return Schema(
+            tenant_id="TENANT_TST2",
+            schema_name="ecommerce",
+            description="E-commerce schema",
+            exclude_description_on_generate_sql=False,
+            context_type="sql",
+            context_setting={},
+            tables={
+                "orders": {
+                    "exclude_description_on_generate_sql": False,
+                    "columns": {"order_id": column("PRIMARY KEY"), "amount": column()}
+                }
+            }
+        )
+
+    def init_query_scope(self) -> QueryScope:
+        return QueryScope(intent="fetch_data", entities=Entities(tables=["orders"], columns=["orders.order_id", "orders.amount"]))
+
+    def _create_sqlite_database(self, tmp_path) -> str:
+        db_url = f"sqlite:///{tmp_path}/tenant.db"
+        engine = create_engine(db_url)
+        with engine.begin() as connection:
+            connection.execute(text("CREATE TABLE orders (order_id INTEGER PRIMARY KEY, amount INTEGER)"))
+            connection.execute(text("INSERT INTO orders VALUES (1, 30), (2, 10), (3, 30), (4, 20), (5, 10)"))
+            connection.execute(text("CREATE TABLE refunds (order_id INTEGER, amount INTEGER)"))
+            connection.execute(text("INSERT INTO refunds VALUES (1, 5), (2, 10), (3, 5)"))
+        engine.dispose()
+        return db_url
+
+    async def _fetch_all_pages(self, sql, tenant, session):
+        first_page = await SqlPaginationService.fetch_first_page(
+            sql=sql, tenant=tenant, schema_name="ecommerce", schema=self.init_mock_schema(),
+            query_scope=self.init_query_scope(), session=session
+        )
+        pages = [first_page]
+        with mock.patch(f"{SERVICE_MODULE}.TenantManagerService.get_tenant", new=mock.AsyncMock(return_value=tenant)):
+            while pages[-1].page.continuation_token:
+                pages.append(await SqlPaginationService.fetch_next_page(
+                    continuation_token=pages[-1].page.continuation_token,
+                    tenant_id="TENANT_TST2", schema_name="ecommerce", session=session
+                ))
+        return pages
+
+    @pytest.mark.asyncio
+    @mock.patch("api.core.services.sql_runner.sql_runner_service.build_db_url_based_on_dialect")
+    async def test_pages_follow_primary_key(self, mock_build_db_url, tmp_path):
+        # Arrange
+        mock_build_db_url.return_value = self._create_sqlite_database(tmp_path)
+        tenant = self.init_mock_tenant(mock_build_db_url.return_value)
+
+        # Act
+        pages = await self._fetch_all_pages("SELECT order_id, amount FROM orders;", tenant, self.init_mock_session())
+
+        # Assert
+        assert [[row["order_id"] for row in page.rows] for page in pages] == [[1, 2], [3, 4], [5]]
+        assert [page.page.has_more for page in pages] == [True, True, False]
+        assert pages[0].page.key_columns == ["order_id"]
+        assert len({page.page.sql_hash for page in pages}) == 1
+        await engine_registry.dispose_all_async()
+
+    @pytest.mark.asyncio
+    @mock.patch("api.core.services.sql_runner.sql_runner_service.build_db_url_based_on_dialect")
+    async def test_pages_keep_trailing_order_by(self, mock_build_db_url, tmp_path):
+        # Arrange
+        mock_build_db_url.return_value = self._create_sqlite_database(tmp_path)
+        tenant = self.init_mock_tenant(mock_build_db_url.return_value)
+
+        # Act
+        pages = await self._fetch_all_pages("SELECT order_id, amount FROM orders ORDER BY amount DESC", tenant, self.init_mock_session())
+
+        # Assert
+        assert [(row["amount"], row["order_id"]) for page in pages for row in page.rows] == [
+            (30, 1), (30, 3), (20, 4), (10, 2), (10, 5)
+        ]
+        assert pages[0].page.key_columns == ["amount", "order_id"]
+        await engine_registry.dispose_all_async()
+
+    @pytest.mark.asyncio
+    @mock.patch("api.core.services.sql_runner.sql_runner_service.build_db_url_based_on_dialect")
+    async def test_pages_keep_order_by_after_window_function(self, mock_build_db_url, tmp_path):
+        # Arrange
+        mock_build_db_url.return_value = self._create_sqlite_database(tmp_path)
+        tenant = self.init_mock_tenant(mock_build_db_url.return_value)
+        sql = "SELECT order_id, amount, ROW_NUMBER() OVER (ORDER BY order_id) AS position FROM orders ORDER BY amount DESC"
+
+        # Act
+        pages = await self._fetch_all_pages(sql, tenant, self.init_mock_session())
+
+        # Assert
+        assert [row["order_id"] for page in pages for row in page.rows] == [1, 3, 4, 2, 5]
+        assert pages[0].page.key_columns == ["amount", "order_id"]
+        await engine_registry.dispose_all_async()
+
+    @pytest.mark.asyncio
+    @mock.patch("api.core.services.sql_runner.sql_runner_service.build_db_url_based_on_dialect")
+    async def test_join_with_duplicate_column_names_is_not_wrapped(self, mock_build_db_url, tmp_path):
+        # Arrange
+        mock_build_db_url.return_value = self._create_sqlite_database(tmp_path)
+        tenant = self.init_mock_tenant(mock_build_db_url.return_value)
+        sql = "SELECT * FROM orders JOIN refunds ON orders.order_id = refunds.order_id ORDER BY orders.order_id"
+
+        # Act
+        with mock.patch.object(SqlRunnerService, "run_sql_async", wraps=SqlRunnerService.run_sql_async) as mock_run_sql:
+            pages = await self._fetch_all_pages(sql, tenant, self.init_mock_session())
+
+        # Assert
+        assert mock_run_sql.call_args.kwargs["query"] == f"{sql} LIMIT 3"
+        assert len(pages) == 1
+        assert [row["order_id"] for row in pages[0].rows] == [1, 2]
+        assert pages[0].page.has_more
+        assert pages[0].page.continuation_token is None
+        assert pages[0].page.key_columns == []
+        await engine_registry.dispose_all_async()
+
+    @pytest.mark.asyncio
+    @mock.patch("api.core.services.sql_runner.sql_runner_service.build_db_url_based_on_dialect")
+    async def test_fetch_next_page_rejects_token_of_other_user(self, mock_build_db_url, tmp_path):
+        # Arrange
+        mock_build_db_url.return_value = self._create_sqlite_database(tmp_path)
+        tenant = self.init_mock_tenant(mock_build_db_url.return_value)
+        first_page = await SqlPaginationService.fetch_first_page(
+            sql="SELECT * FROM orders", tenant=tenant, schema_name="ecommerce", schema=self.init_mock_schema(),
+            query_scope=self.init_query_scope(), session=self.init_mock_session()
+        )
+
+        # Act & Assert
+        with pytest.raises(HTTPException) as exc_info:
+            await SqlPaginationService.fetch_next_page(
+                continuation_token=first_page.page.continuation_token,
+                tenant_id="TENANT_TST2", schema_name="ecommerce", session=self.init_mock_session(user_id="other@example.com")
+            )
+
+        assert exc_info.value.status_code == 403
+        await engine_registry.dispose_all_async()
+
+    @pytest.mark.asyncio
+    @mock.patch("api.core.services.sql_runner.sql_runner_service.build_db_url_based_on_dialect")
+    async def test_fetch_next_page_rejects_token_of_other_session_of_user(self, mock_build_db_url, tmp_path):
+        # Arrange
+        mock_build_db_url.return_value = self._create_sqlite_database(tmp_path)
+        tenant = self.init_mock_tenant(mock_build_db_url.return_value)
+        first_page = await SqlPaginationService.fetch_first_page(
+            sql="SELECT * FROM orders", tenant=tenant, schema_name="ecommerce", schema=self.init_mock_schema(),
+            query_scope=self.init_query_scope(), session=self.init_mock_session()
+        )
+
+        # Act & Assert
+        with pytest.raises(HTTPException) as exc_info:
+            await SqlPaginationService.fetch_next_page(
+                continuation_token=first_page.page.continuation_token,
+                tenant_id="TENANT_TST2", schema_name="ecommerce", session=self.init_mock_session()
+            )
+
+        assert exc_info.value.status_code == 403
+        await engine_registry.dispose_all_async()
+
+    @pytest.mark.asyncio
+    @mock.patch("api.core.services.sql_runner.sql_runner_service.build_db_url_based_on_dialect")
+    async def test_fetch_next_page_rejects_tampered_or_expired_token(self, mock_build_db_url, tmp_path):
+        # Arrange
+        mock_build_db_url.return_value = self._create_sqlite_database(tmp_path)
+        tenant = self.init_mock_tenant(mock_build_db_url.return_value)
+        session = self.init_mock_session()
+        first_page = await SqlPaginationService.fetch_first_page(
+            sql="SELECT * FROM orders", tenant=tenant, schema_name="ecommerce", schema=self.init_mock_schema(),
+            query_scope=self.init_query_scope(), session=session
+        )
+        body, signature = first_page.page.continuation_token.split(".")
+
+        # Act & Assert
+        with pytest.raises(HTTPException) as tampered_info:
+            await SqlPaginationService.fetch_next_page(
+                continuation_token=f"{body}x.{signature}", tenant_id="TENANT_TST2", schema_name="ecommerce", session=session
+            )
+        with mock.patch(f"{SERVICE_MODULE}.time.time", return_value=datetime.now().timestamp() + 7200):
+            with pytest.raises(HTTPException) as expired_info:
+                await SqlPaginationService.fetch_next_page(
+                    continuation_token=first_page.page.continuation_token, tenant_id="TENANT_TST2", schema_name="ecommerce", session=session
+                )
+
+        assert tampered_info.value.status_code == 400
+        assert expired_info.value.status_code == 410
+        await engine_registry.dispose_all_async()
+
+    @pytest.mark.asyncio
+    async def test_fetch_first_page_requires_token_secret(self):
+        # Arrange
+        tenant = self.init_mock_tenant("sqlite:///:memory:")
+
+        # Act & Assert
+        with mock.patch(f"{SERVICE_MODULE}._token_secret", None), pytest.raises(HTTPException) as exc_info:
+            await SqlPaginationService.fetch_first_page(
+                sql="SELECT * FROM orders", tenant=tenant, schema_name="ecommerce", schema=self.init_mock_schema(),
+                query_scope=self.init_query_scope(), session=self.init_mock_session()
+            )
+
+        assert exc_info.value.status_code == 500
+
+    def test_build_page_query_uses_keyset_predicate(self):
+        # Act
+        query, params = SqlPaginationService.build_page_query(
+            "mysql", "SELECT * FROM orders", [PageKey("amount", True), PageKey("order_id")], [30, 1], limit=3
+        )
+
+        # Assert
+        assert query == (
+            "SELECT * FROM (SELECT * FROM orders) AS paged_query"
+            " WHERE (`amount` < :page_key_0) OR (`amount` = :page_key_0 AND `order_id` > :page_key_1)"
+            " ORDER BY `amount` DESC, `order_id` ASC LIMIT 3"
+        )
+        assert params == {"page_key_0": 30, "page_key_1": 1}
+
+    @pytest.mark.parametrize("sql, expected", [
+        ("SELECT order_id, RANK() OVER (ORDER BY amount DESC) AS amount_rank FROM orders",
+         [PageKey("order_id")]),
+        ("SELECT * FROM (SELECT order_id, amount FROM orders ORDER BY amount LIMIT 3) AS cheapest",
+         [PageKey("order_id")]),
+        ("SELECT * FROM (SELECT order_id, amount FROM orders ORDER BY amount LIMIT 3) AS cheapest ORDER BY cheapest.amount DESC, order_id LIMIT 2",
+         [PageKey("amount", True), PageKey("order_id")]),
+    ])
+    def test_select_page_keys_reads_only_top_level_order_by(self, sql, expected):
+        # Act
+        keys = SqlPaginationService.select_page_keys(sql, ["order_id", "amount"], self.init_query_scope(), self.init_mock_schema())
+
+        # Assert
+        assert keys == expected
+
+    def test_build_page_query_without_keys_limits_in_place(self):
+        # Act
+        query, params = SqlPaginationService.build_page_query("mysql", "SELECT * FROM orders o JOIN refunds r ON o.order_id = r.order_id", [], None, limit=3)
+
+        # Assert
+        assert query == "SELECT * FROM orders o JOIN refunds r ON o.order_id = r.order_id LIMIT 3"
+        assert params == {}
+
+    def test_select_page_keys_falls_back_to_all_unique_columns(self):
+        # Act
+        keys = SqlPaginationService.select_page_keys(
+            "SELECT o.amount, o.amount, COUNT(*) AS total FROM orders o GROUP BY o.amount",
+            ["amount", "amount", "total"], self.init_query_scope(), self.init_mock_schema()
+        )
+
+        # Assert
+        assert keys == [PageKey("total")]
+
+    @pytest.mark.parametrize("value", [
+        datetime(2024, 1, 2, 3, 4, 5), Decimal("10.50"), b"\x00\x01", uuid4(), 42, "text"
+    ])
+    def test_key_values_round_trip(self, value):
+        # Act & Assert
+        assert decode_key_value(encode_key_value(value)) == value
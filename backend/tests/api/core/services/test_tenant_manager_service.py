@@ -5,6 +5,7 @@ from model.tenant.tenant import Tenant
 from utils.database import mongodb
 from utils.tenant_manager.setting_utils import SettingUtils
 from api.core.services.tenant_manager.tenant_manager_service import TenantManagerService
+from utils.cache.tenant_cache import tenant_cache
 from model.requests.tenant_manager.update_tenant_request import UpdateTenantRequestModel
 from model.responses.tenant_manager.add_tenant_response import AddTenantResponse
 
@@ -143,7 +144,7 @@ class TestTenantManagerService:
         # Assert
         mock_collection.update_one.assert_called_once_with(
             {"tenant_id": mock_data["tenant_id"]},
-            {"$set": {"tenant_name": "UPDATED TENANT"}}
+            {"$set": {"tenant_name": "UPDATED TENANT"}, "$inc": {"version": 1}}
         )
         assert result == {"message": "Tenant updated successfully"}
 
@@ -179,7 +180,8 @@ class TestTenantManagerService:
         mock_db.__getitem__.side_effect = lambda name: {
             "tenants": mock_tenants_collection,
             "schemas": mock_schemas_collection,
-            "rulesets": mock_rulesets_collection
+            "rulesets": mock_rulesets_collection,
+            "sql_generation_cache": mock.AsyncMock()
         }[name]
 
         mock_schemas_collection.delete_many.return_value = mock.AsyncMock(deleted_count=3)
@@ -194,4 +196,46 @@ class TestTenantManagerService:
             "message": "Tenant and associated orphan data deleted successfully",
             "schemas_deleted": 3,
             "rulesets_deleted": 2
-        }
\ No newline at end of file
+        }
+
+    @mock.patch("utils.database.mongodb.db")
+    async def test_get_tenant_uses_cache(self, mock_db):
+        # Arrange
+        mock_collection = mock.AsyncMock()
+        mock_db.__getitem__.return_value = mock_collection
+        mock_collection.find_one.return_value = {
+            "tenant_id": "TENANT123",
+            "tenant_name": "Test Tenant",
+            "admins": [],
+            "settings": {}
+        }
+
+        # Act
+        first = await TenantManagerService.get_tenant("TENANT123")
+        second = await TenantManagerService.get_tenant("TENANT123")
+
+        # Assert
+        assert first.tenant_name == second.tenant_name == "Test Tenant"
+        assert first is not second
+        mock_collection.find_one.assert_called_once()
+
+    @mock.patch("utils.database.mongodb.db")
+    async def test_get_tenant_does_not_cache_read_racing_update(self, mock_db):
+        # Arrange
+        mock_collection = mock.AsyncMock()
+        mock_db.__getitem__.return_value = mock_collection
+        stale_tenant = {"tenant_id": "TENANT123", "tenant_name": "Stale Tenant", "admins": [], "settings": {}}
+
+        async def find_one_racing_update(query):
+            # The update lands while the read is in flight
+            tenant_cache.invalidate("TENANT123")
+            return stale_tenant
+
+        mock_collection.find_one.side_effect = find_one_racing_update
+
+        # Act
+        tenant = await TenantManagerService.get_tenant("TENANT123")
+
+        # Assert
+        assert tenant.tenant_name == "Stale Tenant"
+        assert tenant_cache.get("TENANT123") is None
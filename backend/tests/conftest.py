@@ -0,0 +1,22 @@
+import pytest
+
+from utils.cache.query_scope_cache import query_scope_cache
+from utils.cache.tenant_cache import tenant_cache
+from utils.cache.schema_ruleset_cache import schema_ruleset_cache
+from utils.cache.schema_entity_index_cache import schema_entity_index_cache
+from utils.cache.session_cache import session_cache
+from utils.sql_runner.expensive_query_queue import expensive_query_queue
+from api.core.services.sql_generation.sql_generation_batch_service import SqlGenerationBatchService
+
+
+@pytest.fixture(autouse=True)
+def clear_process_caches():
+    # Process-wide caches would otherwise leak mocked documents between tests
+    query_scope_cache.clear()
+    tenant_cache.clear()
+    schema_ruleset_cache.clear()
+    schema_entity_index_cache.clear()
+    session_cache.clear()
+    expensive_query_queue.clear()
+    SqlGenerationBatchService.clear_semaphores()
+    yield
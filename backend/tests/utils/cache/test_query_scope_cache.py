@@ -0,0 +1,74 @@
+from model.query_scope.query_scope import QueryScope
+from utils.cache.query_scope_cache import QueryScopeCache
+
+
+def _query_scope(tables) -> QueryScope:
+    return QueryScope(**{
+        "intent": "fetch_data",
+        "entities": {"tables": tables, "columns": [f"{tables[0]}.*"]}
+    })
+
+
+class TestQueryScopeCache:
+
+    def test_get_matches_normalized_input(self):
+        # Arrange
+        cache = QueryScopeCache(max_size=10, ttl_seconds=60)
+        cache.set("TENANT_A", "orders", "Show all orders?", _query_scope(["orders"]))
+
+        # Act
+        cached = cache.get("TENANT_A", "orders", "  show   ALL orders ")
+
+        # Assert
+        assert cached.entities.tables == ["orders"]
+
+    def test_get_returns_copy(self):
+        # Arrange
+        cache = QueryScopeCache(max_size=10, ttl_seconds=60)
+        cache.set("TENANT_A", "orders", "show all orders", _query_scope(["orders"]))
+
+        # Act
+        cache.get("TENANT_A", "orders", "show all orders").entities.tables.append("customers")
+
+        # Assert
+        assert cache.get("TENANT_A", "orders", "show all orders").entities.tables == ["orders"]
+
+    def test_get_is_scoped_by_tenant_and_schema(self):
+        # Arrange
+        cache = QueryScopeCache(max_size=10, ttl_seconds=60)
+        cache.set("TENANT_A", "orders", "show all orders", _query_scope(["orders"]))
+
+        # Act & Assert
+        assert cache.get("TENANT_B", "orders", "show all orders") is None
+        assert cache.get("TENANT_A", "inventory", "show all orders") is None
+
+    def test_get_similarity_tier_matches_near_duplicates(self):
+        # Arrange
+        cache = QueryScopeCache(max_size=10, ttl_seconds=60)
+        cache.set("TENANT_A", "orders", "show me all the orders placed by customers", _query_scope(["orders"]))
+
+        # Act
+        exact_only = cache.get("TENANT_A", "orders", "show me all the orders placed by our customers")
+        similar = cache.get(
+            "TENANT_A", "orders", "show me all the orders placed by our customers", similarity_threshold=0.8
+        )
+        unrelated = cache.get("TENANT_A", "orders", "list products low on stock", similarity_threshold=0.8)
+
+        # Assert
+        assert exact_only is None
+        assert similar.entities.tables == ["orders"]
+        assert unrelated is None
+        assert cache.stats()["similarity_hits"] == 1
+
+    def test_invalidate_schema_removes_only_that_schema(self):
+        # Arrange
+        cache = QueryScopeCache(max_size=10, ttl_seconds=60)
+        cache.set("TENANT_A", "orders", "show all orders", _query_scope(["orders"]))
+        cache.set("TENANT_A", "inventory", "show all products", _query_scope(["products"]))
+
+        # Act
+        cache.invalidate_schema("TENANT_A", "orders")
+
+        # Assert
+        assert cache.get("TENANT_A", "orders", "show all orders") is None
+        assert cache.get("TENANT_A", "inventory", "show all products") is not None
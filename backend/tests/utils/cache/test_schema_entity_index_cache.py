@@ -0,0 +1,46 @@
+from model.responses.schema.schema_tables_response import SchemaTablesResponse, TableResponse
+from utils.cache.schema_entity_index_cache import SchemaEntityIndexCache
+from utils.schema.schema_entity_index import SchemaEntityIndex
+
+
+class TestSchemaEntityIndexCache:
+
+    def init_schema(self, schema_name, table_name):
+        return SchemaTablesResponse(schema_name=schema_name, tables=[TableResponse(table_name=table_name, columns=[])])
+
+    def test_set_rejects_index_built_before_a_change(self):
+        # Arrange
+        cache = SchemaEntityIndexCache(max_size=10, ttl_seconds=60)
+        version = cache.get_version("TENANT_A")
+
+        # Act
+        cache.remove_schema("TENANT_A", "ecommerce")
+        stored = cache.set("TENANT_A", SchemaEntityIndex([self.init_schema("ecommerce", "orders")]), version)
+
+        # Assert
+        assert stored is False
+        assert cache.get("TENANT_A") is None
+
+    def test_changes_are_applied_to_loaded_index(self):
+        # Arrange
+        cache = SchemaEntityIndexCache(max_size=10, ttl_seconds=60)
+        cache.set("TENANT_A", SchemaEntityIndex([self.init_schema("ecommerce", "orders")]), cache.get_version("TENANT_A"))
+
+        # Act
+        cache.upsert_schema("TENANT_A", self.init_schema("shop", "orders"), previous_schema_name="ecommerce")
+        cache.upsert_schema("TENANT_A", self.init_schema("inventory", "products"))
+        cache.remove_schema("TENANT_A", "inventory")
+
+        # Assert
+        assert cache.get("TENANT_A").schema_names == ["shop"]
+
+    def test_invalidate_tenant_drops_index(self):
+        # Arrange
+        cache = SchemaEntityIndexCache(max_size=10, ttl_seconds=60)
+        cache.set("TENANT_A", SchemaEntityIndex(), cache.get_version("TENANT_A"))
+
+        # Act
+        cache.invalidate_tenant("TENANT_A")
+
+        # Assert
+        assert cache.get("TENANT_A") is None
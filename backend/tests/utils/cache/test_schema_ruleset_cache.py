@@ -0,0 +1,85 @@
+from unittest import mock
+
+from utils.cache.schema_ruleset_cache import SchemaRulesetCache, SCHEMA_KIND, RULESET_KIND
+
+
+class TestSchemaRulesetCache:
+
+    def test_get_returns_cached_model(self):
+        # Arrange
+        cache = SchemaRulesetCache(max_size=10, ttl_seconds=60)
+        schema = mock.Mock()
+        cache.set(SCHEMA_KIND, "TENANT_A", "sales", schema, cache.get_version("TENANT_A"))
+
+        # Act
+        result = cache.get(SCHEMA_KIND, "TENANT_A", "sales")
+
+        # Assert
+        assert result is schema
+        assert cache.get(RULESET_KIND, "TENANT_A", "sales") is None
+
+    def test_invalidate_drops_entry(self):
+        # Arrange
+        cache = SchemaRulesetCache(max_size=10, ttl_seconds=60)
+        cache.set(RULESET_KIND, "TENANT_A", "rules", mock.Mock(), cache.get_version("TENANT_A"))
+
+        # Act
+        cache.invalidate(RULESET_KIND, "TENANT_A", "rules")
+
+        # Assert
+        assert cache.get(RULESET_KIND, "TENANT_A", "rules") is None
+
+    def test_set_skips_model_read_before_invalidation(self):
+        # Arrange
+        cache = SchemaRulesetCache(max_size=10, ttl_seconds=60)
+        version = cache.get_version("TENANT_A")
+        cache.invalidate(SCHEMA_KIND, "TENANT_A", "sales")
+
+        # Act
+        stored = cache.set(SCHEMA_KIND, "TENANT_A", "sales", mock.Mock(), version)
+
+        # Assert
+        assert stored is False
+        assert cache.get(SCHEMA_KIND, "TENANT_A", "sales") is None
+
+    def test_invalidate_tenant_keeps_other_tenants(self):
+        # Arrange
+        cache = SchemaRulesetCache(max_size=10, ttl_seconds=60)
+        other_schema = mock.Mock()
+        cache.set(SCHEMA_KIND, "TENANT_A", "sales", mock.Mock(), cache.get_version("TENANT_A"))
+        cache.set(SCHEMA_KIND, "TENANT_B", "sales", other_schema, cache.get_version("TENANT_B"))
+
+        # Act
+        cache.invalidate_tenant("TENANT_A")
+
+        # Assert
+        assert cache.get(SCHEMA_KIND, "TENANT_A", "sales") is None
+        assert cache.get(SCHEMA_KIND, "TENANT_B", "sales") is other_schema
+
+    def test_handle_change_invalidates_deleted_document(self):
+        # Arrange
+        cache = SchemaRulesetCache(max_size=10, ttl_seconds=60)
+        cache.set(RULESET_KIND, "TENANT_A", "rules", mock.Mock(), cache.get_version("TENANT_A"), object_id="65f0c0ffee")
+
+        # Act
+        cache._handle_change(RULESET_KIND, {"operationType": "delete", "documentKey": {"_id": "65f0c0ffee"}})
+
+        # Assert
+        assert cache.get(RULESET_KIND, "TENANT_A", "rules") is None
+
+    def test_handle_change_invalidates_renamed_document(self):
+        # Arrange
+        cache = SchemaRulesetCache(max_size=10, ttl_seconds=60)
+        cache.set(SCHEMA_KIND, "TENANT_A", "sales", mock.Mock(), cache.get_version("TENANT_A"), object_id="65f0c0ffee")
+        cache.set(SCHEMA_KIND, "TENANT_B", "sales", mock.Mock(), cache.get_version("TENANT_B"))
+
+        # Act
+        cache._handle_change(SCHEMA_KIND, {
+            "operationType": "update",
+            "documentKey": {"_id": "65f0c0ffee"},
+            "fullDocument": {"tenant_id": "TENANT_A", "schema_name": "sales_v2", "version": 1}
+        })
+
+        # Assert
+        assert cache.get(SCHEMA_KIND, "TENANT_A", "sales") is None
+        assert cache.get(SCHEMA_KIND, "TENANT_B", "sales") is not None
@@ -0,0 +1,99 @@
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+
+from model.external_system_integration.external_user_session_data import ExternalSessionData
+from utils.auth_utils import authenticate_session
+from utils.cache.session_cache import SessionCache, session_cache
+
+
+def _session_document(expires_in_seconds: int = 3600) -> dict:
+    now = datetime.now(timezone.utc)
+    return {
+        "session_id": uuid4(),
+        "tenant_id": "TENANT_A",
+        "user_id": "user@example.com",
+        "custom_fields": {"role": "admin"},
+        "created_at": now,
+        "expires_at": now + timedelta(seconds=expires_in_seconds),
+        "session_settings": {}
+    }
+
+
+class TestSessionCache:
+
+    def test_get_returns_copy_of_cached_session(self):
+        # Arrange
+        cache = SessionCache(max_size=10, ttl_seconds=60)
+        session_data = ExternalSessionData(**_session_document())
+        cache.set(session_data)
+
+        # Act
+        cached_session = cache.get(session_data.session_id)
+        cached_session.custom_fields["role"] = "guest"
+
+        # Assert
+        assert cache.get(session_data.session_id).custom_fields["role"] == "admin"
+
+    def test_set_skips_expired_session(self):
+        # Arrange
+        cache = SessionCache(max_size=10, ttl_seconds=60)
+        session_data = ExternalSessionData(**_session_document(expires_in_seconds=-5))
+
+        # Act
+        cache.set(session_data)
+
+        # Assert
+        assert cache.get(session_data.session_id) is None
+
+    def test_invalidate_drops_session(self):
+        # Arrange
+        cache = SessionCache(max_size=10, ttl_seconds=60)
+        session_data = ExternalSessionData(**_session_document())
+        cache.set(session_data)
+
+        # Act
+        cache.invalidate(session_data.session_id)
+
+        # Assert
+        assert cache.get(session_data.session_id) is None
+
+
+@pytest.mark.asyncio
+class TestAuthenticateSessionCache:
+
+    @mock.patch("utils.auth_utils.mongodb")
+    async def test_valid_session_is_served_from_cache(self, mock_mongodb):
+        # Arrange
+        session_document = _session_document()
+        mock_collection = mock.AsyncMock()
+        mock_collection.find_one.return_value = session_document
+        mock_mongodb.db.__getitem__.return_value = mock_collection
+
+        # Act
+        first = await authenticate_session(x_session_id=str(session_document["session_id"]))
+        second = await authenticate_session(x_session_id=str(session_document["session_id"]))
+
+        # Assert
+        assert first == second
+        mock_collection.find_one.assert_awaited_once()
+
+    @mock.patch("utils.auth_utils.mongodb")
+    async def test_invalidated_session_is_reloaded(self, mock_mongodb):
+        # Arrange
+        session_document = _session_document()
+        mock_collection = mock.AsyncMock()
+        mock_collection.find_one.side_effect = [session_document, None]
+        mock_mongodb.db.__getitem__.return_value = mock_collection
+        await authenticate_session(x_session_id=str(session_document["session_id"]))
+
+        # Act
+        session_cache.invalidate(session_document["session_id"])
+        with pytest.raises(HTTPException) as exc_info:
+            await authenticate_session(x_session_id=str(session_document["session_id"]))
+
+        # Assert
+        assert exc_info.value.status_code == 401
@@ -0,0 +1,70 @@
+import pytest
+from unittest import mock
+
+from utils.cache.sql_generation_cache import SqlGenerationCache
+
+
+@pytest.mark.asyncio
+class TestSqlGenerationCache:
+
+    def _messages(self, schema_json: str):
+        return [
+            {"role": "system", "content": f"instruction\nSchema: {schema_json}"},
+            {"role": "user", "content": "Get all orders"}
+        ]
+
+    async def test_build_key_changes_with_resolved_schema(self):
+        # Act
+        first = SqlGenerationCache.build_key("gpt-4o-mini", self._messages('{"tables": {"orders": {}}}'))
+        same = SqlGenerationCache.build_key("gpt-4o-mini", self._messages('{"tables": {"orders": {}}}'))
+        changed = SqlGenerationCache.build_key("gpt-4o-mini", self._messages('{"tables": {"customers": {}}}'))
+
+        # Assert
+        assert first == same
+        assert first != changed
+
+    async def test_get_returns_in_memory_entry(self):
+        # Arrange
+        cache = SqlGenerationCache(max_size=10, ttl_seconds=60)
+        await cache.set("TENANT_A", "key", "SELECT * FROM orders;")
+
+        # Act
+        generated_sql = await cache.get("TENANT_A", "key")
+
+        # Assert
+        assert generated_sql == "SELECT * FROM orders;"
+        assert await cache.get("TENANT_B", "key") is None
+        assert cache.stats()["hits"] == 1
+
+    @mock.patch("utils.cache.sql_generation_cache.mongodb")
+    async def test_get_falls_back_to_persistent_tier(self, mock_mongodb):
+        # Arrange
+        cache = SqlGenerationCache(max_size=10, ttl_seconds=60)
+        mock_collection = mock.AsyncMock()
+        mock_collection.find_one.return_value = {"sql_query": "SELECT * FROM orders;"}
+        mock_mongodb.db.__getitem__.return_value = mock_collection
+
+        # Act
+        generated_sql = await cache.get("TENANT_A", "key", use_persistent=True)
+        cached_again = await cache.get("TENANT_A", "key", use_persistent=True)
+
+        # Assert
+        assert generated_sql == cached_again == "SELECT * FROM orders;"
+        mock_collection.find_one.assert_called_once()
+        assert cache.stats()["persistent_hits"] == 1
+
+    @mock.patch("utils.cache.sql_generation_cache.mongodb")
+    async def test_set_writes_persistent_tier(self, mock_mongodb):
+        # Arrange
+        cache = SqlGenerationCache(max_size=10, ttl_seconds=60)
+        mock_collection = mock.AsyncMock()
+        mock_mongodb.db.__getitem__.return_value = mock_collection
+
+        # Act
+        await cache.set("TENANT_A", "key", "SELECT * FROM orders;", use_persistent=True)
+
+        # Assert
+        filter_arg, update_arg = mock_collection.update_one.call_args.args
+        assert filter_arg == {"tenant_id": "TENANT_A", "cache_key": "key"}
+        assert update_arg["$set"]["sql_query"] == "SELECT * FROM orders;"
+        assert mock_collection.update_one.call_args.kwargs["upsert"] is True
@@ -0,0 +1,70 @@
+import pytest
+from unittest import mock
+
+from utils.cache.tenant_cache import TenantCache
+
+
+def _tenant_document(tenant_name: str = "Test Tenant", version: int = 0) -> dict:
+    return {
+        "_id": "65f0c0ffee",
+        "tenant_id": "TENANT_A",
+        "tenant_name": tenant_name,
+        "admins": [],
+        "settings": {},
+        "version": version
+    }
+
+
+@pytest.mark.asyncio
+class TestTenantCache:
+
+    async def test_get_returns_copy_of_cached_tenant(self):
+        # Arrange
+        cache = TenantCache(max_size=10, ttl_seconds=60)
+        cache.set("TENANT_A", _tenant_document(version=3), cache.get_version("TENANT_A"))
+
+        # Act
+        tenant = cache.get("TENANT_A")
+        tenant.settings["NEW_CATEGORY"] = {}
+
+        # Assert
+        assert "NEW_CATEGORY" not in cache.get("TENANT_A").settings
+
+    async def test_set_skips_tenant_read_before_invalidation(self):
+        # Arrange
+        cache = TenantCache(max_size=10, ttl_seconds=60)
+        version = cache.get_version("TENANT_A")
+        cache.invalidate("TENANT_A")
+
+        # Act
+        tenant = cache.set("TENANT_A", _tenant_document(tenant_name="Stale Tenant"), version)
+
+        # Assert
+        assert tenant.tenant_name == "Stale Tenant"
+        assert cache.get("TENANT_A") is None
+
+    @mock.patch("utils.cache.tenant_cache.mongodb")
+    async def test_mark_modified_invalidates_and_bumps_version(self, mock_mongodb):
+        # Arrange
+        cache = TenantCache(max_size=10, ttl_seconds=60)
+        cache.set("TENANT_A", _tenant_document(), cache.get_version("TENANT_A"))
+        mock_collection = mock.AsyncMock()
+        mock_mongodb.db.__getitem__.return_value = mock_collection
+
+        # Act
+        await cache.mark_modified("TENANT_A")
+
+        # Assert
+        assert cache.get("TENANT_A") is None
+        mock_collection.update_one.assert_called_once_with({"tenant_id": "TENANT_A"}, {"$inc": {"version": 1}})
+
+    async def test_handle_change_invalidates_by_document_key(self):
+        # Arrange
+        cache = TenantCache(max_size=10, ttl_seconds=60)
+        cache.set("TENANT_A", _tenant_document(), cache.get_version("TENANT_A"))
+
+        # Act
+        cache._handle_change({"operationType": "delete", "documentKey": {"_id": "65f0c0ffee"}})
+
+        # Assert
+        assert cache.get("TENANT_A") is None
@@ -0,0 +1,75 @@
+from unittest import mock
+
+from utils.cache.ttl_lru_cache import TTLLRUCache
+
+
+class TestTTLLRUCache:
+
+    def test_get_counts_hits_and_misses(self):
+        # Arrange
+        cache = TTLLRUCache(max_size=2)
+        cache.set("a", 1)
+
+        # Act
+        hit = cache.get("a")
+        miss = cache.get("b")
+
+        # Assert
+        assert hit == 1
+        assert miss is None
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_set_evicts_least_recently_used(self):
+        # Arrange
+        cache = TTLLRUCache(max_size=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+
+        # Act
+        cache.set("c", 3)
+
+        # Assert
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.stats()["evictions"] == 1
+
+    @mock.patch("utils.cache.ttl_lru_cache.time.monotonic")
+    def test_get_expires_entries_after_ttl(self, mock_monotonic):
+        # Arrange
+        cache = TTLLRUCache(max_size=2, ttl_seconds=10)
+        mock_monotonic.return_value = 100.0
+        cache.set("a", 1)
+        cache.set("b", 2, ttl_seconds=30)
+
+        # Act
+        mock_monotonic.return_value = 111.0
+
+        # Assert
+        assert cache.get("a") is None
+        assert cache.get("b") == 2
+
+    def test_set_with_non_positive_ttl_does_not_store(self):
+        # Arrange
+        cache = TTLLRUCache(max_size=2)
+
+        # Act
+        cache.set("a", 1, ttl_seconds=0)
+
+        # Assert
+        assert cache.get("a") is None
+
+    def test_delete_where_removes_matching_keys(self):
+        # Arrange
+        cache = TTLLRUCache(max_size=4)
+        cache.set(("T1", "x"), 1)
+        cache.set(("T1", "y"), 2)
+        cache.set(("T2", "x"), 3)
+
+        # Act
+        removed = cache.delete_where(lambda key: key[0] == "T1")
+
+        # Assert
+        assert removed == 2
+        assert cache.get(("T2", "x")) == 3
@@ -0,0 +1,128 @@
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from utils.external_system_utils.external_api_client_registry import ExternalApiClientRegistry
+
+
+async def _start_server() -> TestServer:
+    async def get_users(request):
+        return web.json_response([{"user_id": "user1"}])
+
+    async def login(request):
+        response = web.json_response({"user_id": request.query["user_id"]})
+        response.set_cookie("session", request.query["user_id"])
+        return response
+
+    async def get_cookies(request):
+        return web.json_response(dict(request.cookies))
+
+    app = web.Application()
+    app.router.add_get("/get-users", get_users)
+    app.router.add_get("/login", login)
+    app.router.add_get("/cookies", get_cookies)
+    server = TestServer(app)
+    await server.start_server()
+    return server
+
+
+@pytest.mark.asyncio
+class TestExternalApiClientRegistry:
+
+    async def test_session_reused_per_tenant_origin(self):
+        # Arrange
+        registry = ExternalApiClientRegistry(max_size=10)
+
+        # Act
+        first = await registry.get_session("TENANT_A", "https://external.api/get-user?user_id=1")
+        second = await registry.get_session("TENANT_A", "https://EXTERNAL.api/get-users")
+        other_tenant = await registry.get_session("TENANT_B", "https://external.api/get-user")
+
+        # Assert
+        assert first is second
+        assert other_tenant is not first
+        assert registry.get_summary()["sessions_created"] == 2
+        await registry.close_all()
+
+    async def test_connections_reused_across_calls(self):
+        # Arrange
+        server = await _start_server()
+        registry = ExternalApiClientRegistry(max_size=10)
+        endpoint = str(server.make_url("/get-users"))
+
+        # Act
+        for _ in range(3):
+            async with registry.session("TENANT_A", endpoint) as session:
+                async with session.get(endpoint) as response:
+                    await response.json()
+        summary = registry.get_summary()
+        await registry.close_all()
+        await server.close()
+
+        # Assert
+        assert summary["requests"] == 3
+        assert summary["connections_created"] == 1
+        assert summary["connections_reused"] == 2
+
+    async def test_cookies_are_not_shared_between_calls(self):
+        # Arrange
+        server = await _start_server()
+        registry = ExternalApiClientRegistry(max_size=10)
+        # The default cookie jar ignores cookies of IP address hosts
+        base_url = f"http://localhost:{server.port}"
+        async with registry.session("TENANT_A", base_url) as session:
+            async with session.get(f"{base_url}/login", params={"user_id": "user_a"}) as response:
+                await response.json()
+
+        # Act
+        async with registry.session("TENANT_A", base_url) as session:
+            async with session.get(f"{base_url}/cookies") as response:
+                cookies = await response.json()
+        await registry.close_all()
+        await server.close()
+
+        # Assert
+        assert cookies == {}
+
+    async def test_least_recently_used_session_is_closed(self):
+        # Arrange
+        registry = ExternalApiClientRegistry(max_size=1)
+        first = await registry.get_session("TENANT_A", "https://a.example.com/users")
+
+        # Act
+        await registry.get_session("TENANT_A", "https://b.example.com/users")
+
+        # Assert
+        assert first.closed
+        assert registry.get_summary()["sessions"] == 1
+        await registry.close_all()
+
+    async def test_invalidate_tenant_closes_its_sessions(self):
+        # Arrange
+        registry = ExternalApiClientRegistry(max_size=10)
+        tenant_session = await registry.get_session("TENANT_A", "https://a.example.com/users")
+        other_session = await registry.get_session("TENANT_B", "https://a.example.com/users")
+
+        # Act
+        closed = await registry.invalidate_tenant("TENANT_A")
+
+        # Assert
+        assert closed == 1
+        assert tenant_session.closed
+        assert not other_session.closed
+        await registry.close_all()
+
+    async def test_session_in_use_is_closed_after_last_release(self):
+        # Arrange
+        registry = ExternalApiClientRegistry(max_size=1)
+
+        # Act
+        async with registry.session("TENANT_A", "https://a.example.com/users") as in_use:
+            await registry.get_session("TENANT_A", "https://b.example.com/users")
+            closed_while_in_use = in_use.closed
+
+        # Assert
+        assert not closed_while_in_use
+        assert in_use.closed
+        assert registry.get_summary()["sessions_closed"] == 1
+        await registry.close_all()
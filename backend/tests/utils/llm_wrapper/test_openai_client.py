@@ -0,0 +1,62 @@
+import asyncio
+
+import pytest
+from unittest import mock
+
+from utils.llm_wrapper.openai_client import OpenAIClient
+
+
+@pytest.mark.asyncio
+class TestOpenAIClient:
+
+    async def test_connect_reuses_single_client(self):
+        # Arrange
+        client = OpenAIClient()
+
+        # Act
+        await client.connect()
+        first = client.client
+        await client.connect()
+
+        # Assert
+        assert client.client is first
+        await client.disconnect()
+        assert client.client is None
+
+    async def test_create_chat_completion_applies_default_timeout(self):
+        # Arrange
+        client = OpenAIClient()
+        await client.connect()
+        client.client.chat.completions.create = mock.AsyncMock(return_value="response")
+
+        # Act
+        response = await client.create_chat_completion(model="gpt-4o-mini", messages=[])
+
+        # Assert
+        assert response == "response"
+        assert client.client.chat.completions.create.call_args.kwargs["timeout"] is not None
+        await client.disconnect()
+
+    @mock.patch("utils.llm_wrapper.openai_client.settings.OPENAI_MAX_CONCURRENT_REQUESTS", 2)
+    async def test_create_chat_completion_bounds_concurrency(self):
+        # Arrange
+        client = OpenAIClient()
+        await client.connect()
+        in_flight = 0
+        max_in_flight = 0
+
+        async def fake_create(**kwargs):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+
+        client.client.chat.completions.create = fake_create
+
+        # Act
+        await asyncio.gather(*(client.create_chat_completion(messages=[]) for _ in range(6)))
+
+        # Assert
+        assert max_in_flight == 2
+        await client.disconnect()
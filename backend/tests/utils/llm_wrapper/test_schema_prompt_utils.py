@@ -0,0 +1,94 @@
+import json
+import pytest
+from unittest import mock
+
+from utils.llm_wrapper import schema_prompt_utils
+from utils.llm_wrapper.schema_prompt_utils import SchemaPromptUtils, count_tokens
+
+class TestSchemaPromptUtils:
+
+    def init_resolved_schema(self) -> dict:
+        return {
+            "tables": {
+                "orders": {
+                    "description": "Customer orders",
+                    "synonyms": ["purchases"],
+                    "columns": {
+                        "order_id": {"type": "INTEGER"},
+                        "customer_id": {"type": "INTEGER", "description": "Buyer"}
+                    },
+                    "relationships": {
+                        "customers": {
+                            "table": "customers",
+                            "on": "orders.customer_id = customers.customer_id",
+                            "type": "INNER"
+                        }
+                    }
+                },
+                "customers": {
+                    "columns": {"customer_id": {"type": "INTEGER"}}
+                }
+            }
+        }
+
+    def test_encode_json_keeps_resolved_schema(self):
+        # Arrange
+        resolved_schema = self.init_resolved_schema()
+
+        # Act
+        encoded = SchemaPromptUtils.encode(resolved_schema, "json")
+
+        # Assert
+        assert json.loads(encoded) == resolved_schema
+
+    def test_encode_ddl(self):
+        # Act
+        encoded = SchemaPromptUtils.encode(self.init_resolved_schema(), "ddl")
+
+        # Assert
+        assert encoded.splitlines() == [
+            "CREATE TABLE orders ( -- Customer orders; synonyms: purchases",
+            "  order_id INTEGER,",
+            "  customer_id INTEGER -- Buyer",
+            ");",
+            "CREATE TABLE customers (",
+            "  customer_id INTEGER",
+            ");",
+            "-- orders INNER JOIN customers ON orders.customer_id = customers.customer_id",
+        ]
+
+    def test_encode_compact(self):
+        # Act
+        encoded = SchemaPromptUtils.encode(self.init_resolved_schema(), "compact")
+
+        # Assert
+        assert encoded.splitlines() == [
+            'orders(order_id:INTEGER, customer_id:INTEGER "Buyer") "Customer orders" ~purchases',
+            "customers(customer_id:INTEGER)",
+            "joins:",
+            "orders -INNER-> customers ON orders.customer_id = customers.customer_id",
+        ]
+
+    def test_encode_unknown_format_raises(self):
+        with pytest.raises(ValueError):
+            SchemaPromptUtils.encode(self.init_resolved_schema(), "yaml")
+
+    @pytest.mark.parametrize("schema_format", ["ddl", "compact"])
+    def test_compact_encodings_are_smaller_than_json(self, schema_format):
+        # Arrange
+        resolved_schema = self.init_resolved_schema()
+
+        # Act
+        json_tokens, _ = count_tokens(SchemaPromptUtils.encode(resolved_schema, "json"), "gpt-4o-mini")
+        tokens, _ = count_tokens(SchemaPromptUtils.encode(resolved_schema, schema_format), "gpt-4o-mini")
+
+        # Assert
+        assert tokens < json_tokens
+
+    @mock.patch.object(schema_prompt_utils, "tiktoken", None)
+    def test_count_tokens_estimates_without_tiktoken(self):
+        # Act
+        tokens, counted_with = count_tokens("x" * 9, "gpt-4o-mini")
+
+        # Assert
+        assert (tokens, counted_with) == (3, "estimate")
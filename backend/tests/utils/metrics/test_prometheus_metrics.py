@@ -0,0 +1,153 @@
+import pytest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from fastapi import HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.pool import QueuePool
+
+from api.core.exceptions.default_exception_handler import http_exception_handler
+from model.query_scope.query_scope import QueryScope
+from model.responses.sql_generation.sql_generation_error import (
+    QueryScopeResolutionErrorResponse, QueryScopeErrorType
+)
+from utils.pipeline.stage_graph import StageGraph
+from utils.cache.tenant_cache import TenantCache
+from utils.external_system_utils.external_system_engine_registry import ExternalSystemEngineRegistry
+from utils.metrics.prometheus_metrics import (
+    MongoPoolListener, metrics_registry, record_error, record_llm_usage, render_metrics
+)
+
+
+def sample(name, **labels):
+    return metrics_registry.get_sample_value(name, labels) or 0
+
+
+@pytest.mark.asyncio
+class TestStageMetrics:
+
+    async def test_stage_durations_are_observed_by_tenant_and_status(self):
+        # Arrange
+        async def failing(ok_stage):
+            raise ValueError("boom")
+
+        pipeline = StageGraph(name="metrics_test", tenant_id="TENANT_METRICS")
+        pipeline.add_stage("ok_stage", lambda: 1)
+        pipeline.add_stage("failing_stage", failing, depends_on=["ok_stage"])
+        labels = {"tenant_id": "TENANT_METRICS", "pipeline": "metrics_test"}
+        ok_before = sample("sqlexecutor_pipeline_stage_duration_seconds_count", stage="ok_stage", status="ok", **labels)
+        error_before = sample("sqlexecutor_pipeline_stage_duration_seconds_count", stage="failing_stage", status="error", **labels)
+
+        # Act
+        with pytest.raises(ValueError):
+            await pipeline.run()
+
+        # Assert
+        assert sample("sqlexecutor_pipeline_stage_duration_seconds_count", stage="ok_stage", status="ok", **labels) == ok_before + 1
+        assert sample("sqlexecutor_pipeline_stage_duration_seconds_count", stage="failing_stage", status="error", **labels) == error_before + 1
+
+
+class TestCounters:
+
+    def test_record_error_labels_query_scope_errors(self):
+        # Arrange
+        detail = QueryScopeResolutionErrorResponse(
+            scope_error_type=QueryScopeErrorType.TABLE_NOT_FOUND,
+            user_query_scope=QueryScope(intent="fetch_data", entities={"tables": [], "columns": []}),
+            issues=[],
+            message="Table not found"
+        ).dict()
+        labels = {"tenant_id": "TENANT_ERRORS", "error_type": "query_scope_error", "error_subtype": "table_not_found", "status_code": "400"}
+        before = sample("sqlexecutor_errors_total", **labels)
+
+        # Act
+        record_error("TENANT_ERRORS", 400, detail)
+        record_error(None, 404, "Tenant not found")
+
+        # Assert
+        assert sample("sqlexecutor_errors_total", **labels) == before + 1
+        assert sample("sqlexecutor_errors_total", tenant_id="unknown", error_type="http_error", error_subtype="", status_code="404") >= 1
+
+    def test_record_llm_usage_counts_prompt_and_completion_tokens(self):
+        # Arrange
+        usage = SimpleNamespace(prompt_tokens=120, completion_tokens=30, total_tokens=150)
+        labels = {"tenant_id": "TENANT_TOKENS", "model": "test-model", "call": "sql_generation"}
+
+        # Act
+        record_llm_usage("TENANT_TOKENS", "test-model", "sql_generation", usage)
+        record_llm_usage("TENANT_TOKENS", "test-model", "sql_generation", None)
+
+        # Assert
+        assert sample("sqlexecutor_llm_tokens_total", token_type="prompt", **labels) == 120
+        assert sample("sqlexecutor_llm_tokens_total", token_type="completion", **labels) == 30
+
+    def test_tenant_cache_lookups_are_counted(self):
+        # Arrange
+        cache = TenantCache(max_size=10, ttl_seconds=60)
+        cache.set("TENANT_CACHE", {"tenant_id": "TENANT_CACHE", "tenant_name": "Cached Tenant"}, cache.get_version("TENANT_CACHE"))
+        hits_before = sample("sqlexecutor_cache_requests_total", result="hit", tenant_id="TENANT_CACHE", cache="tenant")
+        misses_before = sample("sqlexecutor_cache_requests_total", result="miss", tenant_id="unknown", cache="tenant")
+
+        # Act
+        hit = cache.get("TENANT_CACHE")
+        miss = cache.get("TENANT_CACHE_MISSING")
+
+        # Assert
+        assert hit.tenant_id == "TENANT_CACHE"
+        assert miss is None
+        assert sample("sqlexecutor_cache_requests_total", result="hit", tenant_id="TENANT_CACHE", cache="tenant") == hits_before + 1
+        assert sample("sqlexecutor_cache_requests_total", result="miss", tenant_id="unknown", cache="tenant") == misses_before + 1
+        assert sample("sqlexecutor_cache_requests_total", result="miss", tenant_id="TENANT_CACHE_MISSING", cache="tenant") == 0
+
+    @pytest.mark.asyncio
+    async def test_http_errors_use_tenant_label_only_for_loaded_tenants(self):
+        # Arrange
+        cache = TenantCache(max_size=10, ttl_seconds=60)
+        cache.set("TENANT_LOADED", {"tenant_id": "TENANT_LOADED", "tenant_name": "Loaded Tenant"}, cache.get_version("TENANT_LOADED"))
+        labels = {"error_type": "http_error", "error_subtype": "", "status_code": "418"}
+        loaded_before = sample("sqlexecutor_errors_total", tenant_id="TENANT_LOADED", **labels)
+        unknown_before = sample("sqlexecutor_errors_total", tenant_id="unknown", **labels)
+
+        # Act
+        with patch("api.core.exceptions.default_exception_handler.tenant_cache", cache):
+            await http_exception_handler(SimpleNamespace(path_params={"tenant_id": "TENANT_LOADED"}), HTTPException(418, "teapot"))
+            await http_exception_handler(SimpleNamespace(path_params={"tenant_id": "TENANT_FORGED"}), HTTPException(418, "teapot"))
+
+        # Assert
+        assert sample("sqlexecutor_errors_total", tenant_id="TENANT_LOADED", **labels) == loaded_before + 1
+        assert sample("sqlexecutor_errors_total", tenant_id="unknown", **labels) == unknown_before + 1
+        assert sample("sqlexecutor_errors_total", tenant_id="TENANT_FORGED", **labels) == 0
+
+
+class TestPoolGauges:
+
+    def test_external_db_pool_gauges_are_collected(self):
+        # Arrange
+        registry = ExternalSystemEngineRegistry(max_size=4)
+        engine = create_engine("sqlite://", poolclass=QueuePool)
+        registry._engines[("TENANT_POOL", "sqlite", None, False)] = ("sqlite://", engine)
+
+        # Act
+        with patch("utils.metrics.prometheus_metrics.engine_registry", registry):
+            content, content_type = render_metrics()
+
+        # Assert
+        assert content_type.startswith("text/plain")
+        assert b'sqlexecutor_external_db_pool_connections{dialect="sqlite",is_async="false",schema_name="",state="checked_out",tenant_id="TENANT_POOL"} 0.0' in content
+        engine.dispose()
+
+    def test_mongo_pool_listener_tracks_checked_out_connections(self):
+        # Arrange
+        listener = MongoPoolListener()
+        event = SimpleNamespace(address=("localhost", 27017))
+
+        # Act
+        listener.pool_created(event)
+        listener.connection_created(event)
+        listener.connection_created(event)
+        listener.connection_checked_out(event)
+        listener.connection_checked_out(event)
+        listener.connection_checked_in(event)
+
+        # Assert
+        assert listener.get_stats() == {"localhost:27017": (2, 1)}
@@ -0,0 +1,119 @@
+import asyncio
+import pytest
+from fastapi import HTTPException
+
+from utils.pipeline.stage_graph import StageGraph
+
+
+@pytest.mark.asyncio
+class TestStageGraph:
+
+    async def test_run_passes_dependency_results(self):
+        # Arrange
+        pipeline = StageGraph(name="test")
+        pipeline.add_stage("a", lambda: 2)
+        pipeline.add_stage("b", lambda a: a * 3, depends_on=["a"])
+
+        # Act
+        results = await pipeline.run()
+
+        # Assert
+        assert results == {"a": 2, "b": 6}
+        assert [timing.stage for timing in pipeline.get_timings()] == ["a", "b"]
+
+    async def test_independent_stages_run_concurrently(self):
+        # Arrange
+        running = set()
+        overlaps = []
+
+        def make_stage(name):
+            async def stage():
+                running.add(name)
+                await asyncio.sleep(0.05)
+                overlaps.append(set(running))
+                running.discard(name)
+                return name
+            return stage
+
+        pipeline = StageGraph(name="test")
+        pipeline.add_stage("left", make_stage("left"))
+        pipeline.add_stage("right", make_stage("right"))
+
+        # Act
+        await pipeline.run()
+
+        # Assert
+        assert {"left", "right"} in overlaps
+
+    async def test_run_only_needed_stages_for_targets(self):
+        # Arrange
+        pipeline = StageGraph(name="test")
+        pipeline.add_stage("a", lambda: 1)
+        pipeline.add_stage("b", lambda a: a + 1, depends_on=["a"])
+        pipeline.add_stage("c", lambda: 3)
+
+        # Act
+        results = await pipeline.run(targets=["b"])
+
+        # Assert
+        assert results == {"a": 1, "b": 2}
+
+    async def test_lazy_dependency_is_awaited_only_when_needed(self):
+        # Arrange
+        started = []
+
+        async def slow_stage():
+            await asyncio.sleep(0.05)
+            return "slow"
+
+        async def lazy_stage(fast, slow):
+            started.append(fast)
+            return f"{fast}+{await slow}"
+
+        pipeline = StageGraph(name="test")
+        pipeline.add_stage("slow", slow_stage)
+        pipeline.add_stage("fast", lambda: "fast")
+        pipeline.add_stage("joined", lazy_stage, depends_on=["fast"], lazy_depends_on=["slow"])
+
+        # Act
+        results = await pipeline.run(targets=["joined"])
+
+        # Assert
+        assert started == ["fast"]
+        assert results == {"slow": "slow", "fast": "fast", "joined": "fast+slow"}
+        timings = {timing.stage: timing for timing in pipeline.get_timings()}
+        assert timings["joined"].started_at_ms < timings["slow"].duration_ms
+
+    async def test_failure_cancels_running_stages(self):
+        # Arrange
+        cancelled = asyncio.Event()
+
+        async def slow_stage():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        def failing_stage():
+            raise HTTPException(status_code=404, detail="Schema not found")
+
+        pipeline = StageGraph(name="test")
+        pipeline.add_stage("slow", slow_stage)
+        pipeline.add_stage("failing", failing_stage)
+
+        # Act
+        with pytest.raises(HTTPException) as exc_info:
+            await pipeline.run()
+
+        # Assert
+        assert exc_info.value.status_code == 404
+        assert cancelled.is_set()
+
+    async def test_add_stage_rejects_unknown_dependency(self):
+        # Arrange
+        pipeline = StageGraph(name="test")
+
+        # Act & Assert
+        with pytest.raises(ValueError):
+            pipeline.add_stage("b", lambda a: a, depends_on=["a"])
@@ -0,0 +1,109 @@
+import pytest
+from fastapi import HTTPException
+
+from api.core.services.ruleset.ruleset_conditions_service import RulesetConditionsService
+from utils.ruleset.ruleset_condition_compiler import compile_condition, to_condition_value
+
+SESSION_DATA = {
+    "user_id": 7,
+    "roles": ["viewer", "admin"],
+    "custom_fields": {"role": "admin", "is_active": "TRUE", "permissions": ["read_only"], "active": True, "age": 30},
+}
+
+CONDITIONS = {
+    "is_active": "${jwt.custom_fields.is_active} == 'TRUE'",
+    "is_admin": "'admin' in ${jwt.custom_fields.role}",
+    "is_adult": "${jwt.age} >= 18",
+}
+
+class TestRulesetConditionCompiler:
+
+    @pytest.mark.parametrize("condition", [
+        "TRUE",
+        "FALSE OR TRUE",
+        "'admin' in ${jwt.custom_fields.role}",
+        "${jwt.custom_fields.is_active} == 'TRUE'",
+        "${conditions.is_active} AND ${conditions.is_admin}",
+        "'viewer' IN ${jwt.roles} AND ${jwt.custom_fields.permissions} IN [['read_only']]",
+        "${jwt.custom_fields.permissions} == ['read_only']",
+        "not ${conditions.is_adult} or ${jwt.user_id} == 7",
+        "18 <= ${jwt.age} < 65 and ${jwt.active} is True",
+        "${jwt.age} + 1 > 30",
+    ])
+    def test_compiled_condition_matches_eval_of_resolved_condition(self, condition):
+        # Arrange
+        expected = eval(RulesetConditionsService.resolve_condition(condition, SESSION_DATA, CONDITIONS))
+
+        # Act
+        result = compile_condition(condition, CONDITIONS).evaluate(SESSION_DATA)
+
+        # Assert
+        assert result == expected
+
+    def test_compile_condition_reuses_compiled_form_until_conditions_change(self):
+        # Arrange
+        updated_conditions = {**CONDITIONS, "is_admin": "'owner' in ${jwt.custom_fields.role}"}
+
+        # Act
+        first = compile_condition("${conditions.is_admin}", CONDITIONS)
+        second = compile_condition("${conditions.is_admin}", dict(CONDITIONS))
+        updated = compile_condition("${conditions.is_admin}", updated_conditions)
+
+        # Assert
+        assert first is second
+        assert updated is not first
+        assert first.evaluate(SESSION_DATA) is True
+        assert updated.evaluate(SESSION_DATA) is False
+
+    def test_evaluate_raises_when_field_is_missing(self):
+        # Arrange
+        compiled_condition = compile_condition("${jwt.custom_fields.unknown} == 1")
+
+        # Act & Assert
+        with pytest.raises(HTTPException) as exc_info:
+            compiled_condition.evaluate(SESSION_DATA)
+
+        assert exc_info.value.status_code == 400
+        assert exc_info.value.detail == "Field 'custom_fields.unknown' is not found in session data."
+
+    def test_compile_condition_raises_for_undefined_named_condition(self):
+        # Act & Assert
+        with pytest.raises(HTTPException) as exc_info:
+            compile_condition("${conditions.unknown}", CONDITIONS)
+
+        assert exc_info.value.detail == "Condition 'unknown' is not defined in the ruleset."
+
+    @pytest.mark.parametrize("condition, error", [
+        ("__import__('os').system('true')", ValueError),
+        ("is_admin", NameError),
+        ("().__class__.__bases__", ValueError),
+        ("[x for x in ${jwt.roles}]", ValueError),
+        ("${jwt.age} == 1 &&", SyntaxError),
+    ])
+    def test_evaluate_rejects_unsupported_expressions(self, condition, error):
+        # Arrange
+        compiled_condition = compile_condition(condition)
+
+        # Act & Assert
+        with pytest.raises(error):
+            compiled_condition.evaluate(SESSION_DATA)
+
+    def test_to_condition_value_normalizes_like_the_condition_text(self):
+        # Act & Assert
+        assert to_condition_value(["TRUE", "x"]) == ["True", "x"]
+        assert to_condition_value(False) is False
+        assert to_condition_value({"a": 1}) == {"a": 1}
+
+class TestEvaluateRulesetCondition:
+
+    def test_evaluate_ruleset_condition_wraps_expression_errors(self):
+        # Act & Assert
+        with pytest.raises(HTTPException) as exc_info:
+            RulesetConditionsService.evaluate_ruleset_condition("${jwt.age} < 'a'", SESSION_DATA, CONDITIONS)
+
+        assert exc_info.value.status_code == 400
+        assert exc_info.value.detail.startswith("Invalid condition: 30 < 'a' | Error:")
+
+    def test_evaluate_ruleset_condition_returns_true_for_empty_condition(self):
+        # Act & Assert
+        assert RulesetConditionsService.evaluate_ruleset_condition(None, SESSION_DATA, None) is True
@@ -0,0 +1,114 @@
+import pytest
+
+from model.query_scope.entities import Entities
+from model.query_scope.query_scope import QueryScope
+from model.responses.schema.schema_tables_response import SchemaTablesResponse, TableResponse, ColumnResponse
+from utils.schema.schema_entity_index import SchemaEntityIndex
+
+
+class TestSchemaEntityIndex:
+
+    def init_schema(self, schema_name, tables):
+        return SchemaTablesResponse(
+            schema_name=schema_name,
+            tables=[
+                TableResponse(
+                    table_name=table_name,
+                    synonyms=synonyms,
+                    columns=[ColumnResponse(column_name=column, type="INTEGER") for column in columns]
+                )
+                for table_name, (columns, synonyms) in tables.items()
+            ]
+        )
+
+    def init_query_scope(self, tables, columns):
+        return QueryScope(intent="fetch_data", entities=Entities(tables=tables, columns=columns))
+
+    def init_index(self):
+        return SchemaEntityIndex([
+            self.init_schema("ecommerce", {"orders": (["order_id", "total"], ["purchases"]), "customers": (["customer_id"], [])}),
+            self.init_schema("inventory", {"products": (["product_id"], ["items"]), "orders": (["order_id"], [])})
+        ])
+
+    def test_routes_to_best_scoring_schema(self):
+        # Arrange
+        schema_index = self.init_index()
+
+        # Act
+        result = schema_index.get_best_matching_schemas(
+            self.init_query_scope(["orders", "customers"], ["orders.total", "customers.customer_id"])
+        )
+
+        # Assert
+        assert result == ["ecommerce"]
+
+    def test_synonym_match_scores(self):
+        # Arrange
+        schema_index = self.init_index()
+
+        # Act
+        result = schema_index.get_best_matching_schemas(self.init_query_scope(["items"], []))
+
+        # Assert
+        assert result == "inventory"
+
+    def test_ties_return_all_best_schemas_in_load_order(self):
+        # Arrange
+        schema_index = self.init_index()
+
+        # Act
+        result = schema_index.get_best_matching_schemas(self.init_query_scope(["orders"], ["orders.order_id"]))
+
+        # Assert
+        assert result == ["ecommerce", "inventory"]
+
+    def test_wildcards_expand_to_table_columns(self):
+        # Arrange
+        schema_index = self.init_index()
+        query_scope = self.init_query_scope(["orders"], ["orders.*"])
+
+        # Act
+        ignored = schema_index.get_best_matching_schemas(query_scope, ignore_wildcards=True)
+        expanded = schema_index.get_best_matching_schemas(query_scope, ignore_wildcards=False)
+
+        # Assert
+        assert ignored == ["ecommerce", "inventory"]
+        assert expanded == ["ecommerce"]
+
+    def test_no_match_returns_empty_list(self):
+        # Arrange
+        schema_index = self.init_index()
+
+        # Act & Assert
+        assert schema_index.get_best_matching_schemas(self.init_query_scope(["invoices"], [])) == []
+
+    def test_incremental_updates_match_a_rebuilt_index(self):
+        # Arrange
+        schema_index = self.init_index()
+        updated_inventory = self.init_schema("inventory", {"products": (["product_id", "price"], [])})
+        warehouse = self.init_schema("warehouse", {"stock": (["product_id"], ["items"])})
+        query_scopes = [
+            self.init_query_scope(["orders"], ["orders.order_id"]),
+            self.init_query_scope(["items"], []),
+            self.init_query_scope(["products"], ["products.price"])
+        ]
+
+        # Act
+        schema_index.add_schema(updated_inventory)
+        schema_index.add_schema(warehouse)
+        schema_index.remove_schema("ecommerce")
+        rebuilt_index = SchemaEntityIndex([updated_inventory, warehouse])
+
+        # Assert
+        assert schema_index.schema_names == ["inventory", "warehouse"]
+        assert set(schema_index.table_names) == {"products", "stock"}
+        for query_scope in query_scopes:
+            assert schema_index.get_best_matching_schemas(query_scope) == rebuilt_index.get_best_matching_schemas(query_scope)
+
+    def test_add_schema_rejects_other_objects(self):
+        # Arrange
+        schema_index = SchemaEntityIndex()
+
+        # Act & Assert
+        with pytest.raises(AttributeError):
+            schema_index.add_schema({"schema_name": "ecommerce", "tables": []})
@@ -0,0 +1,111 @@
+import difflib
+import pytest
+
+from model.schema.schema import Schema
+from utils.schema.schema_lookup_index import FuzzyNameIndex, SchemaLookupIndex, singularize
+
+
+class TestSchemaLookupIndex:
+
+    def init_schema(self) -> Schema:
+        def column(synonyms=None):
+            return {
+                "type": "INTEGER",
+                "synonyms": synonyms or [],
+                "exclude_description_on_generate_sql": False,
+                "is_sensitive_column": False
+            }
+
+        return Schema(
+            tenant_id="TENANT_TST",
+            schema_name="ecommerce",
+            description="Ecommerce schema",
+            exclude_description_on_generate_sql=False,
+            context_type="sql",
+            context_setting={},
+            tables={
+                "orders": {
+                    "columns": {"order_id": column(), "order_date": column(["purchase_date"])},
+                    "synonyms": ["purchases"],
+                    "exclude_description_on_generate_sql": False
+                },
+                "categories": {
+                    "columns": {"category_id": column()},
+                    "exclude_description_on_generate_sql": False
+                },
+                "customers": {
+                    "columns": {"customer_id": column(), "addresses": column()},
+                    "exclude_description_on_generate_sql": False
+                }
+            }
+        )
+
+    @pytest.mark.parametrize("table_name, expected", [
+        ("orders", "orders"),
+        ("purchases", "orders"),
+        ("category", "categories"),
+        ("Customer", "customers"),
+        ("ordrs", "orders"),
+        ("invoices", None)
+    ])
+    def test_find_table(self, table_name, expected):
+        # Arrange
+        lookup_index = SchemaLookupIndex(self.init_schema())
+
+        # Act
+        result = lookup_index.find_table(table_name)
+
+        # Assert
+        assert result == expected
+
+    @pytest.mark.parametrize("column_name, expected", [
+        ("purchase_date", "order_date"),
+        ("order_ids", "order_id"),
+        ("ordr_date", "order_date"),
+        ("total_amount", None)
+    ])
+    def test_find_column(self, column_name, expected):
+        # Arrange
+        lookup_index = SchemaLookupIndex(self.init_schema())
+
+        # Act
+        result = lookup_index.find_column("orders", column_name)
+
+        # Assert
+        assert result == expected
+        assert lookup_index.find_column("unknown_table", column_name) is None
+
+    def test_for_schema_builds_index_once_per_schema(self):
+        # Arrange
+        schema = self.init_schema()
+
+        # Act
+        first_index = SchemaLookupIndex.for_schema(schema)
+        second_index = SchemaLookupIndex.for_schema(schema)
+
+        # Assert
+        assert first_index is second_index
+        assert SchemaLookupIndex.for_schema(self.init_schema()) is not first_index
+        assert "_lookup_index" not in schema.dict()
+
+    @pytest.mark.parametrize("name, expected", [
+        ("categories", "category"),
+        ("addresses", "address"),
+        ("boxes", "box"),
+        ("status", "statu"),
+        ("class", "class"),
+        ("Orders", "order")
+    ])
+    def test_singularize(self, name, expected):
+        # Act & Assert
+        assert singularize(name) == expected
+
+    def test_fuzzy_index_matches_difflib_on_typos(self):
+        # Arrange
+        names = [f"table_{i}_{suffix}" for i in range(200) for suffix in ("orders", "invoices", "shipments")]
+        fuzzy_index = FuzzyNameIndex(names)
+        typos = ["table_17_ordrs", "tabel_42_invoice", "table_199_shipmnts", "tble_3_orders", "unrelated"]
+
+        # Act & Assert
+        for typo in typos:
+            assert fuzzy_index.get_close_matches(typo) == difflib.get_close_matches(typo, names, n=1, cutoff=0.7)
@@ -0,0 +1,125 @@
+import pytest
+
+from model.schema.schema import Schema
+from utils.schema.schema_embedder import HashingEmbedder, get_schema_embedder, register_schema_embedder, schema_embedders
+from utils.schema.schema_table_index import SchemaTableIndex
+
+def init_schema() -> Schema:
+    def table(columns, description=None, synonyms=None, relationships=None):
+        return {
+            "description": description,
+            "synonyms": synonyms or [],
+            "exclude_description_on_generate_sql": False,
+            "columns": {
+                column_name: {"type": "TEXT", "description": None, "constraints": [], "synonyms": column_synonyms,
+                              "exclude_description_on_generate_sql": False, "is_sensitive_column": False}
+                for column_name, column_synonyms in columns.items()
+            },
+            "relationships": relationships or {}
+        }
+
+    def join(target, on):
+        return {"description": None, "table": target, "on": on, "type": "INNER", "exclude_description_on_generate_sql": False}
+
+    return Schema(
+        tenant_id="TENANT_TST",
+        schema_name="erp",
+        description="ERP schema",
+        exclude_description_on_generate_sql=False,
+        tables={
+            "customers": table({"id": [], "customer_name": ["client"], "created_at": []}, "Buyers of the shop"),
+            "orders": table({"id": [], "customer_id": [], "order_total": ["revenue"], "created_at": []}, "Sales orders",
+                            relationships={"customers": join("customers", "orders.customer_id = customers.id")}),
+            "invoices": table({"id": [], "order_id": [], "due_date": [], "created_at": []}, "Invoices sent for orders",
+                              relationships={"orders": join("orders", "invoices.order_id = orders.id")}),
+            "warehouses": table({"id": [], "warehouse_city": [], "created_at": []}, "Storage sites"),
+            "stockItems": table({"id": [], "warehouse_id": [], "quantity": ["stock"], "created_at": []}, "Inventory levels",
+                                relationships={"warehouses": join("warehouses", "stockItems.warehouse_id = warehouses.id")}),
+            "employees": table({"id": [], "employee_name": [], "salary": [], "created_at": []}, "Staff"),
+        },
+        filter_rules=[],
+        context_type="sql",
+        context_setting={}
+    )
+
+class TestSchemaTableIndex:
+
+    @pytest.mark.parametrize("question, expected_table", [
+        ("What is the revenue of each order?", "orders"),
+        ("Which invoices are past their due date?", "invoices"),
+        ("Show the quantity of the stock items", "stockItems"),
+        ("List the clients of the shop", "customers"),
+    ])
+    def test_select_tables_ranks_question_tables_first(self, question, expected_table):
+        # Arrange
+        table_index = SchemaTableIndex(init_schema(), HashingEmbedder())
+
+        # Act
+        selection = table_index.select_tables(question, top_k=1, include_neighbours=False)
+
+        # Assert
+        assert selection.retrieved_tables == [expected_table]
+        assert selection.neighbour_tables == []
+
+    def test_select_tables_adds_join_neighbours_both_ways(self):
+        # Arrange
+        table_index = SchemaTableIndex(init_schema(), HashingEmbedder())
+
+        # Act
+        selection = table_index.select_tables("Which invoices are past their due date?", top_k=1)
+
+        # Assert
+        assert selection.tables == ["invoices", "orders"]
+        assert table_index.neighbours["orders"] == {"customers", "invoices"}
+
+    def test_select_tables_only_considers_candidates(self):
+        # Arrange
+        table_index = SchemaTableIndex(init_schema(), HashingEmbedder())
+
+        # Act
+        selection = table_index.select_tables("Total revenue of the invoices per client", top_k=1,
+                                               candidates=["customers", "orders", "employees"])
+
+        # Assert
+        assert selection.retrieved_tables in (["orders"], ["customers"])
+        assert set(selection.tables) == {"orders", "customers"}
+
+    def test_count_table_tokens(self):
+        # Arrange
+        table_index = SchemaTableIndex(init_schema(), HashingEmbedder())
+
+        # Act
+        tokens = table_index.count_table_tokens(["orders", "invoices"])
+
+        # Assert
+        assert tokens == table_index.table_tokens["orders"] + table_index.table_tokens["invoices"] > 0
+
+    def test_for_schema_builds_once_per_schema_and_embedder(self):
+        # Arrange
+        schema = init_schema()
+        embedder = HashingEmbedder()
+
+        # Act
+        first = SchemaTableIndex.for_schema(schema, embedder)
+        second = SchemaTableIndex.for_schema(schema, embedder)
+        rebuilt = SchemaTableIndex.for_schema(schema.copy(update={"tables": dict(schema.tables)}), embedder)
+
+        # Assert
+        assert first is second
+        assert rebuilt is not first
+
+    def test_register_schema_embedder(self):
+        # Arrange
+        class UpperCaseEmbedder(HashingEmbedder):
+            name = "upper_case"
+
+        # Act
+        register_schema_embedder(UpperCaseEmbedder())
+
+        # Assert
+        try:
+            assert isinstance(get_schema_embedder("upper_case"), UpperCaseEmbedder)
+            with pytest.raises(ValueError):
+                get_schema_embedder("unknown")
+        finally:
+            schema_embedders.pop("upper_case")
@@ -0,0 +1,187 @@
+import json
+
+import pyarrow as pa
+import pytest
+from fastapi import HTTPException
+
+from utils.sql_runner.sql_result_stream_utils import SqlResultStreamUtils
+
+
+async def _batches(*batches):
+    for batch in batches:
+        yield batch
+
+
+async def _collect(stream) -> bytes:
+    return b"".join([chunk async for chunk in stream])
+
+
+def _read_arrow_trailer(body: bytes) -> dict:
+    reader = pa.ipc.open_stream(body)
+    custom_metadata = None
+    while True:
+        try:
+            _, custom_metadata = reader.read_next_batch_with_custom_metadata()
+        except StopIteration:
+            break
+    return {key.decode(): json.loads(value) for key, value in custom_metadata.items()}
+
+
+class TestSqlResultStreamUtils:
+
+    @pytest.mark.asyncio
+    async def test_encode_ndjson_writes_header_rows_and_trailer(self):
+        # Arrange
+        batches = _batches([{"id": 1}, {"id": 2}], [{"id": 3}])
+
+        # Act
+        body = await _collect(SqlResultStreamUtils.encode_ndjson(
+            batches, {"sql_query": "SELECT id FROM t"}, max_rows=10, max_bytes=10_000
+        ))
+
+        # Assert
+        lines = [json.loads(line) for line in body.decode().splitlines()]
+        assert lines[0] == {"type": "header", "sql_query": "SELECT id FROM t"}
+        assert [line["row"]["id"] for line in lines[1:-1]] == [1, 2, 3]
+        assert lines[-1] == {"type": "trailer", "row_count": 3, "truncated": False, "truncated_by": None}
+
+    @pytest.mark.asyncio
+    async def test_encode_ndjson_stops_at_row_cap(self):
+        # Arrange
+        batches = _batches([{"id": 1}, {"id": 2}], [{"id": 3}])
+
+        # Act
+        body = await _collect(SqlResultStreamUtils.encode_ndjson(batches, {}, max_rows=2, max_bytes=10_000))
+
+        # Assert
+        trailer = json.loads(body.decode().splitlines()[-1])
+        assert trailer["row_count"] == 2
+        assert trailer["truncated_by"] == "max_rows"
+
+    @pytest.mark.asyncio
+    async def test_encode_ndjson_stops_at_byte_cap(self):
+        # Arrange
+        batches = _batches([{"payload": "x" * 50} for _ in range(10)])
+
+        # Act
+        body = await _collect(SqlResultStreamUtils.encode_ndjson(batches, {}, max_rows=100, max_bytes=200))
+
+        # Assert
+        trailer = json.loads(body.decode().splitlines()[-1])
+        assert trailer["truncated_by"] == "max_bytes"
+        assert 0 < trailer["row_count"] < 10
+
+    @pytest.mark.asyncio
+    async def test_encode_arrow_writes_readable_ipc_stream(self):
+        # Arrange
+        batches = _batches([{"id": 1, "name": "a"}, {"id": 2, "name": "b"}], [{"id": 3, "name": "c"}])
+
+        # Act
+        body = await _collect(SqlResultStreamUtils.encode_arrow(
+            batches, {"sql_query": "SELECT id, name FROM t"}, max_rows=10, max_bytes=1_000_000
+        ))
+
+        # Assert
+        table = pa.ipc.open_stream(body).read_all()
+        assert table.column("id").to_pylist() == [1, 2, 3]
+        assert json.loads(table.schema.metadata[b"sql_query"]) == "SELECT id, name FROM t"
+
+    @pytest.mark.asyncio
+    async def test_encode_arrow_stops_at_row_cap(self):
+        # Arrange
+        batches = _batches([{"id": 1}, {"id": 2}], [{"id": 3}])
+
+        # Act
+        body = await _collect(SqlResultStreamUtils.encode_arrow(batches, {}, max_rows=1, max_bytes=1_000_000))
+
+        # Assert
+        assert pa.ipc.open_stream(body).read_all().num_rows == 1
+        assert _read_arrow_trailer(body) == {"type": "trailer", "row_count": 1, "truncated": True, "truncated_by": "max_rows"}
+
+    @pytest.mark.asyncio
+    async def test_encode_arrow_reports_byte_cap_in_trailer(self):
+        # Arrange
+        batches = _batches(*[[{"payload": "x" * 500}] for _ in range(10)])
+
+        # Act
+        body = await _collect(SqlResultStreamUtils.encode_arrow(batches, {}, max_rows=100, max_bytes=3000))
+
+        # Assert
+        trailer = _read_arrow_trailer(body)
+        assert trailer["truncated_by"] == "max_bytes"
+        assert 0 < trailer["row_count"] < 10
+        assert pa.ipc.open_stream(body).read_all().num_rows == trailer["row_count"]
+
+    @pytest.mark.asyncio
+    async def test_encode_arrow_trailer_of_complete_result(self):
+        # Arrange
+        batches = _batches([{"id": 1}, {"id": 2}])
+
+        # Act
+        body = await _collect(SqlResultStreamUtils.encode_arrow(batches, {}, max_rows=2, max_bytes=1_000_000))
+
+        # Assert
+        assert _read_arrow_trailer(body) == {"type": "trailer", "row_count": 2, "truncated": False, "truncated_by": None}
+
+    @pytest.mark.asyncio
+    async def test_encode_arrow_types_column_null_in_first_batch(self):
+        # Arrange
+        batches = _batches([{"id": 1, "shipped_at": None}], [{"id": 2, "shipped_at": None}], [{"id": 3, "shipped_at": "2024-01-02"}])
+
+        # Act
+        body = await _collect(SqlResultStreamUtils.encode_arrow(batches, {}, max_rows=10, max_bytes=1_000_000))
+
+        # Assert
+        table = pa.ipc.open_stream(body).read_all()
+        assert table.schema.field("shipped_at").type == pa.string()
+        assert table.column("shipped_at").to_pylist() == [None, None, "2024-01-02"]
+
+    @pytest.mark.asyncio
+    async def test_encode_arrow_keeps_column_null_in_every_row(self):
+        # Arrange
+        batches = _batches([{"id": 1, "note": None}], [{"id": 2, "note": None}])
+
+        # Act
+        body = await _collect(SqlResultStreamUtils.encode_arrow(batches, {}, max_rows=10, max_bytes=1_000_000))
+
+        # Assert
+        table = pa.ipc.open_stream(body).read_all()
+        assert table.column("id").to_pylist() == [1, 2]
+        assert table.column("note").to_pylist() == [None, None]
+
+    @pytest.mark.asyncio
+    async def test_encode_arrow_casts_later_batch_to_sent_schema(self):
+        # Arrange
+        batches = _batches([{"amount": 1.5}], [{"amount": 2}])
+
+        # Act
+        body = await _collect(SqlResultStreamUtils.encode_arrow(batches, {}, max_rows=10, max_bytes=1_000_000))
+
+        # Assert
+        table = pa.ipc.open_stream(body).read_all()
+        assert table.schema.field("amount").type == pa.float64()
+        assert table.column("amount").to_pylist() == [1.5, 2.0]
+
+    @pytest.mark.asyncio
+    async def test_encode_arrow_aborts_on_batch_not_fitting_schema(self):
+        # Arrange
+        batches = _batches([{"amount": 1}], [{"amount": "n/a"}])
+
+        # Act & Assert
+        with pytest.raises(pa.ArrowInvalid):
+            await _collect(SqlResultStreamUtils.encode_arrow(batches, {}, max_rows=10, max_bytes=1_000_000))
+
+    @pytest.mark.asyncio
+    async def test_prime_returns_empty_stream_when_no_rows(self):
+        # Act
+        batches = await SqlResultStreamUtils.prime(_batches())
+
+        # Assert
+        assert [batch async for batch in batches] == []
+
+    def test_validate_stream_format_rejects_unknown_format(self):
+        # Act & Assert
+        with pytest.raises(HTTPException) as exc_info:
+            SqlResultStreamUtils.validate_stream_format("csv")
+
+        assert exc_info.value.status_code == 400
@@ -0,0 +1,59 @@
+import pytest
+
+from utils.sql_runner.sql_statement_utils import SqlStatementUtils
+
+
+class TestSqlStatementUtils:
+
+    def test_mask_nested_keeps_positions_and_outer_parentheses(self):
+        # Arrange
+        sql = "SELECT 'a(b' AS x, COUNT(*) FROM (SELECT 1) t -- ORDER BY x"
+
+        # Act
+        masked = SqlStatementUtils.mask_nested(sql)
+
+        # Assert
+        assert len(masked) == len(sql)
+        assert masked.split() == ["SELECT", "AS", "x,", "COUNT(", ")", "FROM", "(", ")", "t"]
+
+    @pytest.mark.parametrize("sql, expected", [
+        ("SELECT * FROM orders", True),
+        ("WITH recent AS (SELECT * FROM orders) SELECT REPLACE(status, 'a', 'b') FROM recent", True),
+        ("(SELECT 1) UNION (SELECT 2)", True),
+        ("WITH stale AS (SELECT order_id FROM orders) DELETE FROM orders WHERE order_id IN (SELECT order_id FROM stale)", False),
+        ("UPDATE orders SET status = 'shipped'", False),
+    ])
+    def test_is_select(self, sql, expected):
+        # Act & Assert
+        assert SqlStatementUtils.is_select(sql) is expected
+
+    @pytest.mark.parametrize("sql, expected", [
+        ("SELECT * FROM orders", "SELECT * FROM orders LIMIT 10"),
+        ("SELECT * FROM orders LIMIT 50 OFFSET 5", "SELECT * FROM orders LIMIT 10 OFFSET 5"),
+        ("SELECT * FROM orders WHERE note = 'LIMIT 3'", "SELECT * FROM orders WHERE note = 'LIMIT 3' LIMIT 10"),
+        ("SELECT * FROM orders OFFSET 5", None),
+        ("SELECT * FROM orders LIMIT :page_size", None),
+    ])
+    def test_with_limit(self, sql, expected):
+        # Act & Assert
+        assert SqlStatementUtils.with_limit(sql, 10) == expected
+
+    @pytest.mark.parametrize("sql, expected", [
+        ("SELECT * FROM orders ORDER BY amount DESC, order_id LIMIT 5 OFFSET 10", "amount DESC, order_id"),
+        ("SELECT order_id, ROW_NUMBER() OVER (ORDER BY amount) AS position FROM orders", None),
+        ("SELECT * FROM (SELECT * FROM orders ORDER BY amount LIMIT 3) AS cheapest", None),
+        ("SELECT order_id, ROW_NUMBER() OVER (ORDER BY amount) AS position FROM orders ORDER BY position", "position"),
+    ])
+    def test_get_order_by(self, sql, expected):
+        # Act & Assert
+        assert SqlStatementUtils.get_order_by(sql) == expected
+
+    @pytest.mark.parametrize("sql, expected", [
+        ("SELECT o.order_id FROM orders o WHERE note = 'credit_card' -- email", {"select", "o", "order_id", "from", "orders", "where", "note"}),
+        ('SELECT "Credit Card", `email` FROM [Customers]', {"select", "credit card", "email", "from", "customers"}),
+        ("SELECT COUNT(*), price * 2 FROM orders", {"select", "count", "price", "from", "orders"}),
+        ("SELECT o.* FROM orders o", {"select", "o", "*", "from", "orders"}),
+    ])
+    def test_get_identifiers(self, sql, expected):
+        # Act & Assert
+        assert SqlStatementUtils.get_identifiers(sql) == expected
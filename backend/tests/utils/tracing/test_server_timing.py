@@ -0,0 +1,69 @@
+import pytest
+from fastapi import Request
+from fastapi.responses import JSONResponse, Response
+
+from model.responses.sql_generation.stage_timing import StageTiming
+from utils.pipeline.stage_graph import StageGraph
+from utils.tracing.otel_tracing import start_span
+from utils.tracing.server_timing import SERVER_TIMING_HEADER, format_server_timing, trace_request
+
+
+def build_request(path: str) -> Request:
+    return Request({"type": "http", "method": "GET", "path": path, "headers": [], "query_string": b""})
+
+
+async def run_pipeline(request: Request) -> Response:
+    pipeline = StageGraph(name="test", tenant_id="TENANT", span_attributes={"schema_name": "schema_a"})
+    pipeline.add_stage("tenant", lambda: "TENANT")
+    pipeline.add_stage("schema", lambda tenant: "schema_a", depends_on=["tenant"])
+    await pipeline.run()
+    return JSONResponse({"status": "ok"})
+
+
+async def health(request: Request) -> Response:
+    return JSONResponse({"status": "ok"})
+
+
+class TestServerTiming:
+
+    def test_format_server_timing_sums_repeated_stages(self):
+        # Arrange
+        timings = [
+            StageTiming(stage="intent", started_at_ms=0, duration_ms=12.5),
+            StageTiming(stage="generated_sql", started_at_ms=12.5, duration_ms=30),
+            StageTiming(stage="intent", started_at_ms=0, duration_ms=7.5),
+        ]
+
+        # Act
+        header = format_server_timing(timings, total_ms=45.1234)
+
+        # Assert
+        assert header == "intent;dur=20.0, generated_sql;dur=30.0, total;dur=45.123"
+
+    @pytest.mark.asyncio
+    async def test_pipeline_stage_timings_are_returned_in_header(self):
+        # Act
+        response = await trace_request(build_request("/TENANT/schema_a"), run_pipeline)
+
+        # Assert
+        assert response.status_code == 200
+        metrics = [metric.split(";")[0] for metric in response.headers[SERVER_TIMING_HEADER].split(", ")]
+        assert metrics == ["tenant", "schema", "total"]
+
+    @pytest.mark.asyncio
+    async def test_requests_without_pipeline_have_no_header(self):
+        # Act
+        response = await trace_request(build_request("/health"), health)
+
+        # Assert
+        assert response.status_code == 200
+        assert SERVER_TIMING_HEADER not in response.headers
+
+    def test_start_span_is_a_noop_when_tracing_is_disabled(self):
+        # Act
+        with start_span("test", {"tenant_id": "TENANT", "schema_name": None}) as span:
+            span.set_attribute("db.row_count", 3)
+            span.update_name("renamed")
+
+        # Assert
+        assert span is not None